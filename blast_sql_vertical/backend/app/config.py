@@ -18,11 +18,20 @@ def env_list(name: str) -> list[str]:
 
 CONTENT_DIR = Path(os.getenv("CONTENT_DIR", Path(__file__).parent.parent / "content"))
 MAX_QUERY_LENGTH = int(os.getenv("MAX_QUERY_LENGTH", 10240))
+# Prepared statements kept per DuckDB session, and result sets shared across sessions
+# (the seed data is immutable, so identical SELECTs always return identical rows).
+SQL_STATEMENT_CACHE_SIZE = max(0, int(os.getenv("SQL_STATEMENT_CACHE_SIZE", "64")))
+SQL_RESULT_CACHE_SIZE = max(0, int(os.getenv("SQL_RESULT_CACHE_SIZE", "256")))
+SQL_RESULT_CACHE_MAX_ROWS = max(0, int(os.getenv("SQL_RESULT_CACHE_MAX_ROWS", "500")))
 USER_DB_PATH = Path(os.getenv("USER_DB_PATH", Path(__file__).parent.parent / "data" / "users.db"))
 AUTH_TOKEN_TTL_HOURS = int(os.getenv("AUTH_TOKEN_TTL_HOURS", 24 * 7))
 INITIAL_ADMIN_EMAIL = os.getenv("INITIAL_ADMIN_EMAIL", "").strip().lower()
 INITIAL_ADMIN_PASSWORD = os.getenv("INITIAL_ADMIN_PASSWORD", "")
 STRICT_CONTENT_VALIDATION = env_bool("STRICT_CONTENT_VALIDATION", default=True)
+# Solution results precomputed by tools/check_solutions.py; answer validation compares against them
+# instead of re-running the solution (entries whose solution or seed.sql changed are ignored).
+EXPECTED_RESULTS_ENABLED = env_bool("EXPECTED_RESULTS_ENABLED", default=True)
+EXPECTED_RESULTS_PATH = Path(os.getenv("EXPECTED_RESULTS_PATH", "").strip() or CONTENT_DIR / "expected_results.json")
 
 PDF_RENDER_TIMEOUT_MS = int(os.getenv("PDF_RENDER_TIMEOUT_MS", "45000"))
 PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH = os.getenv("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH", "").strip() or None
@@ -31,8 +40,36 @@ PLAYWRIGHT_CHROMIUM_ARGS = [
     for arg in os.getenv("PLAYWRIGHT_CHROMIUM_ARGS", "--disable-dev-shm-usage,--no-sandbox").split(",")
     if arg.strip()
 ]
+# PDF backends in order of preference; "native" draws known templates (certificate)
+# without a browser, "chromium" renders arbitrary HTML and is always the fallback.
+PDF_BACKENDS = [
+    name.strip().lower()
+    for name in os.getenv("PDF_BACKENDS", "native,chromium").split(",")
+    if name.strip()
+]
+# Pooled Chromium pages: concurrent renders, idle page lifetime, renders before a browser
+# restart (0 disables), and how long a request may queue for a free page.
+PDF_PAGE_POOL_SIZE = max(1, int(os.getenv("PDF_PAGE_POOL_SIZE", "2")))
+PDF_PAGE_IDLE_SECONDS = max(0, int(os.getenv("PDF_PAGE_IDLE_SECONDS", "300")))
+PDF_BROWSER_MAX_RENDERS = max(0, int(os.getenv("PDF_BROWSER_MAX_RENDERS", "200")))
+PDF_RENDER_QUEUE_TIMEOUT_SECONDS = max(1, int(os.getenv("PDF_RENDER_QUEUE_TIMEOUT_SECONDS", "30")))
+# Launch Chromium and open the pooled pages during startup instead of on the first render,
+# and how often the supervisor probes the browser and relaunches it if it died (0 disables).
+PDF_WARMUP_ON_STARTUP = env_bool("PDF_WARMUP_ON_STARTUP", default=False)
+PDF_SUPERVISOR_INTERVAL_SECONDS = max(0, int(os.getenv("PDF_SUPERVISOR_INTERVAL_SECONDS", "30")))
+# Content-addressed disk cache for rendered PDFs (certificates); 0 bytes disables it.
+PDF_CACHE_DIR = Path(os.getenv("PDF_CACHE_DIR", "").strip() or Path(__file__).parent.parent / "data" / "pdf_cache")
+PDF_CACHE_MAX_BYTES = max(0, int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024))))
+# Background report render jobs: worker tasks (defaults to the page pool size), max jobs
+# queued or running, and how long finished PDFs stay downloadable under PDF_JOB_DIR.
+PDF_JOB_DIR = Path(os.getenv("PDF_JOB_DIR", "").strip() or Path(__file__).parent.parent / "data" / "pdf_jobs")
+PDF_JOB_WORKERS = max(1, int(os.getenv("PDF_JOB_WORKERS", str(PDF_PAGE_POOL_SIZE))))
+PDF_JOB_MAX_PENDING = max(1, int(os.getenv("PDF_JOB_MAX_PENDING", "50")))
+PDF_JOB_TTL_SECONDS = max(60, int(os.getenv("PDF_JOB_TTL_SECONDS", "900")))
 
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", os.getenv("STRIPE_SEKRET_KEY", "")).strip()
+# Optional Stripe API base override (e.g. http://localhost:12111 for stripe-mock).
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE", "").strip().rstrip("/")
 STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY", "").strip()
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "").strip()
 STRIPE_WEBHOOK_SECRET_FILE = os.getenv("STRIPE_WEBHOOK_SECRET_FILE", "").strip()
@@ -50,6 +87,18 @@ STRIPE_WEBHOOK_FORWARD_EVENTS = os.getenv(
     "checkout.session.completed,payment_intent.succeeded,charge.refunded,customer.subscription.deleted,charge.dispute.created,invoice.paid,invoice.payment_failed",
 ).strip()
 STRIPE_AUTOMATIC_TAX_ENABLED = env_bool("STRIPE_AUTOMATIC_TAX_ENABLED", default=False)
+# TTL caches for read-only Stripe lookups (0 disables caching for that lookup).
+STRIPE_PROMO_CACHE_TTL_SECONDS = max(0, int(os.getenv("STRIPE_PROMO_CACHE_TTL_SECONDS", "300")))
+STRIPE_PROMO_NEGATIVE_CACHE_TTL_SECONDS = max(0, int(os.getenv("STRIPE_PROMO_NEGATIVE_CACHE_TTL_SECONDS", "60")))
+STRIPE_LOOKUP_CACHE_TTL_SECONDS = max(0, int(os.getenv("STRIPE_LOOKUP_CACHE_TTL_SECONDS", "15")))
+# Webhooks are acknowledged after being persisted and processed by background workers.
+STRIPE_WEBHOOK_ASYNC = env_bool("STRIPE_WEBHOOK_ASYNC", default=True)
+STRIPE_WEBHOOK_WORKERS = max(1, int(os.getenv("STRIPE_WEBHOOK_WORKERS", "1")))
+STRIPE_WEBHOOK_POLL_SECONDS = max(0.1, float(os.getenv("STRIPE_WEBHOOK_POLL_SECONDS", "2")))
+STRIPE_WEBHOOK_MAX_ATTEMPTS = max(1, int(os.getenv("STRIPE_WEBHOOK_MAX_ATTEMPTS", "8")))
+STRIPE_WEBHOOK_RETRY_BASE_SECONDS = max(1, int(os.getenv("STRIPE_WEBHOOK_RETRY_BASE_SECONDS", "10")))
+STRIPE_WEBHOOK_RETRY_MAX_SECONDS = max(1, int(os.getenv("STRIPE_WEBHOOK_RETRY_MAX_SECONDS", "3600")))
+STRIPE_WEBHOOK_LOCK_TIMEOUT_SECONDS = max(30, int(os.getenv("STRIPE_WEBHOOK_LOCK_TIMEOUT_SECONDS", "300")))
 BILLING_COURSE_ID = os.getenv("BILLING_COURSE_ID", "sql-basics").strip() or "sql-basics"
 ACCESS_DURATION_MONTHS = int(os.getenv("ACCESS_DURATION_MONTHS", "6"))
 CPF_ENCRYPTION_KEY = os.getenv("CPF_ENCRYPTION_KEY", "").strip()
@@ -65,9 +114,34 @@ STRIPE_INSTALLMENT_PRICE_IDS: dict[int, str] = {
 
 _impersonation_ttl_minutes = int(os.getenv("IMPERSONATION_TTL_MINUTES", "30"))
 IMPERSONATION_TTL_MINUTES = max(15, min(60, _impersonation_ttl_minutes))
+# Admin user list: cached total_items per filter set (0 recounts on every request).
+ADMIN_USERS_COUNT_CACHE_TTL_SECONDS = max(0, int(os.getenv("ADMIN_USERS_COUNT_CACHE_TTL_SECONDS", "30")))
+# Admin dashboard stats cache (cleared on access changes) and hourly trend snapshots (0 disables history).
+ADMIN_STATS_CACHE_TTL_SECONDS = max(0, int(os.getenv("ADMIN_STATS_CACHE_TTL_SECONDS", "15")))
+ADMIN_STATS_HISTORY_BUCKET_SECONDS = max(0, int(os.getenv("ADMIN_STATS_HISTORY_BUCKET_SECONDS", "3600")))
+# Bulk admin jobs (grant/extend access, set progress): users per transaction and per job.
+ADMIN_BULK_CHUNK_SIZE = max(1, min(5000, int(os.getenv("ADMIN_BULK_CHUNK_SIZE", "500"))))
+ADMIN_BULK_MAX_TARGETS = max(1, int(os.getenv("ADMIN_BULK_MAX_TARGETS", "50000")))
+# Admin CSV/Parquet exports: rows fetched from SQLite per fetchmany() batch.
+ADMIN_EXPORT_BATCH_SIZE = max(1, int(os.getenv("ADMIN_EXPORT_BATCH_SIZE", "1000")))
 
 # Password reset + Resend email
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "").strip()
 RESEND_FROM_EMAIL = os.getenv("RESEND_FROM_EMAIL", "Blast Education <noreply@blastgroup.org>").strip()
 APP_BASE_URL = os.getenv("APP_BASE_URL", "http://localhost:5173").strip().rstrip("/")
 PASSWORD_RESET_TOKEN_TTL_MINUTES = int(os.getenv("PASSWORD_RESET_TOKEN_TTL_MINUTES", "60"))
+# Emails are written to an outbox table and delivered in batches by a background sender.
+EMAIL_OUTBOX_ENABLED = env_bool("EMAIL_OUTBOX_ENABLED", default=True)
+EMAIL_OUTBOX_BATCH_SIZE = max(1, min(100, int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))))
+EMAIL_OUTBOX_POLL_SECONDS = max(0.1, float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "2")))
+EMAIL_OUTBOX_MAX_ATTEMPTS = max(1, int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6")))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = max(1, int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30")))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = max(1, int(os.getenv("EMAIL_OUTBOX_RETRY_MAX_SECONDS", "3600")))
+
+# Request/stage timing metrics (Server-Timing header + /metrics)
+METRICS_ENABLED = env_bool("METRICS_ENABLED", default=True)
+METRICS_SAMPLE_RATE = max(0.0, min(1.0, float(os.getenv("METRICS_SAMPLE_RATE", "0.1"))))
+SERVER_TIMING_ENABLED = env_bool("SERVER_TIMING_ENABLED", default=True)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "").strip()
+# Without a token /metrics is only served when explicitly made public.
+METRICS_PUBLIC = env_bool("METRICS_PUBLIC", default=False)
@@ -1,8 +1,13 @@
-from fastapi import Depends, FastAPI
+import hmac
+
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.config import METRICS_ENABLED, METRICS_PUBLIC, METRICS_TOKEN
 from app.routers import admin, account, auth, billing, checkout, courses, lessons, progress, reports, sql
+from app.services.account_service import initialize_certificate_assets
+from app.services.admin_service import recover_admin_bulk_jobs
 from app.services.auth_service import (
     bootstrap_initial_admin,
     bootstrap_required_users,
@@ -10,8 +15,13 @@ from app.services.auth_service import (
 )
 from app.services.billing_service import require_course_access
 from app.services.content_loader import initialize_runtime_content
-from app.services.pdf_service import shutdown_pdf_service
+from app.services.email_outbox_service import start_email_sender, stop_email_sender
+from app.services.metrics_service import MetricsMiddleware, render_prometheus
+from app.services.pdf_job_service import shutdown_pdf_jobs
+from app.services.pdf_service import get_pdf_readiness, shutdown_pdf_service, start_pdf_supervisor
+from app.services.sql_engine import initialize_sql_engine
 from app.services.user_db import init_user_db
+from app.services.webhook_queue_service import start_webhook_workers, stop_webhook_workers
 
 app = FastAPI(title="Blast SQL Learning Platform")
 
@@ -21,24 +31,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/health", tags=["health"])
 def health() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+    # Always 200 so container health checks only track the API; PDF readiness is informational.
+    pdf = get_pdf_readiness()
+    return JSONResponse({"status": "ok" if pdf["ready"] else "degraded", "pdf": pdf})
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(default=None)) -> PlainTextResponse:
+    if not METRICS_ENABLED or not (METRICS_TOKEN or METRICS_PUBLIC):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @app.on_event("startup")
 def startup() -> None:
     init_user_db()
+    recover_admin_bulk_jobs()
     bootstrap_required_users()
     bootstrap_initial_admin()
     initialize_runtime_content()
+    initialize_certificate_assets()
+    initialize_sql_engine()
+    start_webhook_workers()
+    start_email_sender()
+
+
+@app.on_event("startup")
+async def start_pdf_runtime() -> None:
+    await start_pdf_supervisor()
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
+    stop_webhook_workers()
+    stop_email_sender()
+    await shutdown_pdf_jobs()
     await shutdown_pdf_service()
 
 
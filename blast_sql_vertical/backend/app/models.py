@@ -109,6 +109,27 @@ class CheatsheetPdfRequest(BaseModel):
     filename: str | None = Field(default=None, max_length=180)
 
 
+class PdfJobRequest(BaseModel):
+    kind: str = Field(default="master-challenge", max_length=40)
+    html: str = Field(..., min_length=1, max_length=2_000_000)
+    filename: str | None = Field(default=None, max_length=180)
+
+
+class PdfJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    filename: str
+    error: str | None = None
+    size_bytes: int | None = None
+    deduplicated: bool = False
+    created_at: int
+    started_at: int | None = None
+    finished_at: int | None = None
+    expires_at: int | None = None
+    download_url: str | None = None
+
+
 class LessonProgressUpsertRequest(BaseModel):
     progress: dict[str, Any] = Field(default_factory=dict)
     is_completed: bool = False
@@ -195,6 +216,17 @@ class AdminStatsResponse(BaseModel):
     expirations_next_30d: int
 
 
+class AdminStatsHistoryEntry(BaseModel):
+    bucket_start: int
+    recorded_at: int
+    stats: AdminStatsResponse
+
+
+class AdminStatsHistoryResponse(BaseModel):
+    bucket_seconds: int
+    items: list[AdminStatsHistoryEntry]
+
+
 class AdminUserListItem(BaseModel):
     id: int
     full_name: str | None = None
@@ -219,6 +251,7 @@ class AdminUsersResponse(BaseModel):
     page_size: int
     total_items: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class AdminUserProfileResponse(BaseModel):
@@ -317,6 +350,41 @@ class AdminUserProgressUpdateRequest(BaseModel):
     completed_lesson_ids: list[str] | None = None
 
 
+class AdminBulkJobRequest(BaseModel):
+    operation: str = Field(..., max_length=40)
+    reason: str = Field(..., min_length=1, max_length=600)
+    user_ids: list[int] | None = None
+    csv: str | None = Field(default=None, max_length=5_000_000)
+    status: str | None = Field(default=None, max_length=40)
+    expires_at: int | None = None
+    expires_in_days: int | None = Field(default=None, ge=1, le=3650)
+    expires_in_months: int | None = Field(default=None, ge=1, le=120)
+    extend_days: int | None = Field(default=None, ge=1, le=3650)
+    overall_percent: float | None = Field(default=None, ge=0, le=100)
+    completed_lesson_ids: list[str] | None = None
+
+
+class AdminBulkJobError(BaseModel):
+    target: int | str
+    error: str
+
+
+class AdminBulkJobResponse(BaseModel):
+    id: str
+    admin_id: int
+    operation: str
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    errors: list[AdminBulkJobError] = []
+    last_error: str | None = None
+    created_at: int
+    started_at: int | None = None
+    finished_at: int | None = None
+
+
 class AdminImpersonateRequest(BaseModel):
     user_id: int = Field(..., ge=1)
     reason: str | None = Field(default=None, max_length=600)
@@ -0,0 +1,30 @@
+"""
+Rebuild the materialized admin listing columns.
+
+    python -m app.rebuild_progress_summary
+
+Recomputes ``user_progress_summary`` and ``users.latest_purchase_id`` from
+``lesson_progress`` and ``purchases``. Safe to run at any time; normal writes keep both
+in sync, so this is only needed after manual SQL edits or restoring a backup.
+"""
+
+import argparse
+import json
+import logging
+
+from app.services.user_db import init_user_db, rebuild_user_progress_summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild per-user progress summaries and latest purchase ids.")
+    parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    init_user_db()
+    stats = rebuild_user_progress_summary()
+    print(json.dumps(stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
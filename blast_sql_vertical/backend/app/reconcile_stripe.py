@@ -0,0 +1,41 @@
+"""
+Bulk Stripe reconciliation CLI.
+
+    python -m app.reconcile_stripe [--restart] [--dry-run] [--admin-id ID]
+
+Resumes from the last checkpoint unless ``--restart`` is given. Point ``STRIPE_API_BASE``
+at a local Stripe stub (e.g. stripe-mock) to run it without touching the real API.
+"""
+
+import argparse
+import json
+import logging
+
+from app.services.billing_service import reconcile_users_with_stripe
+from app.services.user_db import init_user_db
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile user access state with Stripe in bulk.")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint and start over")
+    parser.add_argument("--page-size", type=int, default=100, help="Stripe list page size (max 100)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Stripe objects per DB transaction/checkpoint")
+    parser.add_argument("--admin-id", type=int, default=None, help="write admin audit logs attributed to this admin")
+    parser.add_argument("--dry-run", action="store_true", help="plan corrections without writing them")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    init_user_db()
+    stats = reconcile_users_with_stripe(
+        restart=args.restart,
+        page_size=args.page_size,
+        chunk_size=args.chunk_size,
+        admin_id=args.admin_id,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
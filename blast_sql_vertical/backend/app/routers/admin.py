@@ -1,11 +1,15 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.models import (
+    AdminBulkJobRequest,
+    AdminBulkJobResponse,
     AdminCreateUserRequest,
     AdminImpersonateRequest,
     AdminImpersonateResponse,
+    AdminStatsHistoryResponse,
     AdminStatsResponse,
     AdminStopImpersonationResponse,
     AdminUserDetailResponse,
@@ -16,11 +20,15 @@ from app.models import (
 )
 from app.services.admin_service import (
     create_admin_user,
+    get_admin_bulk_job_status,
     get_admin_stats,
+    get_admin_stats_history,
     get_admin_user_detail,
     list_admin_users,
     start_admin_impersonation,
     stop_admin_impersonation,
+    stream_admin_export,
+    submit_admin_bulk_job,
     update_admin_user_access,
     update_admin_user_progress,
 )
@@ -80,6 +88,22 @@ def admin_stats(
     return get_admin_stats()
 
 
+@router.get("/stats/history", response_model=AdminStatsHistoryResponse)
+def admin_stats_history(
+    request: Request,
+    days: int = Query(default=30, ge=1, le=365),
+    admin_user: dict = Depends(require_admin_user),
+):
+    _enforce_admin_rate_limit(
+        request,
+        admin_user,
+        bucket="stats_read",
+        limit=120,
+        window_seconds=60,
+    )
+    return get_admin_stats_history(days)
+
+
 @router.get("/users", response_model=AdminUsersResponse)
 def admin_users(
     request: Request,
@@ -92,6 +116,7 @@ def admin_users(
     sort_dir: str = Query(default="desc"),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
     admin_user: dict = Depends(require_admin_user),
 ):
     _enforce_admin_rate_limit(
@@ -111,6 +136,43 @@ def admin_users(
         sort_dir=sort_dir,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+    )
+
+
+@router.get("/export/{dataset}")
+def admin_export(
+    dataset: str,
+    request: Request,
+    export_format: str = Query(default="csv", alias="format"),
+    search: str | None = Query(default=None),
+    status_filter: str | None = Query(default=None, alias="status"),
+    expires_window: str | None = Query(default=None),
+    progress_min: float | None = Query(default=None),
+    progress_max: float | None = Query(default=None),
+    admin_user: dict = Depends(require_admin_user),
+):
+    _enforce_admin_rate_limit(
+        request,
+        admin_user,
+        bucket="export_read",
+        limit=10,
+        window_seconds=60,
+    )
+    body, media_type, filename = stream_admin_export(
+        admin_id=int(admin_user["id"]),
+        dataset=dataset,
+        export_format=export_format,
+        search=search,
+        status_filter=status_filter,
+        expires_window=expires_window,
+        progress_min=progress_min,
+        progress_max=progress_max,
+    )
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
     )
 
 
@@ -203,6 +265,42 @@ def admin_user_update_progress(
     )
 
 
+@router.post("/bulk-jobs", response_model=AdminBulkJobResponse, status_code=202)
+def admin_bulk_job_create(
+    req: AdminBulkJobRequest,
+    request: Request,
+    admin_user: dict = Depends(require_admin_user),
+):
+    _enforce_admin_rate_limit(
+        request,
+        admin_user,
+        bucket="bulk_job_write",
+        limit=10,
+        window_seconds=60,
+    )
+    if hasattr(req, "model_dump"):
+        payload = req.model_dump(exclude_unset=True)
+    else:  # pragma: no cover - pydantic v1 fallback
+        payload = req.dict(exclude_unset=True)
+    return submit_admin_bulk_job(admin_id=int(admin_user["id"]), payload=payload)
+
+
+@router.get("/bulk-jobs/{job_id}", response_model=AdminBulkJobResponse)
+def admin_bulk_job_detail(
+    job_id: str,
+    request: Request,
+    admin_user: dict = Depends(require_admin_user),
+):
+    _enforce_admin_rate_limit(
+        request,
+        admin_user,
+        bucket="bulk_job_read",
+        limit=240,
+        window_seconds=60,
+    )
+    return get_admin_bulk_job_status(job_id)
+
+
 @router.post("/users/{user_id}/refresh-stripe", response_model=AdminUserRefreshStripeResponse)
 def admin_user_refresh_stripe(
     user_id: int,
@@ -12,8 +12,8 @@ from app.services.billing_service import (
     create_checkout_session_for_user,
     create_embedded_checkout_session_for_user,
     get_user_access_status,
-    process_stripe_event,
 )
+from app.services.webhook_queue_service import accept_stripe_event
 
 router = APIRouter()
 
@@ -46,5 +46,5 @@ async def stripe_webhook(
 ):
     payload = await request.body()
     event = construct_stripe_event(payload, signature=stripe_signature)
-    process_stripe_event(event)
+    accept_stripe_event(event, payload)
     return {"received": True}
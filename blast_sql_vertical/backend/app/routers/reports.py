@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, Response
 
-from app.models import CheatsheetPdfRequest, MasterChallengePdfRequest
+from app.models import CheatsheetPdfRequest, MasterChallengePdfRequest, PdfJobRequest, PdfJobResponse
+from app.services.billing_service import require_course_access
+from app.services.pdf_job_service import get_pdf_job_manager
 from app.services.pdf_service import (
     PdfServiceError,
     PdfServiceUnavailable,
@@ -48,3 +50,24 @@ async def build_cheatsheet_pdf(req: CheatsheetPdfRequest):
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
+
+
+@router.post("/pdf-jobs", response_model=PdfJobResponse, status_code=202)
+async def create_pdf_job(req: PdfJobRequest, user: dict = Depends(require_course_access)):
+    return get_pdf_job_manager().submit(
+        owner_id=int(user["id"]),
+        kind=req.kind,
+        html=req.html,
+        filename=req.filename,
+    )
+
+
+@router.get("/pdf-jobs/{job_id}", response_model=PdfJobResponse)
+def get_pdf_job(job_id: str, user: dict = Depends(require_course_access)):
+    return get_pdf_job_manager().status(job_id, owner_id=int(user["id"]))
+
+
+@router.get("/pdf-jobs/{job_id}/download")
+def download_pdf_job(job_id: str, user: dict = Depends(require_course_access)):
+    path, filename = get_pdf_job_manager().artifact(job_id, owner_id=int(user["id"]))
+    return FileResponse(path, media_type="application/pdf", filename=filename)
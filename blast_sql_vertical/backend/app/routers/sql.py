@@ -3,11 +3,15 @@ from fastapi import APIRouter, HTTPException, Query
 from app.models import (
     RunSqlRequest, RunSqlResponse, ValidateRequest, ValidateResponse, ValidatePlaygroundRequest
 )
-from app.services.content_loader import get_lesson_exercises, load_lesson
+from app.services.content_loader import (
+    get_lesson_exercises,
+    get_playground_challenge,
+    load_lesson,
+    load_playground_challenges,
+    load_playground_datasets,
+)
 from app.services.sql_engine import execute_query, get_schema_details
 from app.services.validator import validate, validate_playground
-import json
-from app.config import CONTENT_DIR
 
 router = APIRouter()
 
@@ -71,59 +75,37 @@ def get_solution(exercise_id: str, challenge_index: int = Query(0, ge=0)):
     return {"solution": solution}
 
 
-def get_playground_data():
-    path = CONTENT_DIR / "playground_challenges.json"
-    if not path.exists():
-        return {"datasets": [], "challenges": {}}
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 @router.get("/playground/datasets")
 def get_playground_datasets():
-    data = get_playground_data()
-    return {"datasets": data.get("datasets", [])}
+    return {"datasets": load_playground_datasets()}
 
 
 @router.get("/playground/schema/{schema_name}")
-def get_playground_schema(schema_name: str, session_id: str = Query(...)):
-    schema_details = get_schema_details(session_id, schema_name)
-    tables = {}
-    for row in schema_details:
-        t = row["table"]
-        if t not in tables:
-            tables[t] = []
-        tables[t].append({"name": row["column"], "type": row["type"]})
-    return {"tables": [{"name": k, "columns": v} for k, v in tables.items()]}
+def get_playground_schema(schema_name: str, session_id: str | None = Query(None)):
+    # session_id is still sent by the client but the schema is served from the seed template.
+    return {"tables": get_schema_details(schema_name)}
 
 
 @router.get("/playground/challenges/{dataset_id}")
 def get_playground_challenges(dataset_id: str):
-    data = get_playground_data()
-    challenges = data.get("challenges", {}).get(dataset_id, [])
-    # Strip solution query from response
-    for c in challenges:
-        c.pop("solution_query", None)
-    return {"challenges": challenges}
+    return {"challenges": load_playground_challenges(dataset_id)}
 
 
 @router.post("/playground/validate", response_model=ValidateResponse)
 def validate_playground_query(req: ValidatePlaygroundRequest):
-    data = get_playground_data()
-    challenges = data.get("challenges", {}).get(req.dataset_id, [])
-    challenge = next((c for c in challenges if c["id"] == req.challenge_id), None)
+    challenge, challenge_index, challenge_count = get_playground_challenge(req.dataset_id, req.challenge_id)
     if not challenge:
         raise HTTPException(status_code=404, detail="Challenge not found")
-        
-    correct, message = validate_playground(req.session_id, challenge, req.query)
-    
-    challenge_index = next((i for i, c in enumerate(challenges) if c["id"] == req.challenge_id), -1)
+
+    correct, message = validate_playground(req.session_id, challenge, req.query, dataset_id=req.dataset_id)
+
     next_challenge_index = None
-    if correct and challenge_index + 1 < len(challenges):
+    if correct and challenge_index + 1 < challenge_count:
         next_challenge_index = challenge_index + 1
 
     return ValidateResponse(
         correct=correct,
         message=message,
         next_challenge_index=next_challenge_index,
-        challenge_count=len(challenges)
+        challenge_count=challenge_count,
     )
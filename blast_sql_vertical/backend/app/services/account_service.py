@@ -2,6 +2,7 @@
 Account service: account info, refund/cancellation, profile update, certificate PDF.
 """
 
+import asyncio
 import base64
 import html
 import logging
@@ -16,7 +17,15 @@ from fastapi import HTTPException, status
 from app.config import APP_BASE_URL, BILLING_COURSE_ID, REFUND_WINDOW_DAYS, STRIPE_SECRET_KEY
 from app.services.access_service import has_active_course_access, sync_user_effective_status
 from app.services.content_loader import load_courses
-from app.services.pdf_service import PdfServiceError, PdfServiceUnavailable, render_pdf_from_html
+from app.services.metrics_service import timed
+from app.services.pdf_cache import get_pdf_cache
+from app.services.pdf_native import NativePdfError, prepare_png_image
+from app.services.pdf_service import (
+    PdfServiceError,
+    PdfServiceUnavailable,
+    render_pdf_template,
+    select_pdf_backend,
+)
 from app.services.user_db import (
     get_access_grant,
     get_latest_purchase_for_user,
@@ -28,6 +37,13 @@ from app.services.user_db import (
 
 logger = logging.getLogger(__name__)
 
+_STATIC_DIR = Path(__file__).parent.parent.parent / "static"
+_CERTIFICATE_IMAGES = ("Blast_Full_Black.png", "Blast_Icon_Black.png")
+_STATIC_IMAGES: dict[str, bytes] = {}
+_STATIC_IMAGE_URIS: dict[str, str] = {}
+_MONTHS_PT = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
+              "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+
 
 def _to_int(value: Any) -> int | None:
     if value is None:
@@ -193,12 +209,13 @@ def request_refund(user_id: int, reason: str | None = None) -> dict[str, Any]:
     idempotency_key = f"refund_{user_id}_{pi_id}"
 
     try:
-        refund = stripe.Refund.create(
-            payment_intent=pi_id,
-            reason="requested_by_customer",
-            metadata={"user_id": str(user_id), "course_id": BILLING_COURSE_ID},
-            idempotency_key=idempotency_key,
-        )
+        with timed("stripe"):
+            refund = stripe.Refund.create(
+                payment_intent=pi_id,
+                reason="requested_by_customer",
+                metadata={"user_id": str(user_id), "course_id": BILLING_COURSE_ID},
+                idempotency_key=idempotency_key,
+            )
     except stripe.error.InvalidRequestError as exc:
         if "already been refunded" in str(exc).lower():
             raise HTTPException(
@@ -289,6 +306,34 @@ def update_profile_full_name(user_id: int, full_name: str | None) -> dict[str, A
     return get_account_info(user_id)
 
 
+def _encode_static_image(filename: str) -> str:
+    try:
+        data = (_STATIC_DIR / filename).read_bytes()
+    except Exception:
+        logger.warning("certificate_image_missing filename=%s", filename)
+        return ""
+    _STATIC_IMAGES[filename] = data
+    return "data:image/png;base64," + base64.b64encode(data).decode()
+
+
+def initialize_certificate_assets() -> None:
+    """Load the certificate logos once: data URIs for Chromium, decoded images for the native backend."""
+    for filename in _CERTIFICATE_IMAGES:
+        _STATIC_IMAGE_URIS[filename] = _encode_static_image(filename)
+        if _STATIC_IMAGES.get(filename):
+            try:
+                prepare_png_image(_STATIC_IMAGES[filename])
+            except NativePdfError:
+                logger.warning("certificate_image_not_native filename=%s", filename)
+
+
+def _static_image_uri(filename: str) -> str:
+    uri = _STATIC_IMAGE_URIS.get(filename)
+    if uri is None:
+        uri = _STATIC_IMAGE_URIS[filename] = _encode_static_image(filename)
+    return uri
+
+
 def _lesson_ids_from_course(course: dict) -> list[str]:
     ids: list[str] = []
     for module in course.get("modules", []) or []:
@@ -309,64 +354,17 @@ def _lesson_completed(row: dict | None) -> bool:
     return bool(row.get("is_completed"))
 
 
-async def generate_certificate_pdf_bytes(user_id: int) -> bytes:
-    """
-    Generate certificate PDF for user. Raises HTTPException on validation failures.
-    """
-    user = get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    full_name = (user.get("full_name") or "").strip()
-    if not full_name:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"code": "FULL_NAME_REQUIRED", "message": "Nome completo é obrigatório para emitir o certificado."},
-        )
-    user = sync_user_effective_status(user)
-    if not has_active_course_access(user.get("access_status"), user.get("expires_at")):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Acesso ao curso necessário para emitir o certificado.",
-        )
-    courses = load_courses().get("courses", [])
-    course = next((c for c in courses if c.get("id") == BILLING_COURSE_ID), None)
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Curso não encontrado.",
-        )
-    lesson_ids = _lesson_ids_from_course(course)
-    if not lesson_ids:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Curso não concluído.",
-        )
-    rows = list_progress_for_lessons(user_id, lesson_ids)
-    completed = sum(1 for lid in lesson_ids if _lesson_completed(rows.get(lid)))
-    total = len(lesson_ids)
-    completion_pct = round((completed / total) * 100.0, 2) if total > 0 else 0.0
-    if completion_pct < 100.0:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Curso não concluído. Conclua todas as aulas para emitir o certificado.",
-        )
+def build_certificate_document(
+    full_name: str,
+    *,
+    num_modules: int,
+    total_lessons: int,
+    issue_date: str,
+) -> tuple[str, dict[str, Any]]:
+    """Certificate as browser HTML plus the template context used by the native PDF backend."""
     display_name = html.escape(full_name, quote=True)
-    _static = Path(__file__).parent.parent.parent / "static"
-    def _b64_img(filename: str) -> str:
-        try:
-            return "data:image/png;base64," + base64.b64encode((_static / filename).read_bytes()).decode()
-        except Exception:
-            return ""
-    logo_full_url = _b64_img("Blast_Full_Black.png")
-    icon_url      = _b64_img("Blast_Icon_Black.png")
-    num_modules   = len(course.get("modules", []))
-    _months_pt    = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
-                     "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
-    _now          = datetime.now()
-    issue_date    = f"{_now.day} de {_months_pt[_now.month - 1]} de {_now.year}"
+    logo_full_url = _static_image_uri("Blast_Full_Black.png")
+    icon_url      = _static_image_uri("Blast_Icon_Black.png")
     cert_html = f"""<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -522,7 +520,7 @@ body {{
         <div class="orn-diamond"></div>
         <div class="orn-line"></div>
       </div>
-      <span class="meta">{num_modules} m&#xF3;dulos / {total} aulas</span>
+      <span class="meta">{num_modules} m&#xF3;dulos / {total_lessons} aulas</span>
     </div>
     <div class="divider"></div>
     <div class="footer">
@@ -533,10 +531,83 @@ body {{
 </div>
 </body>
 </html>"""
+    context = {
+        "full_name": full_name,
+        "course_title": "SQL do Básico ao Avançado",
+        "num_modules": num_modules,
+        "total_lessons": total_lessons,
+        "issue_date": issue_date,
+        "logo_png": _STATIC_IMAGES.get("Blast_Full_Black.png") or b"",
+        "icon_png": _STATIC_IMAGES.get("Blast_Icon_Black.png") or b"",
+    }
+    return cert_html, context
+
+
+async def generate_certificate_pdf_bytes(user_id: int) -> bytes:
+    """
+    Generate certificate PDF for user. Raises HTTPException on validation failures.
+    """
+    user = get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    full_name = (user.get("full_name") or "").strip()
+    if not full_name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "FULL_NAME_REQUIRED", "message": "Nome completo é obrigatório para emitir o certificado."},
+        )
+    user = sync_user_effective_status(user)
+    if not has_active_course_access(user.get("access_status"), user.get("expires_at")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso ao curso necessário para emitir o certificado.",
+        )
+    courses = load_courses().get("courses", [])
+    course = next((c for c in courses if c.get("id") == BILLING_COURSE_ID), None)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Curso não encontrado.",
+        )
+    lesson_ids = _lesson_ids_from_course(course)
+    if not lesson_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Curso não concluído.",
+        )
+    rows = list_progress_for_lessons(user_id, lesson_ids)
+    completed = sum(1 for lid in lesson_ids if _lesson_completed(rows.get(lid)))
+    total = len(lesson_ids)
+    completion_pct = round((completed / total) * 100.0, 2) if total > 0 else 0.0
+    if completion_pct < 100.0:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Curso não concluído. Conclua todas as aulas para emitir o certificado.",
+        )
+    _now = datetime.now()
+    cert_html, context = build_certificate_document(
+        full_name,
+        num_modules=len(course.get("modules", [])),
+        total_lessons=total,
+        issue_date=f"{_now.day} de {_MONTHS_PT[_now.month - 1]} de {_now.year}",
+    )
+    # The output only changes with the name, course outline, issue date or backend, so
+    # identical renders are served from the content-addressed disk cache. Entries are
+    # keyed by the backend that rendered them; a name the native renderer cannot encode
+    # falls back to Chromium, so that key is checked too.
+    cache = get_pdf_cache()
+    for variant in dict.fromkeys((select_pdf_backend("certificate").name, "chromium")):
+        cached = await asyncio.to_thread(cache.get, cache.key_for(cert_html, variant=variant))
+        if cached is not None:
+            return cached
     try:
-        pdf_bytes = await render_pdf_from_html(cert_html)
+        pdf_bytes, backend_name = await render_pdf_template("certificate", html=cert_html, context=context)
     except PdfServiceUnavailable as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
     except PdfServiceError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    await asyncio.to_thread(cache.put, cache.key_for(cert_html, variant=backend_name), pdf_bytes)
     return pdf_bytes
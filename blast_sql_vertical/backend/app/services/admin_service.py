@@ -1,11 +1,31 @@
+import base64
+import copy
+import csv
+import io
 import json
+import logging
 import math
+import tempfile
 import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import duckdb
 from fastapi import HTTPException, status
 
-from app.config import BILLING_COURSE_ID, IMPERSONATION_TTL_MINUTES
+from app.config import (
+    ADMIN_BULK_CHUNK_SIZE,
+    ADMIN_BULK_MAX_TARGETS,
+    ADMIN_EXPORT_BATCH_SIZE,
+    ADMIN_STATS_CACHE_TTL_SECONDS,
+    ADMIN_STATS_HISTORY_BUCKET_SECONDS,
+    ADMIN_USERS_COUNT_CACHE_TTL_SECONDS,
+    BILLING_COURSE_ID,
+    IMPERSONATION_TTL_MINUTES,
+)
 from app.services.access_service import (
     compute_effective_access_status,
     has_active_course_access,
@@ -17,26 +37,50 @@ from app.services.auth_service import (
     is_valid_email,
     validate_password_strength,
 )
-from app.services.content_loader import load_courses
+from app.services.content_loader import get_course_outlines
 from app.services.user_db import (
     ACCESS_STATUS_VALUES,
     _connect,
+    apply_admin_access_updates,
+    apply_admin_progress_updates,
     create_admin_audit_log,
+    create_admin_bulk_job,
     create_admin_impersonation_session,
     create_user,
+    fail_unfinished_admin_bulk_jobs,
+    get_admin_bulk_job,
+    get_user_access_rows,
     get_user_by_email,
     get_user_by_id,
+    get_user_ids_by_emails,
+    list_admin_stats_history,
     list_progress_for_lessons,
-    list_purchases_for_user,
-    list_recent_sessions_for_user,
+    list_progress_for_users,
+    load_admin_user_detail,
+    on_user_access_change,
+    record_admin_stats_snapshot,
     stop_admin_impersonation_by_token_hash,
+    update_admin_bulk_job,
     update_user_access_state,
     upsert_access_grant,
-    upsert_lesson_progress,
+    upsert_lesson_progress_batch,
+    user_search_match_expression,
 )
+from app.services.ttl_cache import TTLCache
 
 VALID_SORT_FIELDS = {"last_login_at", "expires_at", "progress_pct", "created_at"}
 ACCESS_GRANTED_STATUSES = {"active", "manual_grant"}
+_USER_COUNT_CACHE = TTLCache("admin_user_count", max_entries=256)
+_ADMIN_STATS_CACHE = TTLCache("admin_stats", max_entries=1)
+BULK_OPERATIONS = ("grant_access", "extend_access", "set_progress")
+_BULK_ERROR_LIMIT = 100
+_BULK_JOB_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="admin-bulk")
+EXPORT_DATASETS = ("users", "purchases", "progress")
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+# Spreadsheets evaluate cells starting with these as formulas.
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+logger = logging.getLogger(__name__)
 
 
 def _now_ts() -> int:
@@ -56,37 +100,11 @@ def _effective_status_sql() -> str:
 
 
 def _course_lessons() -> tuple[str, list[str], list[dict[str, Any]]]:
-    course_id = BILLING_COURSE_ID
-    courses = load_courses().get("courses", [])
-    course = next((item for item in courses if item.get("id") == course_id), None)
-    if not course and courses:
-        course = courses[0]
-        course_id = str(course.get("id") or course_id)
-    if not course:
-        return course_id, [], []
-    lesson_ids: list[str] = []
-    modules: list[dict[str, Any]] = []
-    for module in course.get("modules", []) or []:
-        module_lessons: list[dict[str, str]] = []
-        for lesson in module.get("lessons", []) or []:
-            if isinstance(lesson, str):
-                lesson_id = lesson
-                lesson_title = lesson
-            else:
-                lesson_id = str(lesson.get("id") or "")
-                lesson_title = str(lesson.get("title") or lesson_id)
-            if not lesson_id:
-                continue
-            lesson_ids.append(lesson_id)
-            module_lessons.append({"id": lesson_id, "title": lesson_title})
-        modules.append(
-            {
-                "id": str(module.get("id") or ""),
-                "title": str(module.get("title") or ""),
-                "lessons": module_lessons,
-            }
-        )
-    return course_id, lesson_ids, modules
+    outlines = get_course_outlines()
+    outline = outlines.get(BILLING_COURSE_ID) or next(iter(outlines.values()), None)
+    if not outline:
+        return BILLING_COURSE_ID, [], []
+    return outline["id"] or BILLING_COURSE_ID, outline["lesson_ids"], outline["modules"]
 
 
 def _is_row_completed(row: dict[str, Any] | None) -> bool:
@@ -112,19 +130,18 @@ def _progress_snapshot(lesson_ids: list[str], progress_rows: dict[str, dict]) ->
     }
 
 
-def _upsert_lesson_completion(
+def _lesson_completion_entry(
     *,
-    user_id: int,
     lesson_id: str,
     is_completed: bool,
     current_row: dict[str, Any] | None,
-) -> None:
+) -> tuple[str, dict[str, Any], bool]:
     progress = {}
     if current_row and isinstance(current_row.get("progress"), dict):
         progress = {**current_row.get("progress")}
     progress["lessonCompleted"] = bool(is_completed)
     progress["updatedAt"] = int(time.time() * 1000)
-    upsert_lesson_progress(user_id=user_id, lesson_id=lesson_id, progress=progress, is_completed=bool(is_completed))
+    return lesson_id, progress, bool(is_completed)
 
 
 def _validate_completed_lesson_ids(lesson_ids: list[str], raw_ids: list[str]) -> list[str]:
@@ -203,17 +220,20 @@ def _apply_progress_payload(user_id: int, payload: dict[str, Any]) -> tuple[dict
         target_completed_ids = _validate_completed_lesson_ids(lesson_ids, [str(item) for item in raw_ids])
 
     target_completed = set(target_completed_ids)
+    entries = []
     for lesson_id in lesson_ids:
         current_done = lesson_id in current_completed
         next_done = lesson_id in target_completed
         if current_done == next_done:
             continue
-        _upsert_lesson_completion(
-            user_id=user_id,
-            lesson_id=lesson_id,
-            is_completed=next_done,
-            current_row=progress_rows.get(lesson_id),
+        entries.append(
+            _lesson_completion_entry(
+                lesson_id=lesson_id,
+                is_completed=next_done,
+                current_row=progress_rows.get(lesson_id),
+            )
         )
+    upsert_lesson_progress_batch(user_id, entries)
 
     after_rows = list_progress_for_lessons(user_id, lesson_ids)
     after = _progress_snapshot(lesson_ids, after_rows)
@@ -250,67 +270,188 @@ def _resolve_expires_at(payload: dict[str, Any]) -> int | None:
     return None
 
 
-def get_admin_stats() -> dict[str, Any]:
-    now = _now_ts()
-    effective_status_expr = _effective_status_sql()
-    status_counts = {status_key: 0 for status_key in ACCESS_STATUS_VALUES}
+def _progress_pct(completed_lessons: int, denominator: int) -> float:
+    return round(completed_lessons * 100.0 / denominator, 2)
+
+
+def _min_completed_for_pct(pct: float, denominator: int) -> int:
+    completed = max(0, math.floor(pct * denominator / 100.0) - 1)
+    while _progress_pct(completed, denominator) < pct:
+        completed += 1
+    return completed
 
-    with _connect() as conn:
-        total_row = conn.execute("SELECT COUNT(*) AS n FROM users").fetchone()
-        total_users = int(total_row["n"] if total_row else 0)
 
-        rows = conn.execute(
+def _max_completed_for_pct(pct: float, denominator: int) -> int:
+    completed = math.ceil(pct * denominator / 100.0) + 1
+    while completed >= 0 and _progress_pct(completed, denominator) > pct:
+        completed -= 1
+    return completed
+
+
+def _compute_admin_stats(now: int) -> dict[str, Any]:
+    status_sums = ",\n".join(
+        f"COALESCE(SUM(CASE WHEN effective_status = '{status_key}' THEN 1 ELSE 0 END), 0) AS status_{status_key}"
+        for status_key in ACCESS_STATUS_VALUES
+    )
+    expiring_sums = ",\n".join(
+        f"""COALESCE(SUM(CASE
+                WHEN effective_status IN ('active', 'manual_grant')
+                 AND expires_at > :now AND expires_at <= :until_{days}d
+                THEN 1 ELSE 0 END), 0) AS expirations_next_{days}d"""
+        for days in (7, 14, 30)
+    )
+    params = {
+        "now": now,
+        "since_7d": now - 7 * 86_400,
+        "since_30d": now - 30 * 86_400,
+        "until_7d": now + 7 * 86_400,
+        "until_14d": now + 14 * 86_400,
+        "until_30d": now + 30 * 86_400,
+    }
+    with _connect() as conn:
+        row = conn.execute(
             f"""
-            SELECT effective_status, COUNT(*) AS n
+            SELECT
+                COUNT(*) AS total_users,
+                {status_sums},
+                COALESCE(SUM(CASE WHEN last_login_at >= :since_7d THEN 1 ELSE 0 END), 0) AS active_last_7d,
+                COALESCE(SUM(CASE WHEN last_login_at >= :since_30d THEN 1 ELSE 0 END), 0) AS active_last_30d,
+                {expiring_sums}
             FROM (
-                SELECT {effective_status_expr} AS effective_status
+                SELECT {_effective_status_sql()} AS effective_status, u.last_login_at, u.expires_at
                 FROM users u
             )
-            GROUP BY effective_status
             """,
-            {"now": now},
-        ).fetchall()
-        for row in rows:
-            status_key = str(row["effective_status"] or "")
-            if status_key in status_counts:
-                status_counts[status_key] = int(row["n"] or 0)
-
-        activity_7 = conn.execute(
-            "SELECT COUNT(*) AS n FROM users WHERE last_login_at IS NOT NULL AND last_login_at >= ?",
-            (now - 7 * 86_400,),
-        ).fetchone()
-        activity_30 = conn.execute(
-            "SELECT COUNT(*) AS n FROM users WHERE last_login_at IS NOT NULL AND last_login_at >= ?",
-            (now - 30 * 86_400,),
+            params,
         ).fetchone()
+    data = dict(row) if row else {}
+    return {
+        "total_users": int(data.get("total_users") or 0),
+        "status_counts": {status_key: int(data.get(f"status_{status_key}") or 0) for status_key in ACCESS_STATUS_VALUES},
+        "active_last_7d": int(data.get("active_last_7d") or 0),
+        "active_last_30d": int(data.get("active_last_30d") or 0),
+        "expirations_next_7d": int(data.get("expirations_next_7d") or 0),
+        "expirations_next_14d": int(data.get("expirations_next_14d") or 0),
+        "expirations_next_30d": int(data.get("expirations_next_30d") or 0),
+    }
 
-        def _count_expiring(days: int) -> int:
-            row = conn.execute(
-                f"""
-                SELECT COUNT(*) AS n
-                FROM users u
-                WHERE u.expires_at IS NOT NULL
-                  AND u.expires_at > :now
-                  AND u.expires_at <= :until_ts
-                  AND ({effective_status_expr}) IN ('active', 'manual_grant')
-                """,
-                {"now": now, "until_ts": now + days * 86_400},
-            ).fetchone()
-            return int(row["n"] if row else 0)
 
-        expirations_next_7d = _count_expiring(7)
-        expirations_next_14d = _count_expiring(14)
-        expirations_next_30d = _count_expiring(30)
+def _load_admin_stats() -> dict[str, Any]:
+    now = _now_ts()
+    stats = _compute_admin_stats(now)
+    if ADMIN_STATS_HISTORY_BUCKET_SECONDS > 0:
+        bucket_start = now - now % ADMIN_STATS_HISTORY_BUCKET_SECONDS
+        record_admin_stats_snapshot(bucket_start, stats, recorded_at=now)
+    return stats
+
+
+def get_admin_stats() -> dict[str, Any]:
+    stats = _ADMIN_STATS_CACHE.get_or_load("stats", _load_admin_stats, ttl=ADMIN_STATS_CACHE_TTL_SECONDS)
+    return copy.deepcopy(stats)
+
+
+def get_admin_stats_history(days: int = 30) -> dict[str, Any]:
+    safe_days = max(1, min(365, int(days)))
+    window = safe_days * 86_400
+    bucket_seconds = max(1, int(ADMIN_STATS_HISTORY_BUCKET_SECONDS))
+    return {
+        "bucket_seconds": ADMIN_STATS_HISTORY_BUCKET_SECONDS,
+        "items": list_admin_stats_history(_now_ts() - window, limit=-(-window // bucket_seconds) + 1),
+    }
+
+
+def _invalidate_admin_list_caches() -> None:
+    _ADMIN_STATS_CACHE.clear()
+    _USER_COUNT_CACHE.clear()
+
+
+on_user_access_change(_invalidate_admin_list_caches)
+
+
+def _encode_list_cursor(sort_by: str, sort_dir: str, value: Any, user_id: int) -> str:
+    raw = json.dumps({"s": sort_by, "d": sort_dir, "v": value, "id": user_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_list_cursor(cursor: str, sort_by: str, sort_dir: str) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        value = data["v"]
+        user_id = int(data["id"])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if data.get("s") != sort_by or data.get("d") != sort_dir or not (value is None or isinstance(value, int)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not match sort")
+    return value, user_id
+
+
+def _keyset_condition(column: str, sort_dir: str, value: Any) -> str:
+    # SQLite orders NULL before any value, so NULLs open an ascending list and close a descending one.
+    if sort_dir == "asc":
+        if value is None:
+            return f"(({column} IS NULL AND u.id > :cursor_id) OR {column} IS NOT NULL)"
+        return f"({column} > :cursor_value OR ({column} = :cursor_value AND u.id > :cursor_id))"
+    if value is None:
+        return f"({column} IS NULL AND u.id < :cursor_id)"
+    return f"({column} < :cursor_value OR ({column} = :cursor_value AND u.id < :cursor_id) OR {column} IS NULL)"
+
+
+def _build_user_list_filters(
+    *,
+    now: int,
+    denominator: int,
+    search: str | None,
+    status_filter: str | None,
+    expires_window: str | None,
+    progress_min: float | None,
+    progress_max: float | None,
+) -> tuple[list[str], dict[str, Any]]:
+    """WHERE clauses over ``users u JOIN user_progress_summary s`` shared by listing and export."""
+    where: list[str] = []
+    params: dict[str, Any] = {"now": now}
+
+    clean_search = (search or "").strip().lower()
+    if clean_search:
+        match_expr = user_search_match_expression(clean_search)
+        if match_expr:
+            params["search_match"] = match_expr
+            where.append("u.id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH :search_match)")
+        else:
+            params["search"] = f"%{clean_search}%"
+            where.append("(LOWER(u.email) LIKE :search OR LOWER(COALESCE(u.full_name, '')) LIKE :search)")
 
-        return {
-            "total_users": total_users,
-            "status_counts": status_counts,
-            "active_last_7d": int(activity_7["n"] if activity_7 else 0),
-            "active_last_30d": int(activity_30["n"] if activity_30 else 0),
-            "expirations_next_7d": expirations_next_7d,
-            "expirations_next_14d": expirations_next_14d,
-            "expirations_next_30d": expirations_next_30d,
-        }
+    if status_filter:
+        if status_filter not in ACCESS_STATUS_VALUES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status filter")
+        params["status_filter"] = status_filter
+        where.append(f"{_effective_status_sql()} = :status_filter")
+
+    if expires_window:
+        window_days = {"next_7d": 7, "next_14d": 14, "next_30d": 30}.get(expires_window)
+        if window_days is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid expires_window")
+        params["expires_until"] = now + window_days * 86_400
+        where.append("u.expires_at IS NOT NULL AND u.expires_at > :now AND u.expires_at <= :expires_until")
+
+    # progress_pct is monotonic in completed_lessons, so pct bounds become indexable count bounds.
+    if progress_min is not None:
+        params["completed_min"] = _min_completed_for_pct(float(progress_min), denominator)
+        where.append("s.completed_lessons >= :completed_min")
+    if progress_max is not None:
+        params["completed_max"] = _max_completed_for_pct(float(progress_max), denominator)
+        where.append("s.completed_lessons <= :completed_max")
+
+    return where, params
+
+
+def _count_admin_users(count_key: tuple, count_sql: str, params: dict[str, Any]) -> int:
+    def _load() -> int:
+        with _connect() as conn:
+            row = conn.execute(count_sql, params).fetchone()
+            return int(row["n"] if row else 0)
+
+    return _USER_COUNT_CACHE.get_or_load(count_key, _load, ttl=ADMIN_USERS_COUNT_CACHE_TTL_SECONDS)
 
 
 def list_admin_users(
@@ -324,6 +465,7 @@ def list_admin_users(
     sort_dir: str = "desc",
     page: int = 1,
     page_size: int = 20,
+    cursor: str | None = None,
 ) -> dict[str, Any]:
     now = _now_ts()
     safe_page = max(1, int(page))
@@ -335,60 +477,44 @@ def list_admin_users(
     total_lessons = len(lesson_ids)
     denominator = max(1, total_lessons)
     effective_status_expr = _effective_status_sql()
-    progress_expr = f"ROUND(COALESCE(lp.completed_lessons, 0) * 100.0 / {denominator}, 2)"
-
-    where: list[str] = []
-    params: dict[str, Any] = {"now": now}
-
-    if search:
-        params["search"] = f"%{search.strip().lower()}%"
-        where.append("(LOWER(u.email) LIKE :search OR LOWER(COALESCE(u.full_name, '')) LIKE :search)")
 
-    if status_filter:
-        if status_filter not in ACCESS_STATUS_VALUES:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status filter")
-        params["status_filter"] = status_filter
-        where.append(f"{effective_status_expr} = :status_filter")
-
-    if expires_window:
-        window_days = {"next_7d": 7, "next_14d": 14, "next_30d": 30}.get(expires_window)
-        if window_days is None:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid expires_window")
-        params["expires_until"] = now + window_days * 86_400
-        where.append("u.expires_at IS NOT NULL AND u.expires_at > :now AND u.expires_at <= :expires_until")
-
-    if progress_min is not None:
-        params["progress_min"] = float(progress_min)
-        where.append(f"{progress_expr} >= :progress_min")
-    if progress_max is not None:
-        params["progress_max"] = float(progress_max)
-        where.append(f"{progress_expr} <= :progress_max")
+    where, params = _build_user_list_filters(
+        now=now,
+        denominator=denominator,
+        search=search,
+        status_filter=status_filter,
+        expires_window=expires_window,
+        progress_min=progress_min,
+        progress_max=progress_max,
+    )
+    count_where_sql = f"WHERE {' AND '.join(where)}" if where else ""
 
-    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
     order_map = {
         "created_at": "u.created_at",
         "last_login_at": "u.last_login_at",
         "expires_at": "u.expires_at",
-        "progress_pct": progress_expr,
+        "progress_pct": "s.completed_lessons",
     }
     order_sql = order_map[safe_sort_by]
 
+    offset = (safe_page - 1) * safe_page_size
+    page_where = list(where)
+    page_params = {**params, "limit": safe_page_size + 1}
+    if cursor:
+        cursor_value, cursor_id = _decode_list_cursor(cursor, safe_sort_by, safe_sort_dir)
+        page_where.append(_keyset_condition(order_sql, safe_sort_dir, cursor_value))
+        page_params.update({"cursor_value": cursor_value, "cursor_id": cursor_id})
+        offset = 0
+    page_params["offset"] = offset
+    where_sql = f"WHERE {' AND '.join(page_where)}" if page_where else ""
+
     base_from = """
         FROM users u
-        LEFT JOIN (
-            SELECT user_id, SUM(CASE WHEN is_completed = 1 THEN 1 ELSE 0 END) AS completed_lessons
-            FROM lesson_progress
-            GROUP BY user_id
-        ) lp ON lp.user_id = u.id
-        LEFT JOIN purchases p ON p.id = (
-            SELECT p2.id FROM purchases p2
-            WHERE p2.user_id = u.id
-            ORDER BY p2.created_at DESC
-            LIMIT 1
-        )
+        JOIN user_progress_summary s ON s.user_id = u.id
+        LEFT JOIN purchases p ON p.id = u.latest_purchase_id
     """
 
-    count_sql = f"SELECT COUNT(*) AS n {base_from} {where_sql}"
+    count_sql = f"SELECT COUNT(*) AS n {base_from} {count_where_sql}"
     data_sql = f"""
         SELECT
             u.id,
@@ -400,23 +526,29 @@ def list_admin_users(
             {effective_status_expr} AS effective_access_status,
             u.expires_at,
             u.stripe_customer_id,
-            COALESCE(lp.completed_lessons, 0) AS completed_lessons,
-            {progress_expr} AS progress_pct,
+            s.completed_lessons,
             p.status AS latest_purchase_status,
             p.stripe_payment_intent_id,
             p.stripe_checkout_session_id
         {base_from}
         {where_sql}
-        ORDER BY {order_sql} {safe_sort_dir}, u.id DESC
+        ORDER BY {order_sql} {safe_sort_dir}, u.id {safe_sort_dir}
         LIMIT :limit OFFSET :offset
     """
 
     with _connect() as conn:
-        count_row = conn.execute(count_sql, params).fetchone()
-        total_items = int(count_row["n"] if count_row else 0)
-        data_params = {**params, "limit": safe_page_size, "offset": (safe_page - 1) * safe_page_size}
-        rows = conn.execute(data_sql, data_params).fetchall()
+        rows = conn.execute(data_sql, page_params).fetchall()
+    count_key = (
+        (search or "").strip().lower(),
+        status_filter,
+        expires_window,
+        params.get("completed_min"),
+        params.get("completed_max"),
+    )
+    total_items = _count_admin_users(count_key, count_sql, params)
 
+    has_more = len(rows) > safe_page_size
+    rows = rows[:safe_page_size]
     items = []
     for row in rows:
         row_dict = dict(row)
@@ -430,7 +562,7 @@ def list_admin_users(
                 "access_status": str(row_dict.get("access_status") or "expired"),
                 "effective_access_status": str(row_dict.get("effective_access_status") or "expired"),
                 "expires_at": int(row_dict["expires_at"]) if row_dict.get("expires_at") is not None else None,
-                "progress_pct": float(row_dict.get("progress_pct") or 0.0),
+                "progress_pct": _progress_pct(int(row_dict.get("completed_lessons") or 0), denominator),
                 "completed_lessons": int(row_dict.get("completed_lessons") or 0),
                 "total_lessons": total_lessons,
                 "stripe_customer_id": row_dict.get("stripe_customer_id"),
@@ -440,6 +572,12 @@ def list_admin_users(
             }
         )
 
+    next_cursor = None
+    if has_more and rows:
+        last = dict(rows[-1])
+        sort_column = "completed_lessons" if safe_sort_by == "progress_pct" else safe_sort_by
+        next_cursor = _encode_list_cursor(safe_sort_by, safe_sort_dir, last.get(sort_column), int(last["id"]))
+
     total_pages = math.ceil(total_items / safe_page_size) if total_items > 0 else 0
     return {
         "items": items,
@@ -447,56 +585,17 @@ def list_admin_users(
         "page_size": safe_page_size,
         "total_items": total_items,
         "total_pages": total_pages,
+        "next_cursor": next_cursor,
     }
 
 
-def _list_recent_audit_logs(user_id: int, limit: int = 20) -> list[dict[str, Any]]:
-    safe_limit = max(1, min(100, int(limit)))
-    with _connect() as conn:
-        rows = conn.execute(
-            """
-            SELECT id, admin_id, target_user_id, action_type, reason, before_json, after_json, created_at
-            FROM admin_audit_logs
-            WHERE target_user_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (user_id, safe_limit),
-        ).fetchall()
-    output: list[dict[str, Any]] = []
-    for row in rows:
-        data = dict(row)
-        try:
-            before = json.loads(data.get("before_json") or "{}")
-        except Exception:
-            before = {}
-        try:
-            after = json.loads(data.get("after_json") or "{}")
-        except Exception:
-            after = {}
-        output.append(
-            {
-                "id": int(data.get("id") or 0),
-                "admin_id": int(data.get("admin_id") or 0),
-                "target_user_id": int(data.get("target_user_id") or 0),
-                "action_type": str(data.get("action_type") or ""),
-                "reason": str(data.get("reason") or ""),
-                "before": before if isinstance(before, dict) else {},
-                "after": after if isinstance(after, dict) else {},
-                "created_at": int(data.get("created_at") or 0),
-            }
-        )
-    return output
-
-
 def get_admin_user_detail(user_id: int) -> dict[str, Any]:
-    user = get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user = sync_user_effective_status(user)
-
     _, lesson_ids, modules = _course_lessons()
-    progress_rows = list_progress_for_lessons(user_id, lesson_ids)
+    bundle = load_admin_user_detail(user_id, lesson_ids, session_limit=10, audit_limit=20)
+    if not bundle:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user = bundle["user"]
+    progress_rows = bundle["progress"]
     total_lessons = len(lesson_ids)
     completed_lessons = 0
     module_items: list[dict[str, Any]] = []
@@ -531,8 +630,7 @@ def get_admin_user_detail(user_id: int) -> dict[str, Any]:
         )
 
     overall_pct = round((completed_lessons / total_lessons) * 100.0, 2) if total_lessons else 0.0
-    purchases = list_purchases_for_user(user_id=user_id, limit=1)
-    latest_purchase = purchases[0] if purchases else {}
+    latest_purchase = bundle["latest_purchase"]
     effective_status = compute_effective_access_status(user.get("access_status"), user.get("expires_at"))
 
     return {
@@ -572,9 +670,21 @@ def get_admin_user_detail(user_id: int) -> dict[str, Any]:
         },
         "activity": {
             "last_login_at": int(user["last_login_at"]) if user.get("last_login_at") is not None else None,
-            "sessions": list_recent_sessions_for_user(user_id, limit=10),
+            "sessions": bundle["sessions"],
         },
-        "audit_logs": _list_recent_audit_logs(user_id, limit=20),
+        "audit_logs": [
+            {
+                "id": int(entry.get("id") or 0),
+                "admin_id": int(entry.get("admin_id") or 0),
+                "target_user_id": int(entry.get("target_user_id") or 0),
+                "action_type": str(entry.get("action_type") or ""),
+                "reason": str(entry.get("reason") or ""),
+                "before": entry["before"],
+                "after": entry["after"],
+                "created_at": int(entry.get("created_at") or 0),
+            }
+            for entry in bundle["audit_logs"]
+        ],
     }
 
 
@@ -899,3 +1009,491 @@ def stop_admin_impersonation(
         "token_type": "bearer",
         "redirect_to": f"/admin/users/{target_user_id}",
     }
+
+
+def _parse_bulk_targets(payload: dict[str, Any]) -> list[int | str]:
+    """User ids and/or lower-cased emails from ``user_ids`` and a ``csv`` with a user_id or email column."""
+    targets: list[int | str] = []
+    for raw in payload.get("user_ids") or []:
+        try:
+            targets.append(int(raw))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid user id: {raw}") from exc
+
+    csv_text = str(payload.get("csv") or "")
+    if csv_text.strip():
+        reader = csv.DictReader(io.StringIO(csv_text.lstrip("\ufeff")))
+        columns = {str(name or "").strip().lower(): name for name in reader.fieldnames or []}
+        if "user_id" not in columns and "email" not in columns:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV needs a user_id or email column")
+        for line_number, row in enumerate(reader, start=2):
+            raw_id = str(row.get(columns.get("user_id")) or "").strip() if "user_id" in columns else ""
+            raw_email = str(row.get(columns.get("email")) or "").strip().lower() if "email" in columns else ""
+            if raw_id:
+                try:
+                    targets.append(int(raw_id))
+                except ValueError as exc:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Invalid user_id on CSV line {line_number}",
+                    ) from exc
+            elif raw_email:
+                targets.append(raw_email)
+
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No target users provided")
+    if len(targets) > ADMIN_BULK_MAX_TARGETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {ADMIN_BULK_MAX_TARGETS} users per bulk job",
+        )
+    return targets
+
+
+def _validate_bulk_params(operation: str, payload: dict[str, Any]) -> dict[str, Any]:
+    if operation == "grant_access":
+        requested_status = str(payload.get("status") or "manual_grant").strip()
+        if requested_status not in ACCESS_STATUS_VALUES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
+        expires_at = _resolve_expires_at(payload)
+        if expires_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="grant_access requires expires_at, expires_in_days or expires_in_months",
+            )
+        return {"status": requested_status, "expires_at": int(expires_at)}
+
+    if operation == "extend_access":
+        try:
+            extend_days = int(payload.get("extend_days"))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="extend_days must be an integer") from exc
+        if extend_days <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="extend_days must be > 0")
+        requested_status = payload.get("status")
+        if requested_status is not None and requested_status not in ACCESS_STATUS_VALUES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
+        return {"extend_days": extend_days, "status": requested_status}
+
+    _, lesson_ids, _ = _course_lessons()
+    if not lesson_ids:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Course lessons are not available")
+    has_overall = payload.get("overall_percent") is not None
+    has_lessons = payload.get("completed_lesson_ids") is not None
+    if has_overall == has_lessons:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of overall_percent or completed_lesson_ids",
+        )
+    if has_overall:
+        overall_percent = float(payload.get("overall_percent"))
+        if overall_percent < 0 or overall_percent > 100:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="overall_percent must be between 0 and 100")
+        return {"overall_percent": overall_percent}
+    raw_ids = payload.get("completed_lesson_ids") or []
+    if not isinstance(raw_ids, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="completed_lesson_ids must be a list")
+    return {"completed_lesson_ids": _validate_completed_lesson_ids(lesson_ids, [str(item) for item in raw_ids])}
+
+
+def _access_snapshot(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "access_status": row.get("access_status"),
+        "expires_at": row.get("expires_at"),
+        "access_managed_by": row.get("access_managed_by"),
+        "effective_status": compute_effective_access_status(row.get("access_status"), row.get("expires_at")),
+    }
+
+
+def _apply_bulk_access_chunk(
+    job_id: str,
+    admin_id: int,
+    operation: str,
+    params: dict[str, Any],
+    user_rows: dict[int, dict[str, Any]],
+    reason: str,
+) -> int:
+    now = _now_ts()
+    updates: list[dict[str, Any]] = []
+    for user_id, row in user_rows.items():
+        if operation == "grant_access":
+            next_status = params["status"]
+            next_expires = params["expires_at"]
+            if next_status in ACCESS_GRANTED_STATUSES and next_expires <= now:
+                next_status = "expired"
+        else:
+            current_expires = int(row["expires_at"]) if row.get("expires_at") is not None else now
+            next_expires = current_expires + params["extend_days"] * 86_400
+            next_status = params.get("status") or str(row.get("access_status") or "expired")
+        after = _access_snapshot({"access_status": next_status, "expires_at": next_expires, "access_managed_by": "admin"})
+        after["bulk_job_id"] = job_id
+        updates.append(
+            {
+                "user_id": user_id,
+                "access_status": next_status,
+                "expires_at": next_expires,
+                "before": _access_snapshot(row),
+                "after": after,
+            }
+        )
+    return apply_admin_access_updates(updates, admin_id=admin_id, reason=reason)
+
+
+def _apply_bulk_progress_chunk(
+    job_id: str,
+    admin_id: int,
+    params: dict[str, Any],
+    user_ids: list[int],
+    reason: str,
+) -> int:
+    _, lesson_ids, _ = _course_lessons()
+    progress_by_user = list_progress_for_users(user_ids, lesson_ids)
+    entries: list[tuple[int, str, dict, bool]] = []
+    audits: list[tuple[int, dict[str, Any], dict[str, Any]]] = []
+    for user_id in user_ids:
+        progress_rows = progress_by_user.get(user_id, {})
+        before = _progress_snapshot(lesson_ids, progress_rows)
+        if "overall_percent" in params:
+            target_ids = _build_target_completed_ids(lesson_ids, before["completed_lesson_ids"], params["overall_percent"])
+        else:
+            target_ids = params["completed_lesson_ids"]
+        target = set(target_ids)
+        current = set(before["completed_lesson_ids"])
+        for lesson_id in lesson_ids:
+            if (lesson_id in current) == (lesson_id in target):
+                continue
+            lesson_id, progress, is_completed = _lesson_completion_entry(
+                lesson_id=lesson_id,
+                is_completed=lesson_id in target,
+                current_row=progress_rows.get(lesson_id),
+            )
+            entries.append((user_id, lesson_id, progress, is_completed))
+        after = _progress_snapshot(lesson_ids, {lesson_id: {"is_completed": True} for lesson_id in target})
+        after["bulk_job_id"] = job_id
+        audits.append((user_id, before, after))
+    apply_admin_progress_updates(entries, audits, admin_id=admin_id, reason=reason)
+    return len(user_ids)
+
+
+def _run_admin_bulk_job(
+    job_id: str,
+    admin_id: int,
+    operation: str,
+    params: dict[str, Any],
+    targets: list[int | str],
+    reason: str,
+) -> None:
+    update_admin_bulk_job(job_id, status="running")
+    processed = succeeded = failed = skipped = 0
+    errors: list[dict[str, Any]] = []
+
+    def _record_error(target: int | str, message: str) -> None:
+        if len(errors) < _BULK_ERROR_LIMIT:
+            errors.append({"target": target, "error": message})
+
+    try:
+        # Resolve emails first so a user listed by both email and id is only updated once.
+        emails = [target for target in targets if isinstance(target, str)]
+        email_ids: dict[str, int] = {}
+        for start in range(0, len(emails), ADMIN_BULK_CHUNK_SIZE):
+            email_ids.update(get_user_ids_by_emails(emails[start : start + ADMIN_BULK_CHUNK_SIZE]))
+        target_by_user: dict[int, int | str] = {}
+        for target in targets:
+            user_id = email_ids.get(target) if isinstance(target, str) else target
+            if user_id is None:
+                failed += 1
+                _record_error(target, "User not found")
+            elif user_id in target_by_user:
+                skipped += 1
+            else:
+                target_by_user[user_id] = target
+        processed = failed + skipped
+        update_admin_bulk_job(job_id, processed=processed, failed=failed, skipped=skipped, errors=errors)
+
+        user_ids = list(target_by_user)
+        for start in range(0, len(user_ids), ADMIN_BULK_CHUNK_SIZE):
+            chunk = user_ids[start : start + ADMIN_BULK_CHUNK_SIZE]
+            user_rows = get_user_access_rows(chunk)
+            chunk_rows: dict[int, dict[str, Any]] = {}
+            for user_id in chunk:
+                if user_id not in user_rows:
+                    failed += 1
+                    _record_error(target_by_user[user_id], "User not found")
+                    continue
+                chunk_rows[user_id] = user_rows[user_id]
+
+            if operation == "set_progress":
+                _apply_bulk_progress_chunk(job_id, admin_id, params, list(chunk_rows), reason)
+            else:
+                _apply_bulk_access_chunk(job_id, admin_id, operation, params, chunk_rows, reason)
+            succeeded += len(chunk_rows)
+            processed += len(chunk)
+            update_admin_bulk_job(job_id, processed=processed, succeeded=succeeded, failed=failed, errors=errors)
+    except Exception as exc:
+        logger.exception("admin_bulk_job_failed job_id=%s operation=%s processed=%s", job_id, operation, processed)
+        update_admin_bulk_job(job_id, status="failed", last_error=f"{type(exc).__name__}: {exc}")
+        return
+    update_admin_bulk_job(job_id, status="completed")
+    logger.info(
+        "admin_bulk_job_completed job_id=%s operation=%s succeeded=%s failed=%s skipped=%s",
+        job_id,
+        operation,
+        succeeded,
+        failed,
+        skipped,
+    )
+
+
+def submit_admin_bulk_job(admin_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    reason = str(payload.get("reason") or "").strip()
+    if not reason:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reason is required")
+    operation = str(payload.get("operation") or "").strip()
+    if operation not in BULK_OPERATIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid operation")
+    params = _validate_bulk_params(operation, payload)
+    targets = _parse_bulk_targets(payload)
+
+    job_id = uuid.uuid4().hex
+    job = create_admin_bulk_job(job_id, admin_id=admin_id, operation=operation, total=len(targets))
+    _BULK_JOB_POOL.submit(_run_admin_bulk_job, job_id, admin_id, operation, params, targets, reason)
+    logger.info("admin_bulk_job_submitted job_id=%s operation=%s total=%s", job_id, operation, len(targets))
+    return job
+
+
+def recover_admin_bulk_jobs() -> None:
+    """Fail jobs left queued/running by a previous process (the job pool is in-memory)."""
+    interrupted = fail_unfinished_admin_bulk_jobs("Interrupted by a server restart")
+    if interrupted:
+        logger.warning("admin_bulk_jobs_interrupted count=%s", interrupted)
+
+
+def get_admin_bulk_job_status(job_id: str) -> dict[str, Any]:
+    job = get_admin_bulk_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk job not found")
+    return job
+
+
+def _export_spec(dataset: str, total_lessons: int) -> tuple[str, list[tuple[str, str]], Callable | None]:
+    """SELECT body (after the shared user filters), (column, DuckDB type) pairs and a row mapper."""
+    if dataset == "users":
+        denominator = max(1, total_lessons)
+        select_sql = f"""
+            SELECT
+                u.id, u.email, u.full_name, u.created_at, u.last_login_at,
+                u.access_status, {_effective_status_sql()} AS effective_access_status,
+                u.expires_at, u.access_managed_by, u.stripe_customer_id,
+                p.status AS latest_purchase_status, s.completed_lessons, s.last_activity_at
+            FROM users u
+            JOIN user_progress_summary s ON s.user_id = u.id
+            LEFT JOIN purchases p ON p.id = u.latest_purchase_id
+            {{where_sql}}
+            ORDER BY u.id
+        """
+        columns = [
+            ("id", "BIGINT"),
+            ("email", "VARCHAR"),
+            ("full_name", "VARCHAR"),
+            ("created_at", "BIGINT"),
+            ("last_login_at", "BIGINT"),
+            ("access_status", "VARCHAR"),
+            ("effective_access_status", "VARCHAR"),
+            ("expires_at", "BIGINT"),
+            ("access_managed_by", "VARCHAR"),
+            ("stripe_customer_id", "VARCHAR"),
+            ("latest_purchase_status", "VARCHAR"),
+            ("completed_lessons", "INTEGER"),
+            ("last_activity_at", "BIGINT"),
+            ("total_lessons", "INTEGER"),
+            ("progress_pct", "DOUBLE"),
+        ]
+
+        def _with_progress(row: tuple) -> tuple:
+            return (*row, total_lessons, _progress_pct(int(row[11] or 0), denominator))
+
+        return select_sql, columns, _with_progress
+
+    if dataset == "purchases":
+        select_sql = """
+            SELECT
+                p.id, p.user_id, u.email, p.course_id, p.status, p.amount, p.currency,
+                p.stripe_checkout_session_id, p.stripe_payment_intent_id,
+                p.created_at, p.paid_at, p.refunded_at
+            FROM users u
+            JOIN user_progress_summary s ON s.user_id = u.id
+            JOIN purchases p ON p.user_id = u.id
+            {where_sql}
+            ORDER BY p.user_id, p.id
+        """
+        columns = [
+            ("id", "BIGINT"),
+            ("user_id", "BIGINT"),
+            ("email", "VARCHAR"),
+            ("course_id", "VARCHAR"),
+            ("status", "VARCHAR"),
+            ("amount", "BIGINT"),
+            ("currency", "VARCHAR"),
+            ("stripe_checkout_session_id", "VARCHAR"),
+            ("stripe_payment_intent_id", "VARCHAR"),
+            ("created_at", "BIGINT"),
+            ("paid_at", "BIGINT"),
+            ("refunded_at", "BIGINT"),
+        ]
+        return select_sql, columns, None
+
+    select_sql = """
+        SELECT lp.user_id, u.email, lp.lesson_id, lp.is_completed, lp.created_at, lp.updated_at
+        FROM users u
+        JOIN user_progress_summary s ON s.user_id = u.id
+        JOIN lesson_progress lp ON lp.user_id = u.id
+        {where_sql}
+        ORDER BY lp.user_id, lp.lesson_id
+    """
+    columns = [
+        ("user_id", "BIGINT"),
+        ("email", "VARCHAR"),
+        ("lesson_id", "VARCHAR"),
+        ("is_completed", "BOOLEAN"),
+        ("created_at", "BIGINT"),
+        ("updated_at", "BIGINT"),
+    ]
+    return select_sql, columns, None
+
+
+def _iter_export_batches(sql: str, params: dict[str, Any], row_fn: Callable | None) -> Iterator[list[tuple]]:
+    with _connect() as conn:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(ADMIN_EXPORT_BATCH_SIZE)
+            if not rows:
+                return
+            yield [row_fn(tuple(row)) if row_fn else tuple(row) for row in rows]
+
+
+def _csv_safe_row(row: tuple) -> tuple:
+    return tuple(
+        f"'{value}" if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES) else value for value in row
+    )
+
+
+def _iter_csv_export(
+    sql: str,
+    params: dict[str, Any],
+    columns: list[tuple[str, str]],
+    row_fn: Callable | None,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for batch in _iter_export_batches(sql, params, row_fn):
+        writer.writerows(_csv_safe_row(row) for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _spool_line(row: tuple) -> str:
+    # Text is always quoted and NULL is a bare empty field, so with allow_quoted_nulls off
+    # no real value (not even an empty string or a literal \N) can read back as NULL.
+    fields = []
+    for value in row:
+        if value is None:
+            fields.append("")
+        elif isinstance(value, (bool, int, float)):
+            fields.append(str(value))
+        else:
+            fields.append('"' + str(value).replace('"', '""') + '"')
+    return ",".join(fields) + "\n"
+
+
+def _iter_parquet_export(
+    sql: str,
+    params: dict[str, Any],
+    columns: list[tuple[str, str]],
+    row_fn: Callable | None,
+) -> Iterator[bytes]:
+    # Rows are spooled to a temp CSV batch by batch, then DuckDB converts it to Parquet
+    # in a streaming COPY, so neither side holds the full result set in memory.
+    with tempfile.TemporaryDirectory(prefix="admin-export-") as tmp_dir:
+        spool_path = Path(tmp_dir) / "rows.csv"
+        parquet_path = Path(tmp_dir) / "export.parquet"
+        with spool_path.open("w", encoding="utf-8", newline="") as spool:
+            for batch in _iter_export_batches(sql, params, row_fn):
+                spool.writelines(_spool_line(row) for row in batch)
+
+        column_types = ", ".join(f"'{name}': '{duck_type}'" for name, duck_type in columns)
+        conn = duckdb.connect(":memory:")
+        try:
+            conn.execute(f"SET temp_directory = '{_sql_literal(tmp_dir)}'")
+            conn.execute(
+                f"""
+                COPY (
+                    SELECT * FROM read_csv(
+                        '{_sql_literal(spool_path)}',
+                        header = false,
+                        quote = '"',
+                        escape = '"',
+                        nullstr = '',
+                        allow_quoted_nulls = false,
+                        columns = {{{column_types}}}
+                    )
+                ) TO '{_sql_literal(parquet_path)}' (FORMAT PARQUET, COMPRESSION ZSTD)
+                """
+            )
+        finally:
+            conn.close()
+
+        with parquet_path.open("rb") as handle:
+            while chunk := handle.read(1 << 16):
+                yield chunk
+
+
+def _sql_literal(value: Any) -> str:
+    return str(value).replace("'", "''")
+
+
+def stream_admin_export(
+    *,
+    admin_id: int,
+    dataset: str,
+    export_format: str = "csv",
+    search: str | None = None,
+    status_filter: str | None = None,
+    expires_window: str | None = None,
+    progress_min: float | None = None,
+    progress_max: float | None = None,
+) -> tuple[Iterator[bytes], str, str]:
+    """Validate filters up front and return (body iterator, media type, filename) for a streaming export."""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid export dataset")
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid export format")
+
+    now = _now_ts()
+    _, lesson_ids, _ = _course_lessons()
+    where, params = _build_user_list_filters(
+        now=now,
+        denominator=max(1, len(lesson_ids)),
+        search=search,
+        status_filter=status_filter,
+        expires_window=expires_window,
+        progress_min=progress_min,
+        progress_max=progress_max,
+    )
+    select_sql, columns, row_fn = _export_spec(dataset, len(lesson_ids))
+    sql = select_sql.format(where_sql=f"WHERE {' AND '.join(where)}" if where else "")
+
+    logger.info(
+        "admin_export_started admin_id=%s dataset=%s format=%s filters=%s",
+        admin_id,
+        dataset,
+        export_format,
+        sorted(key for key in params if key != "now"),
+    )
+    iterator = _iter_csv_export if export_format == "csv" else _iter_parquet_export
+    filename = f"{dataset}-{time.strftime('%Y%m%d-%H%M%S', time.gmtime(now))}.{export_format}"
+    return iterator(sql, params, columns, row_fn), EXPORT_FORMATS[export_format], filename
@@ -15,6 +15,7 @@ from app.config import (
     PASSWORD_RESET_TOKEN_TTL_MINUTES,
 )
 from app.services.email_service import build_reset_link, send_password_reset_email
+from app.services.metrics_service import instrument
 from app.services.user_db import (
     count_recent_reset_requests,
     count_users,
@@ -102,6 +103,7 @@ def validate_password_strength_strict(password: str) -> str | None:
     return None
 
 
+@instrument("pbkdf2")
 def hash_password(password: str) -> str:
     salt = secrets.token_bytes(16)
     digest = hashlib.pbkdf2_hmac(
@@ -115,6 +117,7 @@ def hash_password(password: str) -> str:
     return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt_b64}${digest_b64}"
 
 
+@instrument("pbkdf2")
 def verify_password(password: str, encoded_hash: str) -> bool:
     try:
         scheme, iterations, salt_b64, digest_b64 = encoded_hash.split("$", 3)
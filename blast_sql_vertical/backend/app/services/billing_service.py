@@ -1,6 +1,9 @@
 import calendar
+import contextvars
+import copy
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -16,13 +19,17 @@ from app.config import (
     CHECKOUT_RETURN_URL,
     CHECKOUT_SUCCESS_URL,
     CPF_ENCRYPTION_KEY,
+    STRIPE_API_BASE,
     STRIPE_AUTOMATIC_TAX_ENABLED,
     STRIPE_CARD_INSTALLMENTS_ENABLED,
     STRIPE_CHECKOUT_PAYMENT_METHOD_TYPES,
     STRIPE_CHECKOUT_LOCALE,
     STRIPE_INSTALLMENT_PRICE_IDS,
     STRIPE_INSTALLMENTS_MAX_COUNT,
+    STRIPE_LOOKUP_CACHE_TTL_SECONDS,
     STRIPE_PRICE_ID,
+    STRIPE_PROMO_CACHE_TTL_SECONDS,
+    STRIPE_PROMO_NEGATIVE_CACHE_TTL_SECONDS,
     STRIPE_PUBLISHABLE_KEY,
     STRIPE_SECRET_KEY,
     STRIPE_WEBHOOK_SECRET,
@@ -41,17 +48,24 @@ from app.services.access_service import (
 )
 from app.services.crypto_service import encrypt_cpf, normalize_cpf
 from app.services.email_service import build_login_link, send_purchase_confirmation_email
+from app.services.metrics_service import timed
+from app.services.ttl_cache import TTLCache
 from app.services.user_db import (
     ACCESS_STATUS_VALUES,
+    apply_access_corrections,
     attach_checkout_session_to_purchase,
     create_admin_audit_log,
     create_purchase,
     create_checkout_signup_intent,
     create_user,
+    enqueue_stripe_webhook_event,
     expire_old_checkout_signup_intents,
     get_access_grant,
     get_checkout_signup_intent_by_id,
     get_latest_purchase_for_user_any_status,
+    get_reconciliation_checkpoint,
+    get_reconciliation_targets_by_customer_ids,
+    get_reconciliation_targets_by_payment_intent_ids,
     get_purchase_by_checkout_session_id,
     get_purchase_email_event_by_stripe_event_id,
     get_purchase_by_id,
@@ -65,6 +79,7 @@ from app.services.user_db import (
     mark_checkout_signup_intent_completed,
     mark_checkout_signup_intent_session_created,
     mark_purchase_refunded_by_payment_intent,
+    save_reconciliation_checkpoint,
     upsert_purchase_email_event,
     update_purchase_status,
     update_user_access_state,
@@ -76,6 +91,14 @@ from app.services.user_db import (
 logger = logging.getLogger(__name__)
 _webhook_secret_format_warned = False
 
+# Read-only Stripe lookups: promo validation (public endpoint, negative-cached),
+# promotion code ids -> codes (immutable) and admin refresh reads (short TTL).
+_PROMO_CODE_CACHE = TTLCache("stripe_promo_code", max_entries=2048)
+_PROMOTION_CODE_BY_ID_CACHE = TTLCache("stripe_promotion_code_by_id", max_entries=2048)
+_STRIPE_LOOKUP_CACHE = TTLCache("stripe_lookup", max_entries=1024)
+_PROMOTION_CODE_BY_ID_TTL_SECONDS = 3600
+_STRIPE_LOOKUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stripe-lookup")
+
 
 def _obj_get(obj: Any, key: str, default: Any = None) -> Any:
     if isinstance(obj, dict):
@@ -232,6 +255,8 @@ def _require_webhook_config() -> None:
 
 def _configure_stripe() -> None:
     stripe.api_key = STRIPE_SECRET_KEY
+    if STRIPE_API_BASE:
+        stripe.api_base = STRIPE_API_BASE
 
 
 def _add_months(unix_ts: int, months: int) -> int:
@@ -411,7 +436,8 @@ def _create_stripe_checkout_session(
     user_id: int | None,
 ) -> Any:
     try:
-        return stripe.checkout.Session.create(**params)
+        with timed("stripe"):
+            return stripe.checkout.Session.create(**params)
     except stripe.error.InvalidRequestError as exc:
         param = str(getattr(exc, "param", "") or "")
         payment_methods = params.get("payment_method_types") or []
@@ -427,7 +453,8 @@ def _create_stripe_checkout_session(
                 str(exc),
             )
             try:
-                return stripe.checkout.Session.create(**retry_params)
+                with timed("stripe"):
+                    return stripe.checkout.Session.create(**retry_params)
             except stripe.error.StripeError as retry_exc:
                 if purchase_id:
                     update_purchase_status(
@@ -455,7 +482,8 @@ def _create_stripe_checkout_session(
                 str(exc),
             )
             try:
-                return stripe.checkout.Session.create(**retry_params)
+                with timed("stripe"):
+                    return stripe.checkout.Session.create(**retry_params)
             except stripe.error.StripeError as retry_exc:
                 if purchase_id:
                     update_purchase_status(
@@ -568,13 +596,10 @@ def get_user_access_status(user_id: int) -> dict[str, Any]:
     }
 
 
-def validate_promo_code(code: str) -> dict[str, Any]:
-    _configure_stripe()
-    clean_code = (code or "").strip()
-    if not clean_code:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Promo code is required.")
+def _lookup_promo_code(clean_code: str) -> dict[str, Any]:
     try:
-        result = stripe.PromotionCode.list(code=clean_code, active=True, limit=1)
+        with timed("stripe"):
+            result = stripe.PromotionCode.list(code=clean_code, active=True, limit=1)
     except stripe.error.StripeError as exc:
         logger.exception("stripe_promo_code_validate_failed code=%s", clean_code)
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Could not validate promo code.") from exc
@@ -600,6 +625,22 @@ def validate_promo_code(code: str) -> dict[str, Any]:
     return {"valid": True, "promo_code_id": promo_id, "discount": discount}
 
 
+def validate_promo_code(code: str) -> dict[str, Any]:
+    _configure_stripe()
+    clean_code = (code or "").strip()
+    if not clean_code:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Promo code is required.")
+    # Stripe promotion codes are case-insensitive.
+    result = _PROMO_CODE_CACHE.get_or_load(
+        clean_code.upper(),
+        lambda: _lookup_promo_code(clean_code),
+        ttl=STRIPE_PROMO_CACHE_TTL_SECONDS,
+        negative_ttl=STRIPE_PROMO_NEGATIVE_CACHE_TTL_SECONDS,
+        is_negative=lambda value: not value.get("valid"),
+    )
+    return copy.deepcopy(result)
+
+
 def start_public_checkout(email: str, password: str, course_id: str | None = None) -> dict[str, Any]:
     _require_public_checkout_config()
     _configure_stripe()
@@ -966,6 +1007,15 @@ def _extract_discount_entries(session_obj: Any) -> list[Any]:
     return []
 
 
+def _retrieve_promotion_code(promo_id: str) -> str:
+    def load() -> str:
+        with timed("stripe"):
+            promo = stripe.PromotionCode.retrieve(promo_id)
+        return str(_obj_get(promo, "code") or "")
+
+    return _PROMOTION_CODE_BY_ID_CACHE.get_or_load(promo_id, load, ttl=_PROMOTION_CODE_BY_ID_TTL_SECONDS)
+
+
 def _extract_discount_metadata(session_obj: Any) -> dict[str, Any]:
     total_details = _obj_get(session_obj, "total_details", {}) or {}
     amount_discount = _to_int(_obj_get(total_details, "amount_discount"))
@@ -993,8 +1043,7 @@ def _extract_discount_metadata(session_obj: Any) -> dict[str, Any]:
 
         if promo_id and not promo_code:
             try:
-                promo = stripe.PromotionCode.retrieve(promo_id)
-                promo_code = str(_obj_get(promo, "code") or "")
+                promo_code = _retrieve_promotion_code(promo_id)
             except stripe.error.StripeError:
                 logger.warning("stripe_promotion_code_lookup_failed promotion_code_id=%s", promo_id)
 
@@ -1026,10 +1075,11 @@ def _retrieve_session_with_expanded_discounts(session_id: str) -> Any | None:
     if not session_id:
         return None
     try:
-        return stripe.checkout.Session.retrieve(
-            session_id,
-            expand=["discounts.discount.promotion_code"],
-        )
+        with timed("stripe"):
+            return stripe.checkout.Session.retrieve(
+                session_id,
+                expand=["discounts.discount.promotion_code"],
+            )
     except stripe.error.StripeError:
         logger.warning("stripe_session_discount_expand_failed session_id=%s", session_id)
         return None
@@ -1056,7 +1106,8 @@ def _extract_cpf_from_checkout_session(payload: Any, session_id: str) -> str:
     if not session_id:
         return ""
     try:
-        session = stripe.checkout.Session.retrieve(session_id)
+        with timed("stripe"):
+            session = stripe.checkout.Session.retrieve(session_id)
     except stripe.error.StripeError:
         logger.warning("stripe_checkout_session_retrieve_failed_for_cpf session_id=%s", session_id)
         return ""
@@ -1186,7 +1237,12 @@ def _send_purchase_confirmation_for_purchase(
         login_email=user_email,
         login_url=build_login_link(),
         password_created_at_checkout=password_created_at_checkout,
+        stripe_event_id=event_id or None,
+        idempotency_key=f"purchase_confirmation:{purchase_id}",
     )
+    if send_result.get("queued"):
+        # The outbox sender records email_sent_at/provider id on this event once delivered.
+        return event_context
     if send_result.get("sent"):
         _set_event_audit_context(
             event_context,
@@ -1345,7 +1401,8 @@ def _handle_checkout_signup_intent_completion(
     if subscription_id and installment_count and installment_count > 1:
         try:
             cancel_at = _add_months(paid_at, installment_count)
-            stripe.Subscription.modify(subscription_id, cancel_at=cancel_at)
+            with timed("stripe"):
+                stripe.Subscription.modify(subscription_id, cancel_at=cancel_at)
             logger.info(
                 "stripe_installment_subscription_cancel_at_set event_id=%s sub_id=%s installment_count=%s",
                 event_id,
@@ -1818,6 +1875,27 @@ def _handle_charge_dispute_created(
     return event_context
 
 
+def _map_payment_intent_access_status(payment_intent: Any) -> str | None:
+    latest_charge = _obj_get(payment_intent, "latest_charge")
+    amount_refunded = _to_int(_obj_get(latest_charge, "amount_refunded")) or 0
+    if amount_refunded > 0:
+        return "refunded"
+    if _obj_get(latest_charge, "dispute"):
+        return "blocked"
+    if str(_obj_get(payment_intent, "status") or "").lower() == "succeeded":
+        return "active"
+    return None
+
+
+def _map_subscription_access_status(subscription: Any) -> str | None:
+    sub_status = str(_obj_get(subscription, "status") or "").lower()
+    if sub_status in {"canceled", "cancelled", "unpaid", "incomplete_expired"}:
+        return "canceled"
+    if sub_status in {"active", "trialing"}:
+        return "active"
+    return None
+
+
 def refresh_user_from_stripe(user_id: int, requested_by_admin_id: int) -> dict[str, Any]:
     user = get_user_by_id(user_id)
     if not user:
@@ -1839,15 +1917,47 @@ def refresh_user_from_stripe(user_id: int, requested_by_admin_id: int) -> dict[s
     stripe_subscription = None
     mapped_status: str | None = None
 
-    if payment_intent_id:
+    def load_payment_intent() -> Any:
+        with timed("stripe"):
+            return stripe.PaymentIntent.retrieve(payment_intent_id, expand=["latest_charge"])
+
+    def load_subscriptions() -> Any:
+        with timed("stripe"):
+            return stripe.Subscription.list(customer=customer_id, limit=1, status="all")
+
+    # Both lookups are independent; run them concurrently through the short-TTL cache.
+    pi_future = (
+        _STRIPE_LOOKUP_POOL.submit(
+            contextvars.copy_context().run,
+            _STRIPE_LOOKUP_CACHE.get_or_load,
+            ("payment_intent", payment_intent_id),
+            load_payment_intent,
+            ttl=STRIPE_LOOKUP_CACHE_TTL_SECONDS,
+        )
+        if payment_intent_id
+        else None
+    )
+    subs_future = (
+        _STRIPE_LOOKUP_POOL.submit(
+            contextvars.copy_context().run,
+            _STRIPE_LOOKUP_CACHE.get_or_load,
+            ("subscriptions", customer_id),
+            load_subscriptions,
+            ttl=STRIPE_LOOKUP_CACHE_TTL_SECONDS,
+        )
+        if customer_id
+        else None
+    )
+
+    if pi_future is not None:
         try:
-            stripe_pi = stripe.PaymentIntent.retrieve(payment_intent_id, expand=["latest_charge"])
+            stripe_pi = pi_future.result()
         except stripe.error.StripeError:
             logger.warning("stripe_refresh_payment_intent_failed user_id=%s payment_intent_id=%s", user_id, payment_intent_id)
 
-    if customer_id:
+    if subs_future is not None:
         try:
-            subs = stripe.Subscription.list(customer=customer_id, limit=1, status="all")
+            subs = subs_future.result()
             sub_list = _obj_get(subs, "data", []) or []
             if isinstance(sub_list, list) and sub_list:
                 stripe_subscription = sub_list[0]
@@ -1855,22 +1965,10 @@ def refresh_user_from_stripe(user_id: int, requested_by_admin_id: int) -> dict[s
             logger.warning("stripe_refresh_subscription_failed user_id=%s customer_id=%s", user_id, customer_id)
 
     if stripe_pi is not None:
-        latest_charge = _obj_get(stripe_pi, "latest_charge")
-        amount_refunded = _to_int(_obj_get(latest_charge, "amount_refunded")) or 0
-        charge_dispute = _obj_get(latest_charge, "dispute")
-        if amount_refunded > 0:
-            mapped_status = "refunded"
-        elif charge_dispute:
-            mapped_status = "blocked"
-        elif str(_obj_get(stripe_pi, "status") or "").lower() == "succeeded":
-            mapped_status = "active"
+        mapped_status = _map_payment_intent_access_status(stripe_pi)
 
     if mapped_status is None and stripe_subscription is not None:
-        sub_status = str(_obj_get(stripe_subscription, "status") or "").lower()
-        if sub_status in {"canceled", "cancelled", "unpaid", "incomplete_expired"}:
-            mapped_status = "canceled"
-        elif sub_status in {"active", "trialing"}:
-            mapped_status = "active"
+        mapped_status = _map_subscription_access_status(stripe_subscription)
 
     if mapped_status is None:
         mapped_status = str(user.get("access_status") or "expired")
@@ -1923,6 +2021,214 @@ def refresh_user_from_stripe(user_id: int, requested_by_admin_id: int) -> dict[s
     }
 
 
+RECONCILIATION_CHECKPOINT_NAME = "stripe_reconciliation"
+RECONCILIATION_PHASES = ("payment_intents", "refunds", "subscriptions")
+
+
+def _reconciliation_correction(target: dict, mapped_status: str, now: int) -> dict | None:
+    """Same mapping as refresh_user_from_stripe, or None when nothing would change."""
+    if str(target.get("access_managed_by") or "stripe") == "admin":
+        return None
+    current_expires_at = _to_int(target.get("expires_at"))
+    expires_at = current_expires_at
+    if mapped_status == "active" and expires_at is None:
+        expires_at = _to_int(target.get("grant_expires_at"))
+    if mapped_status == "refunded":
+        if target.get("access_status") == "refunded":
+            return None
+        expires_at = now
+    new_status = compute_effective_access_status(mapped_status, expires_at, now_ts=now)
+    if new_status == target.get("access_status") and expires_at == current_expires_at:
+        return None
+    return {
+        "user_id": int(target["user_id"]),
+        "access_status": new_status,
+        "expires_at": expires_at,
+        "before": {"access_status": target.get("access_status"), "expires_at": target.get("expires_at")},
+    }
+
+
+def _refund_payment_intent_id(refund: Any) -> str:
+    value = _obj_get(refund, "payment_intent")
+    if value is not None and not isinstance(value, str):
+        value = _obj_get(value, "id")
+    return str(value or "")
+
+
+def _plan_reconciliation_chunk(phase: str, objects: list[Any], resolved_customers: set[str] | None = None) -> list[dict]:
+    now = int(time.time())
+    if phase == "subscriptions":
+        # Stripe lists newest first: the first subscription per customer wins, matching
+        # refresh_user_from_stripe's ``limit=1`` lookup. ``resolved_customers`` carries
+        # the customers already decided by earlier chunks of the same run.
+        resolved = resolved_customers if resolved_customers is not None else set()
+        by_customer: dict[str, str | None] = {}
+        for subscription in objects:
+            customer = _obj_get(subscription, "customer")
+            customer_id = str(customer if isinstance(customer, str) else _obj_get(customer, "id") or "")
+            if customer_id and customer_id not in by_customer and customer_id not in resolved:
+                by_customer[customer_id] = _map_subscription_access_status(subscription)
+        resolved.update(by_customer)
+        targets = get_reconciliation_targets_by_customer_ids(list(by_customer), BILLING_COURSE_ID)
+        # A payment intent on the latest purchase takes precedence over subscriptions.
+        planned = [
+            (target, by_customer.get(str(target.get("stripe_customer_id") or "")))
+            for target in targets
+            if not target.get("stripe_payment_intent_id")
+        ]
+    else:
+        by_payment_intent: dict[str, str] = {}
+        for obj in objects:
+            if phase == "payment_intents":
+                payment_intent_id = str(_obj_get(obj, "id") or "")
+                mapped = _map_payment_intent_access_status(obj)
+            else:
+                payment_intent_id = _refund_payment_intent_id(obj)
+                mapped = "refunded" if str(_obj_get(obj, "status") or "").lower() in {"succeeded", "pending"} else None
+            if payment_intent_id and mapped:
+                by_payment_intent[payment_intent_id] = mapped
+        targets = get_reconciliation_targets_by_payment_intent_ids(list(by_payment_intent), BILLING_COURSE_ID)
+        planned = [
+            (target, by_payment_intent.get(str(target.get("stripe_payment_intent_id") or ""))) for target in targets
+        ]
+
+    corrections = []
+    for target, mapped_status in planned:
+        correction = _reconciliation_correction(target, mapped_status, now) if mapped_status else None
+        if correction:
+            corrections.append(correction)
+    return corrections
+
+
+def _iter_chunks(items: Any, size: int) -> Any:
+    chunk: list[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _list_reconciliation_phase(phase: str, cursor: str | None, page_size: int) -> Any:
+    params: dict[str, Any] = {"limit": page_size}
+    if cursor:
+        params["starting_after"] = cursor
+    with timed("stripe"):
+        if phase == "payment_intents":
+            listing = stripe.PaymentIntent.list(expand=["data.latest_charge"], **params)
+        elif phase == "refunds":
+            listing = stripe.Refund.list(**params)
+        else:
+            listing = stripe.Subscription.list(status="all", **params)
+    return listing.auto_paging_iter()
+
+
+def reconcile_users_with_stripe(
+    *,
+    restart: bool = False,
+    page_size: int = 100,
+    chunk_size: int = 200,
+    admin_id: int | None = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Reconcile every user's access state with Stripe in bulk.
+
+    Pages PaymentIntents, Refunds and Subscriptions with ``auto_paging_iter``, matches
+    them to users through indexed lookups and applies corrections one chunk per
+    transaction. A checkpoint (phase + Stripe cursor, plus the customers whose newest
+    subscription was already applied) is saved after every chunk so an interrupted run
+    resumes where it stopped unless ``restart`` is set.
+    """
+    if not STRIPE_SECRET_KEY:
+        raise RuntimeError("Missing Stripe config: STRIPE_SECRET_KEY")
+    _configure_stripe()
+
+    checkpoint = None if restart else get_reconciliation_checkpoint(RECONCILIATION_CHECKPOINT_NAME)
+    resolved_customers: set[str] = set()
+    if checkpoint and checkpoint.get("completed_at") is None and checkpoint.get("phase") in RECONCILIATION_PHASES:
+        phase_index = RECONCILIATION_PHASES.index(checkpoint["phase"])
+        cursor = checkpoint.get("cursor") or None
+        stats: dict[str, Any] = dict(checkpoint.get("stats") or {})
+        resolved_customers.update(str(item) for item in stats.pop("subscription_customers", None) or [])
+        started_at = int(checkpoint.get("started_at") or time.time())
+        logger.info("stripe_reconciliation_resumed phase=%s cursor=%s", checkpoint["phase"], cursor or "")
+    else:
+        phase_index, cursor, stats, started_at = 0, None, {}, int(time.time())
+
+    safe_chunk_size = max(1, int(chunk_size))
+    for phase in RECONCILIATION_PHASES[phase_index:]:
+        listing = _list_reconciliation_phase(phase, cursor, max(1, min(100, int(page_size))))
+        for chunk in _iter_chunks(listing, safe_chunk_size):
+            corrections = _plan_reconciliation_chunk(phase, chunk, resolved_customers)
+            applied = 0 if dry_run else apply_access_corrections(corrections, admin_id=admin_id)
+            cursor = str(_obj_get(chunk[-1], "id") or "") or cursor
+            stats[f"{phase}_seen"] = int(stats.get(f"{phase}_seen", 0)) + len(chunk)
+            stats["corrections_planned"] = int(stats.get("corrections_planned", 0)) + len(corrections)
+            stats["corrections_applied"] = int(stats.get("corrections_applied", 0)) + applied
+            if not dry_run:
+                save_reconciliation_checkpoint(
+                    RECONCILIATION_CHECKPOINT_NAME,
+                    phase=phase,
+                    cursor=cursor,
+                    stats={**stats, "subscription_customers": sorted(resolved_customers)},
+                    started_at=started_at,
+                )
+            logger.info(
+                "stripe_reconciliation_chunk phase=%s size=%s planned=%s applied=%s cursor=%s",
+                phase,
+                len(chunk),
+                len(corrections),
+                applied,
+                cursor,
+            )
+        cursor = None
+        if not dry_run and phase != RECONCILIATION_PHASES[-1]:
+            next_phase = RECONCILIATION_PHASES[RECONCILIATION_PHASES.index(phase) + 1]
+            save_reconciliation_checkpoint(
+                RECONCILIATION_CHECKPOINT_NAME,
+                phase=next_phase,
+                cursor=None,
+                stats=stats,
+                started_at=started_at,
+            )
+
+    if not dry_run:
+        save_reconciliation_checkpoint(
+            RECONCILIATION_CHECKPOINT_NAME,
+            phase=RECONCILIATION_PHASES[-1],
+            cursor=None,
+            stats=stats,
+            started_at=started_at,
+            completed=True,
+        )
+    stats["duration_seconds"] = int(time.time()) - started_at
+    logger.info("stripe_reconciliation_completed stats=%s", stats)
+    return stats
+
+
+def enqueue_stripe_event(event: Any, payload: bytes) -> dict | None:
+    """Persist a verified event's raw payload for the background webhook workers."""
+    event_id = str(_obj_get(event, "id") or "")
+    event_type = str(_obj_get(event, "type") or "")
+    event_context = _build_event_audit_context(event_type, _obj_get(_obj_get(event, "data", {}), "object", {}))
+    row = enqueue_stripe_webhook_event(
+        stripe_event_id=event_id,
+        event_type=event_type,
+        payload_json=payload.decode("utf-8"),
+        stripe_session_id=str(event_context.get("stripe_session_id") or "") or None,
+        stripe_payment_intent_id=str(event_context.get("stripe_payment_intent_id") or "") or None,
+    )
+    logger.info(
+        "stripe_webhook_enqueued event_id=%s event_type=%s queue_status=%s",
+        event_id,
+        event_type,
+        (row or {}).get("queue_status"),
+    )
+    return row
+
+
 def process_stripe_event(event: Any) -> None:
     event_id = str(_obj_get(event, "id") or "")
     event_type = str(_obj_get(event, "type") or "")
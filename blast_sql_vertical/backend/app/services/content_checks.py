@@ -0,0 +1,112 @@
+"""
+PT-BR content integrity checks shared by the runtime loader and ``tools/validate_ptbr_content.py``.
+
+Standard library only, so the offline tool can import it without the app config.
+"""
+
+import re
+
+MOJIBAKE_SEQUENCES = (
+    "Ã¡",
+    "Ã¢",
+    "Ã£",
+    "Ã©",
+    "Ãª",
+    "Ã­",
+    "Ã³",
+    "Ã´",
+    "Ãµ",
+    "Ãº",
+    "Ã§",
+    "Ã",
+    "Ã‰",
+    "Ã“",
+    "Ãš",
+    "Ã‡",
+    "Â ",
+    "Â·",
+    "â€“",
+    "â€”",
+    "â€œ",
+    "â€",
+    "â€˜",
+    "â€™",
+    "â€¦",
+    "â€¢",
+    "â‚¬",
+    "ðŸ",
+)
+_WORD_WITH_QMARK = re.compile(r"[A-Za-zÀ-ÿ0-9_?]+")
+
+
+def find_internal_qmark_token(text: str) -> str | None:
+    for token in _WORD_WITH_QMARK.findall(text):
+        if "?" not in token:
+            continue
+        if set(token) == {"?"}:
+            continue
+        if token.endswith("?") and token.count("?") == 1 and token[:-1].isalnum():
+            continue
+        return token
+    return None
+
+
+def collect_text_issues(text: str) -> list[str]:
+    issues: list[str] = []
+    if "\ufffd" in text:
+        issues.append("contains_replacement_char")
+    if any(seq in text for seq in MOJIBAKE_SEQUENCES):
+        issues.append("contains_mojibake_signature")
+    q_token = find_internal_qmark_token(text)
+    if q_token:
+        issues.append(f"contains_internal_qmark_token:{q_token}")
+    return issues
+
+
+def collect_payload_issues(
+    value,
+    pointer: str = "$",
+    out: list[str] | None = None,
+    *,
+    limit: int = 25,
+) -> list[str]:
+    """Append ``"<pointer>: <issue> :: <snippet>"`` for every bad string in ``value``, up to ``limit``."""
+    issues = out if out is not None else []
+    if len(issues) >= limit:
+        return issues
+
+    if isinstance(value, dict):
+        for key, child in value.items():
+            collect_payload_issues(child, f"{pointer}.{key}", issues, limit=limit)
+            if len(issues) >= limit:
+                break
+        return issues
+
+    if isinstance(value, list):
+        for idx, child in enumerate(value):
+            collect_payload_issues(child, f"{pointer}[{idx}]", issues, limit=limit)
+            if len(issues) >= limit:
+                break
+        return issues
+
+    if isinstance(value, str):
+        for issue in collect_text_issues(value):
+            snippet = value.strip().replace("\n", " ")[:120]
+            issues.append(f"{pointer}: {issue} :: {snippet}")
+            if len(issues) >= limit:
+                break
+    return issues
+
+
+def iter_solution_queries(value, pointer: str = "$"):
+    """Yield ``(pointer, query)`` for every non-empty ``solution_query`` in a content payload."""
+    if isinstance(value, dict):
+        query = value.get("solution_query")
+        if isinstance(query, str) and query.strip():
+            yield f"{pointer}.solution_query", query
+        for key, child in value.items():
+            if isinstance(child, (dict, list)):
+                yield from iter_solution_queries(child, f"{pointer}.{key}")
+    elif isinstance(value, list):
+        for idx, child in enumerate(value):
+            yield from iter_solution_queries(child, f"{pointer}[{idx}]")
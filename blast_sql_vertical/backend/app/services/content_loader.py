@@ -6,44 +6,21 @@ import unicodedata
 from pathlib import Path
 
 from app.config import CONTENT_DIR, STRICT_CONTENT_VALIDATION
+from app.services.content_checks import MOJIBAKE_SEQUENCES as _MOJIBAKE_SEQUENCES, collect_payload_issues
+from app.services.expected_results import reset_expected_results
 
 logger = logging.getLogger(__name__)
 
 _COURSES_CACHE: dict | None = None
 _LESSON_CACHE: dict[str, dict] = {}
+_PLAYGROUND_DATASETS: list[dict] = []
+_PLAYGROUND_CHALLENGES: dict[str, list[dict]] = {}
+_PLAYGROUND_PUBLIC_CHALLENGES: dict[str, list[dict]] = {}
+_PLAYGROUND_INDEX: dict[tuple[str, str], int] = {}
+_COURSE_OUTLINES: dict[str, dict] = {}
 _CONTENT_READY = False
 
 _MOJIBAKE_SCORE_MARKERS = ("\u00c3", "\u00c2", "\u00f0", "\ufffd")
-_MOJIBAKE_SEQUENCES = (
-    "Ã¡",
-    "Ã¢",
-    "Ã£",
-    "Ã©",
-    "Ãª",
-    "Ã­",
-    "Ã³",
-    "Ã´",
-    "Ãµ",
-    "Ãº",
-    "Ã§",
-    "Ã",
-    "Ã‰",
-    "Ã“",
-    "Ãš",
-    "Ã‡",
-    "Â ",
-    "Â·",
-    "â€“",
-    "â€”",
-    "â€œ",
-    "â€",
-    "â€˜",
-    "â€™",
-    "â€¦",
-    "â€¢",
-    "â‚¬",
-    "ðŸ",
-)
 _QUESTION_MARK_WORD_FIXES = (
     ("aquisi??o", "aquisi\u00e7\u00e3o"),
     ("Descri??o", "Descri\u00e7\u00e3o"),
@@ -172,59 +149,6 @@ def _normalize_payload(value):
     return value
 
 
-def _find_internal_qmark_token(text: str) -> str | None:
-    for token in re.findall(r"[A-Za-zÀ-ÿ0-9_?]+", text):
-        if "?" not in token:
-            continue
-        if set(token) == {"?"}:
-            continue
-        if token.endswith("?") and token.count("?") == 1 and token[:-1].isalnum():
-            continue
-        return token
-    return None
-
-
-def _collect_text_issues(text: str) -> list[str]:
-    issues: list[str] = []
-    if "\ufffd" in text:
-        issues.append("contains_replacement_char")
-    if any(seq in text for seq in _MOJIBAKE_SEQUENCES):
-        issues.append("contains_mojibake_signature")
-    q_token = _find_internal_qmark_token(text)
-    if q_token:
-        issues.append(f"contains_internal_qmark_token:{q_token}")
-    return issues
-
-
-def _collect_payload_issues(value, pointer: str = "$", out: list[str] | None = None) -> list[str]:
-    issues = out if out is not None else []
-    if len(issues) >= _CONTENT_ISSUE_LIMIT:
-        return issues
-
-    if isinstance(value, dict):
-        for key, child in value.items():
-            _collect_payload_issues(child, f"{pointer}.{key}", issues)
-            if len(issues) >= _CONTENT_ISSUE_LIMIT:
-                break
-        return issues
-
-    if isinstance(value, list):
-        for idx, child in enumerate(value):
-            _collect_payload_issues(child, f"{pointer}[{idx}]", issues)
-            if len(issues) >= _CONTENT_ISSUE_LIMIT:
-                break
-        return issues
-
-    if isinstance(value, str):
-        text_issues = _collect_text_issues(value)
-        for issue in text_issues:
-            snippet = value.strip().replace("\n", " ")[:120]
-            issues.append(f"{pointer}: {issue} :: {snippet}")
-            if len(issues) >= _CONTENT_ISSUE_LIMIT:
-                break
-    return issues
-
-
 def _safe_text(value: object) -> str:
     return value.strip() if isinstance(value, str) else ""
 
@@ -357,12 +281,79 @@ def _enrich_courses_with_slugs(courses_data: dict) -> None:
                 lesson["slug"] = slug
 
 
+def _build_playground_catalog(
+    raw: dict | None,
+) -> tuple[list[dict], dict[str, list[dict]], dict[str, list[dict]], dict[tuple[str, str], int]]:
+    """Split the playground file into datasets, full challenges, a solution-free view and an id index."""
+    raw = raw or {}
+    datasets = [item for item in raw.get("datasets", []) if isinstance(item, dict)]
+    challenges_raw = raw.get("challenges")
+    if not isinstance(challenges_raw, dict):
+        challenges_raw = {}
+
+    challenges: dict[str, list[dict]] = {}
+    public: dict[str, list[dict]] = {}
+    index: dict[tuple[str, str], int] = {}
+    for dataset_id, items in challenges_raw.items():
+        if not isinstance(items, list):
+            continue
+        dataset_challenges = [item for item in items if isinstance(item, dict)]
+        challenges[dataset_id] = dataset_challenges
+        public[dataset_id] = [
+            {k: v for k, v in item.items() if k != "solution_query"} for item in dataset_challenges
+        ]
+        for idx, item in enumerate(dataset_challenges):
+            challenge_id = item.get("id")
+            if isinstance(challenge_id, str):
+                index.setdefault((dataset_id, challenge_id), idx)
+    return datasets, challenges, public, index
+
+
+def _build_course_outlines(courses_data: dict) -> dict[str, dict]:
+    """Course id -> ``{"id", "lesson_ids", "modules": [{"id", "title", "lessons": [{"id", "title"}]}]}``."""
+    outlines: dict[str, dict] = {}
+    for course in courses_data.get("courses", []):
+        if not isinstance(course, dict):
+            continue
+        course_id = str(course.get("id") or "")
+        lesson_ids: list[str] = []
+        modules: list[dict] = []
+        for module in course.get("modules", []) or []:
+            if not isinstance(module, dict):
+                continue
+            module_lessons: list[dict] = []
+            for lesson in module.get("lessons", []) or []:
+                if isinstance(lesson, str):
+                    lesson_id = lesson
+                    lesson_title = lesson
+                elif isinstance(lesson, dict):
+                    lesson_id = str(lesson.get("id") or "")
+                    lesson_title = str(lesson.get("title") or lesson_id)
+                else:
+                    continue
+                if not lesson_id:
+                    continue
+                lesson_ids.append(lesson_id)
+                module_lessons.append({"id": lesson_id, "title": lesson_title})
+            modules.append(
+                {
+                    "id": str(module.get("id") or ""),
+                    "title": str(module.get("title") or ""),
+                    "lessons": module_lessons,
+                }
+            )
+        outlines.setdefault(course_id, {"id": course_id, "lesson_ids": lesson_ids, "modules": modules})
+    return outlines
+
+
 def initialize_runtime_content() -> None:
     refresh_content_cache()
 
 
 def refresh_content_cache() -> None:
     global _COURSES_CACHE, _LESSON_CACHE, _CONTENT_READY
+    global _PLAYGROUND_DATASETS, _PLAYGROUND_CHALLENGES, _PLAYGROUND_PUBLIC_CHALLENGES, _PLAYGROUND_INDEX
+    global _COURSE_OUTLINES
 
     courses_path = CONTENT_DIR / "courses.json"
     courses_raw = _load_json(courses_path) or {"courses": []}
@@ -401,14 +392,28 @@ def refresh_content_cache() -> None:
                 exercise_count += len(get_lesson_exercises(lesson))
                 lesson_cache[lesson_id] = lesson
 
+    (
+        playground_datasets,
+        playground_challenges,
+        playground_public,
+        playground_index,
+    ) = _build_playground_catalog(_load_json(CONTENT_DIR / "playground_challenges.json"))
+
     _COURSES_CACHE = courses
     _LESSON_CACHE = lesson_cache
+    _PLAYGROUND_DATASETS = playground_datasets
+    _PLAYGROUND_CHALLENGES = playground_challenges
+    _PLAYGROUND_PUBLIC_CHALLENGES = playground_public
+    _PLAYGROUND_INDEX = playground_index
+    _COURSE_OUTLINES = _build_course_outlines(courses)
     _CONTENT_READY = True
+    # Precomputed solution results are keyed by solution text; re-read them with the content.
+    reset_expected_results()
 
-    content_issues = _collect_payload_issues(courses)
+    content_issues = collect_payload_issues(courses, limit=_CONTENT_ISSUE_LIMIT)
     if len(content_issues) < _CONTENT_ISSUE_LIMIT:
         for lesson_id, lesson in lesson_cache.items():
-            _collect_payload_issues(lesson, f"lesson:{lesson_id}", content_issues)
+            collect_payload_issues(lesson, f"lesson:{lesson_id}", content_issues, limit=_CONTENT_ISSUE_LIMIT)
             if len(content_issues) >= _CONTENT_ISSUE_LIMIT:
                 break
 
@@ -419,9 +424,11 @@ def refresh_content_cache() -> None:
         logger.warning(msg)
 
     logger.info(
-        "Content cache ready: %s lessons, %s exercises, %s starter queries cleared, %s hints auto-filled.",
+        "Content cache ready: %s lessons, %s exercises, %s playground challenges, "
+        "%s starter queries cleared, %s hints auto-filled.",
         len(_LESSON_CACHE),
         exercise_count,
+        len(_PLAYGROUND_INDEX),
         starter_cleared,
         hints_autofilled,
     )
@@ -437,6 +444,15 @@ def load_courses() -> dict:
     return copy.deepcopy(_COURSES_CACHE or {"courses": []})
 
 
+def get_course_outlines() -> dict[str, dict]:
+    """Precomputed module/lesson ids and titles per course, in content order.
+
+    Shared with the cache (no deep copy), so callers must not mutate it.
+    """
+    _ensure_content_ready()
+    return _COURSE_OUTLINES
+
+
 def load_lesson(lesson_id: str) -> dict | None:
     if not lesson_id:
         return None
@@ -454,6 +470,32 @@ def get_lesson_exercises(lesson: dict | None) -> list[dict]:
     return [exercise for exercise in exercises if isinstance(exercise, dict)]
 
 
+def load_playground_datasets() -> list[dict]:
+    _ensure_content_ready()
+    return copy.deepcopy(_PLAYGROUND_DATASETS)
+
+
+def load_playground_challenges(dataset_id: str) -> list[dict]:
+    """Return the public (solution-stripped) challenges for a dataset."""
+    _ensure_content_ready()
+    return copy.deepcopy(_PLAYGROUND_PUBLIC_CHALLENGES.get(dataset_id, []))
+
+
+def get_playground_challenge(dataset_id: str, challenge_id: str) -> tuple[dict | None, int, int]:
+    """Resolve a playground challenge by id.
+
+    Returns ``(challenge, index, challenge_count)``; ``challenge`` is ``None`` and
+    ``index`` is ``-1`` when the id is unknown. The challenge includes its solution
+    and is shared with the cache, so callers must not mutate it.
+    """
+    _ensure_content_ready()
+    challenges = _PLAYGROUND_CHALLENGES.get(dataset_id, [])
+    idx = _PLAYGROUND_INDEX.get((dataset_id, challenge_id), -1)
+    if idx < 0:
+        return None, -1, len(challenges)
+    return challenges[idx], idx, len(challenges)
+
+
 _COURSE_SLUG_TO_ID: dict[str, str] = {
     "sql-basico-avancado": "sql-basics",
 }
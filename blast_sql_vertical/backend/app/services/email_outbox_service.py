@@ -0,0 +1,286 @@
+"""
+Outbound email outbox.
+
+Emails are written to the ``email_outbox`` table (deduplicated by idempotency key) and
+delivered by a background sender in batches. Failed batches are retried with
+exponential backoff; provider message ids are copied to ``purchase_email_events``.
+Messages the provider rejects outright (e.g. an invalid recipient) are dead-lettered
+on their own without holding back the rest of the batch.
+The rendered body is cleared once a row is sent or dead-lettered.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Protocol
+
+from app.config import (
+    EMAIL_OUTBOX_BATCH_SIZE,
+    EMAIL_OUTBOX_ENABLED,
+    EMAIL_OUTBOX_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_POLL_SECONDS,
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS,
+    RESEND_API_KEY,
+    RESEND_FROM_EMAIL,
+)
+from app.services.metrics_service import inc_counter, register_gauge_callback, timed
+from app.services.user_db import (
+    claim_email_outbox_batch,
+    enqueue_email_outbox,
+    get_email_outbox_stats,
+    mark_email_outbox_failed,
+    mark_email_outbox_sent,
+)
+
+logger = logging.getLogger(__name__)
+
+_LOCK_TIMEOUT_SECONDS = 300
+_WAKEUP = threading.Event()
+_STOP = threading.Event()
+_WORKER: threading.Thread | None = None
+_WORKER_LOCK = threading.Lock()
+
+
+class EmailRejected(Exception):
+    """The provider refused one message for good (bad recipient, invalid fields)."""
+
+
+class EmailProvider(Protocol):
+    def send_batch(self, messages: list[dict[str, Any]]) -> list[str | None | EmailRejected]:
+        """Send ``{"to", "subject", "html", "idempotency_key"}`` messages.
+
+        Returns, in order, each message's provider id or the ``EmailRejected`` error for it.
+        Raising fails the whole batch, which is retried.
+        """
+
+
+def _extract_message_id(response: Any) -> str | None:
+    if isinstance(response, dict):
+        return str(response.get("id") or "") or str((response.get("data") or {}).get("id") or "") or None
+    return str(getattr(response, "id", "") or "") or None
+
+
+def _is_rejection(exc: Exception) -> bool:
+    from resend.exceptions import MissingRequiredFieldsError, ValidationError
+
+    return isinstance(exc, (ValidationError, MissingRequiredFieldsError))
+
+
+class ResendEmailProvider:
+    def send_batch(self, messages: list[dict[str, Any]]) -> list[str | None | EmailRejected]:
+        import resend
+
+        resend.api_key = RESEND_API_KEY
+        params = [
+            {
+                "from": RESEND_FROM_EMAIL,
+                "to": [message["to"]],
+                "subject": message["subject"],
+                "html": message["html"],
+            }
+            for message in messages
+        ]
+        with timed("email_send"):
+            if len(params) > 1:
+                batch_key = hashlib.sha256(
+                    "\n".join(sorted(message["idempotency_key"] for message in messages)).encode("utf-8")
+                ).hexdigest()
+                try:
+                    response = resend.Batch.send(params, {"idempotency_key": f"batch-{batch_key}"})
+                except Exception as exc:
+                    if not _is_rejection(exc):
+                        raise
+                    # One bad message fails the whole batch request; send them one by one instead.
+                    logger.warning("email_batch_rejected size=%s error=%s", len(params), exc)
+                else:
+                    data = response.get("data") if isinstance(response, dict) else getattr(response, "data", None)
+                    data = list(data or [])
+                    return [_extract_message_id(data[idx]) if idx < len(data) else None for idx in range(len(messages))]
+            return [self._send_one(resend, item, message["idempotency_key"]) for item, message in zip(params, messages)]
+
+    @staticmethod
+    def _send_one(resend: Any, params: dict[str, Any], idempotency_key: str) -> str | None | EmailRejected:
+        try:
+            response = resend.Emails.send(params, {"idempotency_key": idempotency_key})
+        except Exception as exc:
+            if not _is_rejection(exc):
+                raise
+            return EmailRejected(str(exc))
+        return _extract_message_id(response)
+
+
+_PROVIDER: EmailProvider | None = None
+
+
+def get_email_provider() -> EmailProvider:
+    global _PROVIDER
+    if _PROVIDER is None:
+        _PROVIDER = ResendEmailProvider()
+    return _PROVIDER
+
+
+def set_email_provider(provider: EmailProvider | None) -> None:
+    """Swap the delivery backend (tests use an in-memory fake)."""
+    global _PROVIDER
+    _PROVIDER = provider
+
+
+def send_email_now(*, to_email: str, subject: str, html: str, idempotency_key: str) -> str | None:
+    """Deliver a single email synchronously; returns the provider message id."""
+    message = {"to": to_email, "subject": subject, "html": html, "idempotency_key": idempotency_key}
+    result = get_email_provider().send_batch([message])[0]
+    if isinstance(result, EmailRejected):
+        raise result
+    return result
+
+
+def enqueue_email(
+    *,
+    idempotency_key: str,
+    kind: str,
+    to_email: str,
+    subject: str,
+    html: str,
+    stripe_event_id: str | None = None,
+) -> dict:
+    row, created = enqueue_email_outbox(
+        idempotency_key=idempotency_key,
+        kind=kind,
+        to_email=to_email,
+        subject=subject,
+        html=html,
+        stripe_event_id=stripe_event_id,
+    )
+    if created:
+        logger.info("email_outbox_enqueued outbox_id=%s kind=%s", row.get("id"), kind)
+        _count_email("enqueued")
+        _WAKEUP.set()
+    else:
+        logger.info(
+            "email_outbox_duplicate outbox_id=%s kind=%s status=%s",
+            row.get("id"),
+            kind,
+            row.get("status"),
+        )
+        _count_email("duplicate")
+    return row
+
+
+def _count_email(outcome: str, amount: int = 1) -> None:
+    inc_counter(
+        "blast_email_outbox_messages_total",
+        amount,
+        labels={"outcome": outcome},
+        description="Outbox emails by delivery outcome.",
+    )
+
+
+def _retry_delay_seconds(attempts: int) -> int:
+    exponent = max(0, int(attempts) - 1)
+    return int(min(EMAIL_OUTBOX_RETRY_MAX_SECONDS, EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** min(exponent, 20))))
+
+
+def process_outbox_batch(limit: int | None = None) -> int:
+    """Send one batch of due emails; returns how many were leased."""
+    claimed = claim_email_outbox_batch(limit or EMAIL_OUTBOX_BATCH_SIZE, lock_timeout_seconds=_LOCK_TIMEOUT_SECONDS)
+    if not claimed:
+        return 0
+    messages = [
+        {
+            "to": item["to_email"],
+            "subject": item["subject"],
+            "html": item["html"],
+            "idempotency_key": item["idempotency_key"],
+        }
+        for item in claimed
+    ]
+    try:
+        provider_ids = get_email_provider().send_batch(messages)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        attempts = max(int(item["attempts"]) for item in claimed)
+        retry_ids = [int(item["id"]) for item in claimed if int(item["attempts"]) < EMAIL_OUTBOX_MAX_ATTEMPTS]
+        dead_ids = [int(item["id"]) for item in claimed if int(item["attempts"]) >= EMAIL_OUTBOX_MAX_ATTEMPTS]
+        delay = _retry_delay_seconds(attempts)
+        mark_email_outbox_failed(retry_ids, error=error, next_attempt_at=int(time.time()) + delay)
+        mark_email_outbox_failed(dead_ids, error=error, next_attempt_at=None)
+        logger.warning(
+            "email_outbox_batch_failed size=%s retry=%s dead=%s delay_seconds=%s error=%s",
+            len(claimed),
+            len(retry_ids),
+            len(dead_ids),
+            delay,
+            error,
+        )
+        if retry_ids:
+            _count_email("retry", len(retry_ids))
+        if dead_ids:
+            _count_email("dead", len(dead_ids))
+        return len(claimed)
+
+    sent: list[tuple[int, str | None]] = []
+    for item, result in zip(claimed, provider_ids):
+        if isinstance(result, EmailRejected):
+            error = f"{type(result).__name__}: {result}"
+            mark_email_outbox_failed([int(item["id"])], error=error, next_attempt_at=None)
+            logger.warning("email_outbox_rejected outbox_id=%s error=%s", item["id"], error)
+            _count_email("rejected")
+        else:
+            sent.append((int(item["id"]), result))
+    mark_email_outbox_sent(sent)
+    logger.info("email_outbox_batch_sent size=%s rejected=%s", len(sent), len(claimed) - len(sent))
+    if sent:
+        _count_email("sent", len(sent))
+    return len(claimed)
+
+
+def _sender_loop() -> None:
+    while not _STOP.is_set():
+        _WAKEUP.clear()
+        try:
+            processed = process_outbox_batch()
+        except Exception:
+            logger.exception("email_outbox_sender_error")
+            processed = 0
+        if not processed:
+            _WAKEUP.wait(EMAIL_OUTBOX_POLL_SECONDS)
+
+
+def start_email_sender() -> None:
+    global _WORKER
+    if not EMAIL_OUTBOX_ENABLED:
+        return
+    with _WORKER_LOCK:
+        if _WORKER is not None:
+            return
+        _STOP.clear()
+        _WORKER = threading.Thread(target=_sender_loop, name="email-outbox-sender", daemon=True)
+        _WORKER.start()
+    logger.info("email_outbox_sender_started batch_size=%s", EMAIL_OUTBOX_BATCH_SIZE)
+
+
+def stop_email_sender(timeout: float = 5.0) -> None:
+    global _WORKER
+    with _WORKER_LOCK:
+        worker, _WORKER = _WORKER, None
+    if worker is None:
+        return
+    _STOP.set()
+    _WAKEUP.set()
+    worker.join(timeout)
+
+
+register_gauge_callback(
+    "blast_email_outbox_lag_seconds",
+    lambda: get_email_outbox_stats()["lag_seconds"],
+    "Age of the oldest unsent outbox email.",
+)
+register_gauge_callback(
+    "blast_email_outbox_depth",
+    lambda: {
+        (("status", status),): count for status, count in get_email_outbox_stats().items() if status != "lag_seconds"
+    },
+    "Outbox emails by status.",
+)
@@ -2,32 +2,22 @@
 Email service using Resend for transactional emails.
 """
 
+import hashlib
 import logging
+import uuid
 from typing import Any
 
-from app.config import APP_BASE_URL, PASSWORD_RESET_TOKEN_TTL_MINUTES, RESEND_API_KEY, RESEND_FROM_EMAIL
+from app.config import APP_BASE_URL, EMAIL_OUTBOX_ENABLED, PASSWORD_RESET_TOKEN_TTL_MINUTES, RESEND_API_KEY
+from app.services.email_outbox_service import enqueue_email, send_email_now
 
 logger = logging.getLogger(__name__)
 
 
-def send_password_reset_email(to_email: str, reset_link: str) -> bool:
-    """
-    Send password reset email via Resend.
-    Returns True if sent successfully, False otherwise.
-    """
-    if not RESEND_API_KEY:
-        logger.warning("RESEND_API_KEY not configured; skipping password reset email")
-        return False
+def build_password_reset_email_content(reset_link: str) -> dict[str, str]:
+    subject = "Redefina sua senha"
+    expires_min = PASSWORD_RESET_TOKEN_TTL_MINUTES
 
-    try:
-        import resend
-
-        resend.api_key = RESEND_API_KEY
-
-        subject = "Redefina sua senha"
-        expires_min = PASSWORD_RESET_TOKEN_TTL_MINUTES
-
-        html = f"""
+    html = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -48,15 +38,37 @@ def send_password_reset_email(to_email: str, reset_link: str) -> bool:
 </body>
 </html>
 """
+    return {"subject": subject, "html": html}
 
-        params: dict[str, Any] = {
-            "from": RESEND_FROM_EMAIL,
-            "to": [to_email.strip().lower()],
-            "subject": subject,
-            "html": html,
-        }
 
-        resend.Emails.send(params)
+def send_password_reset_email(to_email: str, reset_link: str) -> bool:
+    """
+    Send password reset email via Resend (queued in the outbox when enabled).
+    Returns True if sent or queued successfully, False otherwise.
+    """
+    if not RESEND_API_KEY:
+        logger.warning("RESEND_API_KEY not configured; skipping password reset email")
+        return False
+
+    content = build_password_reset_email_content(reset_link)
+    idempotency_key = "password_reset:" + hashlib.sha256(reset_link.encode("utf-8")).hexdigest()
+    try:
+        if EMAIL_OUTBOX_ENABLED:
+            enqueue_email(
+                idempotency_key=idempotency_key,
+                kind="password_reset",
+                to_email=to_email.strip().lower(),
+                subject=content["subject"],
+                html=content["html"],
+            )
+            logger.info("password_reset_email_queued to=%s", to_email)
+            return True
+        send_email_now(
+            to_email=to_email.strip().lower(),
+            subject=content["subject"],
+            html=content["html"],
+            idempotency_key=idempotency_key,
+        )
         logger.info("password_reset_email_sent to=%s", to_email)
         return True
     except Exception as exc:
@@ -123,10 +135,14 @@ def send_purchase_confirmation_email(
     login_email: str,
     login_url: str | None = None,
     password_created_at_checkout: bool,
+    stripe_event_id: str | None = None,
+    idempotency_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Send purchase confirmation email via Resend.
-    Returns a structured result with provider metadata for audit trail.
+    Returns a structured result with provider metadata for audit trail. With the outbox
+    enabled the email is queued (``queued=True``) and the provider id is recorded on the
+    ``stripe_event_id`` row of purchase_email_events once delivered.
     """
     if not RESEND_API_KEY:
         logger.warning("RESEND_API_KEY not configured; skipping purchase confirmation email")
@@ -140,27 +156,27 @@ def send_purchase_confirmation_email(
         password_created_at_checkout=password_created_at_checkout,
     )
 
+    clean_to_email = to_email.strip().lower()
+    resolved_idempotency_key = idempotency_key or f"purchase_confirmation:{uuid.uuid4().hex}"
     try:
-        import resend
-
-        resend.api_key = RESEND_API_KEY
-        params: dict[str, Any] = {
-            "from": RESEND_FROM_EMAIL,
-            "to": [to_email.strip().lower()],
-            "subject": content["subject"],
-            "html": content["html"],
-        }
-        response = resend.Emails.send(params)
-        provider_message_id: str | None = None
-        if isinstance(response, dict):
-            provider_message_id = (
-                str(response.get("id") or "")
-                or str((response.get("data") or {}).get("id") or "")
-                or None
+        if EMAIL_OUTBOX_ENABLED:
+            row = enqueue_email(
+                idempotency_key=resolved_idempotency_key,
+                kind="purchase_confirmation",
+                to_email=clean_to_email,
+                subject=content["subject"],
+                html=content["html"],
+                stripe_event_id=stripe_event_id,
             )
-        else:
-            provider_message_id = str(getattr(response, "id", "") or "") or None
-
+            logger.info("purchase_confirmation_email_queued to=%s outbox_id=%s", to_email, row.get("id"))
+            return {"sent": False, "queued": True, "outbox_id": row.get("id"), "provider_message_id": None, "error": None}
+
+        provider_message_id = send_email_now(
+            to_email=clean_to_email,
+            subject=content["subject"],
+            html=content["html"],
+            idempotency_key=resolved_idempotency_key,
+        )
         logger.info(
             "purchase_confirmation_email_sent to=%s provider_message_id=%s",
             to_email,
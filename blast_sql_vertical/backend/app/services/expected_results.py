@@ -0,0 +1,105 @@
+"""
+Solution results precomputed by ``tools/check_solutions.py``.
+
+``expected_results.json`` maps an exercise key (``lesson:<lesson_id>:<index>`` or
+``playground:<dataset_id>:<challenge_id>``) to its solution's columns plus either the
+normalized rows (small results) or fingerprints of them. Every entry records the
+SHA-256 of the solution it was computed from and the file records the SHA-256 of
+``seed.sql``. Entries that no longer match are ignored, so the validator falls back
+to running the solution. Solutions that read the clock or randomness are never
+snapshotted (see ``is_snapshot_safe``).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from app.config import CONTENT_DIR, EXPECTED_RESULTS_ENABLED, EXPECTED_RESULTS_PATH
+from app.services.metrics_service import inc_counter
+from app.services.sql_engine import _VOLATILE_SQL
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+_LOCK = threading.Lock()
+_ENTRIES: dict[str, dict] | None = None
+
+
+def lesson_key(lesson_id: str, challenge_index: int) -> str:
+    return f"lesson:{lesson_id}:{challenge_index}"
+
+
+def playground_key(dataset_id: str, challenge_id: str) -> str:
+    return f"playground:{dataset_id}:{challenge_id}"
+
+
+def query_digest(query: str) -> str:
+    return hashlib.sha256(query.strip().encode("utf-8")).hexdigest()
+
+
+def seed_digest(content_dir: Path | None = None) -> str:
+    path = Path(content_dir or CONTENT_DIR) / "seed.sql"
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def is_snapshot_safe(solution_query: str) -> bool:
+    """False for solutions whose result drifts (``CURRENT_DATE``, ``now()``, ``random()``...)."""
+    return not _VOLATILE_SQL.search(solution_query)
+
+
+def load_expected_results(path: Path | None = None) -> dict[str, dict]:
+    """Read the artifact; returns no entries when it is missing, unreadable or built from another seed."""
+    path = Path(path or EXPECTED_RESULTS_PATH)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable expected results file %s (%s)", path, exc)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+        logger.warning("Ignoring expected results file %s: unsupported format.", path)
+        return {}
+    if data.get("seed") != seed_digest():
+        logger.warning("Ignoring expected results file %s: built from a different seed.sql.", path)
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def get_expected_result(key: str, solution_query: str) -> dict | None:
+    """Precomputed entry for ``key`` if it was built from exactly ``solution_query``."""
+    global _ENTRIES
+    if not EXPECTED_RESULTS_ENABLED:
+        return None
+    entries = _ENTRIES
+    if entries is None:
+        with _LOCK:
+            if _ENTRIES is None:
+                _ENTRIES = load_expected_results()
+                logger.info("Expected results ready: %s entries.", len(_ENTRIES))
+            entries = _ENTRIES
+    entry = entries.get(key)
+    hit = (
+        isinstance(entry, dict)
+        and entry.get("query") == query_digest(solution_query)
+        and is_snapshot_safe(solution_query)
+    )
+    inc_counter(
+        "blast_expected_results_lookups_total",
+        labels={"outcome": "hit" if hit else "miss"},
+        description="Validations answered from precomputed solution results.",
+    )
+    return entry if hit else None
+
+
+def reset_expected_results() -> None:
+    """Forget the loaded artifact so the next lookup reads it again."""
+    global _ENTRIES
+    with _LOCK:
+        _ENTRIES = None
@@ -0,0 +1,325 @@
+"""
+Lightweight in-process request/stage timing and Prometheus-style metrics.
+
+Stages are timed with ``timed("stage")`` (context manager) or ``@instrument("stage")``
+(decorator). Timings only run for sampled requests (``METRICS_SAMPLE_RATE``); when a
+request is not sampled the stage helpers return immediately.
+"""
+
+import functools
+import inspect
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from app.config import METRICS_ENABLED, METRICS_SAMPLE_RATE, SERVER_TIMING_ENABLED
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_LOCK = threading.Lock()
+_HISTOGRAMS: dict[tuple[str, tuple[tuple[str, str], ...]], "_Histogram"] = {}
+_COUNTERS: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+_GAUGES: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+_GAUGE_CALLBACKS: dict[str, Callable[[], float | dict[tuple[tuple[str, str], ...], float]]] = {}
+_HELP: dict[str, tuple[str, str]] = {
+    "blast_http_request_duration_seconds": ("histogram", "HTTP request latency by route."),
+    "blast_stage_duration_seconds": ("histogram", "Latency of instrumented backend stages."),
+}
+
+# Per-request stage accumulator: {stage: [total_seconds, calls]}. ``None`` outside a
+# sampled request.
+_REQUEST_STAGES: ContextVar[dict[str, list[float]] | None] = ContextVar("blast_request_stages", default=None)
+# Sampling decision of the current request; ``None`` outside the HTTP middleware.
+_REQUEST_SAMPLED: ContextVar[bool | None] = ContextVar("blast_request_sampled", default=None)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[idx] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+def _label_key(labels: dict[str, Any] | None) -> tuple[tuple[str, str], ...]:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _should_sample() -> bool:
+    if not METRICS_ENABLED or METRICS_SAMPLE_RATE <= 0:
+        return False
+    return METRICS_SAMPLE_RATE >= 1 or random.random() < METRICS_SAMPLE_RATE
+
+
+def observe_histogram(name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+    key = (name, _label_key(labels))
+    with _LOCK:
+        hist = _HISTOGRAMS.get(key)
+        if hist is None:
+            hist = _HISTOGRAMS[key] = _Histogram()
+        hist.observe(max(0.0, float(value)))
+
+
+def inc_counter(name: str, amount: float = 1.0, labels: dict[str, Any] | None = None, description: str = "") -> None:
+    if not METRICS_ENABLED:
+        return
+    key = (name, _label_key(labels))
+    with _LOCK:
+        if description and name not in _HELP:
+            _HELP[name] = ("counter", description)
+        _COUNTERS[key] = _COUNTERS.get(key, 0.0) + amount
+
+
+def set_gauge(name: str, value: float, labels: dict[str, Any] | None = None, description: str = "") -> None:
+    if not METRICS_ENABLED:
+        return
+    key = (name, _label_key(labels))
+    with _LOCK:
+        if description and name not in _HELP:
+            _HELP[name] = ("gauge", description)
+        _GAUGES[key] = float(value)
+
+
+def register_gauge_callback(
+    name: str,
+    callback: Callable[[], float | dict[tuple[tuple[str, str], ...], float]],
+    description: str = "",
+) -> None:
+    """Register a gauge evaluated lazily when ``/metrics`` is scraped."""
+    with _LOCK:
+        _HELP[name] = ("gauge", description or name)
+        _GAUGE_CALLBACKS[name] = callback
+
+
+def record_stage(stage: str, elapsed: float) -> None:
+    observe_histogram("blast_stage_duration_seconds", elapsed, {"stage": stage})
+    stages = _REQUEST_STAGES.get()
+    if stages is not None:
+        entry = stages.get(stage)
+        if entry is None:
+            stages[stage] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def _stage_sampled() -> bool:
+    if not METRICS_ENABLED:
+        return False
+    if _REQUEST_STAGES.get() is not None:
+        return True
+    # Outside a sampled request (startup, background workers, unsampled requests).
+    return _REQUEST_SAMPLED.get() is None and _should_sample()
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    if not _stage_sampled():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def instrument(stage: str) -> Callable:
+    """Decorator form of ``timed`` for sync and async callables."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def format_server_timing(stages: dict[str, list[float]], total_seconds: float) -> str:
+    parts = [f"total;dur={total_seconds * 1000:.2f}"]
+    for stage, (elapsed, calls) in stages.items():
+        name = "".join(ch if ch.isalnum() or ch in "_-." else "_" for ch in stage)
+        parts.append(f'{name};dur={elapsed * 1000:.2f};desc="{int(calls)}x"')
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and emitting ``Server-Timing``."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._route_paths: dict[Any, str] = {}
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            app = scope.get("app")
+            for route in getattr(app, "routes", []) or []:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = getattr(route, "path", None)
+                    break
+            path = path or getattr(endpoint, "__name__", "unknown")
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        sampled = _should_sample()
+        stages: dict[str, list[float]] | None = {} if sampled else None
+        stages_token = _REQUEST_STAGES.set(stages)
+        sampled_token = _REQUEST_SAMPLED.set(sampled)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = int(message.get("status", 500))
+                if stages is not None and SERVER_TIMING_ENABLED:
+                    header = format_server_timing(stages, time.perf_counter() - started)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", header.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _REQUEST_STAGES.reset(stages_token)
+            _REQUEST_SAMPLED.reset(sampled_token)
+            observe_histogram(
+                "blast_http_request_duration_seconds",
+                time.perf_counter() - started,
+                {
+                    "method": scope.get("method", ""),
+                    "route": self._route_label(scope),
+                    "status": f"{status_code // 100}xx",
+                },
+            )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in items) + "}"
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus() -> str:
+    with _LOCK:
+        histograms = {key: (list(h.counts), h.total, h.count) for key, h in _HISTOGRAMS.items()}
+        counters = dict(_COUNTERS)
+        gauges = dict(_GAUGES)
+        callbacks = dict(_GAUGE_CALLBACKS)
+        help_text = dict(_HELP)
+
+    for name, callback in callbacks.items():
+        try:
+            value = callback()
+        except Exception:
+            continue
+        if isinstance(value, dict):
+            for labels, item in value.items():
+                gauges[(name, labels)] = float(item)
+        elif value is not None:
+            gauges[(name, ())] = float(value)
+
+    lines: list[str] = []
+    emitted: set[str] = set()
+
+    def header(name: str, default_type: str) -> None:
+        if name in emitted:
+            return
+        emitted.add(name)
+        kind, text = help_text.get(name, (default_type, name))
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), (counts, total, count) in sorted(histograms.items()):
+        header(name, "histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', _format_number(bound)),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+
+    for (name, labels), value in sorted(gauges.items()):
+        header(name, "gauge")
+        lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Clear collected samples (tests and benchmarks)."""
+    with _LOCK:
+        _HISTOGRAMS.clear()
+        _COUNTERS.clear()
+        _GAUGES.clear()
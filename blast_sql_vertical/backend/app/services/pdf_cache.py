@@ -0,0 +1,144 @@
+"""
+Content-addressed on-disk cache for rendered PDFs.
+
+Entries are keyed by a SHA-256 of the exact HTML (plus render options) handed to the
+renderer, so any change to the inputs produces a new key and stale entries simply age
+out. Total size is bounded by ``PDF_CACHE_MAX_BYTES``; the least recently used files
+are evicted first (hits refresh the file mtime).
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from app.config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+from app.services.metrics_service import inc_counter, register_gauge_callback
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".pdf"
+
+
+class PdfDiskCache:
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    @staticmethod
+    def key_for(html: str, *, landscape: bool = False, variant: str = "") -> str:
+        digest = hashlib.sha256()
+        digest.update(b"landscape\0" if landscape else b"portrait\0")
+        digest.update(variant.encode("utf-8") + b"\0")
+        digest.update(html.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _load_index_locked(self) -> OrderedDict[str, int]:
+        if self._index is not None:
+            return self._index
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries: list[tuple[float, str, int]] = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _count(self, outcome: str) -> None:
+        self.stats[outcome] += 1
+        inc_counter(
+            "blast_pdf_cache_requests_total",
+            labels={"outcome": outcome},
+            description="Rendered PDF disk cache lookups by outcome.",
+        )
+
+    def get(self, key: str) -> bytes | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            index = self._load_index_locked()
+            if key not in index:
+                self._count("misses")
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                self._total_bytes -= index.pop(key)
+                self._count("misses")
+                return None
+            index.move_to_end(key)
+            self._count("hits")
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            index = self._load_index_locked()
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, self._path(key))
+            except OSError:
+                logger.exception("pdf_cache_write_failed key=%s", key)
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                return
+            self._total_bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            self._evict_locked(index)
+
+    def _evict_locked(self, index: OrderedDict[str, int]) -> None:
+        while self._total_bytes > self.max_bytes and index:
+            key, size = index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception("pdf_cache_evict_failed key=%s", key)
+            self.stats["evictions"] += 1
+            inc_counter("blast_pdf_cache_evictions_total", description="Rendered PDFs evicted from the disk cache.")
+
+
+_CACHE = PdfDiskCache(PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES)
+
+
+def get_pdf_cache() -> PdfDiskCache:
+    return _CACHE
+
+
+register_gauge_callback(
+    "blast_pdf_cache_bytes",
+    lambda: float(_CACHE.total_bytes),
+    "Bytes held by the rendered PDF disk cache.",
+)
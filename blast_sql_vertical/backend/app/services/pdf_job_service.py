@@ -0,0 +1,306 @@
+"""
+Background PDF render jobs for client-built reports.
+
+The synchronous ``/reports/*/pdf`` endpoints hold the request open while Chromium
+renders (up to ``PDF_RENDER_TIMEOUT_MS``), which is long enough to trip proxy timeouts.
+Here the client submits the HTML, gets a job id back right away, polls the status and
+downloads the finished PDF.
+
+A fixed set of ``PDF_JOB_WORKERS`` asyncio tasks drains an in-process queue, so job
+renders never outnumber the page pool; submissions beyond ``PDF_JOB_MAX_PENDING``
+queued/running jobs are rejected. Identical payloads from the same user share one job
+(SHA-256 of kind + HTML). Finished PDFs live under ``PDF_JOB_DIR`` and are deleted,
+together with their job record, ``PDF_JOB_TTL_SECONDS`` after completion; files left
+behind by a previous process are swept the same way.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.config import PDF_JOB_DIR, PDF_JOB_MAX_PENDING, PDF_JOB_TTL_SECONDS, PDF_JOB_WORKERS
+from app.services.metrics_service import inc_counter, register_gauge_callback
+from app.services.pdf_service import (
+    PdfServiceError,
+    render_pdf_from_html,
+    safe_pdf_filename,
+    sanitize_html_for_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+# kind -> (landscape, default filename)
+PDF_JOB_KINDS: dict[str, tuple[bool, str]] = {
+    "master-challenge": (False, "Blast_EstudoDeCaso"),
+    "cheatsheet": (True, "Blast_SQL_Cheatsheet"),
+}
+_SWEEP_INTERVAL_SECONDS = 30.0
+
+
+def _count_job(outcome: str) -> None:
+    inc_counter(
+        "blast_pdf_jobs_total",
+        labels={"outcome": outcome},
+        description="Background PDF render jobs by outcome.",
+    )
+
+
+def _write_atomic(directory: Path, path: Path, data: bytes) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class _PdfJob:
+    __slots__ = (
+        "id",
+        "owner_id",
+        "payload_key",
+        "kind",
+        "filename",
+        "html",
+        "status",
+        "error",
+        "size_bytes",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def __init__(self, *, owner_id: int, payload_key: str, kind: str, filename: str, html: str) -> None:
+        self.id = secrets.token_urlsafe(16)
+        self.owner_id = owner_id
+        self.payload_key = payload_key
+        self.kind = kind
+        self.filename = filename
+        self.html: str | None = html
+        self.status = "queued"
+        self.error: str | None = None
+        self.size_bytes: int | None = None
+        self.created_at = int(time.time())
+        self.started_at: int | None = None
+        self.finished_at: int | None = None
+
+
+class PdfJobManager:
+    """In-process job queue with bounded workers, payload dedup and TTL cleanup."""
+
+    def __init__(self, directory: Path, *, workers: int, max_pending: int, ttl_seconds: int) -> None:
+        self.directory = Path(directory)
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self._jobs: dict[str, _PdfJob] = {}
+        self._by_payload: dict[str, str] = {}
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._last_sweep = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in {"queued", "running"})
+
+    def _artifact(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.pdf"
+
+    def _serialize(self, job: _PdfJob, *, deduplicated: bool = False) -> dict[str, Any]:
+        expires_at = job.finished_at + self.ttl_seconds if job.finished_at is not None else None
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "filename": job.filename,
+            "error": job.error,
+            "size_bytes": job.size_bytes,
+            "deduplicated": deduplicated,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "expires_at": expires_at,
+            "download_url": f"/reports/pdf-jobs/{job.id}/download" if job.status == "succeeded" else None,
+        }
+
+    def submit(self, *, owner_id: int, kind: str, html: str, filename: str | None = None) -> dict[str, Any]:
+        if kind not in PDF_JOB_KINDS:
+            raise HTTPException(status_code=400, detail=f"Unknown PDF job kind: {kind}")
+        try:
+            clean_html = sanitize_html_for_pdf(html)
+        except PdfServiceError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        self.sweep()
+
+        digest = hashlib.sha256(f"{owner_id}\0{kind}\0".encode("utf-8"))
+        digest.update(clean_html.encode("utf-8"))
+        payload_key = digest.hexdigest()
+        existing = self._jobs.get(self._by_payload.get(payload_key, ""))
+        if existing is not None and existing.status != "failed":
+            _count_job("deduplicated")
+            return self._serialize(existing, deduplicated=True)
+
+        if self.pending >= self.max_pending:
+            _count_job("rejected")
+            raise HTTPException(status_code=503, detail="PDF render queue is full. Try again shortly.")
+
+        _, default_name = PDF_JOB_KINDS[kind]
+        job = _PdfJob(
+            owner_id=owner_id,
+            payload_key=payload_key,
+            kind=kind,
+            filename=safe_pdf_filename(filename or default_name),
+            html=clean_html,
+        )
+        self._jobs[job.id] = job
+        self._by_payload[payload_key] = job.id
+        self._ensure_workers()
+        self._queue.put_nowait(job.id)
+        _count_job("submitted")
+        logger.info("pdf_job_submitted job_id=%s kind=%s owner_id=%s", job.id, kind, owner_id)
+        return self._serialize(job)
+
+    def _owned_job(self, job_id: str, owner_id: int) -> _PdfJob:
+        self.sweep()
+        job = self._jobs.get(job_id)
+        if job is None or job.owner_id != owner_id:
+            raise HTTPException(status_code=404, detail="PDF job not found")
+        return job
+
+    def status(self, job_id: str, *, owner_id: int) -> dict[str, Any]:
+        return self._serialize(self._owned_job(job_id, owner_id))
+
+    def artifact(self, job_id: str, *, owner_id: int) -> tuple[Path, str]:
+        """Path and download filename of a finished job's PDF."""
+        job = self._owned_job(job_id, owner_id)
+        if job.status != "succeeded":
+            raise HTTPException(status_code=409, detail=f"PDF job is {job.status}")
+        path = self._artifact(job.id)
+        if not path.is_file():
+            raise HTTPException(status_code=404, detail="PDF job not found")
+        return path, job.filename
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"pdf-job-worker-{len(self._tasks)}"))
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == "queued":
+                    await self._run(job)
+                self.sweep()
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: _PdfJob) -> None:
+        landscape, _ = PDF_JOB_KINDS[job.kind]
+        job.status = "running"
+        job.started_at = int(time.time())
+        try:
+            pdf_bytes = await render_pdf_from_html(job.html or "", landscape=landscape)
+            await asyncio.to_thread(_write_atomic, self.directory, self._artifact(job.id), pdf_bytes)
+            job.size_bytes = len(pdf_bytes)
+            job.status = "succeeded"
+        except PdfServiceError as exc:
+            job.status, job.error = "failed", str(exc)
+        except Exception:
+            logger.exception("pdf_job_failed job_id=%s", job.id)
+            job.status, job.error = "failed", "Failed to render PDF from HTML payload"
+        finally:
+            job.html = None
+            job.finished_at = int(time.time())
+        _count_job(job.status)
+        logger.info(
+            "pdf_job_finished job_id=%s status=%s seconds=%s",
+            job.id,
+            job.status,
+            job.finished_at - job.created_at,
+        )
+
+    def sweep(self, *, force: bool = False) -> int:
+        """Drop jobs and files older than the TTL; returns how many artifacts were removed."""
+        now = time.time()
+        if not force and now - self._last_sweep < _SWEEP_INTERVAL_SECONDS:
+            return 0
+        self._last_sweep = now
+        for job in list(self._jobs.values()):
+            if job.finished_at is not None and now - job.finished_at >= self.ttl_seconds:
+                del self._jobs[job.id]
+                if self._by_payload.get(job.payload_key) == job.id:
+                    del self._by_payload[job.payload_key]
+        removed = 0
+        if not self.directory.is_dir():
+            return removed
+        for path in self.directory.iterdir():
+            if path.suffix not in {".pdf", ".tmp"} or path.stem in self._jobs:
+                continue
+            try:
+                if path.suffix == ".pdf" or now - path.stat().st_mtime >= self.ttl_seconds:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception("pdf_job_cleanup_failed path=%s", path)
+        return removed
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if job.status in {"queued", "running"}:
+                job.status, job.error, job.html = "failed", "Server shutting down", None
+                job.finished_at = int(time.time())
+        self._queue = None
+
+
+_PDF_JOBS = PdfJobManager(
+    PDF_JOB_DIR,
+    workers=PDF_JOB_WORKERS,
+    max_pending=PDF_JOB_MAX_PENDING,
+    ttl_seconds=PDF_JOB_TTL_SECONDS,
+)
+
+
+def get_pdf_job_manager() -> PdfJobManager:
+    return _PDF_JOBS
+
+
+async def shutdown_pdf_jobs() -> None:
+    await _PDF_JOBS.close()
+
+
+register_gauge_callback(
+    "blast_pdf_jobs",
+    lambda: {
+        (("state", "queued"),): float(_PDF_JOBS.count("queued")),
+        (("state", "running"),): float(_PDF_JOBS.count("running")),
+    },
+    "Background PDF render jobs by state.",
+)
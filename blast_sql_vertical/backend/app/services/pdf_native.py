@@ -0,0 +1,565 @@
+"""
+Browser-free PDF renderer for the fixed-layout templates the backend owns.
+
+Chromium is only needed for arbitrary HTML. The certificate has a fixed layout, so it is
+drawn directly with PDF operators, the standard Type 1 fonts (WinAnsi encoding) and
+logos decoded from PNG once and reused across renders. Layout code works in CSS px on
+a 794x1123 page (A4 at 96 dpi, origin top-left), mirroring the certificate stylesheet in
+``account_service``, and converts to PDF points when emitting operators.
+"""
+
+import hashlib
+import struct
+import threading
+import unicodedata
+import zlib
+from typing import Any, Callable
+
+PAGE_WIDTH_PX = 794
+PAGE_HEIGHT_PX = 1123
+_PAGE_WIDTH_PT = 595.28
+_PAGE_HEIGHT_PT = 841.89
+_PX_TO_PT = 0.75
+# Logos are displayed at most ~320 CSS px wide; larger sources are downsampled to this.
+_MAX_IMAGE_PX = 640
+
+
+class NativePdfError(ValueError):
+    """The input cannot be rendered faithfully without a browser (e.g. unsupported glyphs)."""
+
+
+# ── Standard 14 font metrics (AFM advance widths for ASCII 32..126, 1/1000 em) ──
+
+def _ascii_widths(spec: str) -> dict[str, int]:
+    values = [int(value) for value in spec.split()]
+    return {chr(32 + offset): width for offset, width in enumerate(values)}
+
+
+_HELVETICA = _ascii_widths(
+    "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 "
+    "556 556 556 556 556 556 556 556 556 556 278 278 584 584 584 556 1015 "
+    "667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 611 722 667 944 667 667 611 "
+    "278 278 278 469 556 333 "
+    "556 556 500 556 556 278 556 556 222 222 500 222 833 556 556 556 556 333 500 278 556 500 722 500 500 500 "
+    "334 260 334 584"
+)
+_HELVETICA_BOLD = _ascii_widths(
+    "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 "
+    "556 556 556 556 556 556 556 556 556 556 333 333 584 584 584 611 975 "
+    "722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 667 611 722 667 944 667 667 611 "
+    "333 278 333 584 556 333 "
+    "556 611 556 611 556 333 611 611 278 278 556 278 889 611 611 611 611 389 556 333 611 556 778 556 556 500 "
+    "389 280 389 584"
+)
+_TIMES_ROMAN = _ascii_widths(
+    "250 333 408 500 500 833 778 180 333 333 500 564 250 333 250 278 "
+    "500 500 500 500 500 500 500 500 500 500 278 278 564 564 564 444 921 "
+    "722 667 667 722 611 556 722 722 333 389 722 611 889 722 722 556 722 667 556 611 722 722 944 722 722 611 "
+    "333 278 333 469 500 333 "
+    "444 500 444 500 444 333 500 500 278 278 500 278 778 500 500 500 500 333 389 278 500 500 722 500 500 444 "
+    "480 200 480 541"
+)
+
+
+class _Font:
+    __slots__ = ("resource", "base_font", "widths", "ascent", "descent")
+
+    def __init__(self, resource: str, base_font: str, widths: dict[str, int], ascent: float, descent: float) -> None:
+        self.resource = resource
+        self.base_font = base_font
+        self.widths = widths
+        # Ascent/descent of the browser font the stylesheet resolves to, used to place
+        # baselines inside CSS line boxes.
+        self.ascent = ascent
+        self.descent = descent
+
+    def char_width(self, char: str) -> int:
+        width = self.widths.get(char)
+        if width is None:
+            base = unicodedata.normalize("NFD", char)[:1]
+            width = self.widths.get(base, self.widths["o"])
+        return width
+
+    def text_width(self, text: str, size: float, letter_spacing: float = 0.0) -> float:
+        return sum(self.char_width(char) for char in text) * size / 1000.0 + letter_spacing * len(text)
+
+
+_SANS = _Font("F1", "Helvetica", _HELVETICA, 0.905, 0.212)
+_SANS_BOLD = _Font("F2", "Helvetica-Bold", _HELVETICA_BOLD, 0.905, 0.212)
+_SANS_ITALIC = _Font("F3", "Helvetica-Oblique", _HELVETICA, 0.905, 0.212)
+_SERIF = _Font("F4", "Times-Roman", _TIMES_ROMAN, 0.917, 0.219)
+_FONTS = (_SANS, _SANS_BOLD, _SANS_ITALIC, _SERIF)
+
+
+def _winansi(text: str) -> bytes:
+    normalized = unicodedata.normalize("NFC", text)
+    try:
+        return normalized.encode("cp1252")
+    except UnicodeEncodeError as exc:
+        raise NativePdfError(f"Text has characters outside WinAnsi: {normalized[exc.start:exc.end]!r}") from exc
+
+
+def _pdf_string(text: str) -> str:
+    out = []
+    for byte in _winansi(text):
+        if byte in (0x28, 0x29, 0x5C):
+            out.append("\\" + chr(byte))
+        elif 32 <= byte < 127:
+            out.append(chr(byte))
+        else:
+            out.append(f"\\{byte:03o}")
+    return "(" + "".join(out) + ")"
+
+
+# ── PNG decoding (8-bit, non-interlaced) ──
+
+class _SwarMasks:
+    """Masks for byte-lane arithmetic on a whole scanline packed into one int."""
+
+    __slots__ = ("low7", "high", "full")
+
+    def __init__(self, length: int) -> None:
+        self.low7 = int.from_bytes(b"\x7f" * length, "little")
+        self.high = int.from_bytes(b"\x80" * length, "little")
+        self.full = (1 << (8 * length)) - 1
+
+    def add(self, a: int, b: int) -> int:
+        # Per-byte (a + b) mod 256 without carries leaking into the neighbouring byte.
+        return ((a & self.low7) + (b & self.low7)) ^ ((a ^ b) & self.high)
+
+
+def _unfilter_scanlines(raw: bytes, stride: int, height: int, bpp: int) -> bytes:
+    out = bytearray(stride * height)
+    masks = _SwarMasks(stride)
+    prev = bytes(stride)
+    pos = 0
+    for row in range(height):
+        filter_type = raw[pos]
+        line = raw[pos + 1 : pos + 1 + stride]
+        pos += stride + 1
+        if filter_type == 0:
+            cur = line
+        elif filter_type == 1:
+            # Sub is a running sum with step ``bpp``: log-step prefix sum over byte lanes.
+            acc = int.from_bytes(line, "little")
+            shift = 8 * bpp
+            while shift < 8 * stride:
+                acc = masks.add(acc, (acc << shift) & masks.full)
+                shift *= 2
+            cur = acc.to_bytes(stride, "little")
+        elif filter_type == 2:
+            cur = masks.add(int.from_bytes(line, "little"), int.from_bytes(prev, "little")).to_bytes(stride, "little")
+        elif filter_type == 3:
+            buf = bytearray(line)
+            for i in range(stride):
+                left = buf[i - bpp] if i >= bpp else 0
+                buf[i] = (buf[i] + ((left + prev[i]) >> 1)) & 0xFF
+            cur = bytes(buf)
+        elif filter_type == 4:
+            buf = bytearray(line)
+            for i in range(stride):
+                a = buf[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                buf[i] = (buf[i] + predictor) & 0xFF
+            cur = bytes(buf)
+        else:
+            raise NativePdfError(f"Invalid PNG filter type {filter_type}")
+        out[row * stride : (row + 1) * stride] = cur
+        prev = cur
+    return bytes(out)
+
+
+def _split_channels(pixels: bytes, channels: int, keep: range) -> bytes:
+    if len(keep) == channels:
+        return pixels
+    out = bytearray(len(pixels) // channels * len(keep))
+    for target, source in enumerate(keep):
+        out[target :: len(keep)] = pixels[source::channels]
+    return bytes(out)
+
+
+def _downsample(pixels: bytes, width: int, height: int, channels: int, factor: int) -> tuple[bytes, int, int]:
+    if factor <= 1:
+        return pixels, width, height
+    stride = width * channels
+    new_width = (width + factor - 1) // factor
+    new_height = (height + factor - 1) // factor
+    out = bytearray(new_width * new_height * channels)
+    new_stride = new_width * channels
+    for row_out, row in enumerate(range(0, height, factor)):
+        line = pixels[row * stride : (row + 1) * stride]
+        start = row_out * new_stride
+        for channel in range(channels):
+            out[start + channel : start + new_stride : channels] = line[channel :: factor * channels]
+    return bytes(out), new_width, new_height
+
+
+class _Image:
+    __slots__ = ("width", "height", "color_space", "data", "alpha")
+
+    def __init__(self, width: int, height: int, color_space: str, data: bytes, alpha: bytes | None) -> None:
+        self.width = width
+        self.height = height
+        self.color_space = color_space
+        self.data = data
+        self.alpha = alpha
+
+
+def _decode_png(data: bytes) -> _Image:
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise NativePdfError("Not a PNG image")
+    pos = 8
+    header = None
+    idat = []
+    while pos + 8 <= len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise NativePdfError("PNG has no IHDR chunk")
+    width, height, bit_depth, color_type, _, _, interlace = header
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if bit_depth != 8 or interlace or channels is None:
+        raise NativePdfError("Only 8-bit non-interlaced grey/RGB(A) PNGs are supported")
+
+    pixels = _unfilter_scanlines(zlib.decompress(b"".join(idat)), width * channels, height, channels)
+    pixels, width, height = _downsample(pixels, width, height, channels, -(-width // _MAX_IMAGE_PX))
+    has_alpha = color_type in (4, 6)
+    color_channels = channels - 1 if has_alpha else channels
+    color = _split_channels(pixels, channels, range(color_channels))
+    alpha = _split_channels(pixels, channels, range(color_channels, channels)) if has_alpha else None
+    return _Image(
+        width,
+        height,
+        "DeviceRGB" if color_channels == 3 else "DeviceGray",
+        zlib.compress(color, 6),
+        zlib.compress(alpha, 6) if alpha is not None else None,
+    )
+
+
+_IMAGE_CACHE: dict[str, _Image] = {}
+_IMAGE_CACHE_LOCK = threading.Lock()
+
+
+def prepare_png_image(data: bytes) -> _Image:
+    """Decode and compress a PNG once; later renders reuse the prepared streams."""
+    key = hashlib.sha256(data).hexdigest()
+    with _IMAGE_CACHE_LOCK:
+        image = _IMAGE_CACHE.get(key)
+    if image is None:
+        image = _decode_png(data)
+        with _IMAGE_CACHE_LOCK:
+            _IMAGE_CACHE[key] = image
+    return image
+
+
+# ── PDF assembly ──
+
+class _Canvas:
+    """Content-stream builder taking CSS px coordinates (top-left origin)."""
+
+    def __init__(self) -> None:
+        self.ops: list[str] = []
+        self.images: dict[str, _Image] = {}
+        self.alphas: dict[str, float] = {}
+
+    @staticmethod
+    def _x(value: float) -> str:
+        return f"{value * _PX_TO_PT:.3f}"
+
+    @staticmethod
+    def _y(value: float) -> str:
+        return f"{_PAGE_HEIGHT_PT - value * _PX_TO_PT:.3f}"
+
+    @staticmethod
+    def _rgb(color: tuple[float, float, float]) -> str:
+        return " ".join(f"{channel / 255:.4f}" for channel in color)
+
+    def fill_rect(self, x: float, y: float, w: float, h: float, color: tuple[float, float, float]) -> None:
+        self.ops.append(
+            f"{self._rgb(color)} rg {self._x(x)} {self._y(y + h)} {self._x(w)} {self._x(h)} re f"
+        )
+
+    def stroke_rect(
+        self, x: float, y: float, w: float, h: float, line_width: float, color: tuple[float, float, float]
+    ) -> None:
+        self.ops.append(
+            f"{self._rgb(color)} RG {self._x(line_width)} w "
+            f"{self._x(x)} {self._y(y + h)} {self._x(w)} {self._x(h)} re S"
+        )
+
+    def fill_polygon(self, points: list[tuple[float, float]], color: tuple[float, float, float]) -> None:
+        path = [f"{self._x(points[0][0])} {self._y(points[0][1])} m"]
+        path.extend(f"{self._x(x)} {self._y(y)} l" for x, y in points[1:])
+        self.ops.append(f"{self._rgb(color)} rg {' '.join(path)} h f")
+
+    def text(
+        self,
+        x: float,
+        baseline: float,
+        text: str,
+        font: _Font,
+        size: float,
+        color: tuple[float, float, float],
+        letter_spacing: float = 0.0,
+    ) -> None:
+        self.ops.append(
+            f"BT /{font.resource} {size * _PX_TO_PT:.3f} Tf {self._rgb(color)} rg "
+            f"{letter_spacing * _PX_TO_PT:.3f} Tc {self._x(x)} {self._y(baseline)} Td {_pdf_string(text)} Tj ET"
+        )
+
+    def image(self, image: _Image, x: float, y: float, w: float, h: float, opacity: float = 1.0) -> None:
+        name = f"Im{len(self.images) + 1}"
+        self.images[name] = image
+        ops = ["q"]
+        if opacity < 1.0:
+            state = f"GS{len(self.alphas) + 1}"
+            self.alphas[state] = opacity
+            ops.append(f"/{state} gs")
+        ops.append(f"{self._x(w)} 0 0 {self._x(h)} {self._x(x)} {self._y(y + h)} cm /{name} Do Q")
+        self.ops.append(" ".join(ops))
+
+
+class _PdfWriter:
+    def __init__(self) -> None:
+        self._objects: list[bytes] = []
+
+    def add(self, body: bytes | str) -> int:
+        self._objects.append(body.encode("latin-1") if isinstance(body, str) else body)
+        return len(self._objects)
+
+    def add_stream(self, entries: str, data: bytes) -> int:
+        return self.add(f"<< {entries} /Length {len(data)} >>\nstream\n".encode("latin-1") + data + b"\nendstream")
+
+    def reserve(self) -> int:
+        return self.add(b"null")
+
+    def set(self, number: int, body: str) -> None:
+        self._objects[number - 1] = body.encode("latin-1")
+
+    def to_bytes(self, root: int, info: int) -> bytes:
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(self._objects, start=1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(self._objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        for offset in offsets:
+            out += f"{offset:010d} 00000 n \n".encode("latin-1")
+        out += (
+            f"trailer\n<< /Size {len(self._objects) + 1} /Root {root} 0 R /Info {info} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n"
+        ).encode("latin-1")
+        return bytes(out)
+
+
+def _build_pdf(canvas: _Canvas, title: str) -> bytes:
+    writer = _PdfWriter()
+    font_refs = {
+        font.resource: writer.add(
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{font.base_font} /Encoding /WinAnsiEncoding >>"
+        )
+        for font in _FONTS
+    }
+    image_refs = {}
+    for name, image in canvas.images.items():
+        smask = ""
+        if image.alpha is not None:
+            mask_ref = writer.add_stream(
+                f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+                "/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode",
+                image.alpha,
+            )
+            smask = f" /SMask {mask_ref} 0 R"
+        image_refs[name] = writer.add_stream(
+            f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace /{image.color_space} /BitsPerComponent 8 /Filter /FlateDecode{smask}",
+            image.data,
+        )
+    content = zlib.compress("\n".join(canvas.ops).encode("latin-1"), 6)
+    content_ref = writer.add_stream("/Filter /FlateDecode", content)
+
+    fonts = " ".join(f"/{name} {ref} 0 R" for name, ref in font_refs.items())
+    xobjects = " ".join(f"/{name} {ref} 0 R" for name, ref in image_refs.items())
+    states = " ".join(f"/{name} << /ca {alpha:.4f} /CA {alpha:.4f} >>" for name, alpha in canvas.alphas.items())
+    pages_ref = writer.reserve()
+    page_ref = writer.add(
+        f"<< /Type /Page /Parent {pages_ref} 0 R /MediaBox [0 0 {_PAGE_WIDTH_PT} {_PAGE_HEIGHT_PT}] "
+        f"/Resources << /Font << {fonts} >> /XObject << {xobjects} >> /ExtGState << {states} >> >> "
+        f"/Contents {content_ref} 0 R >>"
+    )
+    writer.set(pages_ref, f"<< /Type /Pages /Kids [{page_ref} 0 R] /Count 1 >>")
+    catalog_ref = writer.add(f"<< /Type /Catalog /Pages {pages_ref} 0 R >>")
+    info_ref = writer.add(f"<< /Title {_pdf_string(title)} /Producer (Blast native PDF) >>")
+    return writer.to_bytes(catalog_ref, info_ref)
+
+
+# ── Certificate template ──
+
+_BLUE = (26, 115, 232)
+_INK = (26, 26, 26)
+_MUTED = (95, 99, 104)
+_FAINT = (154, 160, 166)
+
+
+def _over_white(color: tuple[int, int, int], alpha: float) -> tuple[float, float, float]:
+    return tuple(255 - alpha * (255 - channel) for channel in color)
+
+
+def _baseline(top: float, font: _Font, size: float, line_height: float) -> float:
+    content = (font.ascent + font.descent) * size
+    return top + (line_height - content) / 2 + font.ascent * size
+
+
+def _centered(
+    canvas: _Canvas,
+    center_x: float,
+    top: float,
+    text: str,
+    font: _Font,
+    size: float,
+    color: tuple[float, float, float],
+    *,
+    letter_spacing: float = 0.0,
+    line_height: float | None = None,
+) -> float:
+    """Draw one centered line in a CSS line box starting at ``top``; returns the box height."""
+    box = line_height if line_height is not None else 1.15 * size
+    width = font.text_width(text, size, letter_spacing)
+    canvas.text(center_x - width / 2, _baseline(top, font, size, box), text, font, size, color, letter_spacing)
+    return box
+
+
+def _wrap(text: str, font: _Font, size: float, letter_spacing: float, max_width: float) -> list[str]:
+    lines: list[str] = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if font.text_width(candidate, size, letter_spacing) <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        # word-break: break-word splits words that do not fit on a line of their own.
+        current = ""
+        for char in word:
+            if current and font.text_width(current + char, size, letter_spacing) > max_width:
+                lines.append(current)
+                current = ""
+            current += char
+    if current:
+        lines.append(current)
+    return lines or [""]
+
+
+def _gradient_divider(canvas: _Canvas, left: float, top: float, width: float) -> None:
+    # linear-gradient(transparent, 35% blue at 25%..75%, transparent) as stepped fills.
+    steps = 24
+    ramp = width * 0.25
+    for step in range(steps):
+        alpha = 0.35 * (step + 0.5) / steps
+        color = _over_white(_BLUE, alpha)
+        canvas.fill_rect(left + ramp * step / steps, top, ramp / steps + 0.05, 1, color)
+        canvas.fill_rect(left + width - ramp * (step + 1) / steps, top, ramp / steps + 0.05, 1, color)
+    canvas.fill_rect(left + ramp, top, width - 2 * ramp, 1, _over_white(_BLUE, 0.35))
+
+
+def render_certificate_pdf(context: dict[str, Any]) -> bytes:
+    """Certificate with the same layout as the HTML template in ``account_service``."""
+    full_name = str(context.get("full_name") or "").strip()
+    if not full_name:
+        raise NativePdfError("full_name is required")
+    logo = prepare_png_image(context["logo_png"]) if context.get("logo_png") else None
+    icon = prepare_png_image(context["icon_png"]) if context.get("icon_png") else None
+
+    canvas = _Canvas()
+    center = PAGE_WIDTH_PX / 2
+
+    if icon is not None:
+        canvas.image(icon, center - 160, PAGE_HEIGHT_PX / 2 - 160, 320, 320, opacity=0.055)
+
+    # Frame: 1.5px outer border inset 22px, hairline inner border 9px inside it.
+    canvas.stroke_rect(22.75, 22.75, PAGE_WIDTH_PX - 45.5, PAGE_HEIGHT_PX - 45.5, 1.5, _over_white(_BLUE, 0.7))
+    canvas.stroke_rect(32.75, 32.75, PAGE_WIDTH_PX - 65.5, PAGE_HEIGHT_PX - 65.5, 0.5, _over_white(_BLUE, 0.25))
+    right, bottom = PAGE_WIDTH_PX - 22, PAGE_HEIGHT_PX - 22
+    for x, y, w, h in (
+        (22, 22, 18, 3), (22, 22, 3, 18),
+        (right - 18, 22, 18, 3), (right - 3, 22, 3, 18),
+        (22, bottom - 3, 18, 3), (22, bottom - 18, 3, 18),
+        (right - 18, bottom - 3, 18, 3), (right - 3, bottom - 18, 3, 18),
+    ):
+        canvas.fill_rect(x, y, w, h, _BLUE)
+
+    # .content: padding 64px 88px 56px, header / divider / body (flex: 1) / divider / footer.
+    content_left, content_width = 88, PAGE_WIDTH_PX - 176
+    top = 64.0
+    if logo is not None:
+        logo_width = 160 * logo.width / logo.height
+        canvas.image(logo, center - logo_width / 2, top, logo_width, 160)
+    top += 160 + 7
+    top += _centered(canvas, center, top, "EDUCATION", _SANS, 8.5, _over_white((0, 0, 0), 0.32), letter_spacing=1.87)
+    _gradient_divider(canvas, content_left, top, content_width)
+    body_top = top + 1
+
+    footer_height = 1.15 * 12 + 5 + 1.15 * 10.5
+    footer_top = PAGE_HEIGHT_PX - 56 - footer_height
+    body_bottom = footer_top - 1
+    _gradient_divider(canvas, content_left, body_bottom, content_width)
+    issue_box = _centered(canvas, center, footer_top, str(context.get("issue_date") or ""), _SANS, 12, _MUTED)
+    _centered(canvas, center, footer_top + issue_box + 5, "https://blastgroup.org", _SANS, 10.5, _FAINT, letter_spacing=1.05)
+
+    body_width = content_width - 32
+    name_lines = _wrap(full_name, _SERIF, 38, -0.38, body_width)
+    name_height = 45.6 * len(name_lines)
+    block_height = (
+        1.15 * 10.5 + 30
+        + 1.15 * 14 + 14
+        + name_height + 26
+        + 1.15 * 13.5 + 10
+        + 1.15 * 21 + 32
+        + 6 + 18
+        + 1.15 * 12
+    )
+    y = body_top + max(0.0, (body_bottom - body_top - block_height) / 2)
+    y += _centered(canvas, center, y, "CERTIFICADO DE CONCLUSÃO", _SANS_BOLD, 10.5, _BLUE, letter_spacing=3.15) + 30
+    y += _centered(canvas, center, y, "Este certificado é concedido a", _SANS_ITALIC, 14, _MUTED) + 14
+    for line in name_lines:
+        y += _centered(canvas, center, y, line, _SERIF, 38, _INK, letter_spacing=-0.38, line_height=45.6)
+    y += 26
+    y += _centered(canvas, center, y, "por concluir com êxito o curso", _SANS, 13.5, _MUTED) + 10
+    course_title = str(context.get("course_title") or "SQL do Básico ao Avançado")
+    y += _centered(canvas, center, y, course_title, _SANS_BOLD, 21, _INK, letter_spacing=-0.21) + 32
+
+    # Ornament: two hairlines (flex: 1) around a 6px diamond, 56% of the body width.
+    ornament_width = body_width * 0.56
+    line_width = (ornament_width - 6 - 28) / 2
+    left = center - ornament_width / 2
+    canvas.fill_rect(left, y + 2.5, line_width, 1, _over_white((0, 0, 0), 0.13))
+    canvas.fill_rect(center + 3 + 14, y + 2.5, line_width, 1, _over_white((0, 0, 0), 0.13))
+    half = 3 * 2**0.5
+    canvas.fill_polygon(
+        [(center, y + 3 - half), (center + half, y + 3), (center, y + 3 + half), (center - half, y + 3)],
+        _over_white(_BLUE, 0.55),
+    )
+    y += 6 + 18
+    meta = f"{int(context.get('num_modules') or 0)} módulos / {int(context.get('total_lessons') or 0)} aulas"
+    _centered(canvas, center, y, meta, _SANS, 12, _FAINT, letter_spacing=0.48)
+
+    return _build_pdf(canvas, "Certificado")
+
+
+NATIVE_TEMPLATES: dict[str, Callable[[dict[str, Any]], bytes]] = {
+    "certificate": render_certificate_pdf,
+}
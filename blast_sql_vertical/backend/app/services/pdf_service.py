@@ -1,12 +1,23 @@
 import asyncio
 import logging
 import re
+import time
+from typing import Any, Protocol
 
 from app.config import (
+    PDF_BACKENDS,
+    PDF_BROWSER_MAX_RENDERS,
+    PDF_PAGE_IDLE_SECONDS,
+    PDF_PAGE_POOL_SIZE,
+    PDF_RENDER_QUEUE_TIMEOUT_SECONDS,
     PDF_RENDER_TIMEOUT_MS,
+    PDF_SUPERVISOR_INTERVAL_SECONDS,
+    PDF_WARMUP_ON_STARTUP,
     PLAYWRIGHT_CHROMIUM_ARGS,
     PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH,
 )
+from app.services.metrics_service import inc_counter, instrument, register_gauge_callback, timed
+from app.services.pdf_native import NATIVE_TEMPLATES, NativePdfError
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +27,10 @@ _BROWSER_LOCK = asyncio.Lock()
 
 _SCRIPT_TAG_RE = re.compile(r"<\s*script\b", re.IGNORECASE)
 _ON_HANDLER_RE = re.compile(r"\bon[a-z]+\s*=", re.IGNORECASE)
+_FONTS_READY_TIMEOUT_SECONDS = 5.0
+_BROWSER_PROBE_TIMEOUT_SECONDS = 5.0
+# A connected browser is only relaunched after this many probes in a row have failed.
+_BROWSER_PROBE_FAILURES_BEFORE_RELAUNCH = 3
 
 
 class PdfServiceError(RuntimeError):
@@ -26,6 +41,10 @@ class PdfServiceUnavailable(PdfServiceError):
     pass
 
 
+class PdfTemplateUnsupported(PdfServiceError):
+    """A backend cannot render this template/input; the next backend should be tried."""
+
+
 def sanitize_html_for_pdf(raw_html: str) -> str:
     html = (raw_html or "").strip()
     if not html:
@@ -75,7 +94,8 @@ async def _ensure_browser():
             launch_kwargs["executable_path"] = PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH
 
         try:
-            _BROWSER = await _PLAYWRIGHT.chromium.launch(**launch_kwargs)
+            with timed("chromium_launch"):
+                _BROWSER = await _PLAYWRIGHT.chromium.launch(**launch_kwargs)
         except Exception as exc:
             logger.exception("Failed to launch Chromium for PDF rendering")
             await _PLAYWRIGHT.stop()
@@ -88,30 +108,225 @@ async def _ensure_browser():
         return _BROWSER
 
 
+class _PooledPage:
+    __slots__ = ("browser", "context", "page", "landscape", "renders", "last_used")
+
+    def __init__(self, browser: Any, context: Any, page: Any, landscape: bool) -> None:
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.landscape = landscape
+        self.renders = 0
+        self.last_used = time.monotonic()
+
+
+def _viewport(landscape: bool) -> dict[str, int]:
+    vw, vh = (1123, 794) if landscape else (794, 1123)
+    return {"width": vw, "height": vh}
+
+
+class _PagePool:
+    """Bounded pool of reusable Chromium pages.
+
+    A semaphore caps concurrent renders at ``size``; callers beyond that queue (with a
+    timeout) instead of opening more contexts. Pages idle for longer than
+    ``idle_seconds`` are closed, and after ``max_renders`` renders the browser is
+    restarted once in-flight renders have drained.
+    """
+
+    def __init__(self, size: int, *, idle_seconds: int, max_renders: int, queue_timeout: float) -> None:
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.max_renders = max_renders
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.in_use = 0
+        self.renders_since_launch = 0
+        self.restarts = 0
+        self._idle: list[_PooledPage] = []
+        self._restart_pending = False
+        self._semaphore = asyncio.Semaphore(size)
+        self._condition = asyncio.Condition()
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    async def acquire(self, *, landscape: bool) -> _PooledPage:
+        self.waiting += 1
+        try:
+            with timed("pdf_queue_wait"):
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._semaphore.acquire()
+        except TimeoutError as exc:
+            inc_counter(
+                "blast_pdf_render_rejected_total",
+                description="PDF renders rejected after waiting for a free page.",
+            )
+            raise PdfServiceUnavailable("PDF renderer is busy. Try again shortly.") from exc
+        finally:
+            self.waiting -= 1
+
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: not self._restart_pending or self.in_use == 0)
+                if self._restart_pending:
+                    await self._restart_browser_locked()
+                self.in_use += 1
+                slot = await self._take_idle_locked()
+            if slot is None:
+                slot = await self._open_page(landscape)
+            elif slot.landscape != landscape:
+                await slot.page.set_viewport_size(_viewport(landscape))
+                slot.landscape = landscape
+            return slot
+        except BaseException:
+            async with self._condition:
+                self.in_use -= 1
+                self._condition.notify_all()
+            self._semaphore.release()
+            raise
+
+    async def release(self, slot: _PooledPage, *, healthy: bool) -> None:
+        slot.renders += 1
+        slot.last_used = time.monotonic()
+        try:
+            async with self._condition:
+                self.in_use -= 1
+                self.renders_since_launch += 1
+                if self.max_renders and self.renders_since_launch >= self.max_renders:
+                    self._restart_pending = True
+                if healthy and not self._restart_pending and _slot_alive(slot):
+                    self._idle.append(slot)
+                else:
+                    await _close_slot(slot)
+                if self._restart_pending and self.in_use == 0:
+                    await self._restart_browser_locked()
+                self._condition.notify_all()
+        finally:
+            self._semaphore.release()
+
+    async def warm(self) -> int:
+        """Open pages until ``size`` are idle; returns how many were created."""
+        created = 0
+        async with self._condition:
+            missing = self.size - self.in_use - len(self._idle)
+        for _ in range(max(0, missing)):
+            slot = await self._open_page(False)
+            async with self._condition:
+                self._idle.append(slot)
+            created += 1
+        return created
+
+    async def restart_browser(self) -> bool:
+        """Restart Chromium now if nothing is rendering; otherwise once in-flight renders drain.
+
+        Returns True when the browser was restarted immediately.
+        """
+        async with self._condition:
+            if self.in_use:
+                self._restart_pending = True
+                return False
+            await self._restart_browser_locked()
+            self._condition.notify_all()
+            return True
+
+    async def close(self) -> None:
+        async with self._condition:
+            idle, self._idle = self._idle, []
+            self._restart_pending = False
+            self.renders_since_launch = 0
+        for slot in idle:
+            await _close_slot(slot)
+
+    async def _take_idle_locked(self) -> _PooledPage | None:
+        now = time.monotonic()
+        keep: list[_PooledPage] = []
+        for slot in self._idle:
+            if not _slot_alive(slot) or (self.idle_seconds and now - slot.last_used > self.idle_seconds):
+                await _close_slot(slot)
+            else:
+                keep.append(slot)
+        self._idle = keep
+        return self._idle.pop() if self._idle else None
+
+    async def _open_page(self, landscape: bool) -> _PooledPage:
+        browser = await _ensure_browser()
+        context = await browser.new_context(viewport=_viewport(landscape), java_script_enabled=False)
+        try:
+            page = await context.new_page()
+            await page.emulate_media(media="print")
+        except Exception:
+            await context.close()
+            raise
+        return _PooledPage(browser, context, page, landscape)
+
+    async def _restart_browser_locked(self) -> None:
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await _close_slot(slot)
+        logger.info("pdf_browser_restart renders=%s", self.renders_since_launch)
+        await _close_browser()
+        self.renders_since_launch = 0
+        self._restart_pending = False
+        self.restarts += 1
+        inc_counter(
+            "blast_pdf_browser_restarts_total",
+            description="Chromium restarts by the page pool (render limit or supervisor relaunch).",
+        )
+
+
+def _slot_alive(slot: _PooledPage) -> bool:
+    return slot.browser is _BROWSER and slot.browser.is_connected() and not slot.page.is_closed()
+
+
+async def _close_slot(slot: _PooledPage) -> None:
+    try:
+        await slot.context.close()
+    except Exception:
+        logger.debug("Failed closing pooled PDF page", exc_info=True)
+
+
+_PAGE_POOL = _PagePool(
+    PDF_PAGE_POOL_SIZE,
+    idle_seconds=PDF_PAGE_IDLE_SECONDS,
+    max_renders=PDF_BROWSER_MAX_RENDERS,
+    queue_timeout=PDF_RENDER_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+async def _wait_until_ready(page: Any) -> None:
+    # set_content(wait_until="load") already covers stylesheets and images; web fonts may
+    # still be swapping in, so wait on document.fonts.ready instead of a fixed sleep.
+    try:
+        await asyncio.wait_for(
+            page.evaluate("document.fonts.ready.then(() => document.fonts.status)"),
+            timeout=_FONTS_READY_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        logger.debug("document.fonts.ready unavailable; relying on the load event", exc_info=True)
+
+
+@instrument("pdf_render")
 async def render_pdf_from_html(html: str, *, landscape: bool = False) -> bytes:
     clean_html = sanitize_html_for_pdf(html)
-    browser = await _ensure_browser()
-    vw, vh = (1123, 794) if landscape else (794, 1123)
-    context = await browser.new_context(
-        viewport={"width": vw, "height": vh},
-        java_script_enabled=False,
-    )
-    page = await context.new_page()
+    slot = await _PAGE_POOL.acquire(landscape=landscape)
+    healthy = False
     try:
-        await page.set_content(
+        await slot.page.set_content(
             clean_html,
-            wait_until="domcontentloaded",
+            wait_until="load",
             timeout=PDF_RENDER_TIMEOUT_MS,
         )
-        await page.emulate_media(media="print")
-        await page.wait_for_timeout(120)
-        pdf_bytes = await page.pdf(
+        await _wait_until_ready(slot.page)
+        pdf_bytes = await slot.page.pdf(
             format="A4",
             landscape=landscape,
             print_background=True,
             prefer_css_page_size=True,
             margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
         )
+        healthy = True
         return pdf_bytes
     except PdfServiceError:
         raise
@@ -119,10 +334,117 @@ async def render_pdf_from_html(html: str, *, landscape: bool = False) -> bytes:
         logger.exception("Failed to render PDF with Playwright")
         raise PdfServiceError("Failed to render PDF from HTML payload") from exc
     finally:
-        await context.close()
+        await _PAGE_POOL.release(slot, healthy=healthy)
 
 
-async def shutdown_pdf_service() -> None:
+class PdfBackend(Protocol):
+    name: str
+
+    def supports(self, template: str) -> bool:
+        """Whether ``template`` can be rendered; ``"html"`` stands for arbitrary markup."""
+
+    async def render(self, template: str, *, html: str, context: dict[str, Any], landscape: bool) -> bytes:
+        """Render a PDF from the template ``context`` or, for browser backends, ``html``."""
+
+
+class ChromiumPdfBackend:
+    name = "chromium"
+
+    def supports(self, template: str) -> bool:
+        return True
+
+    async def render(self, template: str, *, html: str, context: dict[str, Any], landscape: bool) -> bytes:
+        return await render_pdf_from_html(html, landscape=landscape)
+
+
+class NativePdfBackend:
+    """Pure-Python renderer for fixed-layout templates (see ``pdf_native``)."""
+
+    name = "native"
+
+    def supports(self, template: str) -> bool:
+        return template in NATIVE_TEMPLATES
+
+    async def render(self, template: str, *, html: str, context: dict[str, Any], landscape: bool) -> bytes:
+        renderer = NATIVE_TEMPLATES.get(template)
+        if renderer is None:
+            raise PdfTemplateUnsupported(f"No native renderer for template {template!r}")
+        try:
+            with timed("pdf_native_render"):
+                return await asyncio.to_thread(renderer, context)
+        except NativePdfError as exc:
+            raise PdfTemplateUnsupported(str(exc)) from exc
+
+
+_BACKENDS: dict[str, PdfBackend] = {}
+
+
+def register_pdf_backend(backend: PdfBackend) -> None:
+    _BACKENDS[backend.name] = backend
+
+
+def select_pdf_backend(template: str) -> PdfBackend:
+    """First backend in ``PDF_BACKENDS`` order that supports ``template`` (Chromium as last resort)."""
+    for name in PDF_BACKENDS:
+        backend = _BACKENDS.get(name)
+        if backend is not None and backend.supports(template):
+            return backend
+    return _BACKENDS["chromium"]
+
+
+async def render_pdf_template(
+    template: str,
+    *,
+    html: str,
+    context: dict[str, Any] | None = None,
+    landscape: bool = False,
+) -> tuple[bytes, str]:
+    """Render a known template with the preferred backend, falling back to Chromium.
+
+    Returns the PDF and the name of the backend that actually rendered it.
+    """
+    backend = select_pdf_backend(template)
+    if backend.name != "chromium":
+        try:
+            pdf_bytes = await backend.render(template, html=html, context=context or {}, landscape=landscape)
+            inc_counter(
+                "blast_pdf_renders_total",
+                labels={"backend": backend.name, "template": template},
+                description="PDF renders by backend and template.",
+            )
+            return pdf_bytes, backend.name
+        except PdfTemplateUnsupported as exc:
+            logger.warning("pdf_backend_fallback backend=%s template=%s reason=%s", backend.name, template, exc)
+    pdf_bytes = await _BACKENDS["chromium"].render(template, html=html, context=context or {}, landscape=landscape)
+    inc_counter(
+        "blast_pdf_renders_total",
+        labels={"backend": "chromium", "template": template},
+        description="PDF renders by backend and template.",
+    )
+    return pdf_bytes, "chromium"
+
+
+register_pdf_backend(ChromiumPdfBackend())
+register_pdf_backend(NativePdfBackend())
+
+
+async def warm_pdf_page_pool() -> int:
+    """Launch Chromium and pre-open the pooled pages so the first render skips cold start."""
+    return await _PAGE_POOL.warm()
+
+
+def get_pdf_pool_stats() -> dict[str, int]:
+    return {
+        "size": _PAGE_POOL.size,
+        "in_use": _PAGE_POOL.in_use,
+        "idle": _PAGE_POOL.idle,
+        "waiting": _PAGE_POOL.waiting,
+        "renders_since_launch": _PAGE_POOL.renders_since_launch,
+        "restarts": _PAGE_POOL.restarts,
+    }
+
+
+async def _close_browser() -> None:
     global _PLAYWRIGHT, _BROWSER
     async with _BROWSER_LOCK:
         if _BROWSER:
@@ -137,3 +459,130 @@ async def shutdown_pdf_service() -> None:
                 logger.exception("Failed stopping Playwright runtime")
         _BROWSER = None
         _PLAYWRIGHT = None
+
+
+_SUPERVISOR_TASK: asyncio.Task | None = None
+_KEEP_WARM = False
+_READINESS: dict[str, Any] = {
+    "state": "cold",
+    "checked_at": None,
+    "last_error": None,
+    "relaunches": 0,
+    "probe_failures": 0,
+}
+
+
+async def _probe_browser(browser: Any) -> bool:
+    if not browser.is_connected():
+        return False
+    try:
+        async with asyncio.timeout(_BROWSER_PROBE_TIMEOUT_SECONDS):
+            context = await browser.new_context(viewport=_viewport(False), java_script_enabled=False)
+            await context.close()
+        return True
+    except Exception:
+        logger.warning("pdf_browser_probe_failed", exc_info=True)
+        return False
+
+
+async def check_pdf_browser() -> str:
+    """Probe Chromium, relaunching it (and re-warming the pool) if it died.
+
+    A browser that is still connected is only relaunched after
+    ``_BROWSER_PROBE_FAILURES_BEFORE_RELAUNCH`` failed probes in a row, and never under
+    in-flight renders: the pool restarts it once they drain and the next check re-warms
+    it. Without warm-up a browser that was never launched is left alone ("cold"); it is
+    launched lazily by the first render as before. Returns the readiness state.
+    """
+    browser = _BROWSER
+    failures = int(_READINESS.get("probe_failures") or 0)
+    if browser is None and not _KEEP_WARM:
+        state, error, failures = "cold", None, 0
+    elif browser is not None and await _probe_browser(browser):
+        state, error, failures = "ready", None, 0
+    elif browser is not None and browser.is_connected() and failures + 1 < _BROWSER_PROBE_FAILURES_BEFORE_RELAUNCH:
+        failures += 1
+        state, error = "degraded", f"health probe failed ({failures} in a row)"
+    else:
+        failures = 0
+        if browser is not None:
+            logger.warning("pdf_browser_unhealthy relaunching=1 in_use=%s", _PAGE_POOL.in_use)
+            _READINESS["relaunches"] += 1
+            inc_counter(
+                "blast_pdf_browser_relaunches_total",
+                description="Chromium relaunches by the PDF supervisor after a failed health probe.",
+            )
+        try:
+            if browser is not None and not await _PAGE_POOL.restart_browser():
+                state, error = "restarting", None
+            else:
+                with timed("pdf_warmup"):
+                    await _PAGE_POOL.warm()
+                state, error = "ready", None
+        except Exception as exc:
+            logger.exception("pdf_browser_launch_failed")
+            state, error = "unavailable", str(exc)
+    _READINESS.update(state=state, checked_at=int(time.time()), last_error=error, probe_failures=failures)
+    return state
+
+
+async def _supervise(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await check_pdf_browser()
+        except Exception:
+            logger.exception("pdf_supervisor_check_failed")
+
+
+async def start_pdf_supervisor(
+    *,
+    warm: bool = PDF_WARMUP_ON_STARTUP,
+    interval: float = PDF_SUPERVISOR_INTERVAL_SECONDS,
+) -> None:
+    """Optionally warm Chromium now, then keep probing it in the background."""
+    global _SUPERVISOR_TASK, _KEEP_WARM
+    _KEEP_WARM = warm
+    if warm:
+        state = await check_pdf_browser()
+        logger.info("pdf_warmup state=%s pages=%s", state, _PAGE_POOL.idle)
+    if interval > 0 and (_SUPERVISOR_TASK is None or _SUPERVISOR_TASK.done()):
+        _SUPERVISOR_TASK = asyncio.create_task(_supervise(interval), name="pdf-browser-supervisor")
+
+
+async def _stop_pdf_supervisor() -> None:
+    global _SUPERVISOR_TASK
+    task, _SUPERVISOR_TASK = _SUPERVISOR_TASK, None
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def get_pdf_readiness() -> dict[str, Any]:
+    """Readiness snapshot for ``/health``: last probe result plus live pool state."""
+    connected = bool(_BROWSER is not None and _BROWSER.is_connected())
+    return {
+        **_READINESS,
+        "warmup": _KEEP_WARM,
+        "browser_connected": connected,
+        "ready": connected or (not _KEEP_WARM and _READINESS["state"] == "cold"),
+        "pool": get_pdf_pool_stats(),
+    }
+
+
+async def shutdown_pdf_service() -> None:
+    await _stop_pdf_supervisor()
+    await _PAGE_POOL.close()
+    await _close_browser()
+
+
+register_gauge_callback(
+    "blast_pdf_render_queue_depth",
+    lambda: float(_PAGE_POOL.waiting),
+    "PDF renders waiting for a pooled Chromium page.",
+)
+register_gauge_callback(
+    "blast_pdf_pages",
+    lambda: {(("state", "in_use"),): float(_PAGE_POOL.in_use), (("state", "idle"),): float(_PAGE_POOL.idle)},
+    "Pooled Chromium pages by state.",
+)
@@ -1,5 +1,9 @@
+import copy
+import itertools
 import logging
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import duckdb
@@ -8,9 +12,40 @@ from sqlparse.tokens import DML
 
 logger = logging.getLogger(__name__)
 
-from app.config import CONTENT_DIR, MAX_QUERY_LENGTH
+from app.config import (
+    CONTENT_DIR,
+    MAX_QUERY_LENGTH,
+    SQL_RESULT_CACHE_MAX_ROWS,
+    SQL_RESULT_CACHE_SIZE,
+    SQL_STATEMENT_CACHE_SIZE,
+)
+from app.services.metrics_service import inc_counter, register_gauge_callback, timed
 
 _SESSIONS: dict[str, duckdb.DuckDBPyConnection] = {}
+# DuckDB connections are not safe to share across threads, so each session is serialized.
+_SESSION_LOCKS: dict[str, threading.RLock] = {}
+_SESSION_LOCKS_GUARD = threading.Lock()
+_SEED_LOCK = threading.Lock()
+_SEED_STATEMENTS: list[str] | None = None
+_SCHEMA_CATALOG: dict[str, list[dict]] = {}
+# Per-session LRU of normalized query -> prepared statement name (guarded by the session lock).
+_STATEMENTS: dict[str, OrderedDict[str, str]] = {}
+_STATEMENT_IDS = itertools.count(1)
+# Shared LRU of normalized query -> (columns, rows). Sessions only ever run SELECTs
+# against the same immutable seed, so a result is valid for every session.
+_RESULT_CACHE: OrderedDict[str, tuple[tuple[str, ...], tuple[tuple, ...]]] = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {"statement_hits": 0, "statement_misses": 0, "result_hits": 0, "result_misses": 0}
+
+# Functions whose output changes between executions; queries using them are never cached.
+_VOLATILE_SQL = re.compile(
+    r"\b(random|setseed|uuid|gen_random_uuid|now|today|current_date|current_time|"
+    r"current_timestamp|get_current_time|get_current_timestamp|localtime|localtimestamp|"
+    r"nextval|currval|tablesample|using\s+sample)\b",
+    re.IGNORECASE,
+)
+# Quoted strings, quoted identifiers and dollar-quoted strings ($$...$$, $tag$...$tag$) are kept verbatim.
+_QUOTED_OR_SPACE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$(\w*)\$.*?\$\1\$|\s+", re.DOTALL)
 
 FORBIDDEN_KEYWORDS = [
     "DROP", "DELETE", "UPDATE", "INSERT", "CREATE", "ALTER",
@@ -80,49 +115,247 @@ def _validate_query(query: str) -> str | None:
     return _is_safe_select_only(query)
 
 
+def _apply_seed(conn: duckdb.DuckDBPyConnection, statements: list[str]) -> None:
+    for stmt in statements:
+        try:
+            conn.execute(stmt)
+        except Exception as exc:
+            preview = stmt[:120].replace("\n", " ")
+            logger.error("Seed SQL failed: %s | stmt: %s", exc, preview)
+            raise RuntimeError(f"Seed initialisation failed: {exc}") from exc
+
+
+def _extract_schema_catalog(conn: duckdb.DuckDBPyConnection) -> dict[str, list[dict]]:
+    """Describe every seeded table (columns, row counts, keys) grouped by schema."""
+    primary_keys: dict[tuple[str, str], list[str]] = {}
+    foreign_keys: dict[tuple[str, str], list[dict]] = {}
+    constraints = conn.execute(
+        "SELECT schema_name, table_name, constraint_type, constraint_column_names, "
+        "referenced_table, referenced_column_names "
+        "FROM duckdb_constraints() "
+        "WHERE constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY')"
+    ).fetchall()
+    for schema, table, kind, columns, ref_table, ref_columns in constraints:
+        key = (schema, table)
+        if kind == "PRIMARY KEY":
+            primary_keys[key] = list(columns or [])
+        else:
+            foreign_keys.setdefault(key, []).append(
+                {
+                    "columns": list(columns or []),
+                    "references_table": ref_table,
+                    "references_columns": list(ref_columns or []),
+                }
+            )
+
+    tables: dict[tuple[str, str], list[dict]] = {}
+    rows = conn.execute(
+        "SELECT table_schema, table_name, column_name, data_type, is_nullable "
+        "FROM information_schema.columns "
+        "ORDER BY table_schema, table_name, ordinal_position"
+    ).fetchall()
+    for schema, table, column, data_type, is_nullable in rows:
+        key = (schema, table)
+        pk_columns = primary_keys.get(key, [])
+        tables.setdefault(key, []).append(
+            {
+                "name": column,
+                "type": data_type,
+                "nullable": is_nullable == "YES",
+                "primary_key": column in pk_columns,
+            }
+        )
+
+    catalog: dict[str, list[dict]] = {}
+    for (schema, table), columns in tables.items():
+        quoted = f'"{schema}"."{table}"'
+        row_count = conn.execute(f"SELECT COUNT(*) FROM {quoted}").fetchone()[0]
+        catalog.setdefault(schema, []).append(
+            {
+                "name": table,
+                "row_count": int(row_count),
+                "primary_key": primary_keys.get((schema, table), []),
+                "foreign_keys": foreign_keys.get((schema, table), []),
+                "columns": columns,
+            }
+        )
+    return catalog
+
+
+def _ensure_seed_template() -> list[str]:
+    """Split the seed once and snapshot schema metadata from a template database."""
+    global _SEED_STATEMENTS, _SCHEMA_CATALOG
+    if _SEED_STATEMENTS is not None:
+        return _SEED_STATEMENTS
+    with _SEED_LOCK:
+        if _SEED_STATEMENTS is not None:
+            return _SEED_STATEMENTS
+        statements = [stmt.strip() for stmt in _get_seed_sql().split(";") if stmt.strip()]
+        template = duckdb.connect(":memory:")
+        try:
+            _apply_seed(template, statements)
+            catalog = _extract_schema_catalog(template)
+        finally:
+            template.close()
+        _SCHEMA_CATALOG = catalog
+        _SEED_STATEMENTS = statements
+        logger.info(
+            "Seed template ready: %s statements, %s schemas, %s tables.",
+            len(statements),
+            len(catalog),
+            sum(len(tables) for tables in catalog.values()),
+        )
+    return _SEED_STATEMENTS
+
+
+def initialize_sql_engine() -> None:
+    _ensure_seed_template()
+
+
+def _session_lock(session_id: str) -> threading.RLock:
+    lock = _SESSION_LOCKS.get(session_id)
+    if lock is None:
+        with _SESSION_LOCKS_GUARD:
+            lock = _SESSION_LOCKS.setdefault(session_id, threading.RLock())
+    return lock
+
+
 def get_connection(session_id: str) -> duckdb.DuckDBPyConnection:
-    if session_id not in _SESSIONS:
-        conn = duckdb.connect(":memory:")
-        seed = _get_seed_sql()
-        if seed:
-            for stmt in seed.split(";"):
-                stmt = stmt.strip()
-                if stmt:
-                    try:
-                        conn.execute(stmt)
-                    except Exception as exc:
-                        preview = stmt[:120].replace("\n", " ")
-                        logger.error("Seed SQL failed: %s | stmt: %s", exc, preview)
-                        raise RuntimeError(f"Seed initialisation failed: {exc}") from exc
-        _SESSIONS[session_id] = conn
-    return _SESSIONS[session_id]
+    with _session_lock(session_id):
+        if session_id not in _SESSIONS:
+            statements = _ensure_seed_template()
+            with timed("duckdb_seed"):
+                conn = duckdb.connect(":memory:")
+                _apply_seed(conn, statements)
+            _SESSIONS[session_id] = conn
+        return _SESSIONS[session_id]
+
+
+def _normalize_query(query: str) -> str:
+    """Cache key for a query: trailing semicolons dropped, whitespace outside quoted text collapsed."""
+    text = query.strip().rstrip(";").strip()
+    return _QUOTED_OR_SPACE.sub(lambda m: " " if m.group(0).isspace() else m.group(0), text)
+
+
+def _is_result_cacheable(normalized: str) -> bool:
+    return SQL_RESULT_CACHE_SIZE > 0 and not _VOLATILE_SQL.search(normalized)
+
+
+def _count_cache(kind: str, hit: bool) -> None:
+    key = f"{kind}_{'hits' if hit else 'misses'}"
+    with _RESULT_CACHE_LOCK:
+        _CACHE_STATS[key] += 1
+    inc_counter(
+        "blast_sql_cache_requests_total",
+        labels={"cache": kind, "outcome": "hit" if hit else "miss"},
+        description="DuckDB statement/result cache lookups.",
+    )
+
+
+def _result_cache_get(normalized: str) -> tuple[tuple[str, ...], tuple[tuple, ...]] | None:
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(normalized)
+        if entry is not None:
+            _RESULT_CACHE.move_to_end(normalized)
+    _count_cache("result", entry is not None)
+    return entry
+
+
+def _result_cache_put(normalized: str, cols: list[str], rows: list[tuple]) -> None:
+    if len(rows) > SQL_RESULT_CACHE_MAX_ROWS:
+        return
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[normalized] = (tuple(cols), tuple(rows))
+        _RESULT_CACHE.move_to_end(normalized)
+        while len(_RESULT_CACHE) > SQL_RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _run_statement(session_id: str, conn: duckdb.DuckDBPyConnection, normalized: str):
+    """Execute through a per-session prepared statement, preparing it on first use.
+
+    Queries with parameter markers, or that DuckDB refuses to prepare, run directly so
+    the user sees DuckDB's original error message. Caller holds the session lock.
+    """
+    if SQL_STATEMENT_CACHE_SIZE <= 0 or "?" in normalized or "$" in normalized:
+        return conn.execute(normalized)
+    statements = _STATEMENTS.setdefault(session_id, OrderedDict())
+    name = statements.get(normalized)
+    if name is not None:
+        statements.move_to_end(normalized)
+        _count_cache("statement", True)
+        return conn.execute(f"EXECUTE {name}")
+    _count_cache("statement", False)
+    name = f"blast_stmt_{next(_STATEMENT_IDS)}"
+    try:
+        conn.execute(f"PREPARE {name} AS {normalized}")
+    except Exception:
+        return conn.execute(normalized)
+    statements[normalized] = name
+    while len(statements) > SQL_STATEMENT_CACHE_SIZE:
+        _, evicted = statements.popitem(last=False)
+        try:
+            conn.execute(f"DEALLOCATE {evicted}")
+        except Exception:
+            pass
+    return conn.execute(f"EXECUTE {name}")
 
 
 def execute_query(session_id: str, query: str) -> tuple[list[str], list[list]] | tuple[None, str]:
-    err = _validate_query(query)
+    with timed("sql_validate"):
+        err = _validate_query(query)
     if err:
         return None, err
-    conn = get_connection(session_id)
-    try:
-        result = conn.execute(query.strip()).fetchall()
-        if result:
-            cols = [d[0] for d in conn.description]
-            rows = [list(r) for r in result]
-            return cols, rows
-        cols = [d[0] for d in conn.description] if conn.description else []
-        return cols, []
-    except Exception as e:
-        return None, str(e)
-
-
-def get_schema_details(session_id: str, schema_name: str) -> list[dict]:
-    conn = get_connection(session_id)
-    try:
-        res = conn.execute(
-            "SELECT table_name, column_name, data_type FROM information_schema.columns WHERE table_schema = ?",
-            [schema_name]
-        ).fetchall()
-        return [{"table": r[0], "column": r[1], "type": r[2]} for r in res]
-    except Exception as e:
-        logger.error(f"Error fetching schema: {e}")
-        return []
+    normalized = _normalize_query(query)
+    cacheable = _is_result_cacheable(normalized)
+    if cacheable:
+        cached = _result_cache_get(normalized)
+        if cached is not None:
+            cols, rows = cached
+            return list(cols), [list(r) for r in rows]
+    with _session_lock(session_id):
+        conn = get_connection(session_id)
+        try:
+            with timed("duckdb_query"):
+                cursor = _run_statement(session_id, conn, normalized)
+                result = cursor.fetchall()
+            cols = [d[0] for d in cursor.description] if cursor.description else []
+        except Exception as e:
+            return None, str(e)
+    if cacheable:
+        _result_cache_put(normalized, cols, result)
+    return cols, [list(r) for r in result]
+
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss counters and hit rates of the statement and result caches."""
+    with _RESULT_CACHE_LOCK:
+        stats: dict = dict(_CACHE_STATS)
+        stats["result_entries"] = len(_RESULT_CACHE)
+    for kind in ("statement", "result"):
+        total = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+        stats[f"{kind}_hit_rate"] = stats[f"{kind}_hits"] / total if total else 0.0
+    return stats
+
+
+def clear_query_caches() -> None:
+    """Drop cached results and reset counters (prepared statements live with their session)."""
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+        for key in _CACHE_STATS:
+            _CACHE_STATS[key] = 0
+
+
+register_gauge_callback(
+    "blast_sql_cache_hit_ratio",
+    lambda: {
+        (("cache", kind),): get_query_cache_stats()[f"{kind}_hit_rate"] for kind in ("statement", "result")
+    },
+    "Hit ratio of the DuckDB statement and result caches since startup.",
+)
+
+
+def get_schema_details(schema_name: str) -> list[dict]:
+    """Return precomputed table metadata for a seeded schema (empty if unknown)."""
+    _ensure_seed_template()
+    return copy.deepcopy(_SCHEMA_CATALOG.get(schema_name, []))
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.services.metrics_service import inc_counter
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """Bounded in-process TTL cache with single-flight loading.
+
+    Concurrent misses for the same key share one ``loader`` call; loader exceptions are
+    propagated to every waiter and never cached. ``negative_ttl`` applies to values for
+    which ``is_negative(value)`` is true (e.g. unknown promo codes).
+    """
+
+    def __init__(self, name: str, *, max_entries: int = 1024) -> None:
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def _count(self, outcome: str) -> None:
+        self.stats[outcome] += 1
+        inc_counter(
+            "blast_cache_requests_total",
+            labels={"cache": self.name, "outcome": outcome},
+            description="In-process TTL cache lookups by outcome.",
+        )
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        *,
+        ttl: float,
+        negative_ttl: float | None = None,
+        is_negative: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._count("hits")
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._count("misses")
+            else:
+                self._count("coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+            raise
+
+        lifetime = ttl
+        if negative_ttl is not None and is_negative is not None and is_negative(value):
+            lifetime = negative_ttl
+        with self._lock:
+            if lifetime > 0:
+                self._entries[key] = (time.monotonic() + lifetime, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        flight.value = value
+        flight.done.set()
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for outcome in self.stats:
+                self.stats[outcome] = 0
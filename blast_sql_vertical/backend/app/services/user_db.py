@@ -1,11 +1,15 @@
 import json
+import logging
 import sqlite3
 import time
 import uuid
 from contextlib import contextmanager
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
 from app.config import BILLING_COURSE_ID, USER_DB_PATH
+from app.services.metrics_service import timed
+
+logger = logging.getLogger(__name__)
 
 ACCESS_STATUS_VALUES = (
     "active",
@@ -18,6 +22,22 @@ ACCESS_STATUS_VALUES = (
 ACCESS_MANAGED_BY_VALUES = ("stripe", "admin")
 IMPERSONATION_STOP_REASON_VALUES = ("manual_stop", "ttl_expired", "replaced", "invalidated")
 _UNSET = object()
+_USERS_FTS_ENABLED = False
+_ACCESS_CHANGE_LISTENERS: list[Callable[[], None]] = []
+
+
+def on_user_access_change(listener: Callable[[], None]) -> None:
+    """Register a callback run after users are created or their access state is written."""
+    if listener not in _ACCESS_CHANGE_LISTENERS:
+        _ACCESS_CHANGE_LISTENERS.append(listener)
+
+
+def _notify_access_change() -> None:
+    for listener in list(_ACCESS_CHANGE_LISTENERS):
+        try:
+            listener()
+        except Exception:
+            logger.exception("user_access_change_listener_failed")
 
 
 def _row_to_dict(row: sqlite3.Row | None) -> dict | None:
@@ -49,10 +69,30 @@ def _encode_json_object(payload: dict[str, Any] | None) -> str:
     return json.dumps(payload or {}, ensure_ascii=False)
 
 
+class _TimedConnection(sqlite3.Connection):
+    """Times each statement and commit as the ``sqlite`` stage, not the connection's lifetime."""
+
+    def execute(self, *args: Any, **kwargs: Any) -> sqlite3.Cursor:
+        with timed("sqlite"):
+            return super().execute(*args, **kwargs)
+
+    def executemany(self, *args: Any, **kwargs: Any) -> sqlite3.Cursor:
+        with timed("sqlite"):
+            return super().executemany(*args, **kwargs)
+
+    def executescript(self, *args: Any, **kwargs: Any) -> sqlite3.Cursor:
+        with timed("sqlite"):
+            return super().executescript(*args, **kwargs)
+
+    def commit(self) -> None:
+        with timed("sqlite"):
+            super().commit()
+
+
 @contextmanager
 def _connect() -> Iterator[sqlite3.Connection]:
     USER_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(USER_DB_PATH, timeout=20, check_same_thread=False)
+    conn = sqlite3.connect(USER_DB_PATH, timeout=20, check_same_thread=False, factory=_TimedConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
@@ -362,10 +402,114 @@ def init_user_db() -> None:
             conn.execute("ALTER TABLE users ADD COLUMN access_managed_by TEXT NOT NULL DEFAULT 'stripe'")
         if not _column_exists(conn, "users", "access_updated_at"):
             conn.execute("ALTER TABLE users ADD COLUMN access_updated_at INTEGER")
+        if not _column_exists(conn, "users", "latest_purchase_id"):
+            conn.execute("ALTER TABLE users ADD COLUMN latest_purchase_id INTEGER")
         if not _column_exists(conn, "purchases", "stripe_refund_id"):
             conn.execute("ALTER TABLE purchases ADD COLUMN stripe_refund_id TEXT")
         if not _column_exists(conn, "purchases", "refund_reason"):
             conn.execute("ALTER TABLE purchases ADD COLUMN refund_reason TEXT")
+        # Durable webhook queue columns (queue_status is NULL for events processed inline).
+        if not _column_exists(conn, "purchase_email_events", "payload_json"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN payload_json TEXT")
+        if not _column_exists(conn, "purchase_email_events", "queue_status"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN queue_status TEXT")
+        if not _column_exists(conn, "purchase_email_events", "attempts"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        if not _column_exists(conn, "purchase_email_events", "next_attempt_at"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN next_attempt_at INTEGER")
+        if not _column_exists(conn, "purchase_email_events", "locked_at"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN locked_at INTEGER")
+        if not _column_exists(conn, "purchase_email_events", "last_error"):
+            conn.execute("ALTER TABLE purchase_email_events ADD COLUMN last_error TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_purchase_email_events_queue ON purchase_email_events(queue_status, next_attempt_at)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS email_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                to_email TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                html TEXT NOT NULL,
+                stripe_event_id TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at INTEGER NOT NULL,
+                locked_at INTEGER,
+                provider_message_id TEXT,
+                last_error TEXT,
+                created_at INTEGER NOT NULL,
+                sent_at INTEGER
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_email_outbox_status_next_attempt ON email_outbox(status, next_attempt_at)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stripe_reconciliation_checkpoints (
+                name TEXT PRIMARY KEY,
+                phase TEXT NOT NULL,
+                cursor TEXT,
+                stats_json TEXT NOT NULL DEFAULT '{}',
+                started_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL,
+                completed_at INTEGER
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS admin_bulk_jobs (
+                id TEXT PRIMARY KEY,
+                admin_id INTEGER NOT NULL,
+                operation TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                total INTEGER NOT NULL DEFAULT 0,
+                processed INTEGER NOT NULL DEFAULT 0,
+                succeeded INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                skipped INTEGER NOT NULL DEFAULT 0,
+                errors_json TEXT NOT NULL DEFAULT '[]',
+                last_error TEXT,
+                created_at INTEGER NOT NULL,
+                started_at INTEGER,
+                finished_at INTEGER
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_admin_bulk_jobs_admin_created ON admin_bulk_jobs(admin_id, created_at)"
+        )
+        if not _column_exists(conn, "admin_bulk_jobs", "skipped"):
+            conn.execute("ALTER TABLE admin_bulk_jobs ADD COLUMN skipped INTEGER NOT NULL DEFAULT 0")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS admin_stats_history (
+                bucket_start INTEGER PRIMARY KEY,
+                stats_json TEXT NOT NULL,
+                recorded_at INTEGER NOT NULL
+            )
+            """
+        )
+        # Per-user progress rollup kept in sync by upsert_lesson_progress*; drives the admin listing.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_progress_summary (
+                user_id INTEGER PRIMARY KEY,
+                completed_lessons INTEGER NOT NULL DEFAULT 0,
+                last_activity_at INTEGER,
+                updated_at INTEGER NOT NULL,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_progress_summary_completed ON user_progress_summary(completed_lessons)"
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS password_reset_tokens (
@@ -397,6 +541,7 @@ def init_user_db() -> None:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_users_access_status ON users(access_status)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_users_expires_at ON users(expires_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_users_last_login_at ON users(last_login_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)")
         conn.execute(
             """
             UPDATE users
@@ -426,9 +571,63 @@ def init_user_db() -> None:
             """
         )
         _bootstrap_access_fields(conn)
+        _bootstrap_progress_summary(conn)
+        _bootstrap_user_search_index(conn)
         conn.commit()
 
 
+def _bootstrap_user_search_index(conn: sqlite3.Connection) -> None:
+    """Trigram FTS5 index over users.email/full_name, kept in sync by triggers."""
+    global _USERS_FTS_ENABLED
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'").fetchone()
+    if not exists:
+        try:
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE users_fts USING fts5(
+                    email, full_name, content='users', content_rowid='id', tokenize='trigram'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer): search falls back to LIKE.
+            _USERS_FTS_ENABLED = False
+            return
+        conn.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS users_fts_after_insert AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts(rowid, email, full_name) VALUES (new.id, new.email, new.full_name);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS users_fts_after_delete AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS users_fts_after_update AFTER UPDATE OF email, full_name ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name);
+            INSERT INTO users_fts(rowid, email, full_name) VALUES (new.id, new.email, new.full_name);
+        END
+        """
+    )
+    _USERS_FTS_ENABLED = True
+
+
+def user_search_match_expression(term: str) -> str | None:
+    """FTS5 MATCH expression for a substring search, or None when the LIKE fallback must be used."""
+    clean = (term or "").strip()
+    # The trigram tokenizer can only match terms of at least three characters.
+    if not _USERS_FTS_ENABLED or len(clean) < 3:
+        return None
+    return '"' + clean.replace('"', '""') + '"'
+
+
 def count_users() -> int:
     with _connect() as conn:
         row = conn.execute("SELECT COUNT(*) AS n FROM users").fetchone()
@@ -494,8 +693,13 @@ def create_user(
             """,
             (cur.lastrowid,),
         ).fetchone()
+        conn.execute(
+            "INSERT OR IGNORE INTO user_progress_summary (user_id, completed_lessons, updated_at) VALUES (?, 0, ?)",
+            (cur.lastrowid, now),
+        )
         conn.commit()
-        return _row_to_dict(row) or {}
+    _notify_access_change()
+    return _row_to_dict(row) or {}
 
 
 def get_user_by_email(email: str) -> dict | None:
@@ -992,7 +1196,8 @@ def update_user_access_state(
             (user_id,),
         ).fetchone()
         conn.commit()
-        return _row_to_dict(row)
+    _notify_access_change()
+    return _row_to_dict(row)
 
 
 def create_admin_audit_log(
@@ -1100,6 +1305,7 @@ def upsert_lesson_progress(user_id: int, lesson_id: str, progress: dict, is_comp
             """,
             (user_id, lesson_id, progress_json, 1 if is_completed else 0, now, now),
         )
+        _refresh_progress_summary(conn, user_id, now)
         row = conn.execute(
             """
             SELECT user_id, lesson_id, progress_json, is_completed, created_at, updated_at
@@ -1116,6 +1322,98 @@ def upsert_lesson_progress(user_id: int, lesson_id: str, progress: dict, is_comp
     return data
 
 
+def upsert_lesson_progress_batch(user_id: int, entries: list[tuple[str, dict, bool]]) -> int:
+    """Write several ``(lesson_id, progress, is_completed)`` rows and the summary in one transaction."""
+    if not entries:
+        return 0
+    now = int(time.time())
+    params = [
+        (
+            user_id,
+            lesson_id,
+            json.dumps(progress if isinstance(progress, dict) else {}, ensure_ascii=False),
+            1 if is_completed else 0,
+            now,
+            now,
+        )
+        for lesson_id, progress, is_completed in entries
+    ]
+    with _connect() as conn:
+        conn.executemany(
+            """
+            INSERT INTO lesson_progress (user_id, lesson_id, progress_json, is_completed, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, lesson_id)
+            DO UPDATE SET
+                progress_json = excluded.progress_json,
+                is_completed = excluded.is_completed,
+                updated_at = excluded.updated_at
+            """,
+            params,
+        )
+        _refresh_progress_summary(conn, user_id, now)
+        conn.commit()
+    return len(params)
+
+
+_PROGRESS_SUMMARY_UPSERT_SQL = """
+    INSERT INTO user_progress_summary (user_id, completed_lessons, last_activity_at, updated_at)
+    SELECT
+        u.id,
+        (SELECT COUNT(*) FROM lesson_progress lp WHERE lp.user_id = u.id AND lp.is_completed = 1),
+        (SELECT MAX(lp.updated_at) FROM lesson_progress lp WHERE lp.user_id = u.id),
+        :now
+    FROM users u
+    WHERE {where}
+    ON CONFLICT(user_id) DO UPDATE SET
+        completed_lessons = excluded.completed_lessons,
+        last_activity_at = excluded.last_activity_at,
+        updated_at = excluded.updated_at
+"""
+
+_LATEST_PURCHASE_UPDATE_SQL = """
+    UPDATE users
+    SET latest_purchase_id = (
+        SELECT p.id FROM purchases p
+        WHERE p.user_id = users.id
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT 1
+    )
+    WHERE {where}
+"""
+
+
+def _refresh_progress_summary(conn: sqlite3.Connection, user_id: int, now: int) -> None:
+    conn.execute(_PROGRESS_SUMMARY_UPSERT_SQL.format(where="u.id = :user_id"), {"user_id": user_id, "now": now})
+
+
+def _bootstrap_progress_summary(conn: sqlite3.Connection) -> None:
+    now = int(time.time())
+    conn.execute(
+        _PROGRESS_SUMMARY_UPSERT_SQL.format(
+            where="NOT EXISTS (SELECT 1 FROM user_progress_summary s WHERE s.user_id = u.id)"
+        ),
+        {"now": now},
+    )
+    conn.execute(
+        _LATEST_PURCHASE_UPDATE_SQL.format(
+            where="latest_purchase_id IS NULL AND EXISTS (SELECT 1 FROM purchases p WHERE p.user_id = users.id)"
+        )
+    )
+
+
+def rebuild_user_progress_summary() -> dict[str, int]:
+    """Recompute every user's progress summary and ``latest_purchase_id`` from the source tables."""
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM user_progress_summary WHERE user_id NOT IN (SELECT id FROM users)")
+        summaries = conn.execute(_PROGRESS_SUMMARY_UPSERT_SQL.format(where="1 = 1"), {"now": now}).rowcount
+        purchases = conn.execute(_LATEST_PURCHASE_UPDATE_SQL.format(where="1 = 1")).rowcount
+        conn.commit()
+    return {"summaries": int(summaries), "users": int(purchases)}
+
+
 def list_progress_for_lessons(user_id: int, lesson_ids: list[str]) -> dict[str, dict]:
     if not lesson_ids:
         return {}
@@ -1148,6 +1446,129 @@ def list_progress_for_lessons(user_id: int, lesson_ids: list[str]) -> dict[str,
     return result
 
 
+def load_admin_user_detail(
+    user_id: int,
+    lesson_ids: list[str],
+    *,
+    now_ts: int | None = None,
+    session_limit: int = 10,
+    audit_limit: int = 20,
+) -> dict | None:
+    """Load everything the admin user detail view needs in one connection and transaction.
+
+    A granted status whose ``expires_at`` has passed is flipped to ``expired`` first, in the
+    same transaction. Only then is the write lock taken; other views read in a deferred
+    transaction. Statement texts are fixed so sqlite3's per-connection cache reuses them.
+    """
+    now = int(now_ts or time.time())
+    unique_ids = [lesson_id for lesson_id in dict.fromkeys(lesson_ids) if lesson_id]
+    with _connect() as conn:
+        # Checked before the transaction starts: upgrading a WAL read snapshot to a write
+        # fails with SQLITE_BUSY instead of waiting, so the lock mode is chosen up front.
+        needs_expiry = (
+            conn.execute(
+                """
+                SELECT 1 FROM users
+                WHERE id = ?
+                  AND access_status IN ('active', 'manual_grant')
+                  AND expires_at IS NOT NULL
+                  AND expires_at <= ?
+                """,
+                (user_id, now),
+            ).fetchone()
+            is not None
+        )
+        conn.execute("BEGIN IMMEDIATE" if needs_expiry else "BEGIN")
+        expired = 0
+        if needs_expiry:
+            expired = conn.execute(
+                """
+                UPDATE users
+                SET access_status = 'expired', access_updated_at = ?, updated_at = ?
+                WHERE id = ?
+                  AND access_status IN ('active', 'manual_grant')
+                  AND expires_at IS NOT NULL
+                  AND expires_at <= ?
+                """,
+                (now, now, user_id, now),
+            ).rowcount
+        user_row = conn.execute(
+            """
+            SELECT id, email, full_name, password_hash, stripe_customer_id, cpf_encrypted, role, is_active,
+                   last_login_at, access_status, expires_at, access_managed_by, access_updated_at, created_at, updated_at
+            FROM users
+            WHERE id = ?
+            """,
+            (user_id,),
+        ).fetchone()
+        if not user_row:
+            conn.rollback()
+            return None
+        progress_rows = conn.execute(
+            """
+            SELECT user_id, lesson_id, progress_json, is_completed, created_at, updated_at
+            FROM lesson_progress
+            WHERE user_id = ? AND lesson_id IN (SELECT value FROM json_each(?))
+            """,
+            (user_id, json.dumps(unique_ids)),
+        ).fetchall()
+        purchase_row = conn.execute(
+            """
+            SELECT id, user_id, course_id, status, stripe_checkout_session_id, stripe_payment_intent_id,
+                   amount, currency, created_at, paid_at, refunded_at, metadata,
+                   stripe_refund_id, refund_reason
+            FROM purchases
+            WHERE id = (SELECT latest_purchase_id FROM users WHERE id = ?)
+            """,
+            (user_id,),
+        ).fetchone()
+        session_rows = conn.execute(
+            """
+            SELECT id, user_id, created_at, expires_at, last_seen_at
+            FROM user_sessions
+            WHERE user_id = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (user_id, max(1, min(50, int(session_limit)))),
+        ).fetchall()
+        audit_rows = conn.execute(
+            """
+            SELECT id, admin_id, target_user_id, action_type, reason, before_json, after_json, created_at
+            FROM admin_audit_logs
+            WHERE target_user_id = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (user_id, max(1, min(100, int(audit_limit)))),
+        ).fetchall()
+        conn.commit()
+
+    if expired:
+        _notify_access_change()
+
+    progress: dict[str, dict] = {}
+    for row in progress_rows:
+        data = _row_to_dict(row) or {}
+        data["progress"] = _decode_progress(data.get("progress_json"))
+        progress[str(data["lesson_id"])] = data
+
+    audit_logs = []
+    for row in audit_rows:
+        data = _row_to_dict(row) or {}
+        data["before"] = _decode_json_object(data.pop("before_json", None))
+        data["after"] = _decode_json_object(data.pop("after_json", None))
+        audit_logs.append(data)
+
+    return {
+        "user": _row_to_dict(user_row),
+        "progress": progress,
+        "latest_purchase": _decode_purchase_row(purchase_row) or {},
+        "sessions": [_row_to_dict(row) or {} for row in session_rows],
+        "audit_logs": audit_logs,
+    }
+
+
 def _decode_checkout_signup_intent_row(row: sqlite3.Row | None) -> dict | None:
     return _row_to_dict(row)
 
@@ -1447,70 +1868,424 @@ def mark_purchase_email_event_processed(
         return _decode_purchase_email_event_row(row)
 
 
-def has_sent_purchase_confirmation_email(
+def enqueue_stripe_webhook_event(
+    stripe_event_id: str,
+    event_type: str,
+    payload_json: str,
     stripe_session_id: str | None = None,
-    purchase_id: int | None = None,
-) -> bool:
-    clean_session_id = (stripe_session_id or "").strip()
-    if not clean_session_id and purchase_id is None:
-        return False
+    stripe_payment_intent_id: str | None = None,
+) -> dict | None:
+    """Persist a verified webhook for background processing.
 
-    query = """
-        SELECT 1
-        FROM purchase_email_events
-        WHERE email_sent_at IS NOT NULL
+    Redeliveries of an event that is already queued or processed are no-ops; a
+    redelivered dead-lettered event is re-armed with a fresh attempt budget.
     """
-    params: list[Any] = []
-    clauses: list[str] = []
-    if clean_session_id:
-        clauses.append("stripe_session_id = ?")
-        params.append(clean_session_id)
-    if purchase_id is not None:
-        clauses.append("purchase_id = ?")
-        params.append(int(purchase_id))
-    query += f" AND ({' OR '.join(clauses)}) LIMIT 1"
+    event_id = (stripe_event_id or "").strip()
+    if not event_id:
+        return None
+    now = int(time.time())
+    clean_event_type = (event_type or "").strip() or "unknown"
+    clean_session_id = (stripe_session_id or "").strip() or None
+    clean_payment_intent_id = (stripe_payment_intent_id or "").strip() or None
 
     with _connect() as conn:
-        row = conn.execute(query, tuple(params)).fetchone()
-        return row is not None
+        conn.execute(
+            """
+            INSERT INTO purchase_email_events (
+                stripe_event_id,
+                stripe_session_id,
+                stripe_payment_intent_id,
+                event_type,
+                payload_json,
+                queue_status,
+                attempts,
+                next_attempt_at,
+                created_at
+            )
+            VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, ?)
+            ON CONFLICT(stripe_event_id)
+            DO UPDATE SET
+                stripe_session_id = COALESCE(purchase_email_events.stripe_session_id, excluded.stripe_session_id),
+                stripe_payment_intent_id = COALESCE(
+                    purchase_email_events.stripe_payment_intent_id,
+                    excluded.stripe_payment_intent_id
+                ),
+                payload_json = CASE
+                    WHEN purchase_email_events.processed_at IS NOT NULL THEN purchase_email_events.payload_json
+                    ELSE excluded.payload_json
+                END,
+                queue_status = CASE
+                    WHEN purchase_email_events.processed_at IS NOT NULL THEN 'done'
+                    WHEN purchase_email_events.queue_status IN ('pending', 'processing')
+                        THEN purchase_email_events.queue_status
+                    ELSE 'pending'
+                END,
+                attempts = CASE
+                    WHEN purchase_email_events.queue_status = 'dead' THEN 0
+                    ELSE purchase_email_events.attempts
+                END,
+                next_attempt_at = CASE
+                    WHEN purchase_email_events.processed_at IS NULL
+                        AND COALESCE(purchase_email_events.queue_status, '') NOT IN ('pending', 'processing')
+                        THEN excluded.next_attempt_at
+                    ELSE purchase_email_events.next_attempt_at
+                END
+            """,
+            (
+                event_id,
+                clean_session_id,
+                clean_payment_intent_id,
+                clean_event_type,
+                payload_json,
+                now,
+                now,
+            ),
+        )
+        row = conn.execute(
+            """
+            SELECT stripe_event_id, event_type, processed_at, queue_status, attempts, next_attempt_at, created_at
+            FROM purchase_email_events
+            WHERE stripe_event_id = ?
+            LIMIT 1
+            """,
+            (event_id,),
+        ).fetchone()
+        conn.commit()
+        return _row_to_dict(row)
 
 
-def update_user_stripe_customer_id(user_id: int, stripe_customer_id: str) -> None:
-    customer_id = (stripe_customer_id or "").strip()
-    if not customer_id:
-        return
-    now = int(time.time())
+def claim_stripe_webhook_events(
+    limit: int,
+    *,
+    now_ts: int | None = None,
+    lock_timeout_seconds: int = 300,
+) -> list[dict]:
+    """Atomically lease due queued events (including stale leases of crashed workers)."""
+    now = int(now_ts or time.time())
+    stale_before = now - max(0, int(lock_timeout_seconds))
     with _connect() as conn:
-        conn.execute(
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
             """
-            UPDATE users
-            SET stripe_customer_id = ?, updated_at = ?
-            WHERE id = ?
+            SELECT stripe_event_id, event_type, payload_json, attempts, created_at
+            FROM purchase_email_events
+            WHERE (queue_status = 'pending' AND next_attempt_at <= ?)
+               OR (queue_status = 'processing' AND locked_at <= ?)
+            ORDER BY created_at ASC, stripe_event_id ASC
+            LIMIT ?
             """,
-            (customer_id, now, user_id),
+            (now, stale_before, max(1, int(limit))),
+        ).fetchall()
+        claimed = [_row_to_dict(row) or {} for row in rows]
+        for item in claimed:
+            item["attempts"] = int(item.get("attempts") or 0) + 1
+        conn.executemany(
+            """
+            UPDATE purchase_email_events
+            SET queue_status = 'processing', locked_at = ?, attempts = ?
+            WHERE stripe_event_id = ?
+            """,
+            [(now, item["attempts"], item["stripe_event_id"]) for item in claimed],
         )
         conn.commit()
+        return claimed
 
 
-def update_user_cpf_if_empty(user_id: int, cpf_encrypted: str) -> None:
-    cpf = (cpf_encrypted or "").strip()
-    if not cpf:
-        return
-    now = int(time.time())
+def complete_stripe_webhook_event(stripe_event_id: str) -> None:
+    """Finish a queued event; the raw payload is dropped since it may carry personal data."""
     with _connect() as conn:
         conn.execute(
             """
-            UPDATE users
-            SET cpf_encrypted = ?, updated_at = ?
-            WHERE id = ? AND (cpf_encrypted IS NULL OR cpf_encrypted = '')
+            UPDATE purchase_email_events
+            SET queue_status = 'done', locked_at = NULL, last_error = NULL, payload_json = NULL
+            WHERE stripe_event_id = ?
             """,
-            (cpf, now, user_id),
+            ((stripe_event_id or "").strip(),),
         )
         conn.commit()
 
 
-def create_purchase(
-    user_id: int,
+def fail_stripe_webhook_event(
+    stripe_event_id: str,
+    *,
+    error: str,
+    next_attempt_at: int | None,
+) -> None:
+    """Schedule a retry, or dead-letter the event when ``next_attempt_at`` is None."""
+    with _connect() as conn:
+        conn.execute(
+            """
+            UPDATE purchase_email_events
+            SET queue_status = ?, next_attempt_at = ?, locked_at = NULL, last_error = ?
+            WHERE stripe_event_id = ?
+            """,
+            (
+                "pending" if next_attempt_at is not None else "dead",
+                next_attempt_at,
+                (error or "").strip()[:1000] or None,
+                (stripe_event_id or "").strip(),
+            ),
+        )
+        conn.commit()
+
+
+def get_stripe_webhook_queue_stats(now_ts: int | None = None) -> dict[str, Any]:
+    now = int(now_ts or time.time())
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT queue_status, COUNT(*) AS total, MIN(created_at) AS oldest_created_at
+            FROM purchase_email_events
+            WHERE queue_status IN ('pending', 'processing', 'dead')
+            GROUP BY queue_status
+            """
+        ).fetchall()
+    stats: dict[str, Any] = {"pending": 0, "processing": 0, "dead": 0, "lag_seconds": 0}
+    oldest: list[int] = []
+    for row in rows:
+        stats[str(row["queue_status"])] = int(row["total"])
+        if row["queue_status"] != "dead" and row["oldest_created_at"] is not None:
+            oldest.append(int(row["oldest_created_at"]))
+    if oldest:
+        stats["lag_seconds"] = max(0, now - min(oldest))
+    return stats
+
+
+def enqueue_email_outbox(
+    *,
+    idempotency_key: str,
+    kind: str,
+    to_email: str,
+    subject: str,
+    html: str,
+    stripe_event_id: str | None = None,
+) -> tuple[dict, bool]:
+    """Insert an outbound email unless one with the same idempotency key exists.
+
+    Returns the outbox row and whether it was newly created.
+    """
+    now = int(time.time())
+    with _connect() as conn:
+        cursor = conn.execute(
+            """
+            INSERT OR IGNORE INTO email_outbox (
+                idempotency_key, kind, to_email, subject, html, stripe_event_id, next_attempt_at, created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                idempotency_key,
+                kind,
+                (to_email or "").strip().lower(),
+                subject,
+                html,
+                (stripe_event_id or "").strip() or None,
+                now,
+                now,
+            ),
+        )
+        created = cursor.rowcount > 0
+        row = conn.execute(
+            """
+            SELECT id, idempotency_key, kind, to_email, stripe_event_id, status, attempts, provider_message_id, created_at
+            FROM email_outbox
+            WHERE idempotency_key = ?
+            """,
+            (idempotency_key,),
+        ).fetchone()
+        conn.commit()
+        return _row_to_dict(row) or {}, created
+
+
+def claim_email_outbox_batch(
+    limit: int,
+    *,
+    now_ts: int | None = None,
+    lock_timeout_seconds: int = 300,
+) -> list[dict]:
+    """Atomically lease up to ``limit`` due outbox emails (including stale leases)."""
+    now = int(now_ts or time.time())
+    stale_before = now - max(0, int(lock_timeout_seconds))
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            """
+            SELECT id, idempotency_key, kind, to_email, subject, html, stripe_event_id, attempts
+            FROM email_outbox
+            WHERE (status = 'pending' AND next_attempt_at <= ?)
+               OR (status = 'sending' AND locked_at <= ?)
+            ORDER BY id ASC
+            LIMIT ?
+            """,
+            (now, stale_before, max(1, int(limit))),
+        ).fetchall()
+        claimed = [_row_to_dict(row) or {} for row in rows]
+        for item in claimed:
+            item["attempts"] = int(item.get("attempts") or 0) + 1
+        conn.executemany(
+            "UPDATE email_outbox SET status = 'sending', locked_at = ?, attempts = ? WHERE id = ?",
+            [(now, item["attempts"], item["id"]) for item in claimed],
+        )
+        conn.commit()
+        return claimed
+
+
+def mark_email_outbox_sent(results: list[tuple[int, str | None]], sent_at: int | None = None) -> None:
+    """Mark ``(outbox_id, provider_message_id)`` pairs as sent and copy them to purchase_email_events.
+
+    The rendered body is dropped since it may carry a password reset link.
+    """
+    if not results:
+        return
+    now = int(sent_at or time.time())
+    with _connect() as conn:
+        conn.executemany(
+            """
+            UPDATE email_outbox
+            SET status = 'sent', sent_at = ?, provider_message_id = ?, locked_at = NULL, last_error = NULL, html = ''
+            WHERE id = ?
+            """,
+            [(now, provider_message_id, outbox_id) for outbox_id, provider_message_id in results],
+        )
+        conn.executemany(
+            """
+            UPDATE purchase_email_events
+            SET email_sent_at = COALESCE(email_sent_at, ?),
+                email_provider_message_id = COALESCE(?, email_provider_message_id),
+                email_error = NULL
+            WHERE stripe_event_id = (SELECT stripe_event_id FROM email_outbox WHERE id = ?)
+            """,
+            [(now, provider_message_id, outbox_id) for outbox_id, provider_message_id in results],
+        )
+        conn.commit()
+
+
+def mark_email_outbox_failed(outbox_ids: list[int], *, error: str, next_attempt_at: int | None) -> None:
+    """Schedule a retry, or dead-letter the emails (and flag their webhook event) when ``next_attempt_at`` is None.
+
+    Dead-lettered rows lose their rendered body, like sent ones.
+    """
+    if not outbox_ids:
+        return
+    clean_error = (error or "").strip()[:1000] or "email send failed"
+    with _connect() as conn:
+        conn.executemany(
+            """
+            UPDATE email_outbox
+            SET status = ?, next_attempt_at = COALESCE(?, next_attempt_at), locked_at = NULL, last_error = ?,
+                html = CASE WHEN ? IS NULL THEN '' ELSE html END
+            WHERE id = ?
+            """,
+            [
+                (
+                    "pending" if next_attempt_at is not None else "dead",
+                    next_attempt_at,
+                    clean_error,
+                    next_attempt_at,
+                    outbox_id,
+                )
+                for outbox_id in outbox_ids
+            ],
+        )
+        if next_attempt_at is None:
+            conn.executemany(
+                """
+                UPDATE purchase_email_events
+                SET email_error = ?
+                WHERE email_sent_at IS NULL
+                  AND stripe_event_id = (SELECT stripe_event_id FROM email_outbox WHERE id = ?)
+                """,
+                [(clean_error, outbox_id) for outbox_id in outbox_ids],
+            )
+        conn.commit()
+
+
+def get_email_outbox_stats(now_ts: int | None = None) -> dict[str, Any]:
+    now = int(now_ts or time.time())
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT status, COUNT(*) AS total, MIN(created_at) AS oldest_created_at
+            FROM email_outbox
+            WHERE status IN ('pending', 'sending', 'dead')
+            GROUP BY status
+            """
+        ).fetchall()
+    stats: dict[str, Any] = {"pending": 0, "sending": 0, "dead": 0, "lag_seconds": 0}
+    oldest: list[int] = []
+    for row in rows:
+        stats[str(row["status"])] = int(row["total"])
+        if row["status"] != "dead" and row["oldest_created_at"] is not None:
+            oldest.append(int(row["oldest_created_at"]))
+    if oldest:
+        stats["lag_seconds"] = max(0, now - min(oldest))
+    return stats
+
+
+def has_sent_purchase_confirmation_email(
+    stripe_session_id: str | None = None,
+    purchase_id: int | None = None,
+) -> bool:
+    clean_session_id = (stripe_session_id or "").strip()
+    if not clean_session_id and purchase_id is None:
+        return False
+
+    query = """
+        SELECT 1
+        FROM purchase_email_events
+        WHERE email_sent_at IS NOT NULL
+    """
+    params: list[Any] = []
+    clauses: list[str] = []
+    if clean_session_id:
+        clauses.append("stripe_session_id = ?")
+        params.append(clean_session_id)
+    if purchase_id is not None:
+        clauses.append("purchase_id = ?")
+        params.append(int(purchase_id))
+    query += f" AND ({' OR '.join(clauses)}) LIMIT 1"
+
+    with _connect() as conn:
+        row = conn.execute(query, tuple(params)).fetchone()
+        return row is not None
+
+
+def update_user_stripe_customer_id(user_id: int, stripe_customer_id: str) -> None:
+    customer_id = (stripe_customer_id or "").strip()
+    if not customer_id:
+        return
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute(
+            """
+            UPDATE users
+            SET stripe_customer_id = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (customer_id, now, user_id),
+        )
+        conn.commit()
+
+
+def update_user_cpf_if_empty(user_id: int, cpf_encrypted: str) -> None:
+    cpf = (cpf_encrypted or "").strip()
+    if not cpf:
+        return
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute(
+            """
+            UPDATE users
+            SET cpf_encrypted = ?, updated_at = ?
+            WHERE id = ? AND (cpf_encrypted IS NULL OR cpf_encrypted = '')
+            """,
+            (cpf, now, user_id),
+        )
+        conn.commit()
+
+
+def create_purchase(
+    user_id: int,
     course_id: str,
     status: str = "pending",
     metadata: dict[str, Any] | None = None,
@@ -1524,6 +2299,10 @@ def create_purchase(
             """,
             (user_id, course_id, status, now, _encode_json_object(metadata)),
         )
+        conn.execute(
+            "UPDATE users SET latest_purchase_id = ? WHERE id = ?",
+            (cur.lastrowid, user_id),
+        )
         row = conn.execute(
             """
             SELECT id, user_id, course_id, status, stripe_checkout_session_id, stripe_payment_intent_id,
@@ -1960,3 +2739,444 @@ def mark_purchase_refunded_by_payment_intent(
         ).fetchone()
         conn.commit()
         return _decode_purchase_row(row), updated
+
+
+def record_admin_stats_snapshot(bucket_start: int, stats: dict[str, Any], recorded_at: int | None = None) -> None:
+    """Store the latest dashboard stats for a time bucket (later snapshots in the bucket win)."""
+    ts = int(recorded_at or time.time())
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO admin_stats_history (bucket_start, stats_json, recorded_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(bucket_start) DO UPDATE SET
+                stats_json = excluded.stats_json,
+                recorded_at = excluded.recorded_at
+            """,
+            (int(bucket_start), _encode_json_object(stats), ts),
+        )
+        conn.commit()
+
+
+def list_admin_stats_history(since_ts: int, limit: int = 1000) -> list[dict]:
+    """Buckets since ``since_ts``, oldest first; when over ``limit``, the newest ones are kept."""
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT bucket_start, stats_json, recorded_at
+            FROM admin_stats_history
+            WHERE bucket_start >= ?
+            ORDER BY bucket_start DESC
+            LIMIT ?
+            """,
+            (int(since_ts), max(1, int(limit))),
+        ).fetchall()
+    return [
+        {
+            "bucket_start": int(row["bucket_start"]),
+            "recorded_at": int(row["recorded_at"]),
+            "stats": _decode_json_object(row["stats_json"]),
+        }
+        for row in reversed(rows)
+    ]
+
+
+def get_reconciliation_checkpoint(name: str) -> dict | None:
+    with _connect() as conn:
+        row = conn.execute(
+            """
+            SELECT name, phase, cursor, stats_json, started_at, updated_at, completed_at
+            FROM stripe_reconciliation_checkpoints
+            WHERE name = ?
+            LIMIT 1
+            """,
+            (name,),
+        ).fetchone()
+    data = _row_to_dict(row)
+    if data is not None:
+        data["stats"] = _decode_json_object(data.pop("stats_json", None))
+    return data
+
+
+def save_reconciliation_checkpoint(
+    name: str,
+    *,
+    phase: str,
+    cursor: str | None,
+    stats: dict[str, Any],
+    started_at: int,
+    completed: bool = False,
+) -> None:
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO stripe_reconciliation_checkpoints (
+                name, phase, cursor, stats_json, started_at, updated_at, completed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name)
+            DO UPDATE SET
+                phase = excluded.phase,
+                cursor = excluded.cursor,
+                stats_json = excluded.stats_json,
+                started_at = excluded.started_at,
+                updated_at = excluded.updated_at,
+                completed_at = excluded.completed_at
+            """,
+            (name, phase, cursor, _encode_json_object(stats), started_at, now, now if completed else None),
+        )
+        conn.commit()
+
+
+def _reconciliation_user_rows(conn: sqlite3.Connection, where_sql: str, params: list[Any], course_id: str) -> list[dict]:
+    rows = conn.execute(
+        f"""
+        SELECT u.id AS user_id, u.stripe_customer_id, u.access_status, u.expires_at, u.access_managed_by,
+               lp.id AS purchase_id, lp.stripe_payment_intent_id,
+               g.expires_at AS grant_expires_at
+        FROM users u
+        LEFT JOIN purchases lp ON lp.id = (
+            SELECT p2.id FROM purchases p2
+            WHERE p2.user_id = u.id AND p2.course_id = ?
+            ORDER BY p2.created_at DESC, p2.id DESC
+            LIMIT 1
+        )
+        LEFT JOIN access_grants g ON g.user_id = u.id AND g.course_id = ?
+        WHERE {where_sql}
+        """,
+        [course_id, course_id, *params],
+    ).fetchall()
+    return [_row_to_dict(row) or {} for row in rows]
+
+
+def get_reconciliation_targets_by_payment_intent_ids(payment_intent_ids: list[str], course_id: str) -> list[dict]:
+    """Users whose latest purchase in ``course_id`` is one of ``payment_intent_ids``."""
+    clean_ids = sorted({pid for pid in payment_intent_ids if pid})
+    if not clean_ids:
+        return []
+    placeholders = ", ".join("?" for _ in clean_ids)
+    with _connect() as conn:
+        return _reconciliation_user_rows(
+            conn,
+            f"u.id IN (SELECT user_id FROM purchases WHERE stripe_payment_intent_id IN ({placeholders})) "
+            f"AND lp.stripe_payment_intent_id IN ({placeholders})",
+            [*clean_ids, *clean_ids],
+            course_id,
+        )
+
+
+def get_reconciliation_targets_by_customer_ids(customer_ids: list[str], course_id: str) -> list[dict]:
+    clean_ids = sorted({cid for cid in customer_ids if cid})
+    if not clean_ids:
+        return []
+    placeholders = ", ".join("?" for _ in clean_ids)
+    with _connect() as conn:
+        return _reconciliation_user_rows(conn, f"u.stripe_customer_id IN ({placeholders})", clean_ids, course_id)
+
+
+def apply_access_corrections(
+    corrections: list[dict[str, Any]],
+    *,
+    admin_id: int | None = None,
+    reason: str = "stripe_reconciliation",
+) -> int:
+    """Apply ``{"user_id", "access_status", "expires_at", "before"}`` corrections in one transaction.
+
+    Each user is updated with its own guarded statement; users whose access is managed by an
+    admin are never touched. When ``admin_id`` is given, audit log rows are written only for
+    the users actually updated. Returns the number of users updated.
+    """
+    if not corrections:
+        return 0
+    now = int(time.time())
+    applied: list[dict[str, Any]] = []
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for item in corrections:
+            cursor = conn.execute(
+                """
+                UPDATE users
+                SET access_status = ?, expires_at = ?, access_managed_by = 'stripe',
+                    access_updated_at = ?, updated_at = ?
+                WHERE id = ? AND COALESCE(access_managed_by, 'stripe') != 'admin'
+                """,
+                (item["access_status"], item["expires_at"], now, now, int(item["user_id"])),
+            )
+            if cursor.rowcount == 1:
+                applied.append(item)
+        if admin_id is not None and applied:
+            conn.executemany(
+                """
+                INSERT INTO admin_audit_logs (
+                    admin_id, target_user_id, action_type, reason, before_json, after_json, created_at
+                )
+                VALUES (?, ?, 'stripe_refresh', ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        admin_id,
+                        int(item["user_id"]),
+                        reason,
+                        _encode_json_object(item.get("before")),
+                        _encode_json_object({"access_status": item["access_status"], "expires_at": item["expires_at"]}),
+                        now,
+                    )
+                    for item in applied
+                ],
+            )
+        conn.commit()
+    if applied:
+        _notify_access_change()
+    return len(applied)
+
+
+def create_admin_bulk_job(job_id: str, *, admin_id: int, operation: str, total: int) -> dict:
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO admin_bulk_jobs (id, admin_id, operation, status, total, created_at)
+            VALUES (?, ?, ?, 'queued', ?, ?)
+            """,
+            (job_id, admin_id, operation, int(total), now),
+        )
+        conn.commit()
+    return get_admin_bulk_job(job_id) or {}
+
+
+def update_admin_bulk_job(
+    job_id: str,
+    *,
+    status: str | None = None,
+    processed: int | None = None,
+    succeeded: int | None = None,
+    failed: int | None = None,
+    skipped: int | None = None,
+    errors: list[dict[str, Any]] | None = None,
+    last_error: str | None = None,
+) -> None:
+    now = int(time.time())
+    updates: list[str] = []
+    params: list[Any] = []
+    if status is not None:
+        updates.append("status = ?")
+        params.append(status)
+        if status == "running":
+            updates.append("started_at = COALESCE(started_at, ?)")
+            params.append(now)
+        elif status in ("completed", "failed"):
+            updates.append("finished_at = ?")
+            params.append(now)
+    counters = (("processed", processed), ("succeeded", succeeded), ("failed", failed), ("skipped", skipped))
+    for column, value in counters:
+        if value is not None:
+            updates.append(f"{column} = ?")
+            params.append(int(value))
+    if errors is not None:
+        updates.append("errors_json = ?")
+        params.append(json.dumps(errors, ensure_ascii=False))
+    if last_error is not None:
+        updates.append("last_error = ?")
+        params.append(last_error[:500])
+    if not updates:
+        return
+    params.append(job_id)
+    with _connect() as conn:
+        conn.execute(f"UPDATE admin_bulk_jobs SET {', '.join(updates)} WHERE id = ?", params)
+        conn.commit()
+
+
+def get_admin_bulk_job(job_id: str) -> dict | None:
+    with _connect() as conn:
+        row = conn.execute(
+            """
+            SELECT id, admin_id, operation, status, total, processed, succeeded, failed, skipped, errors_json,
+                   last_error, created_at, started_at, finished_at
+            FROM admin_bulk_jobs
+            WHERE id = ?
+            LIMIT 1
+            """,
+            (job_id,),
+        ).fetchone()
+    data = _row_to_dict(row)
+    if data is not None:
+        try:
+            errors = json.loads(data.pop("errors_json", None) or "[]")
+        except Exception:
+            errors = []
+        data["errors"] = errors if isinstance(errors, list) else []
+    return data
+
+
+def fail_unfinished_admin_bulk_jobs(error: str) -> int:
+    """Mark queued/running jobs failed; they only run in-process, so none survive a restart."""
+    now = int(time.time())
+    with _connect() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE admin_bulk_jobs
+            SET status = 'failed', last_error = ?, finished_at = ?
+            WHERE status IN ('queued', 'running')
+            """,
+            (error[:500], now),
+        )
+        conn.commit()
+        return int(cursor.rowcount or 0)
+
+
+def get_user_ids_by_emails(emails: list[str]) -> dict[str, int]:
+    clean = [email for email in dict.fromkeys((e or "").strip().lower() for e in emails) if email]
+    if not clean:
+        return {}
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, email FROM users WHERE email IN (SELECT value FROM json_each(?))",
+            (json.dumps(clean),),
+        ).fetchall()
+    return {str(row["email"]): int(row["id"]) for row in rows}
+
+
+def get_user_access_rows(user_ids: list[int]) -> dict[int, dict]:
+    if not user_ids:
+        return {}
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, email, access_status, expires_at, access_managed_by
+            FROM users
+            WHERE id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps([int(user_id) for user_id in user_ids]),),
+        ).fetchall()
+    return {int(row["id"]): _row_to_dict(row) or {} for row in rows}
+
+
+def list_progress_for_users(user_ids: list[int], lesson_ids: list[str]) -> dict[int, dict[str, dict]]:
+    """``{user_id: {lesson_id: row}}`` for many users in one query (see list_progress_for_lessons)."""
+    if not user_ids or not lesson_ids:
+        return {}
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT user_id, lesson_id, progress_json, is_completed, created_at, updated_at
+            FROM lesson_progress
+            WHERE user_id IN (SELECT value FROM json_each(?))
+              AND lesson_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps([int(user_id) for user_id in user_ids]), json.dumps(list(dict.fromkeys(lesson_ids)))),
+        ).fetchall()
+    result: dict[int, dict[str, dict]] = {}
+    for row in rows:
+        data = _row_to_dict(row) or {}
+        data["progress"] = _decode_progress(data.get("progress_json"))
+        result.setdefault(int(data["user_id"]), {})[str(data["lesson_id"])] = data
+    return result
+
+
+def _insert_admin_audit_logs(
+    conn: sqlite3.Connection,
+    *,
+    admin_id: int,
+    action_type: str,
+    reason: str,
+    entries: list[tuple[int, dict[str, Any], dict[str, Any]]],
+    now: int,
+) -> None:
+    conn.executemany(
+        """
+        INSERT INTO admin_audit_logs (
+            admin_id, target_user_id, action_type, reason, before_json, after_json, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (admin_id, int(user_id), action_type, reason, _encode_json_object(before), _encode_json_object(after), now)
+            for user_id, before, after in entries
+        ],
+    )
+
+
+def apply_admin_access_updates(
+    updates: list[dict[str, Any]],
+    *,
+    admin_id: int,
+    reason: str,
+) -> int:
+    """Apply ``{"user_id", "access_status", "expires_at", "before", "after"}`` admin overrides in one transaction.
+
+    Every user becomes ``access_managed_by='admin'`` and gets an ``entitlement_updated``
+    audit row. Returns the number of users updated.
+    """
+    if not updates:
+        return 0
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.executemany(
+            """
+            UPDATE users
+            SET access_status = ?, expires_at = ?, access_managed_by = 'admin',
+                access_updated_at = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            [(item["access_status"], item["expires_at"], now, now, int(item["user_id"])) for item in updates],
+        )
+        _insert_admin_audit_logs(
+            conn,
+            admin_id=admin_id,
+            action_type="entitlement_updated",
+            reason=reason,
+            entries=[(int(item["user_id"]), item.get("before") or {}, item.get("after") or {}) for item in updates],
+            now=now,
+        )
+        conn.commit()
+    _notify_access_change()
+    return int(cursor.rowcount)
+
+
+def apply_admin_progress_updates(
+    entries: list[tuple[int, str, dict, bool]],
+    audits: list[tuple[int, dict[str, Any], dict[str, Any]]],
+    *,
+    admin_id: int,
+    reason: str,
+) -> None:
+    """Upsert ``(user_id, lesson_id, progress, is_completed)`` rows for many users in one transaction.
+
+    Progress summaries of the touched users are refreshed and ``audits`` are written as
+    ``progress_updated`` rows in the same transaction.
+    """
+    if not entries and not audits:
+        return
+    now = int(time.time())
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            """
+            INSERT INTO lesson_progress (user_id, lesson_id, progress_json, is_completed, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, lesson_id)
+            DO UPDATE SET
+                progress_json = excluded.progress_json,
+                is_completed = excluded.is_completed,
+                updated_at = excluded.updated_at
+            """,
+            [
+                (int(user_id), lesson_id, json.dumps(progress, ensure_ascii=False), 1 if is_completed else 0, now, now)
+                for user_id, lesson_id, progress, is_completed in entries
+            ],
+        )
+        conn.executemany(
+            _PROGRESS_SUMMARY_UPSERT_SQL.format(where="u.id = :user_id"),
+            [{"user_id": user_id, "now": now} for user_id in dict.fromkeys(int(entry[0]) for entry in entries)],
+        )
+        _insert_admin_audit_logs(
+            conn,
+            admin_id=admin_id,
+            action_type="progress_updated",
+            reason=reason,
+            entries=audits,
+            now=now,
+        )
+        conn.commit()
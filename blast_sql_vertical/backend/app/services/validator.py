@@ -1,7 +1,10 @@
+import hashlib
+import json
 from decimal import Decimal
 from datetime import date, datetime
 
 from app.services.content_loader import get_lesson_exercises, load_lesson
+from app.services.expected_results import get_expected_result, lesson_key, playground_key, query_digest
 from app.services.sql_engine import execute_query
 
 
@@ -24,6 +27,41 @@ def _row_dict_to_comparable(row: dict, columns: list) -> tuple:
     return tuple(row)
 
 
+def _comparable_rows(columns: list[str], rows: list) -> tuple[list[str], list[tuple]]:
+    """Sorted column names and normalized row tuples, exactly as the result comparison sees them."""
+    dicts = [dict(zip(columns, row, strict=False)) for row in rows]
+    cols = sorted(dicts[0].keys()) if dicts else sorted(set(columns))
+    return cols, [_row_dict_to_comparable(d, cols) for d in dicts]
+
+
+def _fingerprint_value(v):
+    # Tuple comparison treats 1 == 1.0 == True; hash them alike.
+    if isinstance(v, bool):
+        return int(v)
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def _rows_fingerprint(rows: list[tuple], *, ordered: bool) -> str:
+    encoded = [json.dumps([_fingerprint_value(v) for v in row], ensure_ascii=False, default=str) for row in rows]
+    if not ordered:
+        encoded.sort()
+    return hashlib.sha256("\n".join(encoded).encode("utf-8")).hexdigest()
+
+
+def expected_entry(solution_query: str, columns: list[str], rows: list, *, max_rows: int) -> dict:
+    """Expected-results artifact entry: normalized rows when small, row fingerprints otherwise."""
+    entry: dict = {"query": query_digest(solution_query), "columns": list(columns), "row_count": len(rows)}
+    if len(rows) <= max_rows:
+        entry["rows"] = [[_normalize_value(v) for v in row] for row in rows]
+    else:
+        _, comparable = _comparable_rows(columns, rows)
+        entry["ordered"] = _rows_fingerprint(comparable, ordered=True)
+        entry["unordered"] = _rows_fingerprint(comparable, ordered=False)
+    return entry
+
+
 def _compare_to_expected_result(
     user_cols: list[str],
     user_rows: list[list],
@@ -56,6 +94,29 @@ def _compare_to_expected_result(
     return True, "Correct!"
 
 
+def _compare_to_snapshot(
+    user_cols: list[str],
+    user_rows: list[list],
+    entry: dict,
+    *,
+    order_matters: bool,
+) -> tuple[bool, str]:
+    """Same verdicts as ``_compare_to_expected_result`` against a precomputed solution result."""
+    if "rows" in entry:
+        expected = [dict(zip(entry["columns"], row, strict=False)) for row in entry["rows"]]
+        return _compare_to_expected_result(user_cols, user_rows, expected, order_matters=order_matters)
+
+    if set(user_cols) != set(entry["columns"]):
+        return False, "Column names do not match the expected result."
+    _, user_tuples = _comparable_rows(user_cols, user_rows)
+    if len(user_tuples) != entry["row_count"]:
+        return False, "Your result does not match the expected output (row count differs)."
+    fingerprint = entry["ordered"] if order_matters else entry["unordered"]
+    if _rows_fingerprint(user_tuples, ordered=order_matters) != fingerprint:
+        return False, "Your result does not match the expected output."
+    return True, "Correct!"
+
+
 def validate(session_id: str, lesson_id: str, challenge_index: int, user_query: str) -> tuple[bool, str]:
     lesson = load_lesson(lesson_id)
     exercises = get_lesson_exercises(lesson)
@@ -86,9 +147,13 @@ def validate(session_id: str, lesson_id: str, challenge_index: int, user_query:
                 order_matters=order_matters,
             )
 
-        # Strategy 2: run solution_query dynamically and compare outputs
+        # Strategy 2: compare against the solution's output (precomputed when available)
         solution_query = ex.get("solution_query", "").strip()
         if solution_query:
+            snapshot = get_expected_result(lesson_key(lesson_id, challenge_index), solution_query)
+            if snapshot is not None:
+                return _compare_to_snapshot(user_cols, user_rows, snapshot, order_matters=order_matters)
+
             sol_result = execute_query(session_id, solution_query)
             if sol_result[0] is None:
                 # Solution itself fails — fall back to column-only check
@@ -118,7 +183,13 @@ def validate(session_id: str, lesson_id: str, challenge_index: int, user_query:
     return False, "Validation not configured for this challenge."
 
 
-def validate_playground(session_id: str, challenge: dict, user_query: str) -> tuple[bool, str]:
+def validate_playground(
+    session_id: str,
+    challenge: dict,
+    user_query: str,
+    *,
+    dataset_id: str | None = None,
+) -> tuple[bool, str]:
     result = execute_query(session_id, user_query)
     if result[0] is None:
         return False, result[1] or "Execution failed"
@@ -127,7 +198,13 @@ def validate_playground(session_id: str, challenge: dict, user_query: str) -> tu
     solution_query = challenge.get("solution_query", "").strip()
     if not solution_query:
         return False, "Solution not found for this challenge."
-    
+
+    if dataset_id is not None:
+        key = playground_key(dataset_id, str(challenge.get("id") or ""))
+        snapshot = get_expected_result(key, solution_query)
+        if snapshot is not None:
+            return _compare_to_snapshot(user_cols, user_rows, snapshot, order_matters=False)
+
     sol_result = execute_query(session_id, solution_query)
     if sol_result[0] is None:
         return False, "Solution itself failed to execute."
@@ -0,0 +1,163 @@
+"""
+Durable Stripe webhook queue.
+
+Verified events are stored in ``purchase_email_events`` (payload + queue columns) and
+acknowledged right away; background worker threads lease due events, run
+``process_stripe_event`` and retry failures with exponential backoff until
+``STRIPE_WEBHOOK_MAX_ATTEMPTS``, after which the event is dead-lettered.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+import stripe
+
+from app.config import (
+    STRIPE_WEBHOOK_ASYNC,
+    STRIPE_WEBHOOK_LOCK_TIMEOUT_SECONDS,
+    STRIPE_WEBHOOK_MAX_ATTEMPTS,
+    STRIPE_WEBHOOK_POLL_SECONDS,
+    STRIPE_WEBHOOK_RETRY_BASE_SECONDS,
+    STRIPE_WEBHOOK_RETRY_MAX_SECONDS,
+    STRIPE_WEBHOOK_WORKERS,
+)
+from app.services.billing_service import enqueue_stripe_event, process_stripe_event
+from app.services.metrics_service import inc_counter, register_gauge_callback
+from app.services.user_db import (
+    claim_stripe_webhook_events,
+    complete_stripe_webhook_event,
+    fail_stripe_webhook_event,
+    get_stripe_webhook_queue_stats,
+)
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 10
+_WAKEUP = threading.Event()
+_STOP = threading.Event()
+_WORKERS: list[threading.Thread] = []
+_WORKERS_LOCK = threading.Lock()
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    """Exponential backoff for the given number of attempts already made."""
+    exponent = max(0, int(attempts) - 1)
+    return int(min(STRIPE_WEBHOOK_RETRY_MAX_SECONDS, STRIPE_WEBHOOK_RETRY_BASE_SECONDS * (2 ** min(exponent, 20))))
+
+
+def _count_event(outcome: str) -> None:
+    inc_counter(
+        "blast_stripe_webhook_events_total",
+        labels={"outcome": outcome},
+        description="Stripe webhook events by queue outcome.",
+    )
+
+
+def accept_stripe_event(event: Any, payload: bytes) -> None:
+    """Queue a verified webhook event, or process it inline when the queue is disabled."""
+    if not STRIPE_WEBHOOK_ASYNC or not str(event.get("id") or ""):
+        process_stripe_event(event)
+        return
+    enqueue_stripe_event(event, payload)
+    _count_event("enqueued")
+    _WAKEUP.set()
+
+
+def _handle_claimed_event(item: dict) -> None:
+    event_id = str(item.get("stripe_event_id") or "")
+    attempts = int(item.get("attempts") or 1)
+    try:
+        payload = json.loads(item.get("payload_json") or "{}")
+        event = stripe.Event.construct_from(payload, stripe.api_key)
+        process_stripe_event(event)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        if attempts >= STRIPE_WEBHOOK_MAX_ATTEMPTS:
+            fail_stripe_webhook_event(event_id, error=error, next_attempt_at=None)
+            logger.error(
+                "stripe_webhook_dead_lettered event_id=%s attempts=%s error=%s",
+                event_id,
+                attempts,
+                error,
+            )
+            outcome = "dead"
+        else:
+            delay = retry_delay_seconds(attempts)
+            fail_stripe_webhook_event(event_id, error=error, next_attempt_at=int(time.time()) + delay)
+            logger.warning(
+                "stripe_webhook_retry_scheduled event_id=%s attempts=%s delay_seconds=%s error=%s",
+                event_id,
+                attempts,
+                delay,
+                error,
+            )
+            outcome = "retry"
+    else:
+        complete_stripe_webhook_event(event_id)
+        outcome = "processed"
+    _count_event(outcome)
+
+
+def process_pending_webhook_events(limit: int = _BATCH_SIZE) -> int:
+    """Process one batch of due events; returns how many were leased."""
+    claimed = claim_stripe_webhook_events(limit, lock_timeout_seconds=STRIPE_WEBHOOK_LOCK_TIMEOUT_SECONDS)
+    for item in claimed:
+        _handle_claimed_event(item)
+    return len(claimed)
+
+
+def _worker_loop() -> None:
+    while not _STOP.is_set():
+        _WAKEUP.clear()
+        try:
+            processed = process_pending_webhook_events()
+        except Exception:
+            logger.exception("stripe_webhook_worker_error")
+            processed = 0
+        if not processed:
+            _WAKEUP.wait(STRIPE_WEBHOOK_POLL_SECONDS)
+
+
+def start_webhook_workers() -> None:
+    if not STRIPE_WEBHOOK_ASYNC:
+        return
+    with _WORKERS_LOCK:
+        if _WORKERS:
+            return
+        _STOP.clear()
+        for idx in range(STRIPE_WEBHOOK_WORKERS):
+            thread = threading.Thread(target=_worker_loop, name=f"stripe-webhook-worker-{idx}", daemon=True)
+            thread.start()
+            _WORKERS.append(thread)
+    logger.info("stripe_webhook_workers_started count=%s", STRIPE_WEBHOOK_WORKERS)
+
+
+def stop_webhook_workers(timeout: float = 5.0) -> None:
+    with _WORKERS_LOCK:
+        workers = list(_WORKERS)
+        _WORKERS.clear()
+    if not workers:
+        return
+    _STOP.set()
+    _WAKEUP.set()
+    for thread in workers:
+        thread.join(timeout)
+
+
+register_gauge_callback(
+    "blast_stripe_webhook_queue_lag_seconds",
+    lambda: get_stripe_webhook_queue_stats()["lag_seconds"],
+    "Age of the oldest unprocessed Stripe webhook event.",
+)
+register_gauge_callback(
+    "blast_stripe_webhook_queue_depth",
+    lambda: {
+        (("status", status),): count
+        for status, count in get_stripe_webhook_queue_stats().items()
+        if status != "lag_seconds"
+    },
+    "Queued Stripe webhook events by status.",
+)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+In-process load test for the backend API.
+
+Drives ``app.main:app`` through httpx's ASGI transport with a weighted traffic mix
+(login, course tree, lessons, /run-sql, /validate, progress writes, admin listing),
+then reports p50/p95/p99 latency and requests/second per scenario. Results can be
+saved as a JSON baseline and compared against a previous one.
+
+Run from ``backend/``:
+
+    python -m benchmarks.load_test --requests 2000 --concurrency 16 --save bench.json
+    python -m benchmarks.load_test --baseline bench.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_MIX = {
+    "login": 2,
+    "courses": 12,
+    "lesson": 20,
+    "run_sql": 26,
+    "validate": 16,
+    "progress_put": 18,
+    "admin_users": 6,
+}
+STUDENT_PASSWORD = "BenchPass123!"
+
+
+def _prepare_environment() -> None:
+    """Point the app at a throwaway user database; must run before ``app`` is imported."""
+    bench_dir = Path(tempfile.mkdtemp(prefix="blast_bench_"))
+    os.environ["USER_DB_PATH"] = str(bench_dir / "users.db")
+    os.environ.setdefault("STRICT_CONTENT_VALIDATION", "0")
+    os.environ.setdefault("METRICS_SAMPLE_RATE", "0")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(pct / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable regressions (p95 up or rps down by more than ``threshold``)."""
+    regressions: list[str] = []
+    for name, cur in current.get("scenarios", {}).items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if base.get("p95_ms") and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f}ms -> {cur['p95_ms']:.2f}ms")
+        if cur.get("errors", 0) > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {cur['errors']}")
+    cur_total = current.get("overall", {})
+    base_total = baseline.get("overall", {})
+    if base_total.get("rps") and cur_total.get("rps", 0) < base_total["rps"] * (1 - threshold):
+        regressions.append(f"overall: rps {base_total['rps']:.1f} -> {cur_total.get('rps', 0):.1f}")
+    return regressions
+
+
+def _collect_exercises() -> list[dict]:
+    """Lesson exercises with a runnable solution query, used for /run-sql and /validate."""
+    from app.services.content_loader import get_lesson_exercises, load_courses, load_lesson
+
+    items: list[dict] = []
+    for course in load_courses().get("courses", []):
+        for module in course.get("modules", []) or []:
+            for lesson in module.get("lessons", []) or []:
+                lesson_id = lesson.get("id") if isinstance(lesson, dict) else lesson
+                exercises = get_lesson_exercises(load_lesson(lesson_id))
+                for idx, exercise in enumerate(exercises):
+                    query = (exercise.get("solution_query") or "").strip()
+                    if query:
+                        items.append({"lesson_id": lesson_id, "challenge_index": idx, "query": query})
+    return items
+
+
+def _seed_users(students: int) -> tuple[list[dict], list[int]]:
+    from app.services.auth_service import hash_password
+    from app.services.user_db import create_user
+
+    password_hash = hash_password(STUDENT_PASSWORD)
+    expires_at = int(time.time()) + 180 * 86_400
+    stamp = int(time.time())
+    users = []
+    for idx in range(students):
+        email = f"bench_student_{stamp}_{idx}@bench.local"
+        create_user(
+            email=email,
+            password_hash=password_hash,
+            full_name=f"Bench Student {idx}",
+            access_status="active",
+            expires_at=expires_at,
+        )
+        users.append({"email": email})
+    admin = create_user(
+        email=f"bench_admin_{stamp}@bench.local",
+        password_hash=password_hash,
+        role="admin",
+        access_status="active",
+        expires_at=expires_at,
+    )
+    return users, [int(admin["id"])]
+
+
+class Runner:
+    def __init__(self, client, rng: random.Random, users: list[dict], admin_token: str, lessons: list[str], exercises):
+        self.client = client
+        self.rng = rng
+        self.users = users
+        self.admin_token = admin_token
+        self.lessons = lessons
+        self.exercises = exercises
+
+    def _student(self) -> dict:
+        return self.rng.choice(self.users)
+
+    async def login(self) -> int:
+        user = self._student()
+        res = await self.client.post("/auth/login", json={"email": user["email"], "password": STUDENT_PASSWORD})
+        return res.status_code
+
+    async def courses(self) -> int:
+        user = self._student()
+        res = await self.client.get("/courses", headers=user["headers"])
+        return res.status_code
+
+    async def lesson(self) -> int:
+        user = self._student()
+        res = await self.client.get(f"/lesson/{self.rng.choice(self.lessons)}", headers=user["headers"])
+        return res.status_code
+
+    async def run_sql(self) -> int:
+        user = self._student()
+        exercise = self.rng.choice(self.exercises)
+        res = await self.client.post(
+            "/run-sql",
+            headers=user["headers"],
+            json={"session_id": user["session_id"], "lesson_id": exercise["lesson_id"], "query": exercise["query"]},
+        )
+        return res.status_code
+
+    async def validate(self) -> int:
+        user = self._student()
+        exercise = self.rng.choice(self.exercises)
+        res = await self.client.post(
+            "/validate",
+            headers=user["headers"],
+            json={
+                "session_id": user["session_id"],
+                "lesson_id": exercise["lesson_id"],
+                "challenge_index": exercise["challenge_index"],
+                "query": exercise["query"],
+            },
+        )
+        return res.status_code
+
+    async def progress_put(self) -> int:
+        user = self._student()
+        lesson_id = self.rng.choice(self.lessons)
+        res = await self.client.put(
+            f"/progress/lesson/{lesson_id}",
+            headers=user["headers"],
+            json={"progress": {"currentTab": self.rng.randint(0, 3)}, "is_completed": self.rng.random() < 0.3},
+        )
+        return res.status_code
+
+    async def admin_users(self) -> int:
+        page = self.rng.randint(1, 3)
+        res = await self.client.get(
+            f"/admin/users?page={page}&page_size=20",
+            headers={"Authorization": f"Bearer {self.admin_token}"},
+        )
+        return res.status_code
+
+
+async def run_benchmark(
+    *,
+    total_requests: int,
+    concurrency: int,
+    students: int,
+    mix: dict[str, int],
+    seed: int,
+) -> dict:
+    import httpx
+
+    import app.routers.admin as admin_router
+    from app.main import app
+    from app.services.auth_service import create_access_token_for_user
+    from app.services.content_loader import initialize_runtime_content
+    from app.services.sql_engine import initialize_sql_engine
+    from app.services.user_db import init_user_db
+
+    # The admin rate limiter is per-admin; the benchmark measures the endpoints behind it.
+    admin_router.check_fixed_window_limit = lambda *args, **kwargs: (True, 60)
+
+    init_user_db()
+    initialize_runtime_content()
+    initialize_sql_engine()
+
+    rng = random.Random(seed)
+    users, admin_ids = _seed_users(students)
+    exercises = _collect_exercises()
+    if not exercises:
+        raise RuntimeError("No lesson exercises with solution queries found in content")
+    lessons = sorted({item["lesson_id"] for item in exercises})
+    admin_token, _, _ = create_access_token_for_user(admin_ids[0])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for idx, user in enumerate(users):
+            res = await client.post("/auth/login", json={"email": user["email"], "password": STUDENT_PASSWORD})
+            res.raise_for_status()
+            user["headers"] = {"Authorization": f"Bearer {res.json()['access_token']}"}
+            user["session_id"] = f"bench-session-{idx}"
+
+        runner = Runner(client, rng, users, admin_token, lessons, exercises)
+        scenario_names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in scenario_names]
+        plan = rng.choices(scenario_names, weights=weights, k=total_requests)
+        latencies: dict[str, list[float]] = {name: [] for name in scenario_names}
+        errors: dict[str, int] = {name: 0 for name in scenario_names}
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for name in plan:
+            queue.put_nowait(name)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    name = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    status_code = await getattr(runner, name)()
+                except Exception:
+                    status_code = 599
+                latencies[name].append(time.perf_counter() - started)
+                if status_code >= 400:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "created_at": int(time.time()),
+        "config": {
+            "requests": total_requests,
+            "concurrency": concurrency,
+            "students": students,
+            "seed": seed,
+            "mix": mix,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "scenarios": {
+            name: summarize(latencies[name], errors[name], elapsed) for name in scenario_names if latencies[name]
+        },
+    }
+
+
+def _parse_mix(raw: str | None) -> dict[str, int]:
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix: dict[str, int] = {name: 0 for name in DEFAULT_MIX}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario in --mix: {name} (known: {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def _print_report(result: dict) -> None:
+    header = f"{'scenario':<14}{'reqs':>7}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["scenarios"].items()) + [("overall", result["overall"])]
+    for name, stats in rows:
+        print(
+            f"{name:<14}{stats['requests']:>7}{stats['errors']:>6}{stats['rps']:>9.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="In-process load test for the Blast SQL backend.")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests to issue.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests.")
+    parser.add_argument("--students", type=int, default=25, help="Number of seeded student accounts.")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for the traffic plan.")
+    parser.add_argument("--mix", default=None, help="Scenario weights, e.g. run_sql=5,validate=2,courses=1")
+    parser.add_argument("--save", default=None, help="Write the result JSON to this path.")
+    parser.add_argument("--baseline", default=None, help="Compare against a previously saved result JSON.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression for p95 latency and overall rps (default 0.2 = 20%%).",
+    )
+    args = parser.parse_args()
+
+    _prepare_environment()
+    result = asyncio.run(
+        run_benchmark(
+            total_requests=max(1, args.requests),
+            concurrency=max(1, args.concurrency),
+            students=max(1, args.students),
+            mix=_parse_mix(args.mix),
+            seed=args.seed,
+        )
+    )
+    _print_report(result)
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"[OK] Saved benchmark result to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(result, baseline, args.threshold)
+        if regressions:
+            print("[ERROR] Performance regressions against baseline:")
+            for item in regressions:
+                print(f"- {item}")
+            return 1
+        print("[OK] No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Latency and memory benchmark for the PDF backends.
+
+Renders the certificate template repeatedly with each backend (``native`` pure-Python
+drawing vs ``chromium`` via the Playwright page pool) and reports cold-start time,
+warm p50/p95 latency and resident memory. Each backend runs in its own subprocess so
+RSS numbers are not polluted by the other; Chromium's RSS includes its child processes.
+
+Run from ``backend/``:
+
+    python -m benchmarks.pdf_backends --iterations 50
+    python -m benchmarks.pdf_backends --backends native --save pdf_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.load_test import percentile  # noqa: E402
+
+BACKENDS = ("native", "chromium")
+
+
+def _proc_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss_kb(root_pid: int) -> int:
+    """RSS of ``root_pid`` plus all of its descendants (Linux ``/proc``; 0 elsewhere)."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as handle:
+                parent = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += _proc_rss_kb(pid)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+async def _measure(backend_name: str, iterations: int) -> dict:
+    from app.services import account_service, pdf_service
+
+    account_service.initialize_certificate_assets()
+    html, context = account_service.build_certificate_document(
+        "João Silva Santos", num_modules=8, total_lessons=42, issue_date="19 de outubro de 2026"
+    )
+    backend = pdf_service._BACKENDS[backend_name]
+    rss_before = process_tree_rss_kb(os.getpid())
+
+    started = time.perf_counter()
+    try:
+        pdf = await backend.render("certificate", html=html, context=context, landscape=False)
+    except pdf_service.PdfServiceError as exc:
+        return {"backend": backend_name, "error": str(exc)}
+    cold_ms = (time.perf_counter() - started) * 1000.0
+
+    latencies: list[float] = []
+    peak_rss = process_tree_rss_kb(os.getpid())
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await backend.render("certificate", html=html, context=context, landscape=False)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        peak_rss = max(peak_rss, process_tree_rss_kb(os.getpid()))
+    await pdf_service.shutdown_pdf_service()
+
+    latencies.sort()
+    return {
+        "backend": backend_name,
+        "iterations": iterations,
+        "pdf_bytes": len(pdf),
+        "cold_ms": round(cold_ms, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "rss_before_mb": round(rss_before / 1024, 1),
+        "rss_peak_mb": round(peak_rss / 1024, 1),
+        "rss_delta_mb": round((peak_rss - rss_before) / 1024, 1),
+    }
+
+
+def _run_worker(backend_name: str, iterations: int) -> dict:
+    """Measure one backend in a fresh interpreter and return its JSON result."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.pdf_backends", "--worker", backend_name, "--iterations", str(iterations)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        output = (proc.stderr or proc.stdout).strip().splitlines()
+        return {"backend": backend_name, "error": output[-1] if output else "failed"}
+    return json.loads(lines[-1])
+
+
+def _print_report(results: list[dict]) -> None:
+    header = f"{'backend':<10}{'bytes':>9}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>9}{'+RSS MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        if "error" in row:
+            print(f"{row['backend']:<10} unavailable: {row['error']}")
+            continue
+        print(
+            f"{row['backend']:<10}{row['pdf_bytes']:>9}{row['cold_ms']:>10.1f}{row['p50_ms']:>10.2f}"
+            f"{row['p95_ms']:>10.2f}{row['rss_peak_mb']:>9.1f}{row['rss_delta_mb']:>9.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare PDF backends on the certificate template.")
+    parser.add_argument("--iterations", type=int, default=30, help="Warm renders per backend.")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backends to run.")
+    parser.add_argument("--save", default=None, help="Write the results JSON to this path.")
+    parser.add_argument("--worker", choices=BACKENDS, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("METRICS_SAMPLE_RATE", "0")
+    if args.worker:
+        print(json.dumps(asyncio.run(_measure(args.worker, max(1, args.iterations)))))
+        return 0
+
+    names = [name.strip() for name in args.backends.split(",") if name.strip() in BACKENDS]
+    results = [_run_worker(name, max(1, args.iterations)) for name in names]
+    _print_report(results)
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"[OK] Saved benchmark result to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
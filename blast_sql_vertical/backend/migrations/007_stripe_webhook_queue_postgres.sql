@@ -0,0 +1,17 @@
+-- Durable Stripe webhook queue on top of purchase_email_events.
+-- queue_status: pending | processing | done | dead (NULL for events processed inline)
+
+BEGIN;
+
+ALTER TABLE purchase_email_events
+ADD COLUMN IF NOT EXISTS payload_json TEXT,
+ADD COLUMN IF NOT EXISTS queue_status TEXT,
+ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ,
+ADD COLUMN IF NOT EXISTS locked_at TIMESTAMPTZ,
+ADD COLUMN IF NOT EXISTS last_error TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_purchase_email_events_queue
+ON purchase_email_events(queue_status, next_attempt_at);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Durable Stripe webhook queue on top of purchase_email_events.
+-- queue_status: pending | processing | done | dead (NULL for events processed inline)
+-- Run once. init_user_db also ensures columns exist via _column_exists checks.
+
+BEGIN TRANSACTION;
+
+ALTER TABLE purchase_email_events ADD COLUMN payload_json TEXT;
+ALTER TABLE purchase_email_events ADD COLUMN queue_status TEXT;
+ALTER TABLE purchase_email_events ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE purchase_email_events ADD COLUMN next_attempt_at INTEGER;
+ALTER TABLE purchase_email_events ADD COLUMN locked_at INTEGER;
+ALTER TABLE purchase_email_events ADD COLUMN last_error TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_purchase_email_events_queue
+ON purchase_email_events(queue_status, next_attempt_at);
+
+COMMIT;
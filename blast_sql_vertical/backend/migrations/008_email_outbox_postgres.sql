@@ -0,0 +1,27 @@
+-- Outbound email outbox drained by the background sender.
+-- status: pending | sending | sent | dead; idempotency_key dedups repeated sends.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    idempotency_key TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    stripe_event_id TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMPTZ,
+    provider_message_id TEXT,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_status_next_attempt
+ON email_outbox(status, next_attempt_at);
+
+COMMIT;
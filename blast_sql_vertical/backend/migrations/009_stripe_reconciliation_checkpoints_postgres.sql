@@ -0,0 +1,15 @@
+-- Resumable checkpoint for the bulk Stripe reconciliation job (python -m app.reconcile_stripe).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS stripe_reconciliation_checkpoints (
+    name TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    cursor TEXT,
+    stats_json JSONB NOT NULL DEFAULT '{}'::jsonb,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Resumable checkpoint for the bulk Stripe reconciliation job (python -m app.reconcile_stripe).
+
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS stripe_reconciliation_checkpoints (
+    name TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    cursor TEXT,
+    stats_json TEXT NOT NULL DEFAULT '{}',
+    started_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    completed_at INTEGER
+);
+
+COMMIT;
@@ -0,0 +1,39 @@
+-- Materialized per-user progress rollup and latest purchase pointer for the admin user list.
+-- Rebuild at any time with: python -m app.rebuild_progress_summary
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS user_progress_summary (
+    user_id BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    completed_lessons INTEGER NOT NULL DEFAULT 0,
+    last_activity_at BIGINT,
+    updated_at BIGINT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_progress_summary_completed ON user_progress_summary(completed_lessons);
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS latest_purchase_id BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+
+INSERT INTO user_progress_summary (user_id, completed_lessons, last_activity_at, updated_at)
+SELECT
+    u.id,
+    (SELECT COUNT(*) FROM lesson_progress lp WHERE lp.user_id = u.id AND lp.is_completed = 1),
+    (SELECT MAX(lp.updated_at) FROM lesson_progress lp WHERE lp.user_id = u.id),
+    EXTRACT(EPOCH FROM NOW())::BIGINT
+FROM users u
+ON CONFLICT (user_id) DO UPDATE SET
+    completed_lessons = EXCLUDED.completed_lessons,
+    last_activity_at = EXCLUDED.last_activity_at,
+    updated_at = EXCLUDED.updated_at;
+
+UPDATE users
+SET latest_purchase_id = (
+    SELECT p.id FROM purchases p
+    WHERE p.user_id = users.id
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT 1
+);
+
+COMMIT;
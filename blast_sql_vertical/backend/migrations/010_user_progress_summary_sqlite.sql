@@ -0,0 +1,36 @@
+-- Materialized per-user progress rollup and latest purchase pointer for the admin user list.
+-- Rebuild at any time with: python -m app.rebuild_progress_summary
+
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS user_progress_summary (
+    user_id INTEGER PRIMARY KEY,
+    completed_lessons INTEGER NOT NULL DEFAULT 0,
+    last_activity_at INTEGER,
+    updated_at INTEGER NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_progress_summary_completed ON user_progress_summary(completed_lessons);
+
+ALTER TABLE users ADD COLUMN latest_purchase_id INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+
+INSERT OR REPLACE INTO user_progress_summary (user_id, completed_lessons, last_activity_at, updated_at)
+SELECT
+    u.id,
+    (SELECT COUNT(*) FROM lesson_progress lp WHERE lp.user_id = u.id AND lp.is_completed = 1),
+    (SELECT MAX(lp.updated_at) FROM lesson_progress lp WHERE lp.user_id = u.id),
+    CAST(strftime('%s', 'now') AS INTEGER)
+FROM users u;
+
+UPDATE users
+SET latest_purchase_id = (
+    SELECT p.id FROM purchases p
+    WHERE p.user_id = users.id
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT 1
+);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Trigram indexes backing the admin user search (LOWER(...) LIKE '%term%').
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm
+ON users USING GIN (LOWER(email) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_users_full_name_trgm
+ON users USING GIN (LOWER(COALESCE(full_name, '')) gin_trgm_ops);
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- Trigram full-text index over users.email/full_name for the admin user search
+-- (requires SQLite 3.34+ with FTS5; init_user_db() falls back to LIKE otherwise).
+
+BEGIN TRANSACTION;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+    email, full_name, content='users', content_rowid='id', tokenize='trigram'
+);
+
+INSERT INTO users_fts(users_fts) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS users_fts_after_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_fts(rowid, email, full_name) VALUES (new.id, new.email, new.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_fts_after_delete AFTER DELETE ON users BEGIN
+    INSERT INTO users_fts(users_fts, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_fts_after_update AFTER UPDATE OF email, full_name ON users BEGIN
+    INSERT INTO users_fts(users_fts, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name);
+    INSERT INTO users_fts(rowid, email, full_name) VALUES (new.id, new.email, new.full_name);
+END;
+
+COMMIT;
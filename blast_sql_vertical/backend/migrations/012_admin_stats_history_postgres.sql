@@ -0,0 +1,11 @@
+-- Time-bucketed snapshots of the admin dashboard stats (one row per ADMIN_STATS_HISTORY_BUCKET_SECONDS).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS admin_stats_history (
+    bucket_start BIGINT PRIMARY KEY,
+    stats_json JSONB NOT NULL DEFAULT '{}'::jsonb,
+    recorded_at BIGINT NOT NULL
+);
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- Time-bucketed snapshots of the admin dashboard stats (one row per ADMIN_STATS_HISTORY_BUCKET_SECONDS).
+
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS admin_stats_history (
+    bucket_start INTEGER PRIMARY KEY,
+    stats_json TEXT NOT NULL,
+    recorded_at INTEGER NOT NULL
+);
+
+COMMIT;
@@ -0,0 +1,24 @@
+-- Background bulk admin jobs (grant/extend access, set progress) and their progress counters.
+
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS admin_bulk_jobs (
+    id TEXT PRIMARY KEY,
+    admin_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    succeeded INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    errors_json TEXT NOT NULL DEFAULT '[]',
+    last_error TEXT,
+    created_at INTEGER NOT NULL,
+    started_at INTEGER,
+    finished_at INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_admin_bulk_jobs_admin_created ON admin_bulk_jobs(admin_id, created_at);
+
+COMMIT;
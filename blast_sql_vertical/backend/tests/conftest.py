@@ -11,6 +11,9 @@ import pytest
 
 # Use a temporary SQLite DB for tests
 os.environ.setdefault("USER_DB_PATH", str(Path(tempfile.gettempdir()) / "blast_sql_test.db"))
+# Rendered PDFs are cached on disk; keep each test session's cache separate
+os.environ.setdefault("PDF_CACHE_DIR", tempfile.mkdtemp(prefix="blast_pdf_cache_"))
+os.environ.setdefault("PDF_JOB_DIR", tempfile.mkdtemp(prefix="blast_pdf_jobs_"))
 
 
 @pytest.fixture(autouse=True)
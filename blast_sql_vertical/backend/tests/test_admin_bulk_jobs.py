@@ -0,0 +1,171 @@
+import json
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    create_admin_bulk_job,
+    create_user,
+    get_user_by_id,
+    init_user_db,
+    update_user_access_state,
+)
+
+
+def _new_user(prefix: str) -> dict:
+    return create_user(email=f"{prefix}_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+
+
+def _wait_for_job(job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = admin_service.get_admin_bulk_job_status(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"bulk job {job_id} did not finish")
+
+
+def _audit_rows(user_id: int, action_type: str) -> list[dict]:
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM admin_audit_logs WHERE target_user_id = ? AND action_type = ? ORDER BY id",
+            (user_id, action_type),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_bulk_grant_from_csv_and_ids_reports_unknown_targets(monkeypatch):
+    monkeypatch.setattr(admin_service, "ADMIN_BULK_CHUNK_SIZE", 2)
+    admin = _new_user("bulk_admin")
+    by_email, by_id, by_both = _new_user("bulk_email"), _new_user("bulk_id"), _new_user("bulk_both")
+    csv_text = "\ufeffEmail,user_id\n" f"{by_email['email'].upper()},\n" f",{by_both['id']}\n" "ghost@test.local,\n"
+
+    job = admin_service.submit_admin_bulk_job(
+        int(admin["id"]),
+        {
+            "operation": "grant_access",
+            "reason": "Turma corporativa",
+            "csv": csv_text,
+            "user_ids": [by_id["id"], by_both["id"], 999_999_999],
+            "expires_in_days": 30,
+        },
+    )
+    assert job["status"] == "queued"
+    assert job["total"] == 5
+
+    done = _wait_for_job(job["id"])
+    assert done["status"] == "completed"
+    assert (done["processed"], done["succeeded"], done["failed"]) == (5, 3, 2)
+    assert {error["target"] for error in done["errors"]} == {"ghost@test.local", 999_999_999}
+
+    for user in (by_email, by_id, by_both):
+        row = get_user_by_id(int(user["id"]))
+        assert row["access_status"] == "manual_grant"
+        assert row["access_managed_by"] == "admin"
+        assert row["expires_at"] > int(time.time()) + 29 * 86_400
+        audits = _audit_rows(int(user["id"]), "entitlement_updated")
+        assert len(audits) == 1
+        assert json.loads(audits[0]["after_json"])["bulk_job_id"] == job["id"]
+
+
+def test_bulk_extend_adds_days_to_current_expiry():
+    admin = _new_user("bulk_admin")
+    user = _new_user("bulk_extend")
+    base = int(time.time()) + 5 * 86_400
+    update_user_access_state(int(user["id"]), access_status="active", expires_at=base)
+
+    job = admin_service.submit_admin_bulk_job(
+        int(admin["id"]),
+        {"operation": "extend_access", "reason": "Cortesia", "user_ids": [user["id"]], "extend_days": 10},
+    )
+    assert _wait_for_job(job["id"])["succeeded"] == 1
+    row = get_user_by_id(int(user["id"]))
+    assert row["expires_at"] == base + 10 * 86_400
+    assert row["access_status"] == "active"
+
+
+def test_bulk_set_progress_updates_summary_and_audits():
+    _, lesson_ids, _ = admin_service._course_lessons()
+    admin = _new_user("bulk_admin")
+    users = [_new_user("bulk_progress") for _ in range(3)]
+
+    job = admin_service.submit_admin_bulk_job(
+        int(admin["id"]),
+        {
+            "operation": "set_progress",
+            "reason": "Migracao de plataforma",
+            "user_ids": [user["id"] for user in users],
+            "completed_lesson_ids": lesson_ids[:2],
+        },
+    )
+    assert _wait_for_job(job["id"])["succeeded"] == 3
+
+    with _connect() as conn:
+        summaries = conn.execute(
+            "SELECT user_id, completed_lessons FROM user_progress_summary WHERE user_id IN (?, ?, ?)",
+            tuple(int(user["id"]) for user in users),
+        ).fetchall()
+    assert {row["completed_lessons"] for row in summaries} == {2}
+    for user in users:
+        audits = _audit_rows(int(user["id"]), "progress_updated")
+        assert len(audits) == 1
+        assert json.loads(audits[0]["after_json"])["completed_lesson_ids"] == lesson_ids[:2]
+
+
+def test_bulk_job_validation():
+    admin_id = int(_new_user("bulk_admin")["id"])
+    with pytest.raises(HTTPException):
+        admin_service.submit_admin_bulk_job(admin_id, {"operation": "delete", "reason": "x", "user_ids": [1]})
+    with pytest.raises(HTTPException):
+        admin_service.submit_admin_bulk_job(admin_id, {"operation": "grant_access", "reason": "x", "user_ids": [1]})
+    with pytest.raises(HTTPException):
+        admin_service.submit_admin_bulk_job(
+            admin_id, {"operation": "extend_access", "reason": "x", "csv": "name\nfoo\n", "extend_days": 1}
+        )
+    with pytest.raises(HTTPException):
+        admin_service.get_admin_bulk_job_status("missing")
+
+
+def test_bulk_extend_counts_a_user_listed_by_email_and_id_once(monkeypatch):
+    monkeypatch.setattr(admin_service, "ADMIN_BULK_CHUNK_SIZE", 1)
+    admin = _new_user("bulk_admin")
+    user = _new_user("bulk_dupe")
+    base = int(time.time()) + 5 * 86_400
+    update_user_access_state(int(user["id"]), access_status="active", expires_at=base)
+
+    job = admin_service.submit_admin_bulk_job(
+        int(admin["id"]),
+        {
+            "operation": "extend_access",
+            "reason": "Duplicado",
+            "csv": f"email\n{user['email']}\n",
+            "user_ids": [user["id"]],
+            "extend_days": 10,
+        },
+    )
+    done = _wait_for_job(job["id"])
+    assert (done["total"], done["processed"], done["succeeded"], done["failed"], done["skipped"]) == (2, 2, 1, 0, 1)
+    assert get_user_by_id(int(user["id"]))["expires_at"] == base + 10 * 86_400
+    assert len(_audit_rows(int(user["id"]), "entitlement_updated")) == 1
+
+
+def test_unfinished_jobs_are_failed_on_startup():
+    admin = _new_user("bulk_admin")
+    stale = create_admin_bulk_job(uuid.uuid4().hex, admin_id=int(admin["id"]), operation="grant_access", total=3)
+
+    admin_service.recover_admin_bulk_jobs()
+    job = admin_service.get_admin_bulk_job_status(stale["id"])
+    assert job["status"] == "failed"
+    assert job["finished_at"] is not None
+    assert "restart" in job["last_error"]
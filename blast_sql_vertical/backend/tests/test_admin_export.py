@@ -0,0 +1,153 @@
+import csv
+import io
+import uuid
+
+import duckdb
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    create_purchase,
+    create_user,
+    init_user_db,
+    set_user_role_by_email,
+    upsert_lesson_progress,
+)
+
+
+def _new_user(email: str) -> int:
+    return int(create_user(email=email, password_hash=hash_password("TestPass123!"))["id"])
+
+
+def _seed(tag: str) -> tuple[int, int]:
+    _, lesson_ids, _ = admin_service._course_lessons()
+    low = _new_user(f"export_low_{tag}@test.local")
+    high = _new_user(f"export_high_{tag}@test.local")
+    for lesson_id in lesson_ids[:2]:
+        upsert_lesson_progress(high, lesson_id, {"lessonCompleted": True}, True)
+    create_purchase(user_id=high, course_id="sql-basics", status="pending")
+    create_purchase(user_id=high, course_id="sql-basics", status="canceled")
+    return low, high
+
+
+def _read_csv(body: bytes) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_csv_export_streams_in_batches_and_matches_list_filters(monkeypatch):
+    monkeypatch.setattr(admin_service, "ADMIN_EXPORT_BATCH_SIZE", 1)
+    tag = uuid.uuid4().hex
+    low, high = _seed(tag)
+
+    body, media_type, filename = admin_service.stream_admin_export(admin_id=1, dataset="users", search=tag)
+    chunks = list(body)
+    assert media_type.startswith("text/csv")
+    assert filename.startswith("users-") and filename.endswith(".csv")
+    assert len(chunks) == 2
+
+    rows = _read_csv(b"".join(chunks))
+    listed = admin_service.list_admin_users(search=tag, sort_by="created_at", sort_dir="asc")["items"]
+    assert [int(row["id"]) for row in rows] == [item["id"] for item in listed] == [low, high]
+    assert float(rows[1]["progress_pct"]) == listed[1]["progress_pct"]
+    assert rows[1]["latest_purchase_status"] == "canceled"
+    assert rows[0]["latest_purchase_status"] == ""
+
+    filtered, _, _ = admin_service.stream_admin_export(
+        admin_id=1, dataset="users", search=tag, progress_min=listed[1]["progress_pct"]
+    )
+    assert [int(row["id"]) for row in _read_csv(b"".join(filtered))] == [high]
+
+
+def test_purchases_and_progress_exports_follow_user_filters():
+    tag = uuid.uuid4().hex
+    _, high = _seed(tag)
+
+    purchases, _, _ = admin_service.stream_admin_export(admin_id=1, dataset="purchases", search=tag)
+    assert [row["status"] for row in _read_csv(b"".join(purchases))] == ["pending", "canceled"]
+
+    progress, _, _ = admin_service.stream_admin_export(admin_id=1, dataset="progress", search=tag)
+    rows = _read_csv(b"".join(progress))
+    assert {int(row["user_id"]) for row in rows} == {high}
+    assert {row["is_completed"] for row in rows} == {"1"}
+
+
+def test_csv_export_neutralizes_formulas():
+    tag = uuid.uuid4().hex
+    formula = '=HYPERLINK("http://evil.test","x")'
+    user_id = int(
+        create_user(
+            email=f"export_formula_{tag}@test.local", password_hash=hash_password("TestPass123!"), full_name=formula
+        )["id"]
+    )
+
+    body, _, _ = admin_service.stream_admin_export(admin_id=1, dataset="users", search=tag)
+    rows = _read_csv(b"".join(body))
+    assert [int(row["id"]) for row in rows] == [user_id]
+    assert rows[0]["full_name"] == "'" + formula
+    assert rows[0]["email"] == f"export_formula_{tag}@test.local"
+
+
+def test_parquet_export_is_typed(tmp_path):
+    tag = uuid.uuid4().hex
+    low, high = _seed(tag)
+    # Text that looks like a NULL marker must survive the CSV spool.
+    literal = create_user(
+        email=f"export_nullstr_{tag}@test.local", password_hash=hash_password("TestPass123!"), full_name="\\N"
+    )
+
+    body, media_type, filename = admin_service.stream_admin_export(
+        admin_id=1, dataset="users", export_format="parquet", search=tag
+    )
+    assert media_type == "application/vnd.apache.parquet"
+    target = tmp_path / filename
+    target.write_bytes(b"".join(body))
+
+    rows = duckdb.sql(
+        f"SELECT id, full_name, latest_purchase_status, completed_lessons, progress_pct "
+        f"FROM read_parquet('{target}') ORDER BY id"
+    ).fetchall()
+    assert [row[0] for row in rows] == [low, high, literal["id"]]
+    assert rows[0][1] is None and rows[0][2] is None
+    assert rows[2][1] == "\\N"
+    assert rows[1][2] == "canceled"
+    assert rows[1][3] == 2
+    assert isinstance(rows[1][4], float)
+
+    progress, _, name = admin_service.stream_admin_export(
+        admin_id=1, dataset="progress", export_format="parquet", search=tag
+    )
+    target = tmp_path / f"progress-{name}"
+    target.write_bytes(b"".join(progress))
+    assert duckdb.sql(f"SELECT bool_and(is_completed) FROM read_parquet('{target}')").fetchone()[0] is True
+
+
+def test_export_validation_and_route():
+    with pytest.raises(HTTPException):
+        admin_service.stream_admin_export(admin_id=1, dataset="sessions")
+    with pytest.raises(HTTPException):
+        admin_service.stream_admin_export(admin_id=1, dataset="users", export_format="xlsx")
+    with pytest.raises(HTTPException):
+        admin_service.stream_admin_export(admin_id=1, dataset="users", status_filter="bogus")
+
+    client = TestClient(app)
+    email = f"export_admin_{uuid.uuid4().hex}@test.local"
+    password = "TestPass123!"
+    assert client.post("/auth/register", json={"email": email, "password": password}).status_code in (200, 201)
+    token = client.post("/auth/login", json={"email": email, "password": password}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/admin/export/users", headers=headers).status_code == 403
+    assert set_user_role_by_email(email, "admin") is True
+
+    res = client.get("/admin/export/users", params={"search": email}, headers=headers)
+    assert res.status_code == 200
+    assert res.headers["content-disposition"].startswith('attachment; filename="users-')
+    assert [row["email"] for row in _read_csv(res.content)] == [email]
@@ -0,0 +1,92 @@
+import uuid
+
+import pytest
+
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    create_purchase,
+    create_user,
+    init_user_db,
+    rebuild_user_progress_summary,
+    upsert_lesson_progress,
+)
+
+
+def _summary_row(user_id: int) -> dict:
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM user_progress_summary WHERE user_id = ?", (user_id,)).fetchone()
+        return dict(row) if row else {}
+
+
+def _new_user(prefix: str) -> int:
+    user = create_user(email=f"{prefix}_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    return int(user["id"])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_summary_follows_lesson_progress_writes():
+    user_id = _new_user("summary")
+    assert _summary_row(user_id)["completed_lessons"] == 0
+
+    upsert_lesson_progress(user_id, "lesson-a", {"lessonCompleted": True}, True)
+    upsert_lesson_progress(user_id, "lesson-b", {"lessonCompleted": True}, True)
+    upsert_lesson_progress(user_id, "lesson-a", {"lessonCompleted": False}, False)
+
+    row = _summary_row(user_id)
+    assert row["completed_lessons"] == 1
+    assert row["last_activity_at"] is not None
+
+
+def test_admin_list_uses_summary_and_latest_purchase():
+    _, lesson_ids, _ = admin_service._course_lessons()
+    tag = uuid.uuid4().hex
+    low = _new_user(f"list_low_{tag}")
+    high = _new_user(f"list_high_{tag}")
+    for lesson_id in lesson_ids[:3]:
+        upsert_lesson_progress(high, lesson_id, {"lessonCompleted": True}, True)
+    create_purchase(user_id=high, course_id="sql-basics", status="pending")
+    latest = create_purchase(user_id=high, course_id="sql-basics", status="canceled")
+
+    listing = admin_service.list_admin_users(search=tag, sort_by="progress_pct", sort_dir="desc")
+    assert [item["id"] for item in listing["items"]] == [high, low]
+    assert listing["items"][0]["completed_lessons"] == 3
+    assert listing["items"][0]["latest_purchase_status"] == latest["status"]
+    assert listing["items"][1]["latest_purchase_status"] is None
+
+    pct = listing["items"][0]["progress_pct"]
+    assert [i["id"] for i in admin_service.list_admin_users(search=tag, progress_min=pct)["items"]] == [high]
+    assert [i["id"] for i in admin_service.list_admin_users(search=tag, progress_max=pct - 0.01)["items"]] == [low]
+
+
+def test_completed_bounds_match_rounded_pct():
+    for denominator in (1, 7, 42, 300):
+        for pct in (0, 0.5, 14.28, 14.29, 33.33, 50, 99.99, 100):
+            low = admin_service._min_completed_for_pct(pct, denominator)
+            high = admin_service._max_completed_for_pct(pct, denominator)
+            counts = range(0, denominator + 2)
+            assert low == min(c for c in counts if admin_service._progress_pct(c, denominator) >= pct)
+            assert high == max((c for c in counts if admin_service._progress_pct(c, denominator) <= pct), default=-1)
+
+
+def test_rebuild_repairs_drift():
+    user_id = _new_user("rebuild")
+    upsert_lesson_progress(user_id, "lesson-x", {"lessonCompleted": True}, True)
+    purchase = create_purchase(user_id=user_id, course_id="sql-basics", status="pending")
+    with _connect() as conn:
+        conn.execute("UPDATE user_progress_summary SET completed_lessons = 99 WHERE user_id = ?", (user_id,))
+        conn.execute("UPDATE users SET latest_purchase_id = NULL WHERE id = ?", (user_id,))
+        conn.commit()
+
+    stats = rebuild_user_progress_summary()
+
+    assert stats["summaries"] >= 1
+    assert _summary_row(user_id)["completed_lessons"] == 1
+    with _connect() as conn:
+        row = conn.execute("SELECT latest_purchase_id FROM users WHERE id = ?", (user_id,)).fetchone()
+    assert row["latest_purchase_id"] == purchase["id"]
@@ -0,0 +1,109 @@
+import time
+import uuid
+
+import pytest
+
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    create_user,
+    init_user_db,
+    list_admin_stats_history,
+    record_admin_stats_snapshot,
+    update_user_access_state,
+    update_user_last_login,
+)
+
+
+def _naive_stats(now: int) -> dict:
+    with _connect() as conn:
+        rows = [dict(row) for row in conn.execute("SELECT access_status, expires_at, last_login_at FROM users")]
+    effective = []
+    for row in rows:
+        status = row["access_status"]
+        if status in ("active", "manual_grant") and row["expires_at"] is not None and row["expires_at"] <= now:
+            status = "expired"
+        effective.append((status, row))
+
+    def expiring(days: int) -> int:
+        return sum(
+            1
+            for status, row in effective
+            if status in ("active", "manual_grant")
+            and row["expires_at"] is not None
+            and now < row["expires_at"] <= now + days * 86_400
+        )
+
+    return {
+        "total_users": len(rows),
+        "status_counts": {key: sum(1 for s, _ in effective if s == key) for key in admin_service.ACCESS_STATUS_VALUES},
+        "active_last_7d": sum(1 for r in rows if r["last_login_at"] is not None and r["last_login_at"] >= now - 7 * 86_400),
+        "active_last_30d": sum(1 for r in rows if r["last_login_at"] is not None and r["last_login_at"] >= now - 30 * 86_400),
+        "expirations_next_7d": expiring(7),
+        "expirations_next_14d": expiring(14),
+        "expirations_next_30d": expiring(30),
+    }
+
+
+def _new_user() -> int:
+    user = create_user(email=f"stats_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    return int(user["id"])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_single_pass_stats_match_per_metric_counts():
+    now = int(time.time())
+    soon, later, past = _new_user(), _new_user(), _new_user()
+    update_user_access_state(soon, access_status="active", expires_at=now + 3 * 86_400)
+    update_user_access_state(later, access_status="manual_grant", expires_at=now + 20 * 86_400)
+    update_user_access_state(past, access_status="active", expires_at=now - 60)
+    update_user_last_login(soon, now - 10 * 86_400)
+
+    assert admin_service._compute_admin_stats(now) == _naive_stats(now)
+
+
+def test_stats_are_cached_and_invalidated_by_access_changes(monkeypatch):
+    monkeypatch.setattr(admin_service, "ADMIN_STATS_CACHE_TTL_SECONDS", 60)
+    admin_service._ADMIN_STATS_CACHE.clear()
+    first = admin_service.get_admin_stats()
+    with _connect() as conn:
+        conn.execute("UPDATE users SET access_status = 'blocked' WHERE id = (SELECT MIN(id) FROM users)")
+        conn.commit()
+    assert admin_service.get_admin_stats() == first
+
+    user_id = _new_user()
+    after_create = admin_service.get_admin_stats()
+    assert after_create["total_users"] == first["total_users"] + 1
+
+    update_user_access_state(user_id, access_status="blocked")
+    after_update = admin_service.get_admin_stats()
+    assert after_update["status_counts"]["blocked"] == after_create["status_counts"]["blocked"] + 1
+
+
+def test_stats_snapshot_is_recorded_per_bucket(monkeypatch):
+    monkeypatch.setattr(admin_service, "ADMIN_STATS_HISTORY_BUCKET_SECONDS", 3600)
+    admin_service._ADMIN_STATS_CACHE.clear()
+    stats = admin_service.get_admin_stats()
+    now = int(time.time())
+
+    history = list_admin_stats_history(now - now % 3600)
+    assert history[-1]["bucket_start"] == now - now % 3600
+    assert history[-1]["stats"] == stats
+    assert admin_service.get_admin_stats_history(days=1)["items"][-1]["stats"] == stats
+
+
+def test_stats_history_limit_keeps_the_newest_buckets():
+    with _connect() as conn:
+        conn.execute("DELETE FROM admin_stats_history")
+        conn.commit()
+    base = 10_000 * 3600
+    for hour in range(5):
+        record_admin_stats_snapshot(base + hour * 3600, {"hour": hour})
+
+    history = list_admin_stats_history(base, limit=3)
+    assert [item["stats"]["hour"] for item in history] == [2, 3, 4]
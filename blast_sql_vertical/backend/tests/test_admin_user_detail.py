@@ -0,0 +1,77 @@
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    create_admin_audit_log,
+    create_purchase,
+    create_user,
+    get_user_by_id,
+    init_user_db,
+    update_user_access_state,
+    upsert_lesson_progress,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_detail_is_loaded_with_one_connection(monkeypatch):
+    _, lesson_ids, modules = admin_service._course_lessons()
+    user = create_user(email=f"detail_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    user_id = int(user["id"])
+    upsert_lesson_progress(user_id, lesson_ids[0], {"lessonCompleted": True}, True)
+    create_purchase(user_id=user_id, course_id="sql-basics", status="pending")
+    latest = create_purchase(user_id=user_id, course_id="sql-basics", status="canceled")
+    create_admin_audit_log(user_id, user_id, "progress_updated", "seed", {"a": 1}, {"a": 2})
+    update_user_access_state(user_id, access_status="manual_grant", expires_at=int(time.time()) - 5)
+
+    real_connect = sqlite3.connect
+    opened = []
+
+    def counting_connect(*args, **kwargs):
+        opened.append(args)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", counting_connect)
+    detail = admin_service.get_admin_user_detail(user_id)
+    monkeypatch.setattr(sqlite3, "connect", real_connect)
+
+    assert len(opened) == 1
+    assert detail["access"]["status"] == "expired"
+    assert get_user_by_id(user_id)["access_status"] == "expired"
+    assert detail["payment"]["purchase_id"] == latest["id"]
+    assert detail["progress"]["completed_lessons"] == 1
+    assert detail["progress"]["modules"][0]["lessons"][0]["lesson_title"] == modules[0]["lessons"][0]["title"]
+    assert detail["audit_logs"][0]["before"] == {"a": 1}
+    assert detail["audit_logs"][0]["action_type"] == "progress_updated"
+
+
+def test_detail_view_does_not_wait_for_the_write_lock():
+    user = create_user(email=f"detail_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    user_id = int(user["id"])
+    update_user_access_state(user_id, access_status="active", expires_at=int(time.time()) + 3600)
+
+    with _connect() as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.monotonic()
+            detail = admin_service.get_admin_user_detail(user_id)
+            assert time.monotonic() - started < 5
+        finally:
+            writer.rollback()
+    assert detail["access"]["status"] == "active"
+
+
+def test_course_outline_is_shared_not_copied():
+    first = admin_service._course_lessons()
+    second = admin_service._course_lessons()
+    assert first[1] is second[1]
+    assert first[2] is second[2]
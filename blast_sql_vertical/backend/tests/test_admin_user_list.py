@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import admin_service
+from app.services.auth_service import hash_password
+from app.services.user_db import create_user, init_user_db, update_user_full_name, update_user_last_login
+
+
+def _new_user(email: str, full_name: str | None = None) -> int:
+    user = create_user(email=email, password_hash=hash_password("TestPass123!"), full_name=full_name)
+    return int(user["id"])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def test_search_index_matches_substrings_and_follows_renames():
+    tag = uuid.uuid4().hex[:12]
+    by_email = _new_user(f"Zed.{tag}@test.local")
+    by_name = _new_user(f"other_{uuid.uuid4().hex}@test.local", full_name=f"Maria {tag.upper()} Souza")
+
+    found = {item["id"] for item in admin_service.list_admin_users(search=tag)["items"]}
+    assert found == {by_email, by_name}
+    assert [i["id"] for i in admin_service.list_admin_users(search=f"zed.{tag[:6]}")["items"]] == [by_email]
+
+    update_user_full_name(by_name, "Renamed")
+    assert [i["id"] for i in admin_service.list_admin_users(search=f"{tag}@")["items"]] == [by_email]
+    assert admin_service.list_admin_users(search=f"maria {tag}")["items"] == []
+
+
+def test_keyset_pages_cover_every_row_once_for_nullable_sort():
+    tag = uuid.uuid4().hex
+    user_ids = [_new_user(f"keyset_{i}_{tag}@test.local") for i in range(7)]
+    for offset, user_id in enumerate(user_ids[:4]):
+        update_user_last_login(user_id, 1_700_000_000 + (offset % 2))
+
+    for sort_dir in ("asc", "desc"):
+        offset_order = [
+            item["id"]
+            for item in admin_service.list_admin_users(
+                search=tag, sort_by="last_login_at", sort_dir=sort_dir, page_size=100
+            )["items"]
+        ]
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = admin_service.list_admin_users(
+                search=tag, sort_by="last_login_at", sort_dir=sort_dir, page_size=2, cursor=cursor
+            )
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen == offset_order
+        assert sorted(seen) == sorted(user_ids)
+
+
+def test_cursor_must_match_sort():
+    tag = uuid.uuid4().hex
+    for i in range(3):
+        _new_user(f"cursor_{i}_{tag}@test.local")
+    page = admin_service.list_admin_users(search=tag, page_size=1)
+    with pytest.raises(HTTPException):
+        admin_service.list_admin_users(search=tag, sort_by="expires_at", cursor=page["next_cursor"])
+    with pytest.raises(HTTPException):
+        admin_service.list_admin_users(search=tag, cursor="not-a-cursor")
+
+
+def test_total_count_is_cached_per_filter_set():
+    tag = uuid.uuid4().hex
+    _new_user(f"count_a_{tag}@test.local")
+    renamed = _new_user(f"count_b_{uuid.uuid4().hex}@test.local")
+    assert admin_service.list_admin_users(search=tag)["total_items"] == 1
+
+    update_user_full_name(renamed, f"Count {tag}")
+    cached = admin_service.list_admin_users(search=tag)
+    assert len(cached["items"]) == 2
+    assert cached["total_items"] == 1
+
+    # New users and access changes invalidate the cached totals.
+    _new_user(f"count_c_{tag}@test.local")
+    assert admin_service.list_admin_users(search=tag)["total_items"] == 3
@@ -78,7 +78,7 @@ def test_certificate_pdf_requires_auth(client):
     assert res.status_code == 401
 
 
-@patch("app.services.account_service.render_pdf_from_html", new_callable=AsyncMock)
+@patch("app.services.account_service.render_pdf_template", new_callable=AsyncMock)
 def test_certificate_pdf_full_name_required(mock_render, client, test_user):
     """GET /account/certificate/pdf returns 400 FULL_NAME_REQUIRED when full_name is missing."""
     res = client.get("/account/certificate/pdf", headers=_auth_headers(test_user["token"]))
@@ -88,10 +88,10 @@ def test_certificate_pdf_full_name_required(mock_render, client, test_user):
     mock_render.assert_not_called()
 
 
-@patch("app.services.account_service.render_pdf_from_html", new_callable=AsyncMock)
+@patch("app.services.account_service.render_pdf_template", new_callable=AsyncMock)
 def test_certificate_pdf_no_access(mock_render, client, test_user_with_full_name):
     """GET /account/certificate/pdf returns 403 when user has no active course access."""
-    mock_render.return_value = b"%PDF-1.4 fake"
+    mock_render.return_value = (b"%PDF-1.4 fake", "native")
     res = client.get(
         "/account/certificate/pdf",
         headers=_auth_headers(test_user_with_full_name["token"]),
@@ -100,7 +100,7 @@ def test_certificate_pdf_no_access(mock_render, client, test_user_with_full_name
     mock_render.assert_not_called()
 
 
-@patch("app.services.account_service.render_pdf_from_html", new_callable=AsyncMock)
+@patch("app.services.account_service.render_pdf_template", new_callable=AsyncMock)
 def test_certificate_pdf_not_completed(mock_render, client, test_user_with_full_name):
     """GET /account/certificate/pdf returns 403 when course not completed."""
     user_row = get_user_by_email(test_user_with_full_name["email"])
@@ -124,7 +124,7 @@ def test_certificate_pdf_not_completed(mock_render, client, test_user_with_full_
         starts_at=paid_at,
         expires_at=paid_at + 180 * 86400,
     )
-    mock_render.return_value = b"%PDF-1.4 fake"
+    mock_render.return_value = (b"%PDF-1.4 fake", "native")
     res = client.get(
         "/account/certificate/pdf",
         headers=_auth_headers(test_user_with_full_name["token"]),
@@ -133,7 +133,7 @@ def test_certificate_pdf_not_completed(mock_render, client, test_user_with_full_
     mock_render.assert_not_called()
 
 
-@patch("app.services.account_service.render_pdf_from_html", new_callable=AsyncMock)
+@patch("app.services.account_service.render_pdf_template", new_callable=AsyncMock)
 def test_certificate_pdf_success(mock_render, client, test_user_with_full_name):
     """GET /account/certificate/pdf returns PDF when full_name, access, and completion are valid."""
     user_row = get_user_by_email(test_user_with_full_name["email"])
@@ -174,7 +174,7 @@ def test_certificate_pdf_success(mock_render, client, test_user_with_full_name):
             progress={"lessonCompleted": True, "updatedAt": paid_at * 1000},
             is_completed=True,
         )
-    mock_render.return_value = b"%PDF-1.4 fake"
+    mock_render.return_value = (b"%PDF-1.4 fake", "native")
     res = client.get(
         "/account/certificate/pdf",
         headers=_auth_headers(test_user_with_full_name["token"]),
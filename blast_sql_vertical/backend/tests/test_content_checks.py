@@ -0,0 +1,27 @@
+from app.services.content_checks import collect_payload_issues, iter_solution_queries
+
+
+def test_payload_issues_report_pointer_and_stop_at_limit():
+    payload = {
+        "title": "Aquisi??o de clientes",
+        "tabs": [{"body": "Voc� jÃ¡ sabe"}, {"body": "ok?"}],
+    }
+
+    issues = collect_payload_issues(payload, "lesson:x")
+    assert issues == [
+        "lesson:x.title: contains_internal_qmark_token:Aquisi??o :: Aquisi??o de clientes",
+        "lesson:x.tabs[0].body: contains_replacement_char :: Voc� jÃ¡ sabe",
+        "lesson:x.tabs[0].body: contains_mojibake_signature :: Voc� jÃ¡ sabe",
+    ]
+    assert len(collect_payload_issues(payload, limit=2)) == 2
+    assert collect_payload_issues({"title": "Tudo certo? Sim."}) == []
+
+
+def test_iter_solution_queries_finds_lessons_and_playground_challenges():
+    lesson = {"exercises": [{"solution_query": "SELECT 1"}, {"solution_query": "  "}, {"title": "x"}]}
+    playground = {"challenges": {"retail": [{"id": "c1", "solution_query": "SELECT 2"}]}}
+
+    assert list(iter_solution_queries(lesson)) == [("$.exercises[0].solution_query", "SELECT 1")]
+    assert list(iter_solution_queries(playground)) == [
+        ("$.challenges.retail[0].solution_query", "SELECT 2")
+    ]
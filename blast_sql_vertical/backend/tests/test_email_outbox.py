@@ -0,0 +1,200 @@
+import time
+import uuid
+
+import pytest
+import resend
+from resend.exceptions import ValidationError
+
+from app.services import email_outbox_service, email_service
+from app.services.auth_service import hash_password
+from app.services.billing_service import process_stripe_event
+from app.services.user_db import (
+    _connect,
+    create_purchase,
+    create_user,
+    get_purchase_email_event_by_stripe_event_id,
+    init_user_db,
+)
+
+
+class FakeEmailProvider:
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+        self.fail_with: Exception | None = None
+
+    def send_batch(self, messages: list[dict]) -> list[str | None]:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.batches.append(messages)
+        return [f"fake_{uuid.uuid4().hex[:8]}" for _ in messages]
+
+
+def _outbox_row(outbox_id: int) -> dict:
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM email_outbox WHERE id = ?", (outbox_id,)).fetchone()
+        return dict(row) if row else {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+@pytest.fixture()
+def provider(monkeypatch):
+    fake = FakeEmailProvider()
+    email_outbox_service.set_email_provider(fake)
+    monkeypatch.setattr(email_service, "RESEND_API_KEY", "re_test")
+    monkeypatch.setattr(email_service, "EMAIL_OUTBOX_ENABLED", True)
+    while email_outbox_service.process_outbox_batch():
+        pass
+    fake.batches.clear()
+    yield fake
+    email_outbox_service.set_email_provider(None)
+
+
+def test_purchase_email_is_queued_and_provider_id_recorded_on_event(provider):
+    user = create_user(email=f"outbox_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    purchase = create_purchase(user_id=int(user["id"]), course_id="sql-basics", status="pending")
+    event_id = f"evt_{uuid.uuid4().hex}"
+    session_id = f"cs_{uuid.uuid4().hex}"
+    payment_intent_id = f"pi_{uuid.uuid4().hex}"
+    metadata = {"purchase_id": str(purchase["id"]), "course_id": "sql-basics"}
+    process_stripe_event(
+        {
+            "id": event_id,
+            "type": "checkout.session.completed",
+            "created": int(time.time()),
+            "data": {
+                "object": {
+                    "id": session_id,
+                    "payment_status": "paid",
+                    "payment_intent": payment_intent_id,
+                    "amount_total": 9900,
+                    "currency": "brl",
+                    "metadata": metadata,
+                }
+            },
+        }
+    )
+    event_row = get_purchase_email_event_by_stripe_event_id(event_id)
+    assert event_row["processed_at"] is not None
+    assert event_row["email_sent_at"] is None
+    assert provider.batches == []
+
+    # A follow-up event for the same purchase reuses the idempotency key.
+    process_stripe_event(
+        {
+            "id": f"evt_{uuid.uuid4().hex}",
+            "type": "payment_intent.succeeded",
+            "created": int(time.time()),
+            "data": {"object": {"id": payment_intent_id, "amount_received": 9900, "currency": "brl", "metadata": metadata}},
+        }
+    )
+
+    assert email_outbox_service.process_outbox_batch() == 1
+    assert len(provider.batches) == 1
+    assert provider.batches[0][0]["to"] == user["email"]
+    assert provider.batches[0][0]["idempotency_key"] == f"purchase_confirmation:{purchase['id']}"
+
+    event_row = get_purchase_email_event_by_stripe_event_id(event_id)
+    assert event_row["email_sent_at"] is not None
+    assert event_row["email_provider_message_id"].startswith("fake_")
+
+
+def test_password_reset_emails_are_batched_and_deduplicated(provider):
+    links = [f"http://localhost/reset-password?token={uuid.uuid4().hex}" for _ in range(3)]
+    for link in links:
+        assert email_service.send_password_reset_email("reset@test.local", link) is True
+    assert email_service.send_password_reset_email("reset@test.local", links[0]) is True
+
+    assert email_outbox_service.process_outbox_batch() == 3
+    assert len(provider.batches) == 1
+    assert len(provider.batches[0]) == 3
+    assert email_outbox_service.process_outbox_batch() == 0
+
+
+def test_sent_reset_email_no_longer_stores_the_token(provider):
+    token = uuid.uuid4().hex
+    assert email_service.send_password_reset_email("redact@test.local", f"http://localhost/reset-password?token={token}")
+    with _connect() as conn:
+        outbox_id = conn.execute("SELECT MAX(id) FROM email_outbox").fetchone()[0]
+    assert token in _outbox_row(outbox_id)["html"]
+
+    assert email_outbox_service.process_outbox_batch() == 1
+    assert token in provider.batches[0][0]["html"]
+    row = _outbox_row(outbox_id)
+    assert row["status"] == "sent"
+    assert token not in row["html"]
+
+
+def test_failed_batch_backs_off_then_dead_letters(provider, monkeypatch):
+    monkeypatch.setattr(email_outbox_service, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    row = email_outbox_service.enqueue_email(
+        idempotency_key=f"test:{uuid.uuid4().hex}",
+        kind="test",
+        to_email="fail@test.local",
+        subject="s",
+        html="<p>h</p>",
+    )
+    provider.fail_with = RuntimeError("provider unavailable")
+
+    assert email_outbox_service.process_outbox_batch() == 1
+    first = _outbox_row(int(row["id"]))
+    assert first["status"] == "pending"
+    assert first["attempts"] == 1
+    assert first["next_attempt_at"] > int(time.time())
+    assert email_outbox_service.process_outbox_batch() == 0
+
+    with _connect() as conn:
+        conn.execute("UPDATE email_outbox SET next_attempt_at = 0 WHERE id = ?", (row["id"],))
+        conn.commit()
+    assert email_outbox_service.process_outbox_batch() == 1
+    dead = _outbox_row(int(row["id"]))
+    assert dead["status"] == "dead"
+    assert "provider unavailable" in dead["last_error"]
+    assert dead["html"] == ""
+
+
+def test_resend_batch_rejection_falls_back_to_single_sends(monkeypatch):
+    def _batch_send(params, options):
+        raise ValidationError(message="Invalid `to` field.", error_type="validation_error", code=422)
+
+    def _single_send(params, options):
+        if params["to"] == ["not-an-email"]:
+            raise ValidationError(message="Invalid `to` field.", error_type="validation_error", code=422)
+        return {"id": f"re_{options['idempotency_key']}"}
+
+    monkeypatch.setattr(resend.Batch, "send", _batch_send)
+    monkeypatch.setattr(resend.Emails, "send", _single_send)
+    messages = [
+        {"to": to, "subject": "s", "html": "<p>h</p>", "idempotency_key": key}
+        for to, key in (("ok@test.local", "k1"), ("not-an-email", "k2"))
+    ]
+
+    first, second = email_outbox_service.ResendEmailProvider().send_batch(messages)
+    assert first == "re_k1"
+    assert isinstance(second, email_outbox_service.EmailRejected)
+
+
+def test_rejected_message_is_dead_lettered_without_failing_the_batch(provider, monkeypatch):
+    rows = [
+        email_outbox_service.enqueue_email(
+            idempotency_key=f"test:{uuid.uuid4().hex}", kind="test", to_email=to, subject="s", html="<p>h</p>"
+        )
+        for to in ("good@test.local", "bad@test.local")
+    ]
+    real_send = provider.send_batch
+
+    def _send_batch(messages):
+        ids = real_send(messages)
+        return [
+            email_outbox_service.EmailRejected("invalid recipient") if message["to"] == "bad@test.local" else ids[idx]
+            for idx, message in enumerate(messages)
+        ]
+
+    monkeypatch.setattr(provider, "send_batch", _send_batch)
+    assert email_outbox_service.process_outbox_batch() == 2
+    good, bad = (_outbox_row(int(row["id"])) for row in rows)
+    assert good["status"] == "sent" and good["provider_message_id"].startswith("fake_")
+    assert bad["status"] == "dead" and "invalid recipient" in bad["last_error"]
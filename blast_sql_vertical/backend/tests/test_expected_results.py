@@ -0,0 +1,105 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.services import expected_results, validator
+
+
+@pytest.fixture(autouse=True)
+def _fresh_artifact(tmp_path, monkeypatch):
+    monkeypatch.setattr(expected_results, "EXPECTED_RESULTS_PATH", tmp_path / "expected_results.json")
+    monkeypatch.setattr(expected_results, "EXPECTED_RESULTS_ENABLED", True)
+    expected_results.reset_expected_results()
+    yield
+    expected_results.reset_expected_results()
+
+
+def _write_artifact(entries, *, seed=None):
+    payload = {
+        "version": expected_results.FORMAT_VERSION,
+        "seed": seed or expected_results.seed_digest(),
+        "entries": entries,
+    }
+    expected_results.EXPECTED_RESULTS_PATH.write_text(json.dumps(payload), encoding="utf-8")
+    expected_results.reset_expected_results()
+
+
+SOLUTION_COLS = ["id", "total", "day"]
+SOLUTION_ROWS = [(2, Decimal("10.50"), date(2024, 1, 2)), (1, Decimal("3"), date(2024, 1, 1))]
+ANSWERS = [
+    (["day", "id", "total"], [["2024-01-01", 1, 3], ["2024-01-02", 2, 10.5]]),
+    (["id", "total", "day"], [[1, 3.0, date(2024, 1, 1)], [2, 10.5, date(2024, 1, 2)]]),
+    (["id", "total", "day"], [[2, 10.5, date(2024, 1, 2)]]),
+    (["id", "total", "day"], [[1, 3.0, date(2024, 1, 1)], [2, 99, date(2024, 1, 2)]]),
+    (["id", "total"], [[1, 3.0], [2, 10.5]]),
+]
+
+
+@pytest.mark.parametrize("max_rows", [50, 0])
+@pytest.mark.parametrize("order_matters", [False, True])
+def test_snapshot_gives_the_same_verdicts_as_running_the_solution(max_rows, order_matters):
+    # Round-trip through JSON like the artifact file does.
+    entry = validator.expected_entry("SELECT 1", SOLUTION_COLS, SOLUTION_ROWS, max_rows=max_rows)
+    entry = json.loads(json.dumps(entry))
+    assert ("rows" in entry) is (max_rows > 0)
+    live = [dict(zip(SOLUTION_COLS, row)) for row in SOLUTION_ROWS]
+
+    for cols, rows in ANSWERS:
+        expected = validator._compare_to_expected_result(cols, rows, live, order_matters=order_matters)
+        assert validator._compare_to_snapshot(cols, rows, entry, order_matters=order_matters) == expected
+
+
+def test_validate_uses_snapshot_instead_of_running_the_solution(monkeypatch):
+    lesson = {"exercises": [{"solution_query": "SELECT id FROM t", "validation": {}}]}
+    executed = []
+
+    def fake_execute(session_id, query):
+        executed.append(query)
+        return ["id"], [[1], [2]]
+
+    monkeypatch.setattr(validator, "load_lesson", lambda lesson_id: lesson)
+    monkeypatch.setattr(validator, "execute_query", fake_execute)
+
+    _write_artifact(
+        {
+            expected_results.lesson_key("lesson_x", 0): validator.expected_entry(
+                "SELECT id FROM t", ["id"], [(2,), (1,)], max_rows=50
+            )
+        }
+    )
+    assert validator.validate("s", "lesson_x", 0, "SELECT id FROM t2") == (True, "Correct!")
+    assert executed == ["SELECT id FROM t2"]
+
+    # Edited solution: the stale entry is ignored and the solution runs again.
+    lesson["exercises"][0]["solution_query"] = "SELECT id FROM t WHERE id > 0"
+    executed.clear()
+    assert validator.validate("s", "lesson_x", 0, "SELECT id FROM t2") == (True, "Correct!")
+    assert executed == ["SELECT id FROM t2", "SELECT id FROM t WHERE id > 0"]
+
+
+def test_artifact_from_another_seed_or_format_is_ignored():
+    key = expected_results.playground_key("ecommerce", "eco_1")
+    entry = validator.expected_entry("SELECT 1", ["x"], [(1,)], max_rows=50)
+
+    _write_artifact({key: entry}, seed="not-the-current-seed")
+    assert expected_results.get_expected_result(key, "SELECT 1") is None
+
+    _write_artifact({key: entry})
+    assert expected_results.get_expected_result(key, "SELECT 1")["rows"] == [[1]]
+    assert expected_results.get_expected_result(key, "SELECT 2") is None
+
+    expected_results.EXPECTED_RESULTS_PATH.write_text("{broken", encoding="utf-8")
+    expected_results.reset_expected_results()
+    assert expected_results.get_expected_result(key, "SELECT 1") is None
+
+
+def test_volatile_solutions_are_never_answered_from_the_snapshot():
+    key = expected_results.lesson_key("lesson_dates", 0)
+    query = "SELECT CURRENT_DATE - order_date AS age FROM orders"
+    assert not expected_results.is_snapshot_safe(query)
+    assert expected_results.is_snapshot_safe("SELECT order_date FROM orders")
+
+    _write_artifact({key: validator.expected_entry(query, ["age"], [(3,)], max_rows=50)})
+    assert expected_results.get_expected_result(key, query) is None
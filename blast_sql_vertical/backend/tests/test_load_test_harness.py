@@ -0,0 +1,38 @@
+"""Tests for the load-test harness reporting helpers."""
+
+from benchmarks.load_test import compare_to_baseline, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_summarize_reports_ms_and_rps():
+    stats = summarize([0.010, 0.020, 0.030, 0.040], errors=1, elapsed=2.0)
+    assert stats["requests"] == 4
+    assert stats["errors"] == 1
+    assert stats["rps"] == 2.0
+    assert stats["p50_ms"] == 20.0
+    assert stats["p99_ms"] == 40.0
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {
+        "overall": {"rps": 100.0},
+        "scenarios": {"run_sql": {"p95_ms": 10.0, "errors": 0}, "courses": {"p95_ms": 5.0, "errors": 0}},
+    }
+    current = {
+        "overall": {"rps": 70.0},
+        "scenarios": {"run_sql": {"p95_ms": 13.0, "errors": 0}, "courses": {"p95_ms": 5.5, "errors": 2}},
+    }
+    regressions = compare_to_baseline(current, baseline, threshold=0.2)
+    assert any(item.startswith("run_sql: p95") for item in regressions)
+    assert any(item.startswith("courses: errors") for item in regressions)
+    assert not any(item.startswith("courses: p95") for item in regressions)
+    assert any(item.startswith("overall: rps") for item in regressions)
+    assert compare_to_baseline(baseline, baseline, threshold=0.2) == []
@@ -0,0 +1,91 @@
+"""Tests for request timing instrumentation and the /metrics endpoint."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import metrics_service
+from app.services.metrics_service import format_server_timing, instrument, render_prometheus, timed
+
+
+@pytest.fixture()
+def sample_all(monkeypatch):
+    monkeypatch.setattr(metrics_service, "METRICS_SAMPLE_RATE", 1.0)
+    metrics_service.reset_metrics()
+    yield
+    metrics_service.reset_metrics()
+
+
+def test_timed_records_stage_histogram(sample_all):
+    with timed("unit_stage"):
+        pass
+
+    @instrument("unit_decorated")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    text = render_prometheus()
+    assert 'blast_stage_duration_seconds_count{stage="unit_stage"} 1' in text
+    assert 'blast_stage_duration_seconds_count{stage="unit_decorated"} 1' in text
+    assert 'blast_stage_duration_seconds_bucket{stage="unit_stage",le="+Inf"} 1' in text
+
+
+def test_timed_is_noop_when_sampling_off(monkeypatch):
+    monkeypatch.setattr(metrics_service, "METRICS_SAMPLE_RATE", 0.0)
+    metrics_service.reset_metrics()
+    with timed("unsampled_stage"):
+        pass
+    assert "unsampled_stage" not in render_prometheus()
+
+
+def test_format_server_timing():
+    header = format_server_timing({"sqlite": [0.0021, 3], "bad name": [0.001, 1]}, 0.0105)
+    assert header.startswith("total;dur=10.50")
+    assert 'sqlite;dur=2.10;desc="3x"' in header
+    assert "bad_name;dur=1.00" in header
+
+
+def test_request_emits_server_timing_and_metrics(sample_all, monkeypatch):
+    import app.main as main_module
+
+    monkeypatch.setattr(main_module, "METRICS_PUBLIC", True)
+    client = TestClient(app)
+    res = client.post("/auth/login", json={"email": "nobody@test.local", "password": "wrong-password"})
+    assert res.status_code == 401
+    server_timing = res.headers.get("server-timing", "")
+    assert server_timing.startswith("total;dur=")
+    assert "sqlite;dur=" in server_timing
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert 'route="/auth/login"' in metrics.text
+    assert 'stage="sqlite"' in metrics.text
+
+
+def test_metrics_needs_a_token_unless_public(monkeypatch):
+    import app.main as main_module
+
+    client = TestClient(app)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(main_module, "METRICS_TOKEN", "secret-token")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret-token"}).status_code == 200
+
+
+def test_sqlite_stage_times_statements_not_the_connection(sample_all):
+    from app.services.user_db import _connect
+
+    def sqlite_seconds():
+        hist = metrics_service._HISTOGRAMS.get(("blast_stage_duration_seconds", (("stage", "sqlite"),)))
+        return (hist.count, hist.total) if hist else (0, 0.0)
+
+    with _connect() as conn:
+        conn.execute("SELECT 1").fetchall()
+        time.sleep(0.05)
+    count, total = sqlite_seconds()
+    assert count == 3  # two PRAGMAs and the SELECT
+    assert total < 0.05
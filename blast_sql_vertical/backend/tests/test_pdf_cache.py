@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+from app.services import account_service
+from app.services.pdf_cache import PdfDiskCache
+
+
+def test_cache_is_content_addressed_and_evicts_least_recently_used(tmp_path):
+    cache = PdfDiskCache(tmp_path, max_bytes=25)
+    first, second, third = (cache.key_for(f"<p>{i}</p>") for i in range(3))
+    assert cache.key_for("<p>0</p>") == first
+    assert cache.key_for("<p>0</p>", landscape=True) != first
+
+    cache.put(first, b"a" * 10)
+    cache.put(second, b"b" * 10)
+    assert cache.get(first) == b"a" * 10
+    cache.put(third, b"c" * 10)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == b"a" * 10
+    assert cache.get(third) == b"c" * 10
+    assert cache.total_bytes == 20
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([f"{first}.pdf", f"{third}.pdf"])
+    assert cache.stats["evictions"] == 1
+
+
+def test_cache_index_is_rebuilt_from_disk(tmp_path):
+    writer = PdfDiskCache(tmp_path, max_bytes=100)
+    old_key, new_key = writer.key_for("old"), writer.key_for("new")
+    writer.put(old_key, b"x" * 40)
+    writer.put(new_key, b"y" * 40)
+    past = time.time() - 3600
+    os.utime(tmp_path / f"{old_key}.pdf", (past, past))
+
+    reader = PdfDiskCache(tmp_path, max_bytes=100)
+    assert reader.get(new_key) == b"y" * 40
+    reader.put(reader.key_for("third"), b"z" * 40)
+    assert reader.get(old_key) is None
+    assert reader.get(new_key) == b"y" * 40
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = PdfDiskCache(tmp_path / "off", max_bytes=0)
+    cache.put(cache.key_for("x"), b"pdf")
+    assert cache.get(cache.key_for("x")) is None
+    assert not (tmp_path / "off").exists()
+
+
+def test_certificate_render_uses_cache_and_precomputed_images(monkeypatch, tmp_path):
+    cache = PdfDiskCache(tmp_path, max_bytes=1024)
+    monkeypatch.setattr(account_service, "get_pdf_cache", lambda: cache)
+    monkeypatch.setattr(account_service, "_STATIC_IMAGE_URIS", {})
+    account_service.initialize_certificate_assets()
+    assert all(uri.startswith("data:image/png;base64,") for uri in account_service._STATIC_IMAGE_URIS.values())
+
+    def _fail_read(*args, **kwargs):
+        raise AssertionError("static images are read at startup only")
+
+    monkeypatch.setattr(account_service, "_encode_static_image", _fail_read)
+    user = {"id": 1, "full_name": "Ana Lima", "access_status": "active", "expires_at": None}
+    monkeypatch.setattr(account_service, "get_user_by_id", lambda user_id: user)
+    monkeypatch.setattr(account_service, "sync_user_effective_status", lambda row: row)
+    monkeypatch.setattr(account_service, "has_active_course_access", lambda *args: True)
+    monkeypatch.setattr(
+        account_service,
+        "list_progress_for_lessons",
+        lambda user_id, lesson_ids: {lesson_id: {"is_completed": 1} for lesson_id in lesson_ids},
+    )
+
+    with patch.object(account_service, "render_pdf_template", new_callable=AsyncMock) as mock_render:
+        mock_render.return_value = (b"%PDF-1.4 cached", "native")
+        first = asyncio.run(account_service.generate_certificate_pdf_bytes(1))
+        second = asyncio.run(account_service.generate_certificate_pdf_bytes(1))
+        assert first == second == b"%PDF-1.4 cached"
+        mock_render.assert_called_once()
+
+        user["full_name"] = "Ana Lima Souza"
+        asyncio.run(account_service.generate_certificate_pdf_bytes(1))
+        assert mock_render.call_count == 2
+
+        # A name outside WinAnsi falls back to Chromium and is cached under that backend.
+        user["full_name"] = "Zoë 李"
+        mock_render.return_value = (b"%PDF-1.4 chromium", "chromium")
+        assert asyncio.run(account_service.generate_certificate_pdf_bytes(1)) == b"%PDF-1.4 chromium"
+        assert asyncio.run(account_service.generate_certificate_pdf_bytes(1)) == b"%PDF-1.4 chromium"
+        assert mock_render.call_count == 3
+        html = mock_render.call_args.kwargs["html"]
+        assert cache.get(cache.key_for(html, variant="chromium")) == b"%PDF-1.4 chromium"
+        assert cache.get(cache.key_for(html, variant="native")) is None
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import pdf_job_service
+from app.services.pdf_service import PdfServiceUnavailable
+
+
+def _manager(tmp_path, **overrides):
+    options = {"workers": 2, "max_pending": 10, "ttl_seconds": 900}
+    options.update(overrides)
+    return pdf_job_service.PdfJobManager(tmp_path, **options)
+
+
+async def _wait_finished(manager, job_id, owner_id=1):
+    for _ in range(200):
+        job = manager.status(job_id, owner_id=owner_id)
+        if job["status"] in {"succeeded", "failed"}:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_renders_in_background_and_dedups_identical_payloads(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_render(html, *, landscape=False):
+        calls.append(landscape)
+        await asyncio.sleep(0.02)
+        return b"%PDF-1.4 " + html.encode()
+
+    monkeypatch.setattr(pdf_job_service, "render_pdf_from_html", fake_render)
+
+    async def scenario():
+        manager = _manager(tmp_path)
+        first = manager.submit(owner_id=1, kind="cheatsheet", html="<p>x</p>", filename="Minha Cola")
+        again = manager.submit(owner_id=1, kind="cheatsheet", html="<p>x</p>")
+        other_user = manager.submit(owner_id=2, kind="cheatsheet", html="<p>x</p>")
+        assert first["status"] == "queued" and first["download_url"] is None
+        assert again["id"] == first["id"] and again["deduplicated"] is True
+        assert other_user["id"] != first["id"]
+
+        with pytest.raises(HTTPException) as not_ready:
+            manager.artifact(first["id"], owner_id=1)
+        assert not_ready.value.status_code == 409
+
+        done = await _wait_finished(manager, first["id"])
+        path, filename = manager.artifact(first["id"], owner_id=1)
+        with pytest.raises(HTTPException) as foreign:
+            manager.status(first["id"], owner_id=2)
+        await manager.close()
+        return done, path, filename
+
+    done, path, filename = asyncio.run(scenario())
+    assert done["status"] == "succeeded"
+    assert done["download_url"].endswith(f"/{done['id']}/download")
+    assert done["expires_at"] == done["finished_at"] + 900
+    assert path.read_bytes() == b"%PDF-1.4 <p>x</p>"
+    assert filename == "Minha_Cola.pdf"
+    assert calls == [True, True]
+
+
+def test_workers_bound_concurrency_and_queue_rejects_overflow(tmp_path, monkeypatch):
+    active = {"now": 0, "peak": 0}
+
+    async def fake_render(html, *, landscape=False):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return b"%PDF"
+
+    monkeypatch.setattr(pdf_job_service, "render_pdf_from_html", fake_render)
+
+    async def scenario():
+        manager = _manager(tmp_path, workers=2, max_pending=5)
+        ids = [manager.submit(owner_id=1, kind="master-challenge", html=f"<p>{i}</p>")["id"] for i in range(5)]
+        with pytest.raises(HTTPException) as full:
+            manager.submit(owner_id=1, kind="master-challenge", html="<p>overflow</p>")
+        results = [await _wait_finished(manager, job_id) for job_id in ids]
+        await manager.close()
+        return full.value.status_code, results
+
+    status_code, results = asyncio.run(scenario())
+    assert status_code == 503
+    assert {job["status"] for job in results} == {"succeeded"}
+    assert active["peak"] == 2
+
+
+def test_failed_job_reports_error_and_can_be_resubmitted(tmp_path, monkeypatch):
+    async def failing_render(html, *, landscape=False):
+        raise PdfServiceUnavailable("PDF renderer is busy. Try again shortly.")
+
+    monkeypatch.setattr(pdf_job_service, "render_pdf_from_html", failing_render)
+
+    async def scenario():
+        manager = _manager(tmp_path)
+        first = manager.submit(owner_id=1, kind="master-challenge", html="<p>x</p>")
+        failed = await _wait_finished(manager, first["id"])
+        retry = manager.submit(owner_id=1, kind="master-challenge", html="<p>x</p>")
+        await manager.close()
+        return first, failed, retry
+
+    first, failed, retry = asyncio.run(scenario())
+    assert failed["status"] == "failed"
+    assert "busy" in failed["error"]
+    assert retry["id"] != first["id"]
+
+
+def test_unsafe_html_and_unknown_kind_are_rejected_up_front(tmp_path):
+    manager = _manager(tmp_path)
+    for kind, html in (("master-challenge", "<script>alert(1)</script>"), ("invoice", "<p>x</p>")):
+        with pytest.raises(HTTPException) as exc:
+            manager.submit(owner_id=1, kind=kind, html=html)
+        assert exc.value.status_code == 400
+
+
+def test_sweep_expires_finished_jobs_and_orphaned_files(tmp_path, monkeypatch):
+    async def fake_render(html, *, landscape=False):
+        return b"%PDF"
+
+    monkeypatch.setattr(pdf_job_service, "render_pdf_from_html", fake_render)
+    orphan = tmp_path / "left-by-previous-process.pdf"
+    orphan.write_bytes(b"%PDF")
+
+    async def scenario():
+        manager = _manager(tmp_path, ttl_seconds=60)
+        job = manager.submit(owner_id=1, kind="master-challenge", html="<p>x</p>")
+        await _wait_finished(manager, job["id"])
+        await manager.close()
+        return manager, job["id"]
+
+    manager, job_id = asyncio.run(scenario())
+    artifact = tmp_path / f"{job_id}.pdf"
+    assert artifact.exists() and not orphan.exists()
+
+    manager.sweep(force=True)
+    assert artifact.exists()
+
+    past = time.time() - 120
+    manager._jobs[job_id].finished_at = int(past)
+    os.utime(artifact, (past, past))
+    assert manager.sweep(force=True) == 1
+    assert not artifact.exists()
+    with pytest.raises(HTTPException) as gone:
+        manager.status(job_id, owner_id=1)
+    assert gone.value.status_code == 404
@@ -0,0 +1,135 @@
+import asyncio
+import random
+import re
+import struct
+import zlib
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import account_service, pdf_native, pdf_service
+
+
+def _certificate_context(full_name: str = "João Silva Santos") -> dict:
+    account_service.initialize_certificate_assets()
+    _, context = account_service.build_certificate_document(
+        full_name, num_modules=8, total_lessons=42, issue_date="19 de outubro de 2026"
+    )
+    return context
+
+
+def _content_stream(pdf: bytes) -> str:
+    streams = re.findall(rb"/Filter /FlateDecode /Length \d+ >>\nstream\n(.*?)\nendstream", pdf, re.S)
+    return zlib.decompress(streams[-1]).decode("latin-1")
+
+
+def _reference_unfilter(raw: bytes, stride: int, height: int, bpp: int) -> bytes:
+    out = bytearray()
+    prev = bytes(stride)
+    pos = 0
+    for _ in range(height):
+        filter_type, line = raw[pos], bytearray(raw[pos + 1 : pos + 1 + stride])
+        pos += stride + 1
+        for i in range(stride):
+            a = line[i - bpp] if i >= bpp else 0
+            b, c = prev[i], (prev[i - bpp] if i >= bpp else 0)
+            if filter_type == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif filter_type == 2:
+                line[i] = (line[i] + b) & 0xFF
+            elif filter_type == 3:
+                line[i] = (line[i] + ((a + b) >> 1)) & 0xFF
+            elif filter_type == 4:
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                line[i] = (line[i] + (a if pa <= pb and pa <= pc else (b if pb <= pc else c))) & 0xFF
+        out += line
+        prev = bytes(line)
+    return bytes(out)
+
+
+def test_unfilter_matches_reference_for_every_filter():
+    rng = random.Random(7)
+    for bpp, width in ((4, 37), (3, 11), (1, 64)):
+        stride, height = bpp * width, 25
+        raw = b"".join(bytes([row % 5]) + bytes(rng.randrange(256) for _ in range(stride)) for row in range(height))
+        assert pdf_native._unfilter_scanlines(raw, stride, height, bpp) == _reference_unfilter(raw, stride, height, bpp)
+
+
+def test_png_alpha_is_split_into_soft_mask():
+    width, height = 3, 2
+    pixels = bytes([10, 20, 30, 255, 40, 50, 60, 128, 70, 80, 90, 0] * height)
+    raw = b"".join(b"\x00" + pixels[row * 12 : (row + 1) * 12] for row in range(height))
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+    image = pdf_native._decode_png(png)
+    assert (image.width, image.height, image.color_space) == (3, 2, "DeviceRGB")
+    assert zlib.decompress(image.data) == bytes([10, 20, 30, 40, 50, 60, 70, 80, 90] * 2)
+    assert zlib.decompress(image.alpha) == bytes([255, 128, 0] * 2)
+
+
+def test_native_certificate_is_a_well_formed_pdf():
+    pdf = pdf_native.render_certificate_pdf(_certificate_context())
+
+    assert pdf.startswith(b"%PDF-1.4")
+    startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF", pdf).group(1))
+    xref = pdf[startxref:].split(b"trailer")[0].split(b"\n")
+    count = int(xref[1].split()[1])
+    offsets = [int(line.split()[0]) for line in xref[3 : 2 + count]]
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{number} 0 obj".encode())
+    assert pdf.count(b"/Subtype /Image") == 4
+    assert b"/BaseFont /Times-Roman /Encoding /WinAnsiEncoding" in pdf
+
+    content = _content_stream(pdf)
+    assert "(Jo\\343o Silva Santos) Tj" in content
+    assert "(CERTIFICADO DE CONCLUS\\303O) Tj" in content
+    assert "(8 m\\363dulos / 42 aulas) Tj" in content
+    assert "/GS1 gs" in content
+
+
+def test_long_names_wrap_inside_the_body():
+    name = "Maria " + "Aparecida " * 12 + "Santos"
+    content = _content_stream(pdf_native.render_certificate_pdf(_certificate_context(name)))
+    name_lines = re.findall(r"/F4 28\.500 Tf .*? Td \((.*?)\) Tj", content)
+    assert len(name_lines) > 1
+    assert " ".join(name_lines) == name.strip()
+
+
+def test_backend_selection_and_fallback(monkeypatch):
+    assert pdf_service.select_pdf_backend("certificate").name == "native"
+    assert pdf_service.select_pdf_backend("html").name == "chromium"
+    monkeypatch.setattr(pdf_service, "PDF_BACKENDS", ["chromium"])
+    assert pdf_service.select_pdf_backend("certificate").name == "chromium"
+    monkeypatch.setattr(pdf_service, "PDF_BACKENDS", ["native", "chromium"])
+
+    chromium = AsyncMock(return_value=b"%PDF-chromium")
+    monkeypatch.setattr(pdf_service, "render_pdf_from_html", chromium)
+    html, context = account_service.build_certificate_document(
+        "Zoë 李", num_modules=1, total_lessons=1, issue_date="1 de janeiro de 2026"
+    )
+    assert asyncio.run(pdf_service.render_pdf_template("certificate", html=html, context=context)) == (
+        b"%PDF-chromium",
+        "chromium",
+    )
+    chromium.assert_awaited_once_with(html, landscape=False)
+
+    html, context = account_service.build_certificate_document(
+        "Zoë Lima", num_modules=1, total_lessons=1, issue_date="1 de janeiro de 2026"
+    )
+    pdf, backend_name = asyncio.run(pdf_service.render_pdf_template("certificate", html=html, context=context))
+    assert pdf.startswith(b"%PDF-1.4") and backend_name == "native"
+    assert chromium.await_count == 1
+
+
+def test_unsupported_png_is_rejected():
+    with pytest.raises(pdf_native.NativePdfError):
+        pdf_native._decode_png(b"GIF89a")
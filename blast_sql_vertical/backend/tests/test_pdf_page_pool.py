@@ -0,0 +1,249 @@
+import asyncio
+
+import pytest
+
+from app.services import pdf_service
+
+
+class _FakePage:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.browser = browser
+        self.closed = False
+        self.viewports: list[dict] = []
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def emulate_media(self, media: str) -> None:
+        assert media == "print"
+
+    async def set_viewport_size(self, viewport: dict) -> None:
+        self.viewports.append(viewport)
+
+    async def set_content(self, html: str, wait_until: str, timeout: int) -> None:
+        assert wait_until == "load"
+        self.browser.active += 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        await asyncio.sleep(0.01)
+        self.browser.active -= 1
+        if "boom" in html:
+            raise RuntimeError("render crashed")
+
+    async def evaluate(self, expression: str) -> str:
+        assert "document.fonts.ready" in expression
+        return "loaded"
+
+    async def wait_for_timeout(self, ms: int) -> None:
+        raise AssertionError("fixed sleeps are not used")
+
+    async def pdf(self, **kwargs) -> bytes:
+        return b"%PDF-1.4 fake"
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.browser = browser
+        self.page = _FakePage(browser)
+
+    async def new_page(self) -> _FakePage:
+        self.browser.pages_opened += 1
+        return self.page
+
+    async def close(self) -> None:
+        self.page.closed = True
+        self.browser.contexts_closed += 1
+
+
+class _FakeBrowser:
+    launches = 0
+
+    def __init__(self) -> None:
+        _FakeBrowser.launches += 1
+        self.connected = True
+        self.active = 0
+        self.peak = 0
+        self.pages_opened = 0
+        self.contexts_closed = 0
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, viewport: dict, java_script_enabled: bool) -> _FakeContext:
+        assert java_script_enabled is False
+        return _FakeContext(self)
+
+    async def close(self) -> None:
+        self.connected = False
+
+
+@pytest.fixture
+def fake_chromium(monkeypatch):
+    _FakeBrowser.launches = 0
+    monkeypatch.setattr(pdf_service, "_BROWSER", None)
+    monkeypatch.setattr(pdf_service, "_PLAYWRIGHT", None)
+    monkeypatch.setattr(pdf_service, "_KEEP_WARM", False)
+    monkeypatch.setattr(
+        pdf_service,
+        "_READINESS",
+        {"state": "cold", "checked_at": None, "last_error": None, "relaunches": 0, "probe_failures": 0},
+    )
+
+    async def _ensure_browser():
+        if pdf_service._BROWSER is None:
+            pdf_service._BROWSER = _FakeBrowser()
+        return pdf_service._BROWSER
+
+    monkeypatch.setattr(pdf_service, "_ensure_browser", _ensure_browser)
+
+    def _install(size: int = 2, *, idle_seconds: int = 300, max_renders: int = 0, queue_timeout: float = 5):
+        pool = pdf_service._PagePool(
+            size, idle_seconds=idle_seconds, max_renders=max_renders, queue_timeout=queue_timeout
+        )
+        monkeypatch.setattr(pdf_service, "_PAGE_POOL", pool)
+        return pool
+
+    return _install
+
+
+def _render_many(count: int, html: str = "<p>ok</p>", **kwargs) -> list:
+    async def _run():
+        return await asyncio.gather(
+            *(pdf_service.render_pdf_from_html(html, **kwargs) for _ in range(count)), return_exceptions=True
+        )
+
+    return asyncio.run(_run())
+
+
+def test_pool_bounds_concurrency_and_reuses_pages(fake_chromium):
+    pool = fake_chromium(size=2)
+    results = _render_many(8)
+
+    assert results == [b"%PDF-1.4 fake"] * 8
+    browser = pdf_service._BROWSER
+    assert browser.peak == 2
+    assert browser.pages_opened == 2
+    assert pool.idle == 2 and pool.in_use == 0 and pool.waiting == 0
+
+
+def test_failed_render_discards_its_page(fake_chromium):
+    pool = fake_chromium(size=1)
+    result = _render_many(1, "<p>boom</p>")[0]
+    assert isinstance(result, pdf_service.PdfServiceError)
+    assert pool.idle == 0
+    assert _render_many(1) == [b"%PDF-1.4 fake"]
+    assert pdf_service._BROWSER.pages_opened == 2
+
+
+def test_browser_restarts_after_max_renders(fake_chromium):
+    pool = fake_chromium(size=1, max_renders=3)
+    assert _render_many(7) == [b"%PDF-1.4 fake"] * 7
+    assert pool.restarts == 2
+    assert _FakeBrowser.launches == 3
+    assert pool.renders_since_launch == 1
+
+
+def test_idle_pages_are_recycled_and_viewport_follows_orientation(fake_chromium):
+    pool = fake_chromium(size=1, idle_seconds=60)
+    _render_many(1)
+    stale = pool._idle[0]
+    stale.last_used -= 120
+
+    _render_many(1, landscape=True)
+    assert stale.page.closed
+    fresh = pool._idle[0]
+    assert fresh is not stale
+
+    _render_many(1)
+    assert fresh.page.viewports == [{"width": 794, "height": 1123}]
+
+
+def test_queue_timeout_returns_unavailable(fake_chromium):
+    pool = fake_chromium(size=1, queue_timeout=0.001)
+
+    async def _run():
+        slot = await pool.acquire(landscape=False)
+        try:
+            with pytest.raises(pdf_service.PdfServiceUnavailable):
+                await pdf_service.render_pdf_from_html("<p>queued</p>")
+        finally:
+            await pool.release(slot, healthy=True)
+        assert pool.waiting == 0
+
+    asyncio.run(_run())
+
+
+def test_warm_opens_pages_up_front(fake_chromium):
+    pool = fake_chromium(size=3)
+    assert asyncio.run(pdf_service.warm_pdf_page_pool()) == 3
+    assert pool.idle == 3
+    assert pdf_service.get_pdf_pool_stats()["idle"] == 3
+
+
+def test_startup_warmup_and_supervisor_relaunch_crashed_browser(fake_chromium):
+    pool = fake_chromium(size=2)
+
+    async def _run():
+        await pdf_service.start_pdf_supervisor(warm=True, interval=0)
+        warmed = pdf_service.get_pdf_readiness()
+        first = pdf_service._BROWSER
+        first.connected = False
+        crashed = pdf_service.get_pdf_readiness()
+        state = await pdf_service.check_pdf_browser()
+        return warmed, crashed, state, first
+
+    warmed, crashed, state, first = asyncio.run(_run())
+    assert warmed["state"] == "ready" and warmed["ready"] and warmed["pool"]["idle"] == 2
+    assert crashed["browser_connected"] is False and crashed["ready"] is False
+    assert state == "ready"
+    assert _FakeBrowser.launches == 2
+    assert pdf_service._BROWSER is not first
+    assert pool.idle == 2 and all(slot.browser is pdf_service._BROWSER for slot in pool._idle)
+    assert pdf_service.get_pdf_readiness()["relaunches"] == 1
+
+
+def test_failed_probes_relaunch_only_after_a_streak_and_wait_for_in_flight_renders(fake_chromium, monkeypatch):
+    pool = fake_chromium(size=2)
+    probe_ok = {"value": False}
+
+    async def _probe(browser):
+        return probe_ok["value"]
+
+    monkeypatch.setattr(pdf_service, "_probe_browser", _probe)
+
+    async def _run():
+        await pdf_service.start_pdf_supervisor(warm=True, interval=0)
+        first = pdf_service._BROWSER
+        slot = await pool.acquire(landscape=False)
+        streak = pdf_service._BROWSER_PROBE_FAILURES_BEFORE_RELAUNCH
+        states = [await pdf_service.check_pdf_browser() for _ in range(streak)]
+        during = (pdf_service._BROWSER is first, first.connected, pool._restart_pending)
+        await pool.release(slot, healthy=True)
+        after_drain = pdf_service._BROWSER
+        probe_ok["value"] = True
+        final = await pdf_service.check_pdf_browser()
+        return states, during, after_drain, final, first
+
+    states, during, after_drain, final, first = asyncio.run(_run())
+    assert states == ["degraded", "degraded", "restarting"]
+    assert during == (True, True, True)
+    assert first.connected is False and after_drain is None
+    assert final == "ready"
+    assert pool.idle == 2 and all(slot.browser is pdf_service._BROWSER for slot in pool._idle)
+    assert pdf_service.get_pdf_readiness()["relaunches"] == 1
+
+
+def test_lazy_mode_stays_cold_and_launch_failures_are_reported(fake_chromium, monkeypatch):
+    fake_chromium(size=1)
+    assert asyncio.run(pdf_service.check_pdf_browser()) == "cold"
+    assert _FakeBrowser.launches == 0
+    assert pdf_service.get_pdf_readiness()["ready"] is True
+
+    async def _broken_browser():
+        raise pdf_service.PdfServiceUnavailable("Failed to launch Chromium.")
+
+    monkeypatch.setattr(pdf_service, "_ensure_browser", _broken_browser)
+    asyncio.run(pdf_service.start_pdf_supervisor(warm=True, interval=0))
+    readiness = pdf_service.get_pdf_readiness()
+    assert readiness["state"] == "unavailable"
+    assert readiness["ready"] is False
+    assert "Chromium" in readiness["last_error"]
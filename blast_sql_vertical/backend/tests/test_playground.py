@@ -0,0 +1,73 @@
+"""Tests for the cached playground catalog."""
+
+import pytest
+
+from app.services.content_loader import (
+    get_playground_challenge,
+    load_playground_challenges,
+    load_playground_datasets,
+    refresh_content_cache,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _ensure_content():
+    refresh_content_cache()
+
+
+def test_playground_datasets_loaded():
+    datasets = load_playground_datasets()
+    ids = {item["id"] for item in datasets}
+    assert "ecommerce" in ids
+
+
+def test_public_challenges_strip_solution_without_mutating_cache():
+    public = load_playground_challenges("ecommerce")
+    assert public
+    assert all("solution_query" not in item for item in public)
+
+    public[0]["title"] = "mutated"
+    assert load_playground_challenges("ecommerce")[0]["title"] != "mutated"
+
+    challenge, idx, count = get_playground_challenge("ecommerce", public[0]["id"])
+    assert challenge is not None
+    assert idx == 0
+    assert count == len(public)
+    assert challenge["solution_query"].strip()
+
+
+def test_unknown_playground_challenge():
+    challenge, idx, count = get_playground_challenge("ecommerce", "does_not_exist")
+    assert challenge is None
+    assert idx == -1
+    assert count > 0
+    assert get_playground_challenge("nope", "eco_1") == (None, -1, 0)
+    assert load_playground_challenges("nope") == []
+
+
+def test_schema_details_served_from_seed_template():
+    from app.services import sql_engine
+
+    sessions_before = set(sql_engine._SESSIONS)
+    tables = sql_engine.get_schema_details("ecommerce")
+    assert set(sql_engine._SESSIONS) == sessions_before
+
+    by_name = {table["name"]: table for table in tables}
+    assert {"users", "orders", "order_items"} <= set(by_name)
+    orders = by_name["orders"]
+    assert orders["row_count"] > 0
+    assert orders["primary_key"] == ["id"]
+    id_column = next(col for col in orders["columns"] if col["name"] == "id")
+    assert id_column["type"] == "INTEGER"
+    assert id_column["primary_key"] is True
+
+    assert sql_engine.get_schema_details("unknown_schema") == []
+
+
+def test_schema_details_include_foreign_keys():
+    from app.services.sql_engine import get_schema_details
+
+    orders = next(table for table in get_schema_details("main") if table["name"] == "orders")
+    assert {"columns": ["customer_id"], "references_table": "customers", "references_columns": ["id"]} in orders[
+        "foreign_keys"
+    ]
@@ -0,0 +1,51 @@
+"""Tests for the DuckDB prepared-statement and result caches."""
+
+from app.services import sql_engine
+
+
+def setup_function():
+    sql_engine.clear_query_caches()
+
+
+def test_normalize_query_collapses_whitespace_outside_quotes():
+    normalized = sql_engine._normalize_query("  SELECT  name,\n\tid FROM t WHERE name = 'a   b' ;  ")
+    assert normalized == "SELECT name, id FROM t WHERE name = 'a   b'"
+
+
+def test_dollar_quoted_literals_round_trip_unchanged():
+    assert sql_engine._normalize_query("SELECT  $$a   b$$,  $t$c \n d$t$") == "SELECT $$a   b$$, $t$c \n d$t$"
+    assert sql_engine.execute_query("dollar", "SELECT $$a   b$$ AS s") == (["s"], [["a   b"]])
+    assert sql_engine.execute_query("dollar", "SELECT $$a b$$ AS s") == (["s"], [["a b"]])
+
+
+def test_identical_queries_hit_result_cache_across_sessions():
+    first = sql_engine.execute_query("cache-a", "SELECT 1 AS one")
+    second = sql_engine.execute_query("cache-b", "SELECT   1 AS one;")
+    assert first == second == (["one"], [[1]])
+
+    stats = sql_engine.get_query_cache_stats()
+    assert stats["result_hits"] == 1
+    assert stats["result_misses"] == 1
+    assert stats["result_hit_rate"] == 0.5
+
+    # Callers receive copies; mutating them must not poison the cache.
+    second[1][0][0] = 99
+    assert sql_engine.execute_query("cache-c", "SELECT 1 AS one") == (["one"], [[1]])
+
+
+def test_volatile_queries_bypass_result_cache_but_reuse_prepared_statement():
+    query = "SELECT random() < 2 AS ok"
+    assert sql_engine.execute_query("cache-volatile", query) == (["ok"], [[True]])
+    assert sql_engine.execute_query("cache-volatile", query) == (["ok"], [[True]])
+
+    stats = sql_engine.get_query_cache_stats()
+    assert stats["result_entries"] == 0
+    assert stats["statement_hits"] == 1
+    assert stats["statement_misses"] == 1
+
+
+def test_errors_are_reported_and_not_cached():
+    cols, err = sql_engine.execute_query("cache-err", "SELECT missing_column FROM (SELECT 1 AS x)")
+    assert cols is None
+    assert "missing_column" in err
+    assert sql_engine.get_query_cache_stats()["result_entries"] == 0
@@ -0,0 +1,85 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services import billing_service
+from app.services.ttl_cache import TTLCache
+
+
+def test_ttl_cache_coalesces_concurrent_misses():
+    cache = TTLCache("test_single_flight")
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader, ttl=60))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * 5
+    assert cache.stats["misses"] == 1
+    assert cache.stats["coalesced"] == 4
+    assert cache.get_or_load("k", loader, ttl=60) == {"value": 42}
+    assert cache.stats["hits"] == 1
+
+
+def test_ttl_cache_does_not_cache_errors_and_honours_negative_ttl():
+    cache = TTLCache("test_negative")
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing, ttl=60)
+    assert cache.get_or_load("k", lambda: "ok", ttl=60) == "ok"
+
+    loads = []
+
+    def missing():
+        loads.append(1)
+        return None
+
+    cache.get_or_load("unknown", missing, ttl=60, negative_ttl=0, is_negative=lambda v: v is None)
+    cache.get_or_load("unknown", missing, ttl=60, negative_ttl=0, is_negative=lambda v: v is None)
+    assert len(loads) == 2
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache("test_lru", max_entries=2)
+    cache.get_or_load("a", lambda: 1, ttl=60)
+    cache.get_or_load("b", lambda: 2, ttl=60)
+    cache.get_or_load("a", lambda: 0, ttl=60)
+    cache.get_or_load("c", lambda: 3, ttl=60)
+    assert cache.get_or_load("a", lambda: -1, ttl=60) == 1
+    assert cache.get_or_load("b", lambda: -2, ttl=60) == -2
+
+
+def test_validate_promo_code_caches_hits_and_unknown_codes():
+    billing_service._PROMO_CODE_CACHE.clear()
+    promo = {"id": "promo_123", "coupon": {"percent_off": 20}}
+
+    def fake_list(code, active, limit):
+        return {"data": [promo] if code.upper() == "BLAST20" else []}
+
+    with patch.object(billing_service.stripe.PromotionCode, "list", side_effect=fake_list) as mock_list:
+        first = billing_service.validate_promo_code("blast20")
+        first["discount"]["value"] = 0
+        second = billing_service.validate_promo_code("BLAST20 ")
+        assert second == {"valid": True, "promo_code_id": "promo_123", "discount": {"type": "percent", "value": 20.0}}
+
+        assert billing_service.validate_promo_code("NOPE") == {"valid": False}
+        assert billing_service.validate_promo_code("nope") == {"valid": False}
+
+    assert mock_list.call_count == 2
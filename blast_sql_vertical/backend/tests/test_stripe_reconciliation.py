@@ -0,0 +1,196 @@
+import time
+import uuid
+
+import pytest
+
+from app.services import billing_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    apply_access_corrections,
+    create_purchase,
+    create_user,
+    get_reconciliation_checkpoint,
+    get_user_by_id,
+    init_user_db,
+    mark_purchase_paid,
+    update_user_access_state,
+    update_user_stripe_customer_id,
+)
+
+
+class StubList:
+    """Local stand-in for a Stripe list endpoint (newest first, cursor pagination)."""
+
+    def __init__(self, objects: list[dict]) -> None:
+        self.objects = objects
+        self.calls: list[dict] = []
+
+    def __call__(self, **params):
+        self.calls.append(params)
+        stub = self
+
+        class _Listing:
+            def auto_paging_iter(self):
+                start = 0
+                cursor = params.get("starting_after")
+                if cursor:
+                    start = next(i for i, obj in enumerate(stub.objects) if obj["id"] == cursor) + 1
+                yield from stub.objects[start:]
+
+        return _Listing()
+
+
+def _user_with_purchase(*, access_status: str, payment_intent_id: str | None, customer_id: str | None = None) -> int:
+    user = create_user(email=f"reconcile_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    user_id = int(user["id"])
+    purchase = create_purchase(user_id=user_id, course_id="sql-basics", status="pending")
+    if payment_intent_id:
+        mark_purchase_paid(
+            purchase_id=int(purchase["id"]),
+            stripe_checkout_session_id=None,
+            stripe_payment_intent_id=payment_intent_id,
+            amount=9900,
+            currency="brl",
+            paid_at=int(time.time()),
+        )
+    if customer_id:
+        update_user_stripe_customer_id(user_id, customer_id)
+    update_user_access_state(user_id, access_status=access_status, expires_at=None, access_managed_by="stripe")
+    return user_id
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+@pytest.fixture()
+def stripe_stub(monkeypatch):
+    monkeypatch.setattr(billing_service, "STRIPE_SECRET_KEY", "sk_test_stub")
+    stubs = {"payment_intents": StubList([]), "refunds": StubList([]), "subscriptions": StubList([])}
+    monkeypatch.setattr(billing_service.stripe.PaymentIntent, "list", stubs["payment_intents"])
+    monkeypatch.setattr(billing_service.stripe.Refund, "list", stubs["refunds"])
+    monkeypatch.setattr(billing_service.stripe.Subscription, "list", stubs["subscriptions"])
+    return stubs
+
+
+def test_bulk_reconciliation_applies_refresh_mapping(stripe_stub):
+    suffix = uuid.uuid4().hex
+    succeeded = _user_with_purchase(access_status="expired", payment_intent_id=f"pi_ok_{suffix}")
+    refunded = _user_with_purchase(access_status="active", payment_intent_id=f"pi_ref_{suffix}")
+    admin_managed = _user_with_purchase(access_status="manual_grant", payment_intent_id=f"pi_adm_{suffix}")
+    update_user_access_state(admin_managed, access_managed_by="admin")
+    subscription_user = _user_with_purchase(access_status="active", payment_intent_id=None, customer_id=f"cus_{suffix}")
+
+    stripe_stub["payment_intents"].objects = [
+        {"id": f"pi_ok_{suffix}", "status": "succeeded", "latest_charge": {"amount_refunded": 0}},
+        {"id": f"pi_adm_{suffix}", "status": "succeeded", "latest_charge": {"amount_refunded": 9900}},
+        {"id": f"pi_unknown_{suffix}", "status": "succeeded", "latest_charge": None},
+    ]
+    stripe_stub["refunds"].objects = [{"id": f"re_{suffix}", "status": "succeeded", "payment_intent": f"pi_ref_{suffix}"}]
+    stripe_stub["subscriptions"].objects = [
+        {"id": f"sub_new_{suffix}", "status": "canceled", "customer": f"cus_{suffix}"},
+        {"id": f"sub_old_{suffix}", "status": "active", "customer": f"cus_{suffix}"},
+    ]
+
+    stats = billing_service.reconcile_users_with_stripe(restart=True, chunk_size=2)
+
+    assert get_user_by_id(succeeded)["access_status"] == "active"
+    assert get_user_by_id(refunded)["access_status"] == "refunded"
+    assert get_user_by_id(refunded)["expires_at"] is not None
+    assert get_user_by_id(admin_managed)["access_status"] == "manual_grant"
+    assert get_user_by_id(subscription_user)["access_status"] == "canceled"
+    assert stats["payment_intents_seen"] == 3
+    assert stats["corrections_applied"] == 3
+    assert stripe_stub["payment_intents"].calls[0]["expand"] == ["data.latest_charge"]
+    assert get_reconciliation_checkpoint(billing_service.RECONCILIATION_CHECKPOINT_NAME)["completed_at"] is not None
+
+
+def test_bulk_reconciliation_resumes_from_checkpoint(stripe_stub, monkeypatch):
+    suffix = uuid.uuid4().hex
+    users = [_user_with_purchase(access_status="expired", payment_intent_id=f"pi_{i}_{suffix}") for i in range(3)]
+    stripe_stub["payment_intents"].objects = [
+        {"id": f"pi_{i}_{suffix}", "status": "succeeded", "latest_charge": {}} for i in range(3)
+    ]
+
+    real_apply = billing_service.apply_access_corrections
+    calls = {"count": 0}
+
+    def flaky_apply(corrections, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise RuntimeError("interrupted")
+        return real_apply(corrections, **kwargs)
+
+    monkeypatch.setattr(billing_service, "apply_access_corrections", flaky_apply)
+    with pytest.raises(RuntimeError):
+        billing_service.reconcile_users_with_stripe(restart=True, chunk_size=1)
+
+    checkpoint = get_reconciliation_checkpoint(billing_service.RECONCILIATION_CHECKPOINT_NAME)
+    assert checkpoint["phase"] == "payment_intents"
+    assert checkpoint["cursor"] == f"pi_0_{suffix}"
+    assert [get_user_by_id(uid)["access_status"] for uid in users] == ["active", "expired", "expired"]
+
+    stats = billing_service.reconcile_users_with_stripe(chunk_size=1)
+    assert stripe_stub["payment_intents"].calls[-1]["starting_after"] == f"pi_0_{suffix}"
+    assert [get_user_by_id(uid)["access_status"] for uid in users] == ["active", "active", "active"]
+    assert stats["payment_intents_seen"] == 3
+
+
+def test_newest_subscription_wins_across_chunks_and_resume(stripe_stub, monkeypatch):
+    suffix = uuid.uuid4().hex
+    user_id = _user_with_purchase(access_status="active", payment_intent_id=None, customer_id=f"cus_{suffix}")
+    stripe_stub["subscriptions"].objects = [
+        {"id": f"sub_new_{suffix}", "status": "canceled", "customer": f"cus_{suffix}"},
+        {"id": f"sub_old_{suffix}", "status": "active", "customer": f"cus_{suffix}"},
+    ]
+
+    billing_service.reconcile_users_with_stripe(restart=True, chunk_size=1)
+    assert get_user_by_id(user_id)["access_status"] == "canceled"
+
+    # Interrupted between the two chunks: the resumed run still knows the customer is decided.
+    update_user_access_state(user_id, access_status="active", expires_at=None, access_managed_by="stripe")
+    real_apply = billing_service.apply_access_corrections
+    calls = {"count": 0}
+
+    def flaky_apply(corrections, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise RuntimeError("interrupted")
+        return real_apply(corrections, **kwargs)
+
+    monkeypatch.setattr(billing_service, "apply_access_corrections", flaky_apply)
+    with pytest.raises(RuntimeError):
+        billing_service.reconcile_users_with_stripe(restart=True, chunk_size=1)
+    assert get_user_by_id(user_id)["access_status"] == "canceled"
+
+    stats = billing_service.reconcile_users_with_stripe(chunk_size=1)
+    assert stripe_stub["subscriptions"].calls[-1]["starting_after"] == f"sub_new_{suffix}"
+    assert get_user_by_id(user_id)["access_status"] == "canceled"
+    assert "subscription_customers" not in stats
+
+
+def test_corrections_skipped_by_the_guard_write_no_audit_row():
+    admin = create_user(email=f"reconcile_admin_{uuid.uuid4().hex}@test.local", password_hash=hash_password("TestPass123!"))
+    stripe_user = _user_with_purchase(access_status="expired", payment_intent_id=None)
+    # Switched to admin management after the correction was planned.
+    admin_user = _user_with_purchase(access_status="manual_grant", payment_intent_id=None)
+    update_user_access_state(admin_user, access_managed_by="admin")
+
+    corrections = [
+        {"user_id": user_id, "access_status": "active", "expires_at": None, "before": {"access_status": "expired"}}
+        for user_id in (stripe_user, admin_user)
+    ]
+    assert apply_access_corrections(corrections, admin_id=int(admin["id"])) == 1
+
+    with _connect() as conn:
+        audited = [
+            row[0]
+            for row in conn.execute(
+                "SELECT target_user_id FROM admin_audit_logs WHERE action_type = 'stripe_refresh' AND admin_id = ?",
+                (int(admin["id"]),),
+            ).fetchall()
+        ]
+    assert audited == [stripe_user]
+    assert get_user_by_id(admin_user)["access_status"] == "manual_grant"
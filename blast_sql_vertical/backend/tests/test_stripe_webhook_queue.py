@@ -0,0 +1,136 @@
+import json
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import webhook_queue_service
+from app.services.auth_service import hash_password
+from app.services.user_db import (
+    _connect,
+    create_purchase,
+    create_user,
+    get_purchase_by_id,
+    get_purchase_email_event_by_stripe_event_id,
+    get_stripe_webhook_queue_stats,
+    init_user_db,
+)
+
+
+def _queue_row(event_id: str) -> dict:
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT queue_status, attempts, next_attempt_at, payload_json, last_error "
+            "FROM purchase_email_events WHERE stripe_event_id = ?",
+            (event_id,),
+        ).fetchone()
+        return dict(row) if row else {}
+
+
+def _checkout_event(purchase_id: int) -> dict:
+    return {
+        "id": f"evt_{uuid.uuid4().hex}",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "created": int(time.time()),
+        "data": {
+            "object": {
+                "id": f"cs_{uuid.uuid4().hex}",
+                "object": "checkout.session",
+                "payment_status": "paid",
+                "payment_intent": f"pi_{uuid.uuid4().hex}",
+                "amount_total": 9900,
+                "currency": "brl",
+                "metadata": {"purchase_id": str(purchase_id), "course_id": "sql-basics"},
+            }
+        },
+    }
+
+
+def _pending_purchase() -> dict:
+    user = create_user(
+        email=f"webhook_queue_{uuid.uuid4().hex}@test.local",
+        password_hash=hash_password("TestPass123!"),
+    )
+    return create_purchase(user_id=int(user["id"]), course_id="sql-basics", status="pending")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _bootstrap_db():
+    init_user_db()
+
+
+def _accept(event: dict) -> None:
+    webhook_queue_service.accept_stripe_event(event, json.dumps(event).encode("utf-8"))
+
+
+@patch("app.services.billing_service.send_purchase_confirmation_email")
+def test_webhook_endpoint_acks_before_processing(mock_send):
+    mock_send.return_value = {"sent": True, "provider_message_id": "re_queue_1", "error": None}
+    purchase = _pending_purchase()
+    event = _checkout_event(int(purchase["id"]))
+
+    client = TestClient(app)
+    with patch("app.routers.billing.construct_stripe_event", return_value=event):
+        res = client.post("/billing/stripe-webhook", content=json.dumps(event), headers={"stripe-signature": "t=1"})
+    assert res.status_code == 200
+    assert res.json() == {"received": True}
+    assert _queue_row(event["id"])["queue_status"] == "pending"
+    assert get_purchase_by_id(int(purchase["id"]))["status"] == "pending"
+    assert mock_send.call_count == 0
+
+    while webhook_queue_service.process_pending_webhook_events():
+        pass
+
+    assert get_purchase_by_id(int(purchase["id"]))["status"] == "paid"
+    assert mock_send.call_count == 1
+    row = _queue_row(event["id"])
+    assert row["queue_status"] == "done"
+    assert row["payload_json"] is None
+    assert get_purchase_email_event_by_stripe_event_id(event["id"])["processed_at"] is not None
+
+    # Stripe redelivery of an already processed event is not queued again.
+    _accept(event)
+    assert _queue_row(event["id"])["queue_status"] == "done"
+    assert webhook_queue_service.process_pending_webhook_events() == 0
+    assert mock_send.call_count == 1
+
+
+def test_failed_event_is_retried_with_backoff_then_dead_lettered(monkeypatch):
+    monkeypatch.setattr(webhook_queue_service, "STRIPE_WEBHOOK_MAX_ATTEMPTS", 2)
+    event = _checkout_event(0)
+    _accept(event)
+
+    with patch.object(webhook_queue_service, "process_stripe_event", side_effect=RuntimeError("stripe down")):
+        assert webhook_queue_service.process_pending_webhook_events() == 1
+        row = _queue_row(event["id"])
+        assert row["queue_status"] == "pending"
+        assert row["attempts"] == 1
+        assert row["next_attempt_at"] >= int(time.time()) + webhook_queue_service.retry_delay_seconds(1) - 1
+        assert "stripe down" in row["last_error"]
+
+        # Not due yet.
+        assert webhook_queue_service.process_pending_webhook_events() == 0
+        stats = get_stripe_webhook_queue_stats(now_ts=int(time.time()) + 60)
+        assert stats["pending"] >= 1
+        assert stats["lag_seconds"] >= 60
+
+        with _connect() as conn:
+            conn.execute("UPDATE purchase_email_events SET next_attempt_at = 0 WHERE stripe_event_id = ?", (event["id"],))
+            conn.commit()
+        assert webhook_queue_service.process_pending_webhook_events() == 1
+
+    row = _queue_row(event["id"])
+    assert row["queue_status"] == "dead"
+    assert row["attempts"] == 2
+    assert row["payload_json"]
+
+
+def test_retry_delay_is_exponential_and_capped():
+    base = webhook_queue_service.STRIPE_WEBHOOK_RETRY_BASE_SECONDS
+    assert webhook_queue_service.retry_delay_seconds(1) == base
+    assert webhook_queue_service.retry_delay_seconds(3) == base * 4
+    assert webhook_queue_service.retry_delay_seconds(60) == webhook_queue_service.STRIPE_WEBHOOK_RETRY_MAX_SECONDS
@@ -129,46 +129,42 @@ export async function logoutUser() {
   return fetchApi("/auth/logout", { method: "POST" });
 }
 
-export async function buildMasterChallengePdf({ html, filename }) {
-  const url = `${API_BASE}/reports/master-challenge/pdf`;
-  const token = getStoredToken();
-  const res = await fetch(url, {
+const PDF_JOB_POLL_MS = 1000;
+const PDF_JOB_MAX_WAIT_MS = 180000;
+
+// Reports render as background jobs: submit, poll until finished, then download.
+async function renderPdfJob(kind, { html, filename }) {
+  let job = await fetchApi("/reports/pdf-jobs", {
     method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-      ...(token ? { Authorization: `Bearer ${token}` } : {}),
-    },
-    body: JSON.stringify({ html, filename }),
+    body: JSON.stringify({ kind, html, filename }),
   });
-
-  if (!res.ok) {
-    const err = await res.json().catch(() => null);
-    throw new Error(normalizeApiError(err, res.statusText || "Request failed"));
+  const deadline = Date.now() + PDF_JOB_MAX_WAIT_MS;
+  while (job.status === "queued" || job.status === "running") {
+    if (Date.now() > deadline) throw new Error("PDF generation timed out");
+    await new Promise((resolve) => setTimeout(resolve, PDF_JOB_POLL_MS));
+    job = await fetchApi(`/reports/pdf-jobs/${job.id}`);
   }
+  if (job.status !== "succeeded") throw new Error(job.error || "PDF generation failed");
 
-  return res.blob();
-}
-
-export async function buildCheatsheetPdf({ html, filename }) {
-  const url = `${API_BASE}/reports/cheatsheet/pdf`;
   const token = getStoredToken();
-  const res = await fetch(url, {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-      ...(token ? { Authorization: `Bearer ${token}` } : {}),
-    },
-    body: JSON.stringify({ html, filename }),
+  const res = await fetch(`${API_BASE}/reports/pdf-jobs/${job.id}/download`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
   });
-
   if (!res.ok) {
     const err = await res.json().catch(() => null);
     throw new Error(normalizeApiError(err, res.statusText || "Request failed"));
   }
-
   return res.blob();
 }
 
+export async function buildMasterChallengePdf({ html, filename }) {
+  return renderPdfJob("master-challenge", { html, filename });
+}
+
+export async function buildCheatsheetPdf({ html, filename }) {
+  return renderPdfJob("cheatsheet", { html, filename });
+}
+
 export async function getPlaygroundDatasets() {
   return fetchApi("/playground/datasets");
 }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Per-frame timing for the particle rasterizer used by the marketing render tools.
+
+Draws one animation frame's worth of ambient stars (varying alpha) and brace
+particles (opaque), first with the old per-particle ``draw_circle`` loop and then
+with ``particle_raster.splat_discs``. Reports p50/p95 milliseconds per frame for
+each and checks that both produce the same pixels.
+
+Run from the repository root:
+
+    python tools/bench_particle_raster.py
+    python tools/bench_particle_raster.py --width 1080 --height 1920 --particles 12000 --frames 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from particle_raster import draw_circle, splat_discs
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _scene(rng: np.random.Generator, width: int, height: int, particles: int) -> dict[str, np.ndarray]:
+    stars = max(120, int((width * height) / 12000))
+    size = np.array([width, height], dtype=np.float32)
+    return {
+        "star_pos": rng.random((stars, 2), dtype=np.float32) * size,
+        "star_size": rng.uniform(0.65, 2.1, size=stars).astype(np.float32),
+        "star_alpha": rng.uniform(0.08, 1.0, size=stars).astype(np.float32),
+        "pos": rng.random((particles, 2), dtype=np.float32) * size,
+        "size": rng.uniform(0.9, 2.2, size=particles).astype(np.float32),
+    }
+
+
+def _draw_loop(frame: np.ndarray, scene: dict[str, np.ndarray]) -> None:
+    for j in range(len(scene["star_pos"])):
+        x, y = scene["star_pos"][j]
+        draw_circle(frame, float(x), float(y), float(scene["star_size"][j]), (250, 253, 255), float(scene["star_alpha"][j]))
+    for j in range(len(scene["pos"])):
+        x, y = scene["pos"][j]
+        draw_circle(frame, float(x), float(y), float(scene["size"][j]), (66, 133, 244), 1.0)
+
+
+def _draw_vectorized(frame: np.ndarray, scene: dict[str, np.ndarray]) -> None:
+    splat_discs(frame, scene["star_pos"], scene["star_size"], (250, 253, 255), scene["star_alpha"])
+    splat_discs(frame, scene["pos"], scene["size"], (66, 133, 244))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-frame particle rasterization.")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--particles", type=int, default=8000, help="Brace particles per frame.")
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    background = np.full((args.height, args.width, 3), (2, 4, 9), dtype=np.uint8)
+    results: dict[str, list[float]] = {"loop": [], "vectorized": []}
+    mismatched = 0
+    for _ in range(max(1, args.frames)):
+        scene = _scene(rng, args.width, args.height, args.particles)
+        frames = {}
+        for name, draw in (("loop", _draw_loop), ("vectorized", _draw_vectorized)):
+            frame = background.copy()
+            started = time.perf_counter()
+            draw(frame, scene)
+            results[name].append((time.perf_counter() - started) * 1000.0)
+            frames[name] = frame
+        mismatched += int(np.count_nonzero(np.any(frames["loop"] != frames["vectorized"], axis=-1)))
+
+    print(f"{args.width}x{args.height}, {args.particles} particles, {args.frames} frames")
+    print(f"{'renderer':<12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, samples in results.items():
+        print(f"{name:<12}{_percentile(samples, 50):>10.2f}{_percentile(samples, 95):>10.2f}")
+    speedup = _percentile(results["loop"], 50) / max(_percentile(results["vectorized"], 50), 1e-9)
+    print(f"speedup (p50): {speedup:.1f}x, mismatched pixels: {mismatched}")
+    return 0 if mismatched == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
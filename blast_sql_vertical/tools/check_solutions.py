@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Run every solution query against ``seed.sql`` and snapshot the expected results.
+
+Solutions come from the lessons listed in ``courses.json`` and from
+``playground_challenges.json``. They are loaded through the backend content
+loader, so the solution text matches exactly what the validator sees. The
+seed is applied once to an in-memory DuckDB database, and the solutions run
+concurrently on per-thread cursors of that database. Each one is executed the
+way the runtime executes it: the same SELECT-only guard, then the normalized
+query text.
+
+The tool fails (exit 1) when a solution is rejected or errors, when it is
+slower than ``--max-ms``, or when a lesson's ``expected_result`` disagrees with
+its own solution. It prints per-query timings, slowest first.
+
+On success it writes ``backend/content/expected_results.json``, which
+``app.services.validator`` compares answers against instead of re-running the
+solution. Solutions that depend on the clock or on randomness (the engine's
+volatile-SQL check) are listed but not snapshotted, so they keep running live. ``--check`` only verifies that the committed file is up to date (for
+CI).
+
+Run from the repository root:
+
+    python tools/check_solutions.py
+    python tools/check_solutions.py --check --max-ms 200
+    python tools/check_solutions.py --timings all --workers 8
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+
+TOOLS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = TOOLS_DIR.parent / "backend"
+
+
+@dataclass
+class Solution:
+    key: str
+    query: str
+    expected_result: list | None = None
+    order_matters: bool = False
+
+
+@dataclass
+class Outcome:
+    solution: Solution
+    elapsed_ms: float = 0.0
+    columns: list[str] = field(default_factory=list)
+    rows: list[tuple] = field(default_factory=list)
+    error: str | None = None
+
+
+def _bootstrap(content_dir: Path | None) -> None:
+    # The app reads CONTENT_DIR at import time, so set it before importing anything from it.
+    if content_dir is not None:
+        os.environ["CONTENT_DIR"] = str(content_dir.resolve())
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+
+def collect_solutions() -> list[Solution]:
+    from app.services import content_loader
+    from app.services.expected_results import lesson_key, playground_key
+
+    content_loader.refresh_content_cache()
+    solutions: list[Solution] = []
+    for outline in content_loader.get_course_outlines().values():
+        for lesson_id in outline["lesson_ids"]:
+            exercises = content_loader.get_lesson_exercises(content_loader.load_lesson(lesson_id))
+            for idx, exercise in enumerate(exercises):
+                query = str(exercise.get("solution_query") or "").strip()
+                if not query:
+                    continue
+                expected = exercise.get("expected_result")
+                solutions.append(
+                    Solution(
+                        key=lesson_key(lesson_id, idx),
+                        query=query,
+                        expected_result=expected if isinstance(expected, list) else None,
+                        order_matters=bool((exercise.get("validation") or {}).get("order_matters", False)),
+                    )
+                )
+    for dataset in content_loader.load_playground_datasets():
+        dataset_id = str(dataset.get("id") or "")
+        for public in content_loader.load_playground_challenges(dataset_id):
+            challenge, _, _ = content_loader.get_playground_challenge(dataset_id, str(public.get("id") or ""))
+            query = str((challenge or {}).get("solution_query") or "").strip()
+            if query:
+                solutions.append(Solution(key=playground_key(dataset_id, str(challenge["id"])), query=query))
+    return solutions
+
+
+def run_solutions(solutions: list[Solution], *, workers: int) -> tuple[list[Outcome], float]:
+    """Execute every solution on its own thread-local cursor; returns outcomes and seed load ms."""
+    import duckdb
+
+    from app.services import sql_engine
+
+    started = time.perf_counter()
+    conn = duckdb.connect(":memory:")
+    sql_engine._apply_seed(conn, sql_engine._ensure_seed_template())
+    seed_ms = (time.perf_counter() - started) * 1000.0
+
+    local = threading.local()
+    cursors: list = []
+    cursors_lock = threading.Lock()
+
+    def run(solution: Solution) -> Outcome:
+        outcome = Outcome(solution)
+        rejected = sql_engine._validate_query(solution.query)
+        if rejected:
+            outcome.error = f"rejected by the query guard: {rejected}"
+            return outcome
+        cursor = getattr(local, "cursor", None)
+        if cursor is None:
+            cursor = local.cursor = conn.cursor()
+            with cursors_lock:
+                cursors.append(cursor)
+        began = time.perf_counter()
+        try:
+            result = cursor.execute(sql_engine._normalize_query(solution.query))
+            outcome.rows = result.fetchall()
+            outcome.columns = [d[0] for d in result.description] if result.description else []
+        except Exception as exc:
+            outcome.error = str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__
+        outcome.elapsed_ms = (time.perf_counter() - began) * 1000.0
+        return outcome
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            outcomes = list(executor.map(run, solutions))
+    finally:
+        for cursor in cursors:
+            cursor.close()
+        conn.close()
+    return outcomes, seed_ms
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _artifact_text(seed: str, entries: dict[str, dict]) -> str:
+    """One entry per line, so content changes show up as small diffs."""
+    from app.services.expected_results import FORMAT_VERSION
+
+    lines = [f'{{"version": {FORMAT_VERSION}, "seed": {json.dumps(seed)}, "entries": {{']
+    items = sorted(entries.items())
+    for idx, (key, entry) in enumerate(items):
+        comma = "," if idx < len(items) - 1 else ""
+        body = json.dumps(entry, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+        lines.append(f"{json.dumps(key, ensure_ascii=False)}: {body}{comma}")
+    lines.append("}}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(text)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Execute every solution query and snapshot expected results.")
+    parser.add_argument("--content-dir", type=Path, default=None, help="Content directory (default: backend/content).")
+    parser.add_argument(
+        "--out", type=Path, default=None, help="Artifact path (default: <content-dir>/expected_results.json)."
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent cursors (default: CPU count).")
+    parser.add_argument("--max-ms", type=float, default=250.0, help="Fail when a solution takes longer than this.")
+    parser.add_argument("--max-rows", type=int, default=50, help="Results up to this many rows are stored verbatim.")
+    parser.add_argument("--timings", default="10", help="Slowest N queries to list, or 'all'.")
+    parser.add_argument("--check", action="store_true", help="Fail if the artifact is stale instead of writing it.")
+    args = parser.parse_args()
+
+    _bootstrap(args.content_dir)
+    from app.config import CONTENT_DIR
+    from app.services.expected_results import is_snapshot_safe, seed_digest
+    from app.services.validator import _compare_to_expected_result, expected_entry
+
+    out_path = args.out or CONTENT_DIR / "expected_results.json"
+    if not (CONTENT_DIR / "seed.sql").exists():
+        print(f"[ERROR] seed.sql not found in {CONTENT_DIR}")
+        return 2
+
+    started = time.perf_counter()
+    solutions = collect_solutions()
+    workers = args.workers or os.cpu_count() or 1
+    outcomes, seed_ms = run_solutions(solutions, workers=workers)
+    wall_ms = (time.perf_counter() - started) * 1000.0
+
+    failures: list[str] = []
+    volatile: list[str] = []
+    entries: dict[str, dict] = {}
+    for outcome in outcomes:
+        solution = outcome.solution
+        if outcome.error:
+            failures.append(f"{solution.key}: broken solution: {outcome.error}")
+            continue
+        if outcome.elapsed_ms > args.max_ms:
+            failures.append(f"{solution.key}: slow solution: {outcome.elapsed_ms:.1f} ms > {args.max_ms:.0f} ms")
+        if solution.expected_result is not None:
+            ok, message = _compare_to_expected_result(
+                outcome.columns,
+                [list(row) for row in outcome.rows],
+                solution.expected_result,
+                order_matters=solution.order_matters,
+            )
+            if not ok:
+                failures.append(f"{solution.key}: solution disagrees with expected_result: {message}")
+            # The runtime compares against expected_result directly; no snapshot needed.
+            continue
+        if not is_snapshot_safe(solution.query):
+            volatile.append(solution.key)
+            continue
+        entries[solution.key] = expected_entry(
+            solution.query, outcome.columns, outcome.rows, max_rows=max(0, args.max_rows)
+        )
+
+    timed = sorted(outcomes, key=lambda item: item.elapsed_ms, reverse=True)
+    shown = timed if args.timings == "all" else timed[: max(0, int(args.timings))]
+    if shown:
+        print(f"{'ms':>9}  {'rows':>6}  solution")
+        for outcome in shown:
+            status = "ERROR" if outcome.error else str(len(outcome.rows))
+            print(f"{outcome.elapsed_ms:>9.2f}  {status:>6}  {outcome.solution.key}")
+    samples = [outcome.elapsed_ms for outcome in outcomes if not outcome.error]
+    print(
+        f"{len(outcomes)} solutions on {workers} cursors: seed {seed_ms:.0f} ms, "
+        f"p50 {_percentile(samples, 50):.2f} ms, p95 {_percentile(samples, 95):.2f} ms, "
+        f"max {max(samples, default=0.0):.2f} ms, total {wall_ms:.0f} ms"
+    )
+
+    if volatile:
+        print(f"[INFO] {len(volatile)} volatile solution(s) not snapshotted (validated live):")
+        for key in volatile:
+            print(f"- {key}")
+
+    if failures:
+        print(f"[ERROR] {len(failures)} solution check(s) failed:")
+        for failure in failures:
+            print(f"- {failure}")
+        return 1
+
+    text = _artifact_text(seed_digest(CONTENT_DIR), entries)
+    if args.check:
+        current = out_path.read_text(encoding="utf-8") if out_path.exists() else ""
+        if current != text:
+            print(f"[ERROR] {out_path} is stale; run python tools/check_solutions.py and commit it.")
+            return 1
+        print(f"[OK] {out_path} is up to date ({len(entries)} entries).")
+        return 0
+
+    _write_atomic(out_path, text)
+    print(f"[OK] wrote {out_path} ({len(entries)} entries, {len(text.encode('utf-8')) / 1024:.1f} KiB).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
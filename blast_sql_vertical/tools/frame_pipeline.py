@@ -0,0 +1,199 @@
+"""
+Parallel frame pipeline for the particle animations.
+
+The particle simulation is cheap but sequential: each frame integrates from the
+previous one. The render tools run it once up front and record every frame's
+particle positions and alphas. Rasterizing frames is the expensive part, and it
+is independent per frame, so ``encode_scene`` fans it out to a process pool:
+
+* The recorded simulation and a ring of ``slots`` frame buffers live in one
+  memory-mapped file (``SharedArrays``; under ``/dev/shm`` where available).
+  Workers read the simulation and write pixels in place, and only an index
+  crosses the process boundary.
+* The driver keeps at most ``slots`` frames in flight in submission order. It
+  waits on the oldest one, hands it to the ``imageio`` writer (ffmpeg encodes in
+  its own process) and only then reuses that slot for a later frame.
+* ``run_specs`` drives several specs at once from threads that share one process
+  pool, so the cores stay busy while any single encoder is the bottleneck.
+
+Workers open the mapping per task rather than caching it, so nothing stays
+mapped once a spec finishes and its backing file can be removed.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, TypeVar
+import os
+import tempfile
+import time
+
+import imageio.v2 as imageio
+import numpy as np
+
+from particle_raster import blend_rgba, splat_discs
+
+T = TypeVar("T")
+_ALIGN = 64
+
+
+def _shared_dir() -> str | None:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _views(buffer: np.ndarray, layout: dict[str, tuple[int, tuple[int, ...], str]]) -> dict[str, np.ndarray]:
+    views = {}
+    for name, (offset, shape, dtype) in layout.items():
+        count = int(np.prod(shape, dtype=np.int64))
+        nbytes = count * np.dtype(dtype).itemsize
+        views[name] = buffer[offset : offset + nbytes].view(dtype).reshape(shape)
+    return views
+
+
+class SharedArrays:
+    """Named arrays packed into one memory-mapped file that worker processes can open."""
+
+    def __init__(self, specs: dict[str, tuple[tuple[int, ...], str]]) -> None:
+        layout: dict[str, tuple[int, tuple[int, ...], str]] = {}
+        total = 0
+        for name, (shape, dtype) in specs.items():
+            layout[name] = (total, tuple(int(n) for n in shape), dtype)
+            nbytes = int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            total += -(-nbytes // _ALIGN) * _ALIGN
+        fd, self.path = tempfile.mkstemp(prefix="blast_frames_", suffix=".bin", dir=_shared_dir())
+        try:
+            os.ftruncate(fd, max(total, 1))
+        finally:
+            os.close(fd)
+        self.layout = layout
+        self._buffer: np.ndarray | None = np.memmap(self.path, dtype=np.uint8, mode="r+")
+        self.arrays = _views(self._buffer, layout)
+
+    @property
+    def handle(self) -> tuple[str, dict[str, tuple[int, tuple[int, ...], str]]]:
+        return self.path, self.layout
+
+    def close(self) -> None:
+        self.arrays = {}
+        self._buffer = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # Windows refuses while a stray view is still mapped; the temp dir reclaims it.
+            pass
+
+
+def open_shared(handle: tuple[str, dict[str, tuple[int, tuple[int, ...], str]]]) -> dict[str, np.ndarray]:
+    path, layout = handle
+    return _views(np.memmap(path, dtype=np.uint8, mode="r+"), layout)
+
+
+@dataclass(frozen=True)
+class ParticleScene:
+    """Static description of one animation; per-frame state lives in the shared arrays."""
+
+    width: int
+    height: int
+    frame_count: int
+    fps: int
+    background: tuple[int, int, int]
+    star_rgb: tuple[int, int, int]
+    brace_rgb: tuple[int, int, int]
+
+
+def render_scene_frame(frame: np.ndarray, scene: ParticleScene, arrays: dict[str, np.ndarray], index: int) -> None:
+    """Rasterize frame ``index``: background, ambient stars, brace particles, optional overlay."""
+    frame[:, :] = scene.background
+    splat_discs(frame, arrays["star_pos"][index], arrays["star_size"], scene.star_rgb, arrays["star_alpha"][index])
+    splat_discs(frame, arrays["pos"][index], arrays["size"], scene.brace_rgb)
+    if "overlay" in arrays:
+        blend_rgba(frame, arrays["overlay"])
+
+
+def _render_task(handle, scene: ParticleScene, index: int, slot: int) -> int:
+    arrays = open_shared(handle)
+    render_scene_frame(arrays["frames"][slot], scene, arrays, index)
+    return index
+
+
+def encode_scene(
+    scene: ParticleScene,
+    simulation: dict[str, np.ndarray],
+    out_path: Path,
+    *,
+    executor: Executor,
+    slots: int,
+    on_frame: Callable[[int, np.ndarray], None] | None = None,
+) -> None:
+    """Render ``scene`` on ``executor`` and encode the frames to ``out_path`` in order.
+
+    ``simulation`` holds ``star_pos`` (F, S, 2), ``star_size`` (S,), ``star_alpha`` (F, S),
+    ``pos`` (F, N, 2), ``size`` (N,) and optionally an RGBA ``overlay`` (H, W, 4).
+    """
+    slots = max(1, min(slots, scene.frame_count))
+    specs = {name: (value.shape, value.dtype.str) for name, value in simulation.items()}
+    specs["frames"] = ((slots, scene.height, scene.width, 3), "|u1")
+    shared = SharedArrays(specs)
+    writer = None
+    in_flight: deque = deque()
+    try:
+        for name, value in simulation.items():
+            shared.arrays[name][...] = value
+
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        writer = imageio.get_writer(
+            out_path.as_posix(),
+            fps=scene.fps,
+            codec="libx264",
+            quality=8,
+            pixelformat="yuv420p",
+            macro_block_size=1,
+        )
+        submitted = 0
+        started = time.time()
+        while submitted < slots:
+            in_flight.append(executor.submit(_render_task, shared.handle, scene, submitted, submitted % slots))
+            submitted += 1
+        for index in range(scene.frame_count):
+            in_flight.popleft().result()
+            frame = shared.arrays["frames"][index % slots]
+            writer.append_data(frame)
+            if on_frame is not None:
+                on_frame(index, frame)
+            # The slot is free again only once the encoder has taken this frame.
+            if submitted < scene.frame_count:
+                in_flight.append(executor.submit(_render_task, shared.handle, scene, submitted, submitted % slots))
+                submitted += 1
+            if (index + 1) % 30 == 0:
+                print(f"[{out_path.name}] frame {index + 1}/{scene.frame_count} ({time.time() - started:.1f}s)")
+    finally:
+        for future in in_flight:
+            future.cancel()
+        for future in in_flight:
+            if not future.cancelled():
+                future.exception()
+        if writer is not None:
+            writer.close()
+        shared.close()
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def run_specs(jobs: list[Callable[[Executor, int], T]], *, workers: int | None = None) -> list[T]:
+    """Run ``job(executor, slots)`` for every spec concurrently on one shared process pool."""
+    workers = workers or default_workers()
+    # Enough buffered frames per spec to keep every worker busy while encoders drain.
+    slots = max(4, (2 * workers) // max(1, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Start the workers from this thread, before the driver threads exist (fork safety).
+        executor.submit(int).result()
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as drivers:
+            futures = [drivers.submit(job, executor, slots) for job in jobs]
+            return [future.result() for future in futures]
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-import math
+from typing import Callable
+import argparse
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
+
+from particle_raster import splat_discs
+from render_kit import brace_targets
 
 
 @dataclass(frozen=True)
@@ -15,67 +21,24 @@ class StillSpec:
     theme: str  # dark | white
 
 
-def _pick_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    candidates = [
-        "C:/Windows/Fonts/seguisb.ttf",
-        "C:/Windows/Fonts/segoeui.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-        "C:/Windows/Fonts/calibri.ttf",
-    ]
-    for font_path in candidates:
-        if Path(font_path).exists():
-            try:
-                return ImageFont.truetype(font_path, size=size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+SPECS = [
+    StillSpec(1080, 1350, "dark"),
+    StillSpec(1080, 1920, "dark"),
+    StillSpec(1080, 1350, "white"),
+    StillSpec(1080, 1920, "white"),
+]
+SEED_BASE = 303500
 
 
 def _build_brace_targets(width: int, height: int, spacing: int = 6) -> np.ndarray:
-    mask = Image.new("L", (width, height), 0)
-    draw = ImageDraw.Draw(mask)
-
-    font_size = int(min(width * 0.42, height * 0.225))
-    font = _pick_font(font_size)
-
-    cx = width / 2.0
-    cy = height / 2.0
-    offset = max(min(width * 0.385, 430), 205)
-    draw.text((cx - offset, cy), "{", fill=255, font=font, anchor="mm")
-    draw.text((cx + offset, cy), "}", fill=255, font=font, anchor="mm")
-
-    data = np.array(mask)
-    points: list[tuple[float, float]] = []
-    for y in range(0, height, spacing):
-        row = data[y]
-        for x in range(0, width, spacing):
-            if row[x] > 80:
-                points.append((float(x), float(y)))
-    return np.array(points, dtype=np.float32)
-
-
-def _draw_circle(image: np.ndarray, x: float, y: float, r: float, color: tuple[int, int, int], alpha: float) -> None:
-    h, w, _ = image.shape
-    cx = int(round(x))
-    cy = int(round(y))
-    rad = max(1, int(math.ceil(r)))
-    x0 = max(0, cx - rad)
-    x1 = min(w - 1, cx + rad)
-    y0 = max(0, cy - rad)
-    y1 = min(h - 1, cy + rad)
-    if x1 < x0 or y1 < y0:
-        return
-
-    yy, xx = np.ogrid[y0 : y1 + 1, x0 : x1 + 1]
-    dist2 = (xx - x) ** 2 + (yy - y) ** 2
-    mask = dist2 <= (r * r)
-    if not np.any(mask):
-        return
-
-    patch = image[y0 : y1 + 1, x0 : x1 + 1]
-    col = np.array(color, dtype=np.float32)
-    a = np.clip(alpha, 0.0, 1.0)
-    patch[mask] = (patch[mask] * (1.0 - a) + col * a).astype(np.uint8)
+    return brace_targets(
+        width,
+        height,
+        center_y=height / 2.0,
+        font_size=int(min(width * 0.42, height * 0.225)),
+        offset=max(min(width * 0.385, 430), 205),
+        spacing=spacing,
+    )
 
 
 def render_still(spec: StillSpec, out_path: Path, seed: int) -> None:
@@ -106,15 +69,7 @@ def render_still(spec: StillSpec, out_path: Path, seed: int) -> None:
     star_size = rng.uniform(0.65, 2.1, size=star_count).astype(np.float32)
     star_alpha = rng.uniform(0.20, 0.95, size=star_count).astype(np.float32) * star_alpha_scale
 
-    for i in range(star_count):
-        _draw_circle(
-            frame,
-            float(star_pos[i, 0]),
-            float(star_pos[i, 1]),
-            float(star_size[i]),
-            star_rgb,
-            float(star_alpha[i]),
-        )
+    splat_discs(frame, star_pos, star_size, star_rgb, star_alpha)
 
     # Brace particles.
     jitter = np.column_stack(
@@ -126,38 +81,47 @@ def render_still(spec: StillSpec, out_path: Path, seed: int) -> None:
     points = targets + jitter
     sizes = rng.uniform(0.9, 2.2, size=len(points)).astype(np.float32)
 
-    for i in range(len(points)):
-        _draw_circle(
-            frame,
-            float(points[i, 0]),
-            float(points[i, 1]),
-            float(sizes[i]),
-            brace_rgb,
-            1.0,
-        )
+    splat_discs(frame, points, sizes, brace_rgb)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     Image.fromarray(frame, mode="RGB").save(out_path.as_posix(), format="PNG", optimize=True)
 
 
+def _still_path(spec: StillSpec, out_dir: Path) -> Path:
+    suffix = "white_bg" if spec.theme == "white" else "dark_bg"
+    return out_dir / f"brace_particles_static_{suffix}_{spec.width}x{spec.height}.png"
+
+
+def _render_job(job: tuple[StillSpec, Path, int]) -> Path:
+    spec, out_file, seed = job
+    print(f"Rendering {out_file} ...")
+    render_still(spec, out_file, seed=seed)
+    return out_file
+
+
+def _submit_still(job: tuple[StillSpec, Path, int], executor: Executor, slots: int) -> Path:
+    out_file = executor.submit(_render_job, job).result()
+    print(f"Done: {out_file}")
+    return out_file
+
+
+def make_job(spec: StillSpec, out_dir: Path, seed: int) -> Callable[[Executor, int], Path]:
+    return partial(_submit_still, (spec, _still_path(spec, out_dir), seed))
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the static brace particle images.")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count).")
+    args = parser.parse_args()
+
     root = Path(__file__).resolve().parents[1]
     out_dir = root / "docs" / "marketing" / "assets"
+    jobs = [(spec, _still_path(spec, out_dir), SEED_BASE + idx) for idx, spec in enumerate(SPECS, start=1)]
 
-    specs = [
-        StillSpec(1080, 1350, "dark"),
-        StillSpec(1080, 1920, "dark"),
-        StillSpec(1080, 1350, "white"),
-        StillSpec(1080, 1920, "white"),
-    ]
-
-    for idx, spec in enumerate(specs, start=1):
-        suffix = "white_bg" if spec.theme == "white" else "dark_bg"
-        filename = f"brace_particles_static_{suffix}_{spec.width}x{spec.height}.png"
-        out_file = out_dir / filename
-        print(f"Rendering {out_file} ...")
-        render_still(spec, out_file, seed=303500 + idx)
-        print(f"Done: {out_file}")
+    # Each still is a single frame, so parallelize across specs instead.
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for out_file in executor.map(_render_job, jobs):
+            print(f"Done: {out_file}")
 
 
 if __name__ == "__main__":
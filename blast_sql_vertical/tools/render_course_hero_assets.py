@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import Callable
+import argparse
 import math
 
-import imageio.v2 as imageio
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+from frame_pipeline import ParticleScene, encode_scene, run_specs
+from render_kit import brace_targets, pick_font
 
 
 @dataclass(frozen=True)
@@ -22,26 +28,13 @@ class RenderSpec:
         return self.seconds * self.fps
 
 
-def _pick_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    if bold:
-        candidates = [
-            "C:/Windows/Fonts/seguisb.ttf",
-            "C:/Windows/Fonts/segoeuib.ttf",
-            "C:/Windows/Fonts/arialbd.ttf",
-        ]
-    else:
-        candidates = [
-            "C:/Windows/Fonts/segoeui.ttf",
-            "C:/Windows/Fonts/calibri.ttf",
-            "C:/Windows/Fonts/arial.ttf",
-        ]
-    for font_path in candidates:
-        if Path(font_path).exists():
-            try:
-                return ImageFont.truetype(font_path, size=size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+SPECS = [
+    RenderSpec(1080, 1350, "dark", seconds=10, fps=30),
+    RenderSpec(1080, 1920, "dark", seconds=10, fps=30),
+    RenderSpec(1080, 1350, "white", seconds=10, fps=30),
+    RenderSpec(1080, 1920, "white", seconds=10, fps=30),
+]
+SEED_BASE = 404000
 
 
 def _layout_values(w: int, h: int) -> dict[str, float]:
@@ -66,24 +59,15 @@ def _layout_values(w: int, h: int) -> dict[str, float]:
 
 
 def _build_brace_targets(width: int, height: int, center_y: float, spacing: int = 6) -> np.ndarray:
-    mask = Image.new("L", (width, height), 0)
-    draw = ImageDraw.Draw(mask)
-    brace_size = int(min(width * 0.34, 300))
-    brace_font = _pick_font(brace_size, bold=False)
-
-    center_x = width * 0.5
-    brace_offset = max(min(width * 0.40, 440), 250)
-    draw.text((center_x - brace_offset, center_y), "{", fill=255, font=brace_font, anchor="mm")
-    draw.text((center_x + brace_offset, center_y), "}", fill=255, font=brace_font, anchor="mm")
-
-    data = np.array(mask)
-    pts: list[tuple[float, float]] = []
-    for y in range(0, height, spacing):
-        row = data[y]
-        for x in range(0, width, spacing):
-            if row[x] > 80:
-                pts.append((float(x), float(y)))
-    return np.array(pts, dtype=np.float32)
+    return brace_targets(
+        width,
+        height,
+        center_y=center_y,
+        font_size=int(min(width * 0.34, 300)),
+        offset=max(min(width * 0.40, 440), 250),
+        family="regular",
+        spacing=spacing,
+    )
 
 
 def _text_overlay(spec: RenderSpec) -> np.ndarray:
@@ -112,12 +96,12 @@ def _text_overlay(spec: RenderSpec) -> np.ndarray:
         button_fg = (14, 18, 24, 255)
 
     # Slightly smaller typography for ad-safe composition on vertical canvases.
-    kicker_font = _pick_font(max(20, int(min_dim * 0.024)), bold=True)
-    h1_font = _pick_font(max(46, int(min_dim * 0.060)), bold=True)
-    h2_font = _pick_font(max(46, int(min_dim * 0.060)), bold=True)
-    subtitle_font = _pick_font(max(22, int(min_dim * 0.024)), bold=False)
-    stats_font = _pick_font(max(18, int(min_dim * 0.020)), bold=False)
-    button_font = _pick_font(max(22, int(min_dim * 0.026)), bold=True)
+    kicker_font = pick_font(max(20, int(min_dim * 0.024)), "bold")
+    h1_font = pick_font(max(46, int(min_dim * 0.060)), "bold")
+    h2_font = pick_font(max(46, int(min_dim * 0.060)), "bold")
+    subtitle_font = pick_font(max(22, int(min_dim * 0.024)), "regular")
+    stats_font = pick_font(max(18, int(min_dim * 0.020)), "regular")
+    button_font = pick_font(max(22, int(min_dim * 0.026)), "bold")
 
     cx = w * 0.5
     draw.text((cx, vals["kicker_y"]), "SQL DO BÁSICO AO AVANÇADO", fill=kicker_color, font=kicker_font, anchor="mm")
@@ -139,36 +123,8 @@ def _text_overlay(spec: RenderSpec) -> np.ndarray:
     return np.array(canvas, dtype=np.uint8)
 
 
-def _draw_circle(img: np.ndarray, x: float, y: float, r: float, rgb: tuple[int, int, int], alpha: float) -> None:
-    h, w, _ = img.shape
-    cx = int(round(x))
-    cy = int(round(y))
-    rad = max(1, int(math.ceil(r)))
-    x0 = max(0, cx - rad)
-    x1 = min(w - 1, cx + rad)
-    y0 = max(0, cy - rad)
-    y1 = min(h - 1, cy + rad)
-    if x1 < x0 or y1 < y0:
-        return
-    yy, xx = np.ogrid[y0 : y1 + 1, x0 : x1 + 1]
-    dist2 = (xx - x) ** 2 + (yy - y) ** 2
-    mask = dist2 <= (r * r)
-    if not np.any(mask):
-        return
-    patch = img[y0 : y1 + 1, x0 : x1 + 1]
-    col = np.array(rgb, dtype=np.float32)
-    a = np.clip(alpha, 0.0, 1.0)
-    patch[mask] = (patch[mask] * (1.0 - a) + col * a).astype(np.uint8)
-
-
-def _blend_overlay(base: np.ndarray, overlay_rgba: np.ndarray) -> np.ndarray:
-    alpha = (overlay_rgba[..., 3:4].astype(np.float32) / 255.0)
-    over_rgb = overlay_rgba[..., :3].astype(np.float32)
-    out = base.astype(np.float32) * (1.0 - alpha) + over_rgb * alpha
-    return out.astype(np.uint8)
-
-
-def render_pair(spec: RenderSpec, output_dir: Path, seed: int) -> tuple[Path, Path]:
+def simulate(spec: RenderSpec, seed: int) -> tuple[ParticleScene, dict[str, np.ndarray]]:
+    """Run the particle simulation for every frame up front (it is cheap and sequential)."""
     rng = np.random.default_rng(seed)
     w, h = spec.width, spec.height
     vals = _layout_values(w, h)
@@ -181,12 +137,12 @@ def render_pair(spec: RenderSpec, output_dir: Path, seed: int) -> tuple[Path, Pa
 
     # Theme colors.
     if spec.theme == "white":
-        bg_color = np.array([245, 247, 250], dtype=np.uint8)
+        bg_color = (245, 247, 250)
         brace_rgb = (58, 127, 244)
         star_rgb = (84, 95, 110)
         star_alpha_scale = 0.44
     else:
-        bg_color = np.array([3, 6, 12], dtype=np.uint8)
+        bg_color = (3, 6, 12)
         brace_rgb = (66, 133, 244)
         star_rgb = (246, 250, 255)
         star_alpha_scale = 1.0
@@ -212,94 +168,87 @@ def render_pair(spec: RenderSpec, output_dir: Path, seed: int) -> tuple[Path, Pa
     star_phase = rng.uniform(0.0, math.tau, size=star_count).astype(np.float32)
     star_freq = rng.uniform(0.55, 1.7, size=star_count).astype(np.float32)
 
-    suffix = "white_bg" if spec.theme == "white" else "dark_bg"
-    mp4_path = output_dir / f"course_hero_anim_{suffix}_{w}x{h}_10s.mp4"
-    png_path = output_dir / f"course_hero_static_{suffix}_{w}x{h}.png"
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    writer = imageio.get_writer(
-        mp4_path.as_posix(),
-        fps=spec.fps,
-        codec="libx264",
-        quality=8,
-        pixelformat="yuv420p",
-        macro_block_size=1,
-    )
+    pos_track = np.empty((spec.frame_count, n, 2), dtype=np.float32)
+    star_track = np.empty((spec.frame_count, star_count, 2), dtype=np.float32)
+    alpha_track = np.empty((spec.frame_count, star_count), dtype=np.float32)
+    for i in range(spec.frame_count):
+        t = i / spec.fps
+
+        # Brace dynamics.
+        wobble = np.column_stack(
+            (
+                np.sin(phase + t * 1.32) * 0.75,
+                np.cos(phase + t * 1.08) * 0.75,
+            )
+        ).astype(np.float32)
+        desired = targets + wobble
+        force = (desired - pos) * 0.082
+        noise = np.column_stack(
+            (
+                np.sin((phase * 0.7) + t * 1.72) * 0.03,
+                np.cos((phase * 0.5) + t * 1.48) * 0.03,
+            )
+        ).astype(np.float32)
+        vel = (vel + force + noise) * 0.80
+        pos += vel
+
+        # Ambient motion + wrap.
+        star_pos += star_vel
+        star_pos[:, 0] = np.where(star_pos[:, 0] < -2, w + 2, star_pos[:, 0])
+        star_pos[:, 0] = np.where(star_pos[:, 0] > w + 2, -2, star_pos[:, 0])
+        star_pos[:, 1] = np.where(star_pos[:, 1] < -2, h + 2, star_pos[:, 1])
+        star_pos[:, 1] = np.where(star_pos[:, 1] > h + 2, -2, star_pos[:, 1])
+
+        twinkle = star_alpha + 0.22 * np.sin(star_phase + t * star_freq * math.tau)
+        twinkle = np.clip(twinkle, 0.08, 1.0)
+
+        pos_track[i] = pos
+        star_track[i] = star_pos
+        alpha_track[i] = twinkle
+
+    scene = ParticleScene(w, h, spec.frame_count, spec.fps, bg_color, star_rgb, brace_rgb)
+    simulation = {
+        "star_pos": star_track,
+        "star_size": star_size,
+        "star_alpha": alpha_track,
+        "pos": pos_track,
+        "size": size,
+        "overlay": overlay,
+    }
+    return scene, simulation
 
+
+def render_pair(spec: RenderSpec, output_dir: Path, seed: int, executor: Executor, slots: int) -> tuple[Path, Path]:
+    print(f"Rendering hero assets: theme={spec.theme} {spec.width}x{spec.height}")
+    suffix = "white_bg" if spec.theme == "white" else "dark_bg"
+    mp4_path = output_dir / f"course_hero_anim_{suffix}_{spec.width}x{spec.height}_{spec.seconds}s.mp4"
+    png_path = output_dir / f"course_hero_static_{suffix}_{spec.width}x{spec.height}.png"
     static_frame_idx = spec.frame_count // 2
-    try:
-        for i in range(spec.frame_count):
-            t = i / spec.fps
-
-            # Brace dynamics.
-            wobble = np.column_stack(
-                (
-                    np.sin(phase + t * 1.32) * 0.75,
-                    np.cos(phase + t * 1.08) * 0.75,
-                )
-            ).astype(np.float32)
-            desired = targets + wobble
-            force = (desired - pos) * 0.082
-            noise = np.column_stack(
-                (
-                    np.sin((phase * 0.7) + t * 1.72) * 0.03,
-                    np.cos((phase * 0.5) + t * 1.48) * 0.03,
-                )
-            ).astype(np.float32)
-            vel = (vel + force + noise) * 0.80
-            pos += vel
-
-            # Ambient motion + wrap.
-            star_pos += star_vel
-            star_pos[:, 0] = np.where(star_pos[:, 0] < -2, w + 2, star_pos[:, 0])
-            star_pos[:, 0] = np.where(star_pos[:, 0] > w + 2, -2, star_pos[:, 0])
-            star_pos[:, 1] = np.where(star_pos[:, 1] < -2, h + 2, star_pos[:, 1])
-            star_pos[:, 1] = np.where(star_pos[:, 1] > h + 2, -2, star_pos[:, 1])
-
-            frame = np.empty((h, w, 3), dtype=np.uint8)
-            frame[:, :] = bg_color
-
-            twinkle = star_alpha + 0.22 * np.sin(star_phase + t * star_freq * math.tau)
-            twinkle = np.clip(twinkle, 0.08, 1.0)
-
-            for j in range(star_count):
-                _draw_circle(
-                    frame,
-                    float(star_pos[j, 0]),
-                    float(star_pos[j, 1]),
-                    float(star_size[j]),
-                    star_rgb,
-                    float(twinkle[j]),
-                )
-
-            for j in range(n):
-                _draw_circle(frame, float(pos[j, 0]), float(pos[j, 1]), float(size[j]), brace_rgb, 1.0)
-
-            frame = _blend_overlay(frame, overlay)
-            writer.append_data(frame)
-
-            if i == static_frame_idx:
-                Image.fromarray(frame, mode="RGB").save(png_path.as_posix(), format="PNG", optimize=True)
-    finally:
-        writer.close()
 
+    def save_static(index: int, frame: np.ndarray) -> None:
+        if index == static_frame_idx:
+            Image.fromarray(frame, mode="RGB").save(png_path.as_posix(), format="PNG", optimize=True)
+
+    scene, simulation = simulate(spec, seed)
+    encode_scene(scene, simulation, mp4_path, executor=executor, slots=slots, on_frame=save_static)
+    print(f"Done MP4: {mp4_path}")
+    print(f"Done PNG: {png_path}")
     return mp4_path, png_path
 
 
+def make_job(spec: RenderSpec, out_dir: Path, seed: int) -> Callable[[Executor, int], tuple[Path, Path]]:
+    return partial(render_pair, spec, out_dir, seed)
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the course hero videos and stills.")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count).")
+    args = parser.parse_args()
+
     root = Path(__file__).resolve().parents[1]
     out_dir = root / "docs" / "marketing" / "assets"
-    specs = [
-        RenderSpec(1080, 1350, "dark", seconds=10, fps=30),
-        RenderSpec(1080, 1920, "dark", seconds=10, fps=30),
-        RenderSpec(1080, 1350, "white", seconds=10, fps=30),
-        RenderSpec(1080, 1920, "white", seconds=10, fps=30),
-    ]
-    for idx, spec in enumerate(specs, start=1):
-        print(f"Rendering hero assets: theme={spec.theme} {spec.width}x{spec.height}")
-        mp4_path, png_path = render_pair(spec, out_dir, seed=404000 + idx)
-        print(f"Done MP4: {mp4_path}")
-        print(f"Done PNG: {png_path}")
+    jobs = [make_job(spec, out_dir, SEED_BASE + idx) for idx, spec in enumerate(SPECS, start=1)]
+    run_specs(jobs, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Shared helpers and a batch CLI for the marketing render tools.
+
+* ``pick_font`` probes the candidate font files once per family and keeps the
+  loaded ``FreeTypeFont`` per size.
+* ``brace_targets`` rasterizes the ``{ }`` glyph mask and samples particle
+  targets from it. Point clouds are cached in memory and persisted as ``.npy``
+  under ``RENDER_KIT_CACHE`` (default ``tools/.render_cache``), keyed by canvas
+  size, layout, font file and spacing, so repeated specs and later runs skip
+  the text rasterization.
+* The CLI renders any subset of the ads / stills / hero specs on one shared
+  process pool. ``--seconds`` shortens videos for quick iteration. Seeds follow
+  each tool's spec order, so a filtered run reproduces the published assets.
+
+Run from the repository root:
+
+    python tools/render_kit.py                          # everything, full length
+    python tools/render_kit.py hero --theme dark --seconds 2
+    python tools/render_kit.py ads stills --size 1080x1920 --out /tmp/preview
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from particle_raster import mask_points
+
+FONT_CANDIDATES: dict[str, tuple[str, ...]] = {
+    "brace": (
+        "C:/Windows/Fonts/seguisb.ttf",
+        "C:/Windows/Fonts/segoeui.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+        "C:/Windows/Fonts/calibri.ttf",
+    ),
+    "bold": (
+        "C:/Windows/Fonts/seguisb.ttf",
+        "C:/Windows/Fonts/segoeuib.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+    ),
+    "regular": (
+        "C:/Windows/Fonts/segoeui.ttf",
+        "C:/Windows/Fonts/calibri.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+    ),
+}
+KINDS = ("ads", "stills", "hero")
+CACHE_DIR = Path(os.getenv("RENDER_KIT_CACHE", "").strip() or Path(__file__).resolve().parent / ".render_cache")
+# Bump when the target rasterization changes so stale .npy files are ignored.
+_TARGETS_VERSION = 1
+_TARGETS: dict[str, np.ndarray] = {}
+_TARGETS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def font_path(family: str) -> str | None:
+    """First loadable candidate for ``family``, or ``None`` for Pillow's default font."""
+    for candidate in FONT_CANDIDATES[family]:
+        if Path(candidate).exists():
+            try:
+                ImageFont.truetype(candidate, size=12)
+                return candidate
+            except Exception:
+                pass
+    return None
+
+
+@lru_cache(maxsize=256)
+def pick_font(size: int, family: str = "brace") -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    path = font_path(family)
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size=size)
+
+
+def _rasterize_targets(
+    width: int, height: int, center_y: float, font_size: int, offset: float, family: str, spacing: int
+) -> np.ndarray:
+    mask = Image.new("L", (width, height), 0)
+    draw = ImageDraw.Draw(mask)
+    font = pick_font(font_size, family)
+    center_x = width / 2.0
+    draw.text((center_x - offset, center_y), "{", fill=255, font=font, anchor="mm")
+    draw.text((center_x + offset, center_y), "}", fill=255, font=font, anchor="mm")
+    return mask_points(mask, spacing)
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.save(handle, array)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def brace_targets(
+    width: int,
+    height: int,
+    *,
+    center_y: float,
+    font_size: int,
+    offset: float,
+    family: str = "brace",
+    spacing: int = 6,
+) -> np.ndarray:
+    """Particle targets for a ``{ }`` pair centred at ``center_y``, cached in memory and on disk."""
+    key = "|".join(
+        str(part)
+        for part in (
+            _TARGETS_VERSION,
+            width,
+            height,
+            f"{center_y:.4f}",
+            font_size,
+            f"{offset:.4f}",
+            family,
+            font_path(family),
+            spacing,
+        )
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    with _TARGETS_LOCK:
+        cached = _TARGETS.get(digest)
+    if cached is not None:
+        return cached.copy()
+
+    path = CACHE_DIR / f"targets_{digest}.npy"
+    points = None
+    if path.is_file():
+        try:
+            points = np.load(path)
+        except (OSError, ValueError):
+            points = None
+    if points is None:
+        points = _rasterize_targets(width, height, center_y, font_size, offset, family, spacing)
+        try:
+            _save_npy(path, points)
+        except OSError as exc:
+            print(f"[render_kit] could not persist {path.name}: {exc}")
+    with _TARGETS_LOCK:
+        _TARGETS[digest] = points
+    return points.copy()
+
+
+def clear_cache() -> int:
+    """Drop in-memory caches and delete persisted target files; returns files removed."""
+    with _TARGETS_LOCK:
+        _TARGETS.clear()
+    pick_font.cache_clear()
+    font_path.cache_clear()
+    removed = 0
+    if CACHE_DIR.is_dir():
+        for path in CACHE_DIR.glob("targets_*.npy"):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def _tool_registry() -> dict[str, object]:
+    # Imported lazily: the tools import this module for fonts and targets.
+    import render_brace_ads
+    import render_brace_stills
+    import render_course_hero_assets
+
+    return {
+        "ads": render_brace_ads,
+        "stills": render_brace_stills,
+        "hero": render_course_hero_assets,
+    }
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    try:
+        width, height = value.lower().split("x", 1)
+        return int(width), int(height)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}") from exc
+
+
+def build_jobs(
+    kinds: list[str],
+    *,
+    out_dir: Path,
+    sizes: list[tuple[int, int]] | None = None,
+    theme: str | None = None,
+    seconds: int | None = None,
+    fps: int | None = None,
+) -> list[Callable]:
+    """``run_specs`` jobs for the selected tools' specs after filters and overrides."""
+    registry = _tool_registry()
+    jobs = []
+    for kind in kinds:
+        tool = registry[kind]
+        for idx, spec in enumerate(tool.SPECS, start=1):
+            if sizes and (spec.width, spec.height) not in sizes:
+                continue
+            if theme and spec.theme != theme:
+                continue
+            names = {field.name for field in fields(spec)}
+            overrides = {
+                name: value for name, value in (("seconds", seconds), ("fps", fps)) if value and name in names
+            }
+            jobs.append(tool.make_job(replace(spec, **overrides), out_dir, tool.SEED_BASE + idx))
+    return jobs
+
+
+def main() -> int:
+    from frame_pipeline import run_specs
+
+    root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Batch-render marketing particle assets.")
+    parser.add_argument("kinds", nargs="*", metavar="{ads,stills,hero}", help="Tools to run (default: all).")
+    parser.add_argument("--size", type=_parse_size, action="append", help="Only specs of this WIDTHxHEIGHT.")
+    parser.add_argument("--theme", choices=["dark", "white"], default=None)
+    parser.add_argument("--seconds", type=int, default=None, help="Override video length (quick previews).")
+    parser.add_argument("--fps", type=int, default=None, help="Override video frame rate.")
+    parser.add_argument("--out", type=Path, default=root / "docs" / "marketing" / "assets")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count).")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete cached target point clouds first.")
+    args = parser.parse_args()
+    unknown = sorted(set(args.kinds) - set(KINDS))
+    if unknown:
+        parser.error(f"unknown tool(s): {', '.join(unknown)}")
+
+    if args.clear_cache:
+        print(f"[render_kit] removed {clear_cache()} cached target files")
+    kinds = args.kinds or list(KINDS)
+    jobs = build_jobs(
+        kinds,
+        out_dir=args.out,
+        sizes=args.size,
+        theme=args.theme,
+        seconds=args.seconds,
+        fps=args.fps,
+    )
+    if not jobs:
+        print("[render_kit] no specs match the filters")
+        return 1
+    run_specs(jobs, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,98 +6,161 @@ Checks:
 - U+FFFD replacement character (�)
 - classic mojibake signatures (Ã¡, â€™, etc.)
 - internal question marks inside words (aquisi??o)
+- every ``solution_query`` runs against the seeded DuckDB database and passes
+  the same SELECT-only guard that user queries go through
+
+The text checks are ``app.services.content_checks``, the same engine the backend
+runs at startup (``STRICT_CONTENT_VALIDATION``), so both agree on what is broken.
+
+Runs are incremental: per-file SHA-256 hashes and results are kept in a manifest
+(``tools/.validate_ptbr_manifest.json`` by default) and only new or changed files
+are parsed again. Any change to the check engine, ``seed.sql`` or the options
+invalidates the whole manifest. Changed files are checked on a process pool;
+``seed.sql`` is applied once to a template database that every worker opens
+read-only.
+
+Run from the repository root:
+
+    python tools/validate_ptbr_content.py
+    python tools/validate_ptbr_content.py --no-cache --workers 4
+    python tools/validate_ptbr_content.py --no-solutions   # text checks only, no DuckDB
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import argparse
+import hashlib
 import json
-import re
-from pathlib import Path
+import os
+import sys
+import tempfile
+import time
 
-MOJIBAKE_SEQUENCES = (
-    "Ã¡",
-    "Ã¢",
-    "Ã£",
-    "Ã©",
-    "Ãª",
-    "Ã­",
-    "Ã³",
-    "Ã´",
-    "Ãµ",
-    "Ãº",
-    "Ã§",
-    "Ã",
-    "Ã‰",
-    "Ã“",
-    "Ãš",
-    "Ã‡",
-    "Â ",
-    "Â·",
-    "â€“",
-    "â€”",
-    "â€œ",
-    "â€",
-    "â€˜",
-    "â€™",
-    "â€¦",
-    "â€¢",
-    "â‚¬",
-    "ðŸ",
-)
-
-
-def iter_json_strings(value, pointer="$"):
-    if isinstance(value, dict):
-        for key, child in value.items():
-            yield from iter_json_strings(child, f"{pointer}.{key}")
-        return
-    if isinstance(value, list):
-        for idx, child in enumerate(value):
-            yield from iter_json_strings(child, f"{pointer}[{idx}]")
+TOOLS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = TOOLS_DIR.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services import content_checks  # noqa: E402
+from app.services.content_checks import collect_payload_issues, iter_solution_queries  # noqa: E402
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST = TOOLS_DIR / ".validate_ptbr_manifest.json"
+
+# Per-process state set by ``_init_worker``.
+_SEED_DB: object | None = None
+_QUERY_GUARD = None
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fingerprint(seed_path: Path | None, limit: int) -> str:
+    """Everything besides the file itself that a cached result depends on."""
+    digest = hashlib.sha256(f"{MANIFEST_VERSION}|{limit}|{seed_path is not None}".encode())
+    for source in (Path(content_checks.__file__), Path(__file__)):
+        digest.update(_sha256_file(source).encode())
+    if seed_path is not None:
+        digest.update(_sha256_file(seed_path).encode() if seed_path.exists() else b"no-seed")
+    return digest.hexdigest()
+
+
+def _load_manifest(path: Path, fingerprint: str) -> dict[str, dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_manifest(path: Path, fingerprint: str, files: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            payload = {"fingerprint": fingerprint, "files": files}
+            json.dump(payload, handle, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _build_seed_template(seed_path: Path, directory: str) -> str:
+    """Apply ``seed.sql`` once to an on-disk DuckDB file that workers open read-only."""
+    import duckdb
+
+    db_path = os.path.join(directory, "seed.duckdb")
+    conn = duckdb.connect(db_path)
+    try:
+        # Same statement split as app.services.sql_engine._ensure_seed_template.
+        for stmt in seed_path.read_text(encoding="utf-8").split(";"):
+            if stmt.strip():
+                conn.execute(stmt.strip())
+    finally:
+        conn.close()
+    return db_path
+
+
+def _init_worker(seed_db_path: str | None) -> None:
+    global _SEED_DB, _QUERY_GUARD
+    if seed_db_path is None:
         return
-    if isinstance(value, str):
-        yield pointer, value
+    import duckdb
 
+    from app.services.sql_engine import _validate_query
 
-def find_internal_qmark_token(text: str) -> str | None:
-    for token in re.findall(r"[A-Za-zÀ-ÿ0-9_?]+", text):
-        if "?" not in token:
-            continue
-        if set(token) == {"?"}:
-            continue
-        if token.endswith("?") and token.count("?") == 1 and token[:-1].isalnum():
-            continue
-        return token
-    return None
+    _SEED_DB = duckdb.connect(seed_db_path, read_only=True)
+    _QUERY_GUARD = _validate_query
 
 
-def check_text(text: str) -> list[str]:
+def _check_solutions(data, label: str) -> tuple[list[str], int]:
     issues: list[str] = []
-    if "\ufffd" in text:
-        issues.append("contains_replacement_char")
-    if any(seq in text for seq in MOJIBAKE_SEQUENCES):
-        issues.append("contains_mojibake_signature")
-    token = find_internal_qmark_token(text)
-    if token:
-        issues.append(f"contains_internal_qmark_token:{token}")
-    return issues
-
-
-def validate_file(path: Path, max_issues: int) -> list[str]:
-    file_issues: list[str] = []
+    count = 0
+    for pointer, query in iter_solution_queries(data):
+        count += 1
+        rejected = _QUERY_GUARD(query)
+        if rejected:
+            issues.append(f"{label}:{pointer}: solution_query_rejected: {rejected}")
+            continue
+        try:
+            _SEED_DB.execute(query).fetchall()
+        except Exception as exc:
+            message = str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__
+            issues.append(f"{label}:{pointer}: solution_query_failed: {message[:200]}")
+    return issues, count
+
+
+def validate_file(path: Path, max_issues: int) -> dict:
+    """Check one file; returns ``{"issues": [...], "solutions": <queries executed>}``."""
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception as exc:
-        return [f"{path}: invalid_json: {exc}"]
+        return {"issues": [f"{path}: invalid_json: {exc}"], "solutions": 0}
 
-    for pointer, text in iter_json_strings(data):
-        for issue in check_text(text):
-            snippet = text.strip().replace("\n", " ")[:120]
-            file_issues.append(f"{path}:{pointer}: {issue} :: {snippet}")
-            if len(file_issues) >= max_issues:
-                return file_issues
-    return file_issues
+    issues = [f"{path}:{issue}" for issue in collect_payload_issues(data, limit=max_issues)]
+    solutions = 0
+    if _SEED_DB is not None:
+        solution_issues, solutions = _check_solutions(data, str(path))
+        issues.extend(solution_issues)
+    return {"issues": issues[:max_issues], "solutions": solutions}
+
+
+def _check_task(path: str, max_issues: int) -> dict:
+    return validate_file(Path(path), max_issues)
 
 
 def main() -> int:
@@ -113,6 +176,10 @@ def main() -> int:
         default=200,
         help="Maximum number of issues to print before stopping.",
     )
+    parser.add_argument("--workers", type=int, default=None, help="Checker processes (default: CPU count).")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Incremental results manifest.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file (the manifest is rewritten).")
+    parser.add_argument("--no-solutions", action="store_true", help="Skip executing solution_query against the seed.")
     args = parser.parse_args()
 
     content_dir = Path(args.content_dir)
@@ -120,19 +187,69 @@ def main() -> int:
         print(f"[ERROR] content dir not found: {content_dir}")
         return 2
 
-    issues: list[str] = []
+    limit = max(1, args.limit)
+    seed_path = None if args.no_solutions else content_dir / "seed.sql"
+    started = time.perf_counter()
+    fingerprint = _fingerprint(seed_path, limit)
+    cached = {} if args.no_cache else _load_manifest(args.manifest, fingerprint)
+
+    results: dict[str, dict] = {}
+    pending: dict[str, str] = {}
     for path in sorted(content_dir.rglob("*.json")):
-        issues.extend(validate_file(path, max_issues=max(1, args.limit - len(issues))))
-        if len(issues) >= args.limit:
-            break
+        rel = path.relative_to(content_dir).as_posix()
+        digest = _sha256_file(path)
+        entry = cached.get(rel)
+        if isinstance(entry, dict) and entry.get("sha256") == digest:
+            results[rel] = entry
+        else:
+            pending[rel] = digest
+
+    if pending:
+        with tempfile.TemporaryDirectory(prefix="ptbr_validate_") as tmp_dir:
+            seed_db = None
+            if seed_path is not None and seed_path.exists():
+                try:
+                    seed_db = _build_seed_template(seed_path, tmp_dir)
+                except ImportError:
+                    print("[ERROR] duckdb is required to check solution queries (or pass --no-solutions).")
+                    return 2
+                except Exception as exc:
+                    print(f"[ERROR] seed.sql failed to apply: {exc}")
+                    return 1
+            paths = [str(content_dir / rel) for rel in pending]
+            workers = max(1, min(args.workers or os.cpu_count() or 1, len(paths)))
+            if workers == 1:
+                _init_worker(seed_db)
+                checked = [_check_task(path, limit) for path in paths]
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=(seed_db,)
+                ) as executor:
+                    checked = list(executor.map(_check_task, paths, [limit] * len(paths), chunksize=4))
+        for (rel, digest), result in zip(pending.items(), checked):
+            results[rel] = {"sha256": digest, **result}
+
+    try:
+        _save_manifest(args.manifest, fingerprint, dict(sorted(results.items())))
+    except OSError as exc:
+        print(f"[WARN] could not write manifest {args.manifest}: {exc}")
+
+    issues: list[str] = []
+    for rel in sorted(results):
+        issues.extend(results[rel]["issues"])
+    solutions = sum(int(entry.get("solutions", 0)) for entry in results.values())
+    summary = (
+        f"{len(results)} files ({len(pending)} checked, {len(results) - len(pending)} unchanged), "
+        f"{solutions} solution queries, {time.perf_counter() - started:.2f}s"
+    )
 
     if issues:
-        print("[ERROR] PT-BR content validation failed:")
-        for issue in issues:
+        print(f"[ERROR] PT-BR content validation failed ({summary}):")
+        for issue in issues[:limit]:
             print(f"- {issue}")
         return 1
 
-    print("[OK] PT-BR content validation passed.")
+    print(f"[OK] PT-BR content validation passed ({summary}).")
     return 0
 
 